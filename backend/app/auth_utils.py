@@ -2,7 +2,9 @@
 Authentication utilities for route protection.
 """
 
-from fastapi import Depends, HTTPException, status
+from typing import Optional
+
+from fastapi import Depends, HTTPException, Query, status
 from fastapi.security import OAuth2PasswordBearer
 from jose import JWTError, jwt
 
@@ -10,20 +12,20 @@ SECRET_KEY = "your-secret-key-change-this-in-production-use-env-variable"
 ALGORITHM = "HS256"
 
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="/api/auth/login")
+optional_oauth2_scheme = OAuth2PasswordBearer(tokenUrl="/api/auth/login", auto_error=False)
 
 
-async def get_current_user(token: str = Depends(oauth2_scheme)):
-    """
-    Validate JWT token and return current user.
-
-    Used as dependency in protected routes.
-    """
+def _user_from_token(token: Optional[str]) -> dict:
+    """Decode a JWT access token, raising 401 if it is missing or invalid."""
     credentials_exception = HTTPException(
         status_code=status.HTTP_401_UNAUTHORIZED,
         detail="Could not validate credentials",
         headers={"WWW-Authenticate": "Bearer"},
     )
 
+    if not token:
+        raise credentials_exception
+
     try:
         payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
         email: str = payload.get("sub")
@@ -32,3 +34,26 @@ async def get_current_user(token: str = Depends(oauth2_scheme)):
         return {"email": email}
     except JWTError:
         raise credentials_exception
+
+
+async def get_current_user(token: str = Depends(oauth2_scheme)):
+    """
+    Validate JWT token and return current user.
+
+    Used as dependency in protected routes.
+    """
+    return _user_from_token(token)
+
+
+async def get_stream_user(
+    header_token: Optional[str] = Depends(optional_oauth2_scheme),
+    token: Optional[str] = Query(None, description="Access token (EventSource can't send an Authorization header)")
+):
+    """
+    Validate the JWT token of a Server-Sent Events request.
+
+    Browsers' EventSource can't set headers, so the token may also be passed
+    as a `token` query parameter; the Authorization header wins if both are
+    sent.
+    """
+    return _user_from_token(header_token or token)
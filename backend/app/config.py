@@ -39,8 +39,36 @@ class Config:
         self.google_webhook_secret = os.getenv('GOOGLE_WEBHOOK_SECRET')
         self.onedrive_webhook_secret = os.getenv('ONEDRIVE_WEBHOOK_SECRET')
 
-        # Database (future)
+        # Database
         self.database_url = os.getenv('DATABASE_URL')
+        self.database_mode = os.getenv('DATABASE_MODE', 'production')  # 'production' (WAL + tuned pragmas) or 'basic'
+        self.db_pool_size = int(os.getenv('DB_POOL_SIZE', '10'))
+        self.db_max_overflow = int(os.getenv('DB_MAX_OVERFLOW', '20'))
+
+        # Pipeline telemetry
+        self.pipeline_trace_memory = os.getenv('PIPELINE_TRACE_MEMORY', 'False').lower() == 'true'  # tracemalloc per stage (slow)
+        self.portfolio_workers = int(os.getenv('PORTFOLIO_WORKERS', '0'))  # Concurrent project pipelines in portfolio runs (0 = one per CPU core)
+        self.portfolio_sqlite_workers = int(os.getenv('PORTFOLIO_SQLITE_WORKERS', '4'))  # Cap on PORTFOLIO_WORKERS when the database is SQLite (workers share its write lock)
+
+        # Dashboard workbook cache
+        self.workbook_cache_size = int(os.getenv('WORKBOOK_CACHE_SIZE', '64'))  # Parsed workbook results kept across projects (LRU)
+        self.document_viewer_cache_size = int(os.getenv('DOCUMENT_VIEWER_CACHE_SIZE', '256'))  # Sheet windows and PDF page ranges kept by the document viewer (LRU)
+        self.workbook_read_workers = int(os.getenv('WORKBOOK_READ_WORKERS', '4'))  # Threads reading dashboard workbooks off the event loop
+        self.dashboard_snapshot_poll_seconds = float(os.getenv('DASHBOARD_SNAPSHOT_POLL_SECONDS', '10'))  # Dashboard snapshot rebuild polling (0 = rebuild on request only)
+
+        # HTTP responses
+        self.compression_min_size = int(os.getenv('COMPRESSION_MIN_SIZE', '1024'))  # Smallest response body compressed with br/gzip (bytes)
+
+        # Excel reading
+        self.excel_engine = os.getenv('EXCEL_ENGINE', 'auto').lower()  # Value-only reads: auto, calamine or openpyxl
+
+        # Project registry
+        self.project_registry_watch = os.getenv('PROJECT_REGISTRY_WATCH', 'True').lower() == 'true'  # Invalidate from watchdog events on backend/projects
+        self.project_registry_rescan_seconds = float(os.getenv('PROJECT_REGISTRY_RESCAN_SECONDS', '5'))  # Without the watcher: full project rescan interval (folder mtimes are checked on every read)
+
+        # Document previews
+        self.thumbnail_cache_dir = Path(os.getenv('THUMBNAIL_CACHE_DIR', 'data/thumbnails'))  # Rendered page thumbnails
+        self.thumbnail_cache_mb = int(os.getenv('THUMBNAIL_CACHE_MB', '256'))  # Disk space for thumbnails (least recently used evicted)
 
         # Redis (future)
         self.redis_url = os.getenv('REDIS_URL')
@@ -80,6 +108,9 @@ class Config:
         if not self.database_url:
             warnings.append("DATABASE_URL not set - using file-based storage (not recommended for production)")
 
+        if self.database_mode not in ('production', 'basic'):
+            issues.append(f"DATABASE_MODE must be 'production' or 'basic' (got '{self.database_mode}')")
+
         if not self.redis_url:
             warnings.append("REDIS_URL not set - caching disabled")
 
@@ -110,7 +141,7 @@ class Config:
         logger.info(f"  Dropbox Webhook: {'✅ Configured' if self.dropbox_webhook_secret else '❌ Not configured'}")
         logger.info(f"  Google Webhook: {'✅ Configured' if self.google_webhook_secret else '❌ Not configured'}")
         logger.info(f"  OneDrive Webhook: {'✅ Configured' if self.onedrive_webhook_secret else '❌ Not configured'}")
-        logger.info(f"  Database: {'✅ Configured' if self.database_url else '⚠️  Using file storage'}")
+        logger.info(f"  Database: {'✅ Configured' if self.database_url else '⚠️  Using file storage'} (mode: {self.database_mode})")
         logger.info(f"  Redis: {'✅ Configured' if self.redis_url else '⚠️  Caching disabled'}")
 
     def get_status(self) -> Dict[str, Any]:
@@ -1,22 +1,93 @@
 """
 Database configuration and session management
 """
-from sqlalchemy import create_engine
+import logging
+import queue
+import threading
+from concurrent.futures import Future
+from typing import Any, Callable, List, Optional, Tuple
+
+from sqlalchemy import create_engine, event, inspect
 from sqlalchemy.ext.declarative import declarative_base
-from sqlalchemy.orm import sessionmaker
+from sqlalchemy.orm import Session, sessionmaker
 from pathlib import Path
 
+from app.config import get_config
+
+logger = logging.getLogger(__name__)
+
 # Database file path
 DB_PATH = Path(__file__).parent.parent / "data" / "financial_builder.db"
 DB_PATH.parent.mkdir(exist_ok=True)
 
-# SQLite database URL
-SQLALCHEMY_DATABASE_URL = f"sqlite:///{DB_PATH}"
+# SQLite pragmas applied to every new connection in production mode.
+# WAL lets readers proceed while a writer holds the lock; NORMAL sync is
+# durable across application crashes in WAL mode and avoids an fsync per commit.
+SQLITE_PRAGMAS = {
+    "journal_mode": "WAL",
+    "synchronous": "NORMAL",
+    "cache_size": -64000,  # 64MB page cache (negative = KiB)
+    "mmap_size": 268435456,  # 256MB memory-mapped I/O
+    "temp_store": "MEMORY",
+    "busy_timeout": 5000,  # ms to wait on a locked database before failing
+}
+
+
+def _resolve_database_url() -> str:
+    """Use DATABASE_URL when configured, otherwise the local SQLite file."""
+    return get_config().database_url or f"sqlite:///{DB_PATH}"
+
+
+def _engine_options(url: str) -> dict:
+    """Build create_engine keyword arguments for the configured backend."""
+    config = get_config()
+
+    if url.startswith("sqlite"):
+        options = {
+            "connect_args": {
+                "check_same_thread": False,  # Needed for SQLite
+                "timeout": SQLITE_PRAGMAS["busy_timeout"] / 1000,
+            }
+        }
+        if ":memory:" not in url and url != "sqlite://":
+            options.update(
+                pool_size=config.db_pool_size,
+                max_overflow=config.db_max_overflow,
+                pool_pre_ping=True,
+            )
+        return options
+
+    return {
+        "pool_size": config.db_pool_size,
+        "max_overflow": config.db_max_overflow,
+        "pool_pre_ping": True,
+        "pool_recycle": 1800,
+    }
+
+
+def _apply_sqlite_pragmas(dbapi_connection, connection_record):
+    """Tune every new SQLite connection for concurrent readers and one writer."""
+    cursor = dbapi_connection.cursor()
+    try:
+        for pragma, value in SQLITE_PRAGMAS.items():
+            cursor.execute(f"PRAGMA {pragma}={value}")
+    finally:
+        cursor.close()
+
+
+def configure_engine(target_engine):
+    """Register connection hooks for the configured database mode."""
+    if target_engine.dialect.name == "sqlite" and get_config().database_mode == "production":
+        event.listen(target_engine, "connect", _apply_sqlite_pragmas)
+    return target_engine
+
+
+# Database URL (DATABASE_URL or local SQLite file)
+SQLALCHEMY_DATABASE_URL = _resolve_database_url()
 
 # Create engine
-engine = create_engine(
-    SQLALCHEMY_DATABASE_URL,
-    connect_args={"check_same_thread": False}  # Needed for SQLite
+engine = configure_engine(
+    create_engine(SQLALCHEMY_DATABASE_URL, **_engine_options(SQLALCHEMY_DATABASE_URL))
 )
 
 # Create SessionLocal class
@@ -38,15 +109,272 @@ def get_db():
         db.close()
 
 
+# Async drivers for the synchronous URLs we support
+ASYNC_DRIVERS = {
+    "sqlite": "sqlite+aiosqlite",
+    "postgresql": "postgresql+asyncpg",
+    "postgres": "postgresql+asyncpg",
+}
+
+_async_engine = None
+_async_session_factory = None
+
+
+def _async_database_url(url: str) -> str:
+    """Map a sync database URL onto its asyncio driver."""
+    scheme, sep, rest = url.partition("://")
+    dialect = scheme.split("+", 1)[0]
+    return f"{ASYNC_DRIVERS.get(dialect, scheme)}{sep}{rest}"
+
+
+def _async_engine_options(url: str) -> dict:
+    """
+    create_async_engine keyword arguments for the configured backend.
+
+    aiosqlite defaults to NullPool for file databases on SQLAlchemy < 2.1,
+    which rejects pool sizing arguments; ask for the asyncio queue pool
+    explicitly so the async engine pools like the sync one.
+    """
+    options = _engine_options(url)
+    if "pool_size" in options:
+        from sqlalchemy.pool import AsyncAdaptedQueuePool
+
+        options["poolclass"] = AsyncAdaptedQueuePool
+    return options
+
+
+def get_async_engine():
+    """
+    Get or create the asyncio engine (same database and pragmas as `engine`).
+
+    Created lazily so the async driver is only imported when an async
+    endpoint is first used.
+    """
+    global _async_engine
+
+    if _async_engine is None:
+        from sqlalchemy.ext.asyncio import create_async_engine
+
+        _async_engine = create_async_engine(
+            _async_database_url(SQLALCHEMY_DATABASE_URL),
+            **_async_engine_options(SQLALCHEMY_DATABASE_URL)
+        )
+        configure_engine(_async_engine.sync_engine)
+
+    return _async_engine
+
+
+def get_async_session_factory():
+    """Get or create the AsyncSession factory bound to the async engine."""
+    global _async_session_factory
+
+    if _async_session_factory is None:
+        from sqlalchemy.ext.asyncio import async_sessionmaker
+
+        _async_session_factory = async_sessionmaker(
+            bind=get_async_engine(),
+            autoflush=False,
+            expire_on_commit=False
+        )
+
+    return _async_session_factory
+
+
+async def get_async_db():
+    """
+    Dependency function to get an async database session.
+    Used by read-heavy endpoints so queries don't block the event loop.
+    """
+    async with get_async_session_factory()() as db:
+        yield db
+
+
+async def dispose_async_engine():
+    """Close pooled async connections."""
+    global _async_engine, _async_session_factory
+
+    if _async_engine is not None:
+        await _async_engine.dispose()
+        _async_engine = None
+        _async_session_factory = None
+
+
 def init_db():
     """
     Initialize database tables.
     Creates all tables defined in models.
     """
-    # Import models to register them
-    from app.models.extraction import ExtractionJob, ExtractedData, Transaction
-    from app.models.data_points import DataPoint, DataPointConflict, DataPointValidationRule
+    # Import models to register them (tables are created from Base.metadata)
+    from app.models.extraction import ExtractionJob, ExtractedData, FileManifestEntry, Transaction  # noqa: F401
+    from app.models.data_points import DataPoint, DataPointConflict, DataPointValidationRule  # noqa: F401
 
     # Create all tables
     Base.metadata.create_all(bind=engine)
-    print(f"✅ Database initialized at {DB_PATH}")
+    add_missing_columns(engine)
+    print(f"✅ Database initialized at {engine.url.render_as_string(hide_password=True)}")
+
+
+def add_missing_columns(target_engine):
+    """
+    Add columns and indexes introduced after a table was first created.
+
+    create_all() only creates missing tables, so nullable columns added to
+    existing models are appended with ALTER TABLE ... ADD COLUMN and new
+    indexes are created explicitly.
+    """
+    inspector = inspect(target_engine)
+    existing_tables = set(inspector.get_table_names())
+
+    with target_engine.begin() as conn:
+        for table in Base.metadata.sorted_tables:
+            if table.name not in existing_tables:
+                continue
+
+            existing_columns = {column["name"] for column in inspector.get_columns(table.name)}
+            for column in table.columns:
+                if column.name in existing_columns or not column.nullable:
+                    continue
+
+                column_type = column.type.compile(dialect=target_engine.dialect)
+                conn.exec_driver_sql(f'ALTER TABLE {table.name} ADD COLUMN {column.name} {column_type}')
+                logger.info(f"Added column {table.name}.{column.name}")
+
+            # Indexes declared after the table was created
+            existing_indexes = {index["name"] for index in inspector.get_indexes(table.name)}
+            for index in table.indexes:
+                if index.name not in existing_indexes:
+                    index.create(bind=conn)
+                    logger.info(f"Added index {index.name}")
+
+
+WriteOperation = Callable[[Session], Any]
+
+
+class DatabaseWriter:
+    """
+    Single-writer queue for background jobs.
+
+    Background work (file extraction, pipeline progress) submits write
+    operations instead of committing on its own session. One thread drains
+    the queue and applies pending operations in a single transaction, so the
+    SQLite write lock is taken once per batch rather than once per row and
+    request handlers never queue up behind a long-running pipeline.
+    """
+
+    def __init__(self, session_factory=SessionLocal, max_batch_size: int = 200, max_delay: float = 0.05):
+        self.session_factory = session_factory
+        self.max_batch_size = max_batch_size
+        self.max_delay = max_delay
+        self._queue: "queue.Queue[Optional[Tuple[WriteOperation, Future]]]" = queue.Queue()
+        self._thread: Optional[threading.Thread] = None
+        self._lock = threading.Lock()
+
+    def start(self):
+        """Start the writer thread (idempotent)."""
+        with self._lock:
+            if self._thread is None or not self._thread.is_alive():
+                self._thread = threading.Thread(target=self._run, name="db-writer", daemon=True)
+                self._thread.start()
+
+    def submit(self, operation: WriteOperation) -> Future:
+        """
+        Queue a write operation.
+
+        Args:
+            operation: Callable receiving a Session; its return value is the
+                future's result once the batch containing it has committed.
+
+        Returns:
+            Future resolved after commit (or failed with the raised exception)
+        """
+        self.start()
+        future: Future = Future()
+        self._queue.put((operation, future))
+        return future
+
+    def flush(self, timeout: Optional[float] = None):
+        """Block until every operation queued so far has been committed."""
+        self.submit(lambda session: None).result(timeout=timeout)
+
+    def shutdown(self, timeout: float = 10.0):
+        """Drain pending writes and stop the writer thread."""
+        with self._lock:
+            thread = self._thread
+            self._thread = None
+        if thread is not None and thread.is_alive():
+            self._queue.put(None)
+            thread.join(timeout=timeout)
+
+    def _run(self):
+        while True:
+            item = self._queue.get()
+            if item is None:
+                return
+
+            batch = [item]
+            stop = False
+            while len(batch) < self.max_batch_size:
+                try:
+                    item = self._queue.get(timeout=self.max_delay)
+                except queue.Empty:
+                    break
+                if item is None:
+                    stop = True
+                    break
+                batch.append(item)
+
+            self._apply(batch)
+
+            if stop:
+                return
+
+    def _apply(self, batch: List[Tuple[WriteOperation, Future]]):
+        """Apply a batch in one transaction, falling back to one-by-one on failure."""
+        session = self.session_factory()
+        try:
+            results = [operation(session) for operation, _ in batch]
+            session.commit()
+            for (_, future), result in zip(batch, results):
+                future.set_result(result)
+            return
+        except Exception as e:
+            session.rollback()
+            logger.warning(f"Batched write of {len(batch)} operations failed ({e}); retrying individually")
+        finally:
+            session.close()
+
+        for operation, future in batch:
+            session = self.session_factory()
+            try:
+                result = operation(session)
+                session.commit()
+                future.set_result(result)
+            except Exception as e:
+                session.rollback()
+                logger.error(f"Database write failed: {e}")
+                future.set_exception(e)
+            finally:
+                session.close()
+
+
+# Singleton instance
+_db_writer: Optional[DatabaseWriter] = None
+
+
+def get_db_writer() -> DatabaseWriter:
+    """Get or create the database writer singleton."""
+    global _db_writer
+
+    if _db_writer is None:
+        _db_writer = DatabaseWriter()
+
+    return _db_writer
+
+
+def shutdown_db_writer():
+    """Flush pending writes and stop the writer thread."""
+    global _db_writer
+
+    if _db_writer is not None:
+        _db_writer.shutdown()
+        _db_writer = None
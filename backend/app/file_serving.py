@@ -0,0 +1,207 @@
+"""
+Binary file serving.
+
+serve_file() answers downloads and inline previews straight from disk:
+- ETag (mtime and size) and Last-Modified validators; If-None-Match and
+  If-Modified-Since get 304 Not Modified
+- Single byte ranges (Range: bytes=...), honoring If-Range, for resumed
+  downloads and progressive loading of large drawings and photos;
+  multi-range requests get the whole file
+- Bodies streamed in 64 KB chunks, never loaded whole into memory; when
+  the server supports the ASGI pathsend extension, whole files are handed
+  to it to send (zero-copy where the server uses sendfile)
+
+serve_bytes() and not_modified() do the ETag/304 part for generated content
+(thumbnails).
+"""
+
+import mimetypes
+import os
+from email.utils import formatdate, parsedate_to_datetime
+from pathlib import Path
+from typing import Dict, Optional, Tuple
+from urllib.parse import quote
+
+import anyio
+from fastapi import Request
+from fastapi.responses import Response
+from starlette.types import Receive, Scope, Send
+
+CHUNK_SIZE = 64 * 1024
+
+# Revalidate on every use; unchanged files cost a 304
+CACHE_CONTROL = "private, no-cache"
+
+
+def etag_matches(request: Request, etag: str) -> bool:
+    """Whether the request's If-None-Match lists etag (or is '*')."""
+    if_none_match = request.headers.get("if-none-match", "")
+    tags = [tag.strip() for tag in if_none_match.split(",")]
+    return etag in tags or f"W/{etag}" in tags or "*" in tags
+
+
+def _not_modified_since(request: Request, mtime: float) -> bool:
+    if_modified_since = request.headers.get("if-modified-since")
+    if not if_modified_since or "if-none-match" in request.headers:
+        return False
+    try:
+        return int(mtime) <= parsedate_to_datetime(if_modified_since).timestamp()
+    except (TypeError, ValueError):
+        return False
+
+
+def parse_range(range_header: str, size: int) -> Optional[Tuple[int, int]]:
+    """
+    First and last byte of a single-range Range header.
+
+    Returns:
+        (start, end) inclusive, or None when the header isn't a single
+        byte range (the whole file is served)
+
+    Raises:
+        ValueError: The range lies outside the file (416)
+    """
+    unit, _, ranges = range_header.partition("=")
+    first, dash, last = ranges.strip().partition("-")
+    if unit.strip().lower() != "bytes" or "," in ranges or not dash:
+        return None
+    if not (first or last).isdigit() or (first and last and not last.isdigit()):
+        # Malformed ranges are ignored
+        return None
+
+    if not first:
+        # Suffix range: the last N bytes
+        length = int(last)
+        if length == 0:
+            raise ValueError(f"Empty range '{range_header}'")
+        return max(size - length, 0), size - 1
+
+    start = int(first)
+    if last and int(last) < start:
+        return None
+    if start >= size:
+        raise ValueError(f"Range '{range_header}' outside {size} bytes")
+    return start, min(int(last), size - 1) if last else size - 1
+
+
+def _content_disposition(filename: str, inline: bool) -> str:
+    disposition = "inline" if inline else "attachment"
+    quoted = quote(filename)
+    if quoted != filename:
+        return f"{disposition}; filename*=utf-8''{quoted}"
+    return f'{disposition}; filename="{filename}"'
+
+
+class FileRangeResponse(Response):
+    """Streams a file, or one byte range of it, from disk."""
+
+    def __init__(
+        self,
+        path: Path,
+        start: int,
+        end: int,
+        status_code: int,
+        headers: Dict[str, str],
+        media_type: str
+    ):
+        super().__init__(status_code=status_code, headers=headers, media_type=media_type)
+        self.path = path
+        self.start = start
+        self.end = end
+        self.headers["content-length"] = str(end - start + 1)
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        await send({"type": "http.response.start", "status": self.status_code, "headers": self.raw_headers})
+        if scope["method"] == "HEAD":
+            await send({"type": "http.response.body", "body": b"", "more_body": False})
+            return
+
+        whole_file = self.start == 0 and self.status_code == 200
+        if whole_file and "http.response.pathsend" in scope.get("extensions", {}):
+            await send({"type": "http.response.pathsend", "path": str(self.path)})
+            return
+
+        remaining = self.end - self.start + 1
+        if remaining <= 0:
+            await send({"type": "http.response.body", "body": b"", "more_body": False})
+            return
+
+        async with await anyio.open_file(self.path, "rb") as file:
+            await file.seek(self.start)
+            while remaining > 0:
+                chunk = await file.read(min(CHUNK_SIZE, remaining))
+                if not chunk:
+                    # File shrank while being sent
+                    break
+                remaining -= len(chunk)
+                await send({"type": "http.response.body", "body": chunk, "more_body": remaining > 0})
+        if remaining > 0:
+            await send({"type": "http.response.body", "body": b"", "more_body": False})
+
+
+def serve_file(
+    request: Request,
+    path: Path,
+    media_type: Optional[str] = None,
+    filename: Optional[str] = None,
+    inline: bool = False
+) -> Response:
+    """
+    Response serving a file with validators, conditional GET and Range support.
+
+    Args:
+        request: Incoming request (conditional and Range headers)
+        path: File to serve (must exist)
+        media_type: Content type (default: guessed from the file name)
+        filename: Name given to the client (Content-Disposition)
+        inline: Display in the browser rather than download
+
+    Returns:
+        200 / 206 streaming response, 304, or 416
+    """
+    stat = os.stat(path)
+    size = stat.st_size
+    etag = f'"{stat.st_mtime_ns:x}-{size:x}"'
+    last_modified = formatdate(stat.st_mtime, usegmt=True)
+    media_type = media_type or mimetypes.guess_type(path.name)[0] or "application/octet-stream"
+
+    headers = {
+        "ETag": etag,
+        "Last-Modified": last_modified,
+        "Cache-Control": CACHE_CONTROL,
+        "Accept-Ranges": "bytes",
+    }
+    if filename:
+        headers["Content-Disposition"] = _content_disposition(filename, inline)
+
+    if etag_matches(request, etag) or _not_modified_since(request, stat.st_mtime):
+        return Response(status_code=304, headers=headers)
+
+    byte_range = None
+    range_header = request.headers.get("range")
+    if_range = request.headers.get("if-range")
+    if range_header and size > 0 and (if_range is None or if_range.strip() in (etag, last_modified)):
+        try:
+            byte_range = parse_range(range_header, size)
+        except ValueError:
+            headers["Content-Range"] = f"bytes */{size}"
+            return Response(status_code=416, headers=headers)
+
+    if byte_range is None:
+        return FileRangeResponse(path, 0, size - 1, 200, headers, media_type)
+
+    start, end = byte_range
+    headers["Content-Range"] = f"bytes {start}-{end}/{size}"
+    return FileRangeResponse(path, start, end, 206, headers, media_type)
+
+
+def not_modified(etag: str) -> Response:
+    """304 for generated content whose ETag the client already has."""
+    return Response(status_code=304, headers={"ETag": etag, "Cache-Control": CACHE_CONTROL})
+
+
+def serve_bytes(request: Request, content: bytes, media_type: str, etag: str) -> Response:
+    """Generated content with an ETag; a matching If-None-Match gets 304."""
+    if etag_matches(request, etag):
+        return not_modified(etag)
+    return Response(content=content, media_type=media_type, headers={"ETag": etag, "Cache-Control": CACHE_CONTROL})
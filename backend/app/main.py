@@ -11,8 +11,9 @@ load_dotenv()
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 from contextlib import asynccontextmanager
-from app.routers import projects, uploads, auth, documents, financials, extraction, aggregation, batch, email, webhooks, system, automation, templates, folder_watch, extraction_test, project_files, financial_builder, analytics
-from app.middleware import setup_error_handling
+from app.routers import projects, uploads, auth, documents, financials, extraction, aggregation, batch, email, webhooks, system, automation, templates, folder_watch, extraction_test, project_files, financial_builder, analytics, portfolio
+from app.middleware import CompressionMiddleware, setup_error_handling
+from app.responses import FastJSONResponse
 
 
 @asynccontextmanager
@@ -38,6 +39,17 @@ async def lifespan(app: FastAPI):
     scheduler.start()
     print("✅ Batch scheduler started")
 
+    # Watch project folders for the project registry
+    from app.services.project_registry import get_project_registry, start_project_registry
+    start_project_registry()
+    if get_project_registry().watching:
+        print("✅ Project registry watching")
+
+    # Start dashboard snapshot materializer
+    from app.services.dashboard_snapshot import get_dashboard_snapshots
+    get_dashboard_snapshots().start()
+    print("✅ Dashboard materializer started")
+
     print("🎉 Application startup complete")
 
     yield
@@ -49,6 +61,27 @@ async def lifespan(app: FastAPI):
     shutdown_scheduler()
     print("✅ Batch scheduler stopped")
 
+    from app.services.portfolio_runner import shutdown_portfolio_runner
+    shutdown_portfolio_runner()
+    print("✅ Portfolio runner stopped")
+
+    from app.services.dashboard_snapshot import shutdown_dashboard_snapshots
+    shutdown_dashboard_snapshots()
+    print("✅ Dashboard materializer stopped")
+
+    from app.services.project_registry import shutdown_project_registry
+    shutdown_project_registry()
+    print("✅ Project registry stopped")
+
+    from app.services.workbook_cache import shutdown_workbook_executor
+    shutdown_workbook_executor()
+    print("✅ Workbook readers stopped")
+
+    from app.database import shutdown_db_writer, dispose_async_engine
+    shutdown_db_writer()
+    await dispose_async_engine()
+    print("✅ Database writer flushed")
+
     print("👋 Application shutdown complete")
 
 
@@ -57,7 +90,8 @@ app = FastAPI(
     title="Intelligent Finance Platform API",
     description="Backend API for construction project financial management",
     version="1.0.0",
-    lifespan=lifespan
+    lifespan=lifespan,
+    default_response_class=FastJSONResponse
 )
 
 # Setup error handling and logging middleware
@@ -83,8 +117,12 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["X-Next-Cursor"],  # Keyset pagination (app/pagination.py)
 )
 
+# Compress large JSON/text responses (br or gzip); added last so it wraps everything
+app.add_middleware(CompressionMiddleware)
+
 # Include routers
 app.include_router(auth.router)  # Auth endpoints (no protection needed)
 app.include_router(projects.router)
@@ -103,6 +141,7 @@ app.include_router(folder_watch.router)  # Local folder monitoring
 app.include_router(extraction_test.router)  # MinerU extraction testing and comparison
 app.include_router(project_files.router)  # Project file structure for AI animation
 app.include_router(financial_builder.router)  # Financial Builder - full pipeline processing
+app.include_router(portfolio.router)  # Portfolio-wide pipeline runs
 app.include_router(analytics.router)  # AI Analytics and Predictions (Databricks)
 
 
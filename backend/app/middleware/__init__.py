@@ -1,5 +1,6 @@
 """Middleware package for error handling and monitoring."""
 
+from .compression import CompressionMiddleware
 from .error_handler import setup_error_handling
 
-__all__ = ['setup_error_handling']
+__all__ = ['CompressionMiddleware', 'setup_error_handling']
@@ -0,0 +1,206 @@
+"""
+Response Compression Middleware
+
+Compresses responses with brotli (when the brotli package is installed and
+the client accepts it) or gzip, once the body reaches COMPRESSION_MIN_SIZE
+bytes.
+
+Skipped responses:
+- Content types that don't compress (images, PDFs, xlsx/zip downloads)
+- Server-sent events (text/event-stream), which must reach the client
+  chunk by chunk
+- Responses that already set Content-Encoding (e.g. the precomputed gzip
+  dashboard snapshot)
+- Partial content (206 / Content-Range) and bodiless statuses (204, 304)
+
+The start of a response is held until COMPRESSION_MIN_SIZE bytes or the
+end of the body have arrived (responses passing through BaseHTTPMiddleware
+arrive in chunks even when small); after that, streaming responses are
+compressed incrementally, flushing after each chunk.
+"""
+
+import gzip
+import io
+from typing import List, Optional
+
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.config import get_config
+
+try:
+    import brotli
+except ImportError:  # gzip only
+    brotli = None
+
+GZIP_LEVEL = 6
+BROTLI_QUALITY = 4  # Dynamic responses: fast, still smaller than gzip -6
+
+_COMPRESSIBLE_PREFIXES = ("text/",)
+_COMPRESSIBLE_TYPES = {
+    "application/json",
+    "application/javascript",
+    "application/xml",
+    "application/x-ndjson",
+    "image/svg+xml",
+}
+
+
+def accepted_encoding(accept_encoding: str) -> Optional[str]:
+    """Preferred encoding ('br' or 'gzip') the client accepts, if any."""
+    accepted = set()
+    for item in accept_encoding.lower().split(","):
+        coding, _, params = item.strip().partition(";")
+        quality = 1.0
+        for param in params.split(";"):
+            name, _, value = param.strip().partition("=")
+            if name == "q":
+                try:
+                    quality = float(value)
+                except ValueError:
+                    quality = 0.0
+        if quality > 0:
+            accepted.add(coding.strip())
+
+    if brotli is not None and ("br" in accepted or "*" in accepted):
+        return "br"
+    if "gzip" in accepted or "*" in accepted:
+        return "gzip"
+    return None
+
+
+def is_compressible(content_type: str) -> bool:
+    media_type = content_type.split(";")[0].strip().lower()
+    if media_type == "text/event-stream":
+        return False
+    return (
+        media_type.startswith(_COMPRESSIBLE_PREFIXES)
+        or media_type in _COMPRESSIBLE_TYPES
+        or media_type.endswith(("+json", "+xml"))
+    )
+
+
+class _Compressor:
+    """Incremental br/gzip encoder."""
+
+    def __init__(self, encoding: str):
+        self.encoding = encoding
+        if encoding == "br":
+            self._brotli = brotli.Compressor(quality=BROTLI_QUALITY)
+        else:
+            self._buffer = io.BytesIO()
+            self._gzip = gzip.GzipFile(mode="wb", fileobj=self._buffer, compresslevel=GZIP_LEVEL)
+
+    def compress(self, data: bytes, final: bool) -> bytes:
+        if self.encoding == "br":
+            output = self._brotli.process(data)
+            return output + (self._brotli.finish() if final else self._brotli.flush())
+
+        self._gzip.write(data)
+        if final:
+            self._gzip.close()
+        else:
+            self._gzip.flush()
+        output = self._buffer.getvalue()
+        self._buffer.seek(0)
+        self._buffer.truncate()
+        return output
+
+
+class CompressionMiddleware:
+    """ASGI middleware compressing large compressible responses with br or gzip."""
+
+    def __init__(self, app: ASGIApp, minimum_size: Optional[int] = None):
+        self.app = app
+        self.minimum_size = get_config().compression_min_size if minimum_size is None else minimum_size
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        encoding = accepted_encoding(Headers(scope=scope).get("accept-encoding", ""))
+        if encoding is None:
+            await self.app(scope, receive, send)
+            return
+
+        await _CompressedResponder(self.app, encoding, self.minimum_size)(scope, receive, send)
+
+
+class _CompressedResponder:
+    """Per-request state: decides from the first body chunk whether to compress."""
+
+    def __init__(self, app: ASGIApp, encoding: str, minimum_size: int):
+        self.app = app
+        self.encoding = encoding
+        self.minimum_size = minimum_size
+        self.send: Send = None
+        self.start_message: Optional[Message] = None
+        self.pending: List[bytes] = []
+        self.pending_size = 0
+        self.compressor: Optional[_Compressor] = None
+        self.passthrough = False
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        self.send = send
+        await self.app(scope, receive, self.send_with_compression)
+
+    async def send_with_compression(self, message: Message):
+        if message["type"] == "http.response.start":
+            headers = Headers(raw=message["headers"])
+            self.passthrough = (
+                message["status"] in (204, 206, 304)
+                or "content-encoding" in headers
+                or "content-range" in headers
+                or not is_compressible(headers.get("content-type", ""))
+            )
+            if self.passthrough:
+                await self.send(message)
+            else:
+                # Held until the body shows whether it's worth compressing
+                self.start_message = message
+            return
+
+        if message["type"] != "http.response.body" or self.passthrough:
+            if self.start_message is not None:
+                # Body sent by the server itself (pathsend): left uncompressed
+                start, self.start_message = self.start_message, None
+                self.passthrough = True
+                await self.send(start)
+            await self.send(message)
+            return
+
+        body = message.get("body", b"")
+        more_body = message.get("more_body", False)
+
+        if self.start_message is not None:
+            self.pending.append(body)
+            self.pending_size += len(body)
+            if more_body and self.pending_size < self.minimum_size:
+                return
+
+            start, self.start_message = self.start_message, None
+            body, self.pending = b"".join(self.pending), []
+            if not more_body and len(body) < self.minimum_size:
+                # Small complete response: send as is
+                self.passthrough = True
+                await self.send(start)
+                await self.send({"type": "http.response.body", "body": body, "more_body": False})
+                return
+
+            self.compressor = _Compressor(self.encoding)
+            compressed = self.compressor.compress(body, final=not more_body)
+
+            headers = MutableHeaders(raw=start["headers"])
+            headers["Content-Encoding"] = self.encoding
+            headers.add_vary_header("Accept-Encoding")
+            if more_body:
+                del headers["Content-Length"]
+            else:
+                headers["Content-Length"] = str(len(compressed))
+            await self.send(start)
+            await self.send({"type": "http.response.body", "body": compressed, "more_body": more_body})
+            return
+
+        compressed = self.compressor.compress(body, final=not more_body)
+        await self.send({"type": "http.response.body", "body": compressed, "more_body": more_body})
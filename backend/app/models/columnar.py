@@ -0,0 +1,183 @@
+"""
+Columnar Payloads
+
+Encodes the tables extracted from Excel/CSV files (one DataFrame per sheet)
+into a single binary payload stored on ExtractedData, so the transaction
+parser gets typed columns back instead of re-parsing a JSON list of row
+dicts.
+
+Payload layout:
+
+    codec (1 byte) | header length (4 bytes, big endian) | header JSON | sheet blobs
+
+The header lists each sheet's name and blob length. Sheets are Arrow IPC
+streams (zstd compressed) when pyarrow is installed, otherwise zlib
+compressed JSON in pandas 'split' orientation with the column dtypes, so
+rows written with either codec stay readable.
+
+The searchable text rendering of a table ("col: value | col: value" per
+row) is produced on demand by tables_to_text() rather than stored.
+"""
+
+import json
+import logging
+import struct
+import zlib
+from typing import Dict, Iterator, List, Optional
+
+import pandas as pd
+
+try:
+    import pyarrow as pa
+except ImportError:  # JSON fallback
+    pa = None
+
+logger = logging.getLogger(__name__)
+
+CODEC_ARROW = b"a"
+CODEC_JSON = b"j"
+
+# Table name used for single-table sources such as CSV files
+DEFAULT_TABLE = "Sheet1"
+
+_HEADER = struct.Struct(">I")
+
+
+def _normalize(df: pd.DataFrame) -> pd.DataFrame:
+    """String column names and Arrow-compatible columns."""
+    df = df.copy()
+    df.columns = [str(col) for col in df.columns]
+    df = df.reset_index(drop=True)
+
+    for col in df.columns:
+        series = df[col]
+        if series.dtype != object:
+            continue
+        # Mixed-type object columns (e.g. numbers and notes in one column)
+        # have no Arrow type; store them as text and keep the nulls
+        non_null = series.dropna()
+        if non_null.map(type).nunique() > 1:
+            df[col] = series.map(lambda v: None if pd.isna(v) else str(v))
+    return df
+
+
+def _encode_arrow(df: pd.DataFrame) -> bytes:
+    table = pa.Table.from_pandas(df, preserve_index=False)
+    sink = pa.BufferOutputStream()
+    options = pa.ipc.IpcWriteOptions(compression="zstd")
+    with pa.ipc.new_stream(sink, table.schema, options=options) as writer:
+        writer.write_table(table)
+    return sink.getvalue().to_pybytes()
+
+
+def _decode_arrow(blob: bytes) -> pd.DataFrame:
+    with pa.ipc.open_stream(blob) as reader:
+        return reader.read_all().to_pandas()
+
+
+def _encode_json(df: pd.DataFrame) -> bytes:
+    payload = {
+        'dtypes': {col: str(dtype) for col, dtype in df.dtypes.items()},
+        'frame': json.loads(df.to_json(orient='split', index=False, date_format='iso')),
+    }
+    return zlib.compress(json.dumps(payload).encode("utf-8"), 6)
+
+
+def _decode_json(blob: bytes) -> pd.DataFrame:
+    payload = json.loads(zlib.decompress(blob).decode("utf-8"))
+    frame = payload['frame']
+    df = pd.DataFrame(frame['data'], columns=frame['columns'])
+    for col, dtype in payload['dtypes'].items():
+        if dtype.startswith("datetime64"):
+            df[col] = pd.to_datetime(df[col], errors="coerce")
+    return df
+
+
+def encode_tables(tables: Dict[str, pd.DataFrame]) -> bytes:
+    """
+    Encode extracted tables into a columnar payload.
+
+    Args:
+        tables: DataFrame per sheet name
+
+    Returns:
+        Payload bytes for ExtractedData.structured_columnar
+    """
+    codec = CODEC_ARROW if pa is not None else CODEC_JSON
+    encode = _encode_arrow if pa is not None else _encode_json
+
+    sheets = []
+    blobs = []
+    for name, df in tables.items():
+        blob = encode(_normalize(df))
+        sheets.append([str(name), len(blob)])
+        blobs.append(blob)
+
+    header = json.dumps({'sheets': sheets}).encode("utf-8")
+    return b"".join([codec, _HEADER.pack(len(header)), header, *blobs])
+
+
+def decode_tables(payload: bytes) -> Dict[str, pd.DataFrame]:
+    """Decode a payload written by encode_tables()."""
+    codec = payload[:1]
+    if codec == CODEC_ARROW:
+        if pa is None:
+            raise RuntimeError("pyarrow is required to read this payload")
+        decode = _decode_arrow
+    elif codec == CODEC_JSON:
+        decode = _decode_json
+    else:
+        raise ValueError(f"Unknown columnar codec {codec!r}")
+
+    (header_length,) = _HEADER.unpack_from(payload, 1)
+    offset = 1 + _HEADER.size
+    header = json.loads(payload[offset:offset + header_length])
+    offset += header_length
+
+    tables = {}
+    for name, length in header['sheets']:
+        tables[name] = decode(payload[offset:offset + length])
+        offset += length
+    return tables
+
+
+def tables_from_records(structured: object) -> Dict[str, pd.DataFrame]:
+    """
+    Tables from a legacy JSON structured_data payload.
+
+    Accepts the shapes written before columnar payloads: a list of row dicts
+    (CSV), a dict of sheet name to row dicts (Excel) or {'rows': [...]}.
+    """
+    if isinstance(structured, list):
+        return {DEFAULT_TABLE: pd.DataFrame(structured)}
+    if isinstance(structured, dict):
+        return {
+            name: pd.DataFrame(rows)
+            for name, rows in structured.items()
+            if isinstance(rows, list)
+        }
+    return {}
+
+
+def iter_row_text(df: pd.DataFrame, max_rows: Optional[int] = None) -> Iterator[str]:
+    """Searchable text per row: 'column: value' pairs of non-null cells."""
+    if max_rows is not None:
+        df = df.head(max_rows)
+    columns: List[str] = [str(col) for col in df.columns]
+    for values in df.itertuples(index=False, name=None):
+        yield ' | '.join(f"{col}: {value}" for col, value in zip(columns, values) if pd.notna(value))
+
+
+def tables_to_text(tables: Dict[str, pd.DataFrame], max_rows: Optional[int] = None) -> str:
+    """Text rendering of every table, one line per row."""
+    lines: List[str] = []
+    for df in tables.values():
+        lines.extend(iter_row_text(df, max_rows))
+    return '\n'.join(lines)
+
+
+def tables_to_json(tables: Dict[str, pd.DataFrame]) -> str:
+    """Tables as the legacy JSON structured_data (sheet name to row dicts)."""
+    return json.dumps(
+        {name: json.loads(df.to_json(orient='records', date_format='iso')) for name, df in tables.items()}
+    )
@@ -1,11 +1,51 @@
 """
 Database models for file extraction and processing
 """
-from sqlalchemy import Column, Integer, String, Float, DateTime, Text, ForeignKey, Enum
+from sqlalchemy import Column, Integer, BigInteger, String, Float, DateTime, Text, ForeignKey, Enum, LargeBinary, Index, UniqueConstraint
 from sqlalchemy.sql import func
-from sqlalchemy.orm import relationship
+from sqlalchemy.orm import relationship, deferred
+from typing import Dict, Optional, TYPE_CHECKING
 import enum
+import zlib
 from app.database import Base
+from app.models.columnar import decode_tables, encode_tables, tables_to_json, tables_to_text
+
+if TYPE_CHECKING:
+    import pandas as pd
+
+try:
+    import zstandard
+except ImportError:  # zlib fallback
+    zstandard = None
+
+# Extracted payloads are stored compressed with a one-byte codec prefix so
+# rows written with either codec stay readable
+CODEC_ZLIB = b"z"
+CODEC_ZSTD = b"s"
+TEXT_PREVIEW_LENGTH = 200
+TEXT_PREVIEW_ROWS = 5
+
+
+def compress_payload(value: Optional[str]) -> Optional[bytes]:
+    """Compress a text payload for storage (zstd when available, else zlib)."""
+    if value is None:
+        return None
+    data = value.encode("utf-8")
+    if zstandard is not None:
+        return CODEC_ZSTD + zstandard.ZstdCompressor(level=10).compress(data)
+    return CODEC_ZLIB + zlib.compress(data, 6)
+
+
+def decompress_payload(blob: Optional[bytes]) -> Optional[str]:
+    """Decompress a payload written by compress_payload."""
+    if blob is None:
+        return None
+    codec, data = blob[:1], blob[1:]
+    if codec == CODEC_ZSTD:
+        if zstandard is None:
+            raise RuntimeError("zstandard is required to read this payload")
+        return zstandard.ZstdDecompressor().decompress(data).decode("utf-8")
+    return zlib.decompress(data).decode("utf-8")
 
 
 class JobStatus(str, enum.Enum):
@@ -39,6 +79,10 @@ class ExtractionJob(Base):
 class ExtractedData(Base):
     """Stores extracted data from individual files"""
     __tablename__ = "extracted_data"
+    __table_args__ = (
+        # Keyset pagination of a project's files (WHERE project_id = ? AND id > ? ORDER BY id)
+        Index("ix_extracted_data_project_id_id", "project_id", "id"),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     job_id = Column(String, ForeignKey("extraction_jobs.job_id"))
@@ -47,8 +91,16 @@ class ExtractedData(Base):
     file_name = Column(String)
     file_type = Column(String)  # 'pdf', 'xlsx', 'csv'
     extraction_method = Column(String)  # 'mineru', 'pdfplumber', 'openpyxl'
-    raw_text = Column(Text)
-    structured_data = Column(Text)  # JSON string for Excel data
+    text_preview = Column(String, nullable=True)  # First characters of raw_text for listings
+    # Compressed payloads; only loaded when accessed (or with undefer_group('payload'))
+    raw_text_compressed = deferred(Column(LargeBinary, nullable=True), group="payload")
+    structured_data_compressed = deferred(Column(LargeBinary, nullable=True), group="payload")  # JSON string for Excel data
+    # Excel/CSV tables as a columnar payload (app.models.columnar); raw_text
+    # and structured_data are derived from it on access
+    structured_columnar = deferred(Column(LargeBinary, nullable=True), group="payload")
+    # Uncompressed columns written before compression was added
+    legacy_raw_text = deferred(Column("raw_text", Text), group="payload")
+    legacy_structured_data = deferred(Column("structured_data", Text), group="payload")
     extraction_status = Column(String)  # 'success', 'failed', 'partial'
     error_message = Column(Text, nullable=True)
     created_at = Column(DateTime(timezone=True), server_default=func.now())
@@ -57,6 +109,78 @@ class ExtractedData(Base):
     job = relationship("ExtractionJob", back_populates="extracted_data")
     transactions = relationship("Transaction", back_populates="extracted_file")
 
+    @property
+    def raw_text(self) -> Optional[str]:
+        if self.raw_text_compressed is not None:
+            return decompress_payload(self.raw_text_compressed)
+        if self.structured_columnar is not None:
+            return tables_to_text(self.tables)
+        return self.legacy_raw_text
+
+    @raw_text.setter
+    def raw_text(self, value: Optional[str]):
+        self.raw_text_compressed = compress_payload(value)
+        self.legacy_raw_text = None
+        self.text_preview = value[:TEXT_PREVIEW_LENGTH] if value else None
+
+    @property
+    def structured_data(self) -> Optional[str]:
+        if self.structured_data_compressed is not None:
+            return decompress_payload(self.structured_data_compressed)
+        if self.structured_columnar is not None:
+            return tables_to_json(self.tables)
+        return self.legacy_structured_data
+
+    @structured_data.setter
+    def structured_data(self, value: Optional[str]):
+        self.structured_data_compressed = compress_payload(value)
+        self.legacy_structured_data = None
+
+    # (payload, tables) last decoded from structured_columnar, per instance
+    _decoded_tables = None
+
+    @property
+    def tables(self) -> Optional[Dict[str, "pd.DataFrame"]]:
+        """
+        Extracted tables (DataFrame per sheet), None for rows without a columnar payload.
+
+        Decoded once per payload and shared by later reads (raw_text,
+        structured_data, the transaction parser); treat them as read-only.
+        """
+        payload = self.structured_columnar
+        if payload is None:
+            return None
+        if self._decoded_tables is None or self._decoded_tables[0] is not payload:
+            self._decoded_tables = (payload, decode_tables(payload))
+        return self._decoded_tables[1]
+
+    @tables.setter
+    def tables(self, value: Optional[Dict[str, "pd.DataFrame"]]):
+        self.structured_columnar = encode_tables(value) if value is not None else None
+        self.raw_text_compressed = None
+        self.legacy_raw_text = None
+        self.structured_data_compressed = None
+        self.legacy_structured_data = None
+        preview = tables_to_text(value, max_rows=TEXT_PREVIEW_ROWS) if value else None
+        self.text_preview = preview[:TEXT_PREVIEW_LENGTH] if preview else None
+
+
+class FileManifestEntry(Base):
+    """Last extracted state of one file in a project's data folder"""
+    __tablename__ = "file_manifest"
+    __table_args__ = (
+        UniqueConstraint("project_id", "file_path", name="uq_file_manifest_project_path"),
+    )
+
+    id = Column(Integer, primary_key=True, index=True)
+    project_id = Column(String, nullable=False, index=True)
+    file_path = Column(String, nullable=False)
+    file_size = Column(BigInteger)
+    file_mtime_ns = Column(BigInteger)
+    content_hash = Column(String)  # SHA-256 of the file contents
+    extracted_data_id = Column(Integer, ForeignKey("extracted_data.id"), nullable=True)
+    updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
+
 
 class Transaction(Base):
     """Categorized transactions mapped to template"""
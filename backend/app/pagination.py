@@ -0,0 +1,84 @@
+"""
+Cursor (keyset) pagination and field projection helpers for listing endpoints.
+
+Cursors are opaque to clients: a URL-safe base64 encoding of the sort key
+of the last item returned. Endpoints resume from that key instead of an
+offset, so every page costs the same regardless of how deep it is.
+"""
+import base64
+import json
+from typing import Any, Dict, Iterable, List, Optional
+
+from fastapi import HTTPException, Response
+
+NEXT_CURSOR_HEADER = "X-Next-Cursor"
+
+
+def encode_cursor(key: Dict[str, Any]) -> str:
+    """Encode a sort key as an opaque cursor string."""
+    raw = json.dumps(key, separators=(",", ":"), default=str).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def decode_cursor(cursor: Optional[str]) -> Optional[Dict[str, Any]]:
+    """
+    Decode a cursor produced by encode_cursor.
+
+    Raises:
+        HTTPException: 400 if the cursor is malformed
+    """
+    if not cursor:
+        return None
+
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        key = json.loads(base64.urlsafe_b64decode(padded.encode()))
+    except Exception:
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+
+    if not isinstance(key, dict):
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+
+    return key
+
+
+def parse_fields(fields: Optional[str], allowed: Iterable[str]) -> Optional[List[str]]:
+    """
+    Parse a comma-separated `fields=` projection.
+
+    Args:
+        fields: Raw query parameter (None/empty means all fields)
+        allowed: Field names the endpoint can return
+
+    Returns:
+        Requested field names in the order given, or None for all fields
+
+    Raises:
+        HTTPException: 400 if an unknown field is requested
+    """
+    if not fields:
+        return None
+
+    requested = [f.strip() for f in fields.split(",") if f.strip()]
+    allowed = list(allowed)
+    unknown = [f for f in requested if f not in allowed]
+    if unknown:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Unknown fields: {', '.join(unknown)}. Available: {', '.join(allowed)}"
+        )
+
+    return list(dict.fromkeys(requested))
+
+
+def project(item: Dict[str, Any], fields: Optional[List[str]]) -> Dict[str, Any]:
+    """Keep only the requested fields of an item."""
+    if fields is None:
+        return item
+    return {field: item.get(field) for field in fields}
+
+
+def set_next_cursor(response: Response, cursor: Optional[str]):
+    """Expose the next page cursor as a response header."""
+    if cursor:
+        response.headers[NEXT_CURSOR_HEADER] = cursor
@@ -0,0 +1,66 @@
+"""
+Fast JSON responses.
+
+FastJSONResponse is the app's default response class. It renders with
+orjson when installed (stdlib json otherwise) and serializes pydantic
+models through pydantic's own JSON serializer, embedding the result
+without first converting the model to a dict.
+
+Routes that return large models (extraction and aggregation results)
+return FastJSONResponse(model) directly, which also skips FastAPI's
+jsonable_encoder pass over the model.
+"""
+import datetime
+import json
+from decimal import Decimal
+from typing import Any
+
+from fastapi.responses import JSONResponse
+from pydantic import BaseModel
+
+try:
+    import orjson
+except ImportError:  # stdlib json fallback
+    orjson = None
+
+if orjson is not None:
+    _ORJSON_OPTIONS = orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY
+
+
+def _default(obj: Any) -> Any:
+    """Values the JSON encoder doesn't handle natively."""
+    if isinstance(obj, BaseModel):
+        if orjson is not None:
+            return orjson.Fragment(obj.model_dump_json(by_alias=True))
+        return obj.model_dump(mode="json", by_alias=True)
+    if isinstance(obj, Decimal):
+        return float(obj)
+    if isinstance(obj, (set, frozenset)):
+        return list(obj)
+    if isinstance(obj, (datetime.date, datetime.time)):
+        # Subclasses such as pandas Timestamps
+        return obj.isoformat()
+    if hasattr(obj, "item"):
+        # numpy scalars
+        return obj.item()
+    return str(obj)
+
+
+def dumps(content: Any) -> bytes:
+    """Serialize content the way FastJSONResponse renders it."""
+    if orjson is not None:
+        return orjson.dumps(content, default=_default, option=_ORJSON_OPTIONS)
+    return json.dumps(
+        content,
+        default=_default,
+        ensure_ascii=False,
+        allow_nan=False,
+        separators=(",", ":"),
+    ).encode("utf-8")
+
+
+class FastJSONResponse(JSONResponse):
+    """JSONResponse rendered with orjson; pydantic models are serialized directly."""
+
+    def render(self, content: Any) -> bytes:
+        return dumps(content)
@@ -19,6 +19,7 @@ from datetime import datetime
 import json
 
 from app.auth_utils import get_current_user
+from app.responses import FastJSONResponse
 from schemas.extraction_schema import (
     AggregatedFinancialData,
     ExtractionResult,
@@ -208,7 +209,7 @@ async def get_aggregation_result(
     if not aggregated_data:
         raise HTTPException(status_code=404, detail=f"Aggregation '{project_id}' not found")
 
-    return aggregated_data
+    return FastJSONResponse(aggregated_data)
 
 
 @router.get("/validate/{project_id}")
@@ -1,16 +1,33 @@
 """
 Document management and preview endpoints
 """
-from fastapi import APIRouter, HTTPException, Depends
-from fastapi.responses import FileResponse
+import asyncio
+import hashlib
+
+from fastapi import APIRouter, HTTPException, Depends, Query, Request
 from pathlib import Path
-from typing import Dict, Any, List
-from app.services.document_viewer import DocumentViewer
+from typing import Dict, Any, List, Optional
+from app.file_serving import etag_matches, not_modified, serve_bytes, serve_file
+from app.services.document_viewer import DocumentViewer, IMAGE_EXTENSIONS, parse_page_range
+from app.services.thumbnails import image_thumbnail, image_thumbnail_key, pdf_thumbnail, thumbnail_key
 from app.routers.auth import get_current_user, User
 
 router = APIRouter(prefix="/api/documents", tags=["documents"])
 
 
+def _project_file(project_id: str, file_path: str) -> Path:
+    """Path of a file in the project's data folder; 404 if missing or outside it"""
+    base_dir = DocumentViewer(project_id=project_id).base_dir.resolve()
+    full_path = (base_dir / file_path).resolve()
+    if not full_path.is_relative_to(base_dir) or not full_path.is_file():
+        raise HTTPException(status_code=404, detail=f"File not found: {file_path}")
+    return full_path
+
+
+def _etag(key: str) -> str:
+    return f'"{hashlib.sha256(key.encode()).hexdigest()[:32]}"'
+
+
 @router.get("/list/{project_id}")
 async def list_documents(
     project_id: str,
@@ -82,30 +99,59 @@ async def get_document_metadata(
 
 @router.get("/download/{project_id}/{file_path:path}")
 async def download_document(
+    request: Request,
     project_id: str,
     file_path: str,
     current_user: User = Depends(get_current_user)
 ):
     """
     Download a document file
+    Streamed from disk with Range and ETag/Last-Modified support
     """
     try:
-        doc_viewer = DocumentViewer(project_id=project_id)
-        full_path = doc_viewer.base_dir / file_path
+        full_path = _project_file(project_id, file_path)
+        return serve_file(request, full_path, filename=full_path.name)
 
-        if not full_path.exists():
-            raise HTTPException(status_code=404, detail=f"File not found: {file_path}")
+    except HTTPException:
+        raise
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Error downloading file: {str(e)}")
 
-        return FileResponse(
-            path=str(full_path),
-            filename=full_path.name,
-            media_type="application/octet-stream"
-        )
+
+@router.get("/file/{project_id}/{file_path:path}")
+async def view_document(
+    request: Request,
+    project_id: str,
+    file_path: str,
+    width: Optional[int] = Query(None, ge=16, le=4096, description="Image thumbnail width in pixels"),
+    current_user: User = Depends(get_current_user)
+):
+    """
+    Serve a document for display in the browser
+    - Any file: streamed inline with Range and ETag/Last-Modified support
+    - Images with width: a downscaled variant, rendered once and cached
+    """
+    try:
+        full_path = _project_file(project_id, file_path)
+
+        if width is None:
+            return serve_file(request, full_path, filename=full_path.name, inline=True)
+
+        if full_path.suffix.lower() not in IMAGE_EXTENSIONS:
+            raise HTTPException(status_code=400, detail="Thumbnails are only available for images")
+
+        loop = asyncio.get_running_loop()
+        etag = _etag(await loop.run_in_executor(None, image_thumbnail_key, full_path, width))
+        if etag_matches(request, etag):
+            return not_modified(etag)
+
+        content, media_type = await loop.run_in_executor(None, image_thumbnail, full_path, width)
+        return serve_bytes(request, content, media_type, etag)
 
     except HTTPException:
         raise
     except Exception as e:
-        raise HTTPException(status_code=500, detail=f"Error downloading file: {str(e)}")
+        raise HTTPException(status_code=500, detail=f"Error serving file: {str(e)}")
 
 
 @router.get("/excel/{project_id}/{file_path:path}")
@@ -133,18 +179,61 @@ async def preview_excel(
         raise HTTPException(status_code=500, detail=f"Error previewing Excel: {str(e)}")
 
 
+@router.get("/excel-window/{project_id}/{file_path:path}")
+async def excel_window(
+    project_id: str,
+    file_path: str,
+    sheet: Optional[str] = Query(None, description="Sheet name (default: first sheet)"),
+    offset: int = Query(0, ge=0, description="First data row of the window"),
+    limit: int = Query(100, ge=1, le=1000, description="Rows in the window"),
+    columns: Optional[str] = Query(None, description="Comma-separated column names (default: all)"),
+    current_user: User = Depends(get_current_user)
+) -> Dict[str, Any]:
+    """
+    Page through one sheet of an Excel file
+    Only the requested rows are read; total_rows gives the sheet length
+    """
+    try:
+        full_path = _project_file(project_id, file_path)
+        doc_viewer = DocumentViewer(project_id=project_id)
+        column_names = [name.strip() for name in columns.split(",") if name.strip()] if columns else None
+        window = doc_viewer.excel_window(
+            full_path.relative_to(doc_viewer.base_dir.resolve()), sheet, offset, limit, column_names
+        )
+
+        if "error" in window:
+            raise HTTPException(status_code=404, detail=window["error"])
+
+        return window
+
+    except HTTPException:
+        raise
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Error reading Excel window: {str(e)}")
+
+
 @router.get("/pdf/{project_id}/{file_path:path}")
 async def preview_pdf(
     project_id: str,
     file_path: str,
+    pages: Optional[str] = Query(None, description="Page range, e.g. 11-20 (default: first 10 pages)"),
     current_user: User = Depends(get_current_user)
 ) -> Dict[str, Any]:
     """
     Preview PDF file
+    Extracts the text of the requested pages only
     """
     try:
+        first_page, last_page = parse_page_range(pages) if pages else (1, None)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+    try:
+        full_path = _project_file(project_id, file_path)
         doc_viewer = DocumentViewer(project_id=project_id)
-        preview = doc_viewer.pdf_to_preview(Path(file_path))
+        preview = doc_viewer.pdf_to_preview(
+            full_path.relative_to(doc_viewer.base_dir.resolve()), first_page, last_page
+        )
 
         if "error" in preview:
             raise HTTPException(status_code=404, detail=preview["error"])
@@ -157,6 +246,41 @@ async def preview_pdf(
         raise HTTPException(status_code=500, detail=f"Error previewing PDF: {str(e)}")
 
 
+@router.get("/pdf-page/{project_id}/{file_path:path}")
+async def pdf_page_image(
+    request: Request,
+    project_id: str,
+    file_path: str,
+    page: int = Query(1, ge=1, description="Page number"),
+    dpi: int = Query(72, ge=24, le=300, description="Resolution"),
+    current_user: User = Depends(get_current_user)
+):
+    """
+    Render one PDF page as a PNG thumbnail
+    Renders are cached on disk by file hash, page and DPI; clients
+    revalidate with the ETag
+    """
+    try:
+        full_path = _project_file(project_id, file_path)
+        if full_path.suffix.lower() != ".pdf":
+            raise HTTPException(status_code=404, detail=f"PDF not found: {file_path}")
+
+        loop = asyncio.get_running_loop()
+        etag = _etag(await loop.run_in_executor(None, thumbnail_key, full_path, page, dpi))
+        if etag_matches(request, etag):
+            return not_modified(etag)
+
+        image = await loop.run_in_executor(None, pdf_thumbnail, full_path, page, dpi)
+        return serve_bytes(request, image, "image/png", etag)
+
+    except HTTPException:
+        raise
+    except IndexError as e:
+        raise HTTPException(status_code=404, detail=str(e))
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Error rendering PDF page: {str(e)}")
+
+
 @router.get("/image/{project_id}/{file_path:path}")
 async def preview_image(
     project_id: str,
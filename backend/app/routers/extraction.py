@@ -7,13 +7,15 @@ Endpoints for uploading files, triggering extraction, and retrieving results.
 import os
 import json
 import shutil
+import bisect
+import glob
 from pathlib import Path
 from typing import List, Optional
 from datetime import datetime
 
-from fastapi import APIRouter, UploadFile, File, HTTPException, Depends, BackgroundTasks
-from fastapi.responses import JSONResponse
-from pydantic import BaseModel
+from fastapi import APIRouter, UploadFile, File, HTTPException, Depends, BackgroundTasks, Query, Response
+from fastapi.responses import StreamingResponse
+from pydantic import BaseModel, Field
 
 import sys
 from pathlib import Path
@@ -25,7 +27,12 @@ from extraction.base_extractor import ExtractorFactory
 from extraction.extractors import ExcelExtractor, PDFExtractor, CSVExtractor, ImageExtractor
 from schemas.extraction_schema import ExtractionResult, FileType
 from classification.ai_classifier import AIClassifier
-from app.auth_utils import get_current_user
+from app.auth_utils import get_current_user, get_stream_user
+from app.pagination import (
+    NEXT_CURSOR_HEADER, decode_cursor, encode_cursor, parse_fields, project, set_next_cursor
+)
+from app.responses import FastJSONResponse
+from app.services.progress_bus import SSE_HEADERS, event_stream, file_channel, get_progress_bus
 
 router = APIRouter(prefix="/api/extraction", tags=["extraction"])
 
@@ -71,6 +78,23 @@ class ExtractionStatusResponse(BaseModel):
     error: Optional[str] = None
 
 
+class BulkStatusRequest(BaseModel):
+    """File IDs to check in one call."""
+    file_ids: List[str] = Field(..., max_length=1000)
+
+
+class FileStatusItem(BaseModel):
+    """Status of a single file extraction."""
+    file_id: str
+    status: str  # processing, completed, failed
+    error: Optional[str] = None
+
+
+class BulkStatusResponse(BaseModel):
+    """Statuses for a batch of file IDs."""
+    statuses: List[FileStatusItem]
+
+
 class FileListItem(BaseModel):
     """Summary of an uploaded file."""
     file_id: str
@@ -126,7 +150,12 @@ def process_file_extraction(file_id: str, file_path: str):
     3. Classify with AI (if enabled)
     4. Save results
     """
+    bus = get_progress_bus()
+    channel = file_channel(file_id)
+
     try:
+        bus.publish(channel, "phase", file_id=file_id, status="processing", phase="extracting")
+
         # Get extractor
         extractor = ExtractorFactory.get_extractor(file_path)
 
@@ -138,6 +167,7 @@ def process_file_extraction(file_id: str, file_path: str):
 
         # Classify with AI (if API key available)
         try:
+            bus.publish(channel, "phase", phase="classifying")
             classifier = AIClassifier()
             if classifier.is_available():
                 result = classifier.classify_extraction(result)
@@ -147,6 +177,11 @@ def process_file_extraction(file_id: str, file_path: str):
 
         # Save result
         save_extraction_result(file_id, result)
+        bus.publish(
+            channel, "completed",
+            status="completed",
+            confidence_score=result.metadata.confidence_score
+        )
 
     except Exception as e:
         # Save error state
@@ -158,6 +193,37 @@ def process_file_extraction(file_id: str, file_path: str):
         error_path = EXTRACTION_DIR / f"{file_id}_error.json"
         with error_path.open("w") as f:
             json.dump(error_result, f, indent=2)
+        bus.publish(channel, "failed", status="failed", error=str(e))
+
+
+def _file_status(file_id: str) -> dict:
+    """Lightweight status of a file extraction (no result parsing)."""
+    state = get_progress_bus().state(file_channel(file_id))
+    if state and state.get("last_event") == "completed":
+        return {"file_id": file_id, "status": "completed", "error": None}
+    if state and state.get("last_event") == "failed":
+        return {"file_id": file_id, "status": "failed", "error": state.get("error")}
+
+    if (EXTRACTION_DIR / f"{file_id}.json").exists():
+        return {"file_id": file_id, "status": "completed", "error": None}
+
+    error_path = EXTRACTION_DIR / f"{file_id}_error.json"
+    if error_path.exists():
+        try:
+            with error_path.open("r") as f:
+                error = json.load(f).get("error", "Unknown error")
+        except Exception:
+            error = "Unknown error"
+        return {"file_id": file_id, "status": "failed", "error": error}
+
+    return {"file_id": file_id, "status": "processing", "error": None}
+
+
+def _is_extracting(file_id: str) -> bool:
+    """Whether a file was uploaded or is being extracted (its progress channel exists)."""
+    if get_progress_bus().state(file_channel(file_id)) is not None:
+        return True
+    return any(path.stem == file_id for path in UPLOAD_DIR.glob(f"{glob.escape(file_id)}*"))
 
 
 # ============================================================================
@@ -260,11 +326,12 @@ async def get_extraction_status(
     result = load_extraction_result(file_id)
 
     if result:
-        return ExtractionStatusResponse(
+        # Rendered directly: the full result is large and already validated
+        return FastJSONResponse(ExtractionStatusResponse(
             file_id=file_id,
             status="completed",
             extraction_result=result
-        )
+        ))
 
     # Check if error exists
     error_path = EXTRACTION_DIR / f"{file_id}_error.json"
@@ -284,24 +351,94 @@ async def get_extraction_status(
     )
 
 
+@router.get("/events/{file_id}")
+async def stream_extraction_events(
+    file_id: str,
+    user: dict = Depends(get_stream_user)
+):
+    """
+    Stream extraction progress for a file as Server-Sent Events.
+
+    The stream ends with a 'completed' or 'failed' event; if extraction has
+    already finished, that event is sent immediately. EventSource clients
+    pass their access token as the `token` query parameter.
+    """
+    initial = []
+    status = _file_status(file_id)
+
+    if status["status"] == "processing" and not _is_extracting(file_id):
+        raise HTTPException(status_code=404, detail=f"No extraction for file {file_id}")
+
+    if status["status"] != "processing":
+        initial.append({"event": status["status"], "seq": 0, **status})
+    else:
+        snapshot = get_progress_bus().snapshot(file_channel(file_id))
+        initial.append(snapshot or {"event": "snapshot", "seq": 0, **status})
+
+    return StreamingResponse(
+        event_stream(file_channel(file_id), initial=initial),
+        media_type="text/event-stream",
+        headers=SSE_HEADERS
+    )
+
+
+@router.post("/status/bulk", response_model=BulkStatusResponse)
+async def get_bulk_extraction_status(
+    request: BulkStatusRequest,
+    user: dict = Depends(get_current_user)
+):
+    """
+    Get extraction status for many files in one call.
+
+    Only statuses are returned (not full results); finished files are
+    detected from the result/error files without parsing results.
+    """
+    return BulkStatusResponse(
+        statuses=[FileStatusItem(**_file_status(file_id)) for file_id in dict.fromkeys(request.file_ids)]
+    )
+
+
 @router.get("/list", response_model=List[FileListItem])
 async def list_extracted_files(
+    response: Response,
+    limit: Optional[int] = Query(None, ge=1, le=1000, description="Page size (all files when omitted)"),
+    cursor: Optional[str] = Query(None, description="X-Next-Cursor value from the previous page"),
+    fields: Optional[str] = Query(None, description="Comma-separated fields to return"),
     user: dict = Depends(get_current_user)
 ):
     """
     List all extracted files for the current user.
 
-    Returns summary information for each file.
+    Returns summary information for each file, newest first. File IDs start
+    with the upload timestamp, so result files are paged in file_id order
+    straight from the directory listing and only the files on the requested
+    page are loaded.
     """
+    projection = parse_fields(fields, FileListItem.model_fields)
+    after = decode_cursor(cursor)
+
+    # file_id is "<upload timestamp>_<hash>", so name order is upload order
+    file_ids = sorted(
+        entry.name[:-len(".json")] for entry in os.scandir(EXTRACTION_DIR)
+        if entry.name.endswith(".json") and not entry.name.endswith("_error.json")
+    )
+
+    # Walk newest first, starting below the cursor
+    end = len(file_ids)
+    if after:
+        end = bisect.bisect_left(file_ids, str(after.get("file_id", "")))
 
     files = []
+    next_cursor = None
+    last_file_id = None
 
-    for result_file in EXTRACTION_DIR.glob("*.json"):
-        if result_file.name.endswith("_error.json"):
-            continue
+    for position in range(end - 1, -1, -1):
+        if limit and len(files) == limit:
+            next_cursor = encode_cursor({"file_id": last_file_id})
+            break
 
         try:
-            result = load_extraction_result(result_file.stem)
+            result = load_extraction_result(file_ids[position])
 
             if result:
                 files.append(FileListItem(
@@ -312,12 +449,17 @@ async def list_extracted_files(
                     extraction_status="completed",
                     confidence_score=result.metadata.confidence_score
                 ))
+                last_file_id = file_ids[position]
         except Exception:
             continue
 
-    # Sort by upload date (newest first)
-    files.sort(key=lambda x: x.upload_date, reverse=True)
+    if projection:
+        return FastJSONResponse(
+            content=[project(f.model_dump(), projection) for f in files],
+            headers={NEXT_CURSOR_HEADER: next_cursor} if next_cursor else None
+        )
 
+    set_next_cursor(response, next_cursor)
     return files
 
 
@@ -340,7 +482,7 @@ async def get_extraction_result(
             detail=f"Extraction result not found for file_id: {file_id}"
         )
 
-    return result
+    return FastJSONResponse(result)
 
 
 @router.put("/result/{file_id}", response_model=ExtractionResult)
@@ -2,19 +2,30 @@
 Financial Builder API Endpoints
 Handles full pipeline: extraction → categorization → aggregation → Excel population
 """
-from fastapi import APIRouter, Depends, HTTPException, BackgroundTasks
-from fastapi.responses import FileResponse
-from sqlalchemy.orm import Session
+from fastapi import APIRouter, Depends, HTTPException, BackgroundTasks, Query, Request, Response
+from fastapi.responses import StreamingResponse
+from sqlalchemy import String, cast, func, or_, select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session, undefer_group
 from typing import Dict, Any, Optional
 from pydantic import BaseModel
 from datetime import datetime
 
-from app.database import get_db
+from app.config import get_config
+from app.database import get_db, get_async_db, get_async_session_factory
+from app.file_serving import serve_file
+from app.pagination import decode_cursor, encode_cursor, parse_fields, set_next_cursor
 from app.services.template_parser import parse_template, TemplateParser
-from app.services.file_extractor import start_extraction, get_extraction_status, FileExtractor
+from app.services.file_extractor import start_extraction, get_extraction_status_async, FileExtractor
 from app.services.ai_categorizer import create_categorizer
 from app.services.excel_populator import create_excel_populator
+from app.services.pipeline_stream import data_point_transaction, run_streaming_pipeline
+from app.services.pipeline_metrics import PipelineMetrics, compare_runs
+from app.services.pipeline_stages import PipelineStageCache, STAGES, hash_json
+from app.services.progress_bus import SSE_HEADERS, event_stream, format_sse, get_progress_bus, job_channel
 from app.models.extraction import ExtractionJob, JobStatus, ExtractedData
+from app.models.data_points import DataPoint, DataPointConflict, DataPointStatus, DataPointType
+import asyncio
 import json
 import os
 from pathlib import Path
@@ -24,6 +35,9 @@ logger = logging.getLogger(__name__)
 
 router = APIRouter(prefix="/api/financial-builder", tags=["financial-builder"])
 
+# Seconds between database reads when streaming a job another process runs
+JOB_POLL_INTERVAL = 2.0
+
 
 class ParseTemplateResponse(BaseModel):
     success: bool
@@ -135,18 +149,34 @@ async def extract_all_files(
 
 
 @router.get("/jobs/{job_id}/status", response_model=JobStatusResponse)
-async def get_job_status(job_id: str, db: Session = Depends(get_db)):
+async def get_job_status(job_id: str, db: AsyncSession = Depends(get_async_db)):
     """
     Get current status of an extraction job.
 
     Args:
         job_id: Job identifier
-        db: Database session
+        db: Async database session
 
     Returns:
         Job status with progress information
     """
-    status = get_extraction_status(job_id, db)
+    # Jobs running in this process report live progress from the progress
+    # bus; the database is only consulted for jobs it hasn't seen
+    state = get_progress_bus().state(job_channel(job_id))
+    if state and "total_files" in state:
+        return JobStatusResponse(
+            job_id=job_id,
+            project_id=state.get("project_id", ""),
+            status=state.get("status", JobStatus.PROCESSING.value),
+            total_files=state["total_files"],
+            processed_files=state.get("processed_files", 0),
+            failed_files=state.get("failed_files", 0),
+            progress_percent=state.get("progress_percent", 0.0),
+            error_message=state.get("error_message"),
+            metadata=state.get("metadata")
+        )
+
+    status = await get_extraction_status_async(job_id, db)
 
     if not status:
         raise HTTPException(status_code=404, detail=f"Job {job_id} not found")
@@ -154,20 +184,198 @@ async def get_job_status(job_id: str, db: Session = Depends(get_db)):
     return JobStatusResponse(**status)
 
 
+@router.get("/jobs/{job_id}/events")
+async def stream_job_events(job_id: str, db: AsyncSession = Depends(get_async_db)):
+    """
+    Stream job progress as Server-Sent Events.
+
+    Sends a snapshot of the current state first, then phase changes,
+    per-file completion and errors until the job completes or fails. Jobs
+    this process isn't running are followed through the database instead.
+
+    Args:
+        job_id: Job identifier
+        db: Async database session
+
+    Returns:
+        text/event-stream response
+    """
+    snapshot = get_progress_bus().snapshot(job_channel(job_id))
+
+    if snapshot is not None:
+        body = event_stream(job_channel(job_id), initial=[snapshot])
+    else:
+        # Job not running in this process - follow its persisted state
+        status = await get_extraction_status_async(job_id, db)
+        if not status:
+            raise HTTPException(status_code=404, detail=f"Job {job_id} not found")
+        body = _persisted_job_stream(job_id, status)
+
+    return StreamingResponse(body, media_type="text/event-stream", headers=SSE_HEADERS)
+
+
+def _status_event(status: Dict[str, Any], seq: int) -> Dict[str, Any]:
+    """A persisted job status as a progress event."""
+    finished = status["status"] in (JobStatus.COMPLETED.value, JobStatus.FAILED.value)
+    return {"event": status["status"] if finished else "snapshot", "seq": seq, **status}
+
+
+async def _persisted_job_stream(job_id: str, status: Dict[str, Any], keepalive: float = 15.0):
+    """
+    SSE body for a job that isn't publishing on this process's progress bus.
+
+    The job is finished, or running in another process (or was left behind
+    by a restart), so its database row is polled and sent whenever it
+    changes. The stream ends when the job completes or fails, or switches
+    to the bus once events for the job are published here.
+    """
+    seq = 0
+    message = _status_event(status, seq)
+    yield format_sse(message)
+    idle = 0.0
+
+    while message["event"] == "snapshot":
+        await asyncio.sleep(JOB_POLL_INTERVAL)
+
+        snapshot = get_progress_bus().snapshot(job_channel(job_id))
+        if snapshot is not None:
+            async for frame in event_stream(job_channel(job_id), initial=[snapshot], keepalive=keepalive):
+                yield frame
+            return
+
+        async with get_async_session_factory()() as db:
+            latest = await get_extraction_status_async(job_id, db)
+
+        if latest is None:
+            yield format_sse({"event": "failed", "seq": seq + 1, "job_id": job_id,
+                              "status": JobStatus.FAILED.value, "error_message": "Job no longer exists"})
+            return
+
+        if latest != status:
+            status = latest
+            seq += 1
+            message = _status_event(status, seq)
+            yield format_sse(message)
+            idle = 0.0
+        else:
+            idle += JOB_POLL_INTERVAL
+            if idle >= keepalive:
+                yield ": keepalive\n\n"
+                idle = 0.0
+
+
+def _job_metrics(job: ExtractionJob) -> Optional[Dict[str, Any]]:
+    """Stage metrics stored in a job's metadata (None for jobs without them)."""
+    if not job.job_metadata:
+        return None
+    try:
+        metadata = json.loads(job.job_metadata)
+    except ValueError:
+        return None
+    if not isinstance(metadata, dict) or 'metrics' not in metadata:
+        return None
+    return metadata
+
+
+@router.get("/jobs/{job_id}/metrics")
+async def get_job_metrics(job_id: str, db: AsyncSession = Depends(get_async_db)):
+    """
+    Get per-stage timing, memory and throughput metrics of a pipeline run.
+
+    Args:
+        job_id: Job identifier
+        db: Async database session
+
+    Returns:
+        Stage metrics recorded by the pipeline
+    """
+    result = await db.execute(select(ExtractionJob).where(ExtractionJob.job_id == job_id))
+    job = result.scalars().first()
+
+    if not job:
+        raise HTTPException(status_code=404, detail=f"Job {job_id} not found")
+
+    metadata = _job_metrics(job)
+    if metadata is None:
+        raise HTTPException(status_code=404, detail=f"No metrics recorded for job {job_id}")
+
+    return {
+        "job_id": job.job_id,
+        "project_id": job.project_id,
+        "status": job.status.value,
+        "mode": metadata.get("mode"),
+        "stages_cached": metadata.get("stages"),
+        "metrics": metadata["metrics"]
+    }
+
+
+@router.get("/{project_id}/metrics")
+async def compare_pipeline_metrics(
+    project_id: str,
+    limit: int = Query(10, ge=2, le=100, description="Number of recent runs to compare"),
+    db: AsyncSession = Depends(get_async_db)
+):
+    """
+    Compare stage metrics across a project's recent pipeline runs.
+
+    The latest run is compared against the median of the earlier ones;
+    stages that got markedly slower are listed under 'regressions'.
+
+    Args:
+        project_id: Project identifier
+        limit: Number of recent runs to compare
+        db: Async database session
+
+    Returns:
+        Per-run overview, per-stage latest vs baseline and regressions
+    """
+    result = await db.execute(
+        select(ExtractionJob)
+        .where(
+            ExtractionJob.project_id == project_id,
+            ExtractionJob.job_metadata.is_not(None)
+        )
+        .order_by(ExtractionJob.created_at.desc(), ExtractionJob.id.desc())
+        .limit(limit)
+    )
+
+    runs = []
+    for job in result.scalars():
+        metadata = _job_metrics(job)
+        if metadata is not None:
+            runs.append({
+                "job_id": job.job_id,
+                "created_at": job.created_at.isoformat() if job.created_at else None,
+                "mode": metadata.get("mode"),
+                "metrics": metadata["metrics"]
+            })
+
+    if not runs:
+        raise HTTPException(status_code=404, detail=f"No pipeline metrics recorded for project {project_id}")
+
+    return {"project_id": project_id, **compare_runs(runs)}
+
+
 @router.post("/{project_id}/run-full-pipeline")
 async def run_full_pipeline(
     project_id: str,
     background_tasks: BackgroundTasks,
+    force: bool = Query(False, description="Ignore cached stage results and re-run every phase"),
+    streaming: bool = Query(False, description="Overlap extraction, parsing, dedup and categorization"),
     db: Session = Depends(get_db)
 ):
     """
     Run complete pipeline: parse template → extract files → categorize → aggregate → populate Excel.
 
-    This is the main endpoint for the Financial Builder feature.
+    This is the main endpoint for the Financial Builder feature. Stages whose
+    inputs are unchanged since the previous run are skipped.
 
     Args:
         project_id: Project identifier
         background_tasks: FastAPI background tasks
+        force: Re-run every stage even if its inputs are unchanged
+        streaming: Stream each file through parse → dedup → categorize
+            instead of waiting for every file at each phase
         db: Database session
 
     Returns:
@@ -197,7 +405,9 @@ async def run_full_pipeline(
             project_id,
             job_id,
             template_dict,
-            db
+            db,
+            force,
+            streaming
         )
 
         return {
@@ -213,46 +423,249 @@ async def run_full_pipeline(
 
 
 @router.get("/{project_id}/extracted-data")
-async def get_extracted_data(project_id: str, db: Session = Depends(get_db)):
+async def get_extracted_data(
+    project_id: str,
+    response: Response,
+    limit: Optional[int] = Query(None, ge=1, le=5000, description="Page size (all files when omitted)"),
+    cursor: Optional[str] = Query(None, description="next_cursor value from the previous page"),
+    fields: Optional[str] = Query(None, description="Comma-separated fields to return"),
+    db: AsyncSession = Depends(get_async_db)
+):
     """
     Get all extracted data for a project.
 
+    Pages are keyed on id (ascending) and served from the (project_id, id)
+    index, so every page costs the same regardless of depth.
+
     Args:
         project_id: Project identifier
-        db: Database session
+        limit: Page size
+        cursor: Cursor returned with the previous page
+        fields: Optional projection (e.g. "id,file_name,extraction_status")
+        db: Async database session
 
     Returns:
         List of extracted data records
     """
-    from app.models.extraction import ExtractedData
+    from app.models.extraction import ExtractedData, TEXT_PREVIEW_LENGTH
+
+    # Only read listing columns; rows written before the preview column
+    # existed fall back to a substring of the legacy text column
+    columns = {
+        "id": ExtractedData.id,
+        "file_name": ExtractedData.file_name,
+        "file_type": ExtractedData.file_type,
+        "extraction_status": ExtractedData.extraction_status,
+        "extraction_method": ExtractedData.extraction_method,
+        "text_preview": func.coalesce(
+            ExtractedData.text_preview,
+            func.substr(ExtractedData.legacy_raw_text, 1, TEXT_PREVIEW_LENGTH)
+        ),
+        "created_at": ExtractedData.created_at
+    }
+    projection = parse_fields(fields, columns) or list(columns)
+    after = decode_cursor(cursor)
 
-    data = db.query(ExtractedData).filter(
+    query = select(
+        ExtractedData.id.label("_cursor_id"),
+        *(columns[name].label(name) for name in projection)
+    ).where(
         ExtractedData.project_id == project_id
-    ).all()
+    ).order_by(ExtractedData.id)
+
+    if after:
+        query = query.where(ExtractedData.id > after.get("id", 0))
+    if limit:
+        query = query.limit(limit + 1)
+
+    data = (await db.execute(query)).all()
+
+    next_cursor = None
+    if limit and len(data) > limit:
+        data = data[:limit]
+        next_cursor = encode_cursor({"id": data[-1]._cursor_id})
+
+    if limit or after:
+        total_files = await db.scalar(
+            select(func.count(ExtractedData.id)).where(ExtractedData.project_id == project_id)
+        )
+    else:
+        total_files = len(data)
 
+    formatters = {
+        "text_preview": lambda value: value or None,
+        "created_at": lambda value: value.isoformat() if value else None
+    }
+
+    set_next_cursor(response, next_cursor)
     return {
         "project_id": project_id,
-        "total_files": len(data),
+        "total_files": total_files,
+        "next_cursor": next_cursor,
         "files": [
             {
-                "id": d.id,
-                "file_name": d.file_name,
-                "file_type": d.file_type,
-                "extraction_status": d.extraction_status,
-                "extraction_method": d.extraction_method,
-                "text_preview": d.raw_text[:200] if d.raw_text else None,
-                "created_at": d.created_at.isoformat() if d.created_at else None
+                name: formatters[name](d._mapping[name]) if name in formatters else d._mapping[name]
+                for name in projection
             }
             for d in data
         ]
     }
 
 
+def _data_point_dict(dp: DataPoint) -> Dict[str, Any]:
+    """Serialize a data point for API responses."""
+    return {
+        "id": dp.id,
+        "source_file_id": dp.source_file_id,
+        "source_file_name": dp.source_file_name,
+        "source_location": dp.source_location,
+        "data_point_type": dp.data_point_type.value if dp.data_point_type else None,
+        "status": dp.status.value if dp.status else None,
+        "transaction_date": dp.transaction_date.isoformat() if dp.transaction_date else None,
+        "description": dp.description,
+        "amount": dp.amount,
+        "vendor": dp.vendor,
+        "category": dp.category,
+        "conflict_group_id": dp.conflict_group_id,
+        "confidence_score": dp.confidence_score,
+        "manually_edited": dp.manually_edited
+    }
+
+
+@router.get("/{project_id}/data-points")
+async def get_data_points(
+    project_id: str,
+    status: Optional[DataPointStatus] = None,
+    data_point_type: Optional[DataPointType] = None,
+    include_superseded: bool = False,
+    limit: int = Query(500, ge=1, le=5000),
+    offset: int = Query(0, ge=0),
+    db: AsyncSession = Depends(get_async_db)
+):
+    """
+    Get normalized data points for a project.
+
+    Args:
+        project_id: Project identifier
+        status: Optional status filter
+        data_point_type: Optional type filter
+        include_superseded: Include duplicates and superseded points
+        limit: Maximum number of points to return
+        offset: Number of points to skip
+        db: Async database session
+
+    Returns:
+        Data points matching the filters
+    """
+    filters = [DataPoint.project_id == project_id]
+    if status:
+        filters.append(DataPoint.status == status)
+    if data_point_type:
+        filters.append(DataPoint.data_point_type == data_point_type)
+    if not include_superseded:
+        filters.extend([DataPoint.is_duplicate == False, DataPoint.superseded_by == None])
+
+    total = await db.scalar(select(func.count()).select_from(DataPoint).where(*filters))
+    result = await db.execute(
+        select(DataPoint).where(*filters).order_by(DataPoint.extracted_at, DataPoint.id)
+        .offset(offset).limit(limit)
+    )
+
+    return {
+        "project_id": project_id,
+        "total": total,
+        "data_points": [_data_point_dict(dp) for dp in result.scalars()]
+    }
+
+
+@router.get("/{project_id}/conflicts")
+async def get_conflicts(
+    project_id: str,
+    resolved: bool = False,
+    db: AsyncSession = Depends(get_async_db)
+):
+    """
+    Get data point conflicts for a project.
+
+    Args:
+        project_id: Project identifier
+        resolved: Return resolved conflicts instead of open ones
+        db: Async database session
+
+    Returns:
+        Conflicts with the data points involved
+    """
+    result = await db.execute(
+        select(DataPointConflict).where(
+            DataPointConflict.project_id == project_id,
+            DataPointConflict.resolved == resolved
+        ).order_by(DataPointConflict.detected_at)
+    )
+    conflicts = result.scalars().all()
+
+    # Load every referenced data point in one query
+    point_ids = {pid for c in conflicts for pid in json.loads(c.data_point_ids)}
+    points = {}
+    if point_ids:
+        point_result = await db.execute(select(DataPoint).where(DataPoint.id.in_(point_ids)))
+        points = {dp.id: dp for dp in point_result.scalars()}
+
+    return {
+        "project_id": project_id,
+        "total_conflicts": len(conflicts),
+        "conflicts": [
+            {
+                "id": c.id,
+                "conflict_group_id": c.conflict_group_id,
+                "conflict_type": c.conflict_type,
+                "conflict_description": c.conflict_description,
+                "suggested_resolution": c.suggested_resolution,
+                "resolved": c.resolved,
+                "resolution_action": c.resolution_action,
+                "winning_data_point_id": c.winning_data_point_id,
+                "detected_at": c.detected_at.isoformat() if c.detected_at else None,
+                "data_points": [
+                    _data_point_dict(points[pid])
+                    for pid in json.loads(c.data_point_ids) if pid in points
+                ]
+            }
+            for c in conflicts
+        ]
+    }
+
+
+def _validation_rules_version(db: Session, project_id: str) -> str:
+    """Hash of the validation rules that apply to a project."""
+    from app.models.data_points import DataPointValidationRule
+
+    rules = db.query(DataPointValidationRule).filter(
+        or_(
+            DataPointValidationRule.project_id == project_id,
+            DataPointValidationRule.project_id == None
+        ),
+        DataPointValidationRule.active == True
+    ).order_by(DataPointValidationRule.id).all()
+
+    return hash_json([
+        [r.id, r.rule_type, r.rule_name, r.data_point_type, r.rule_parameters]
+        for r in rules
+    ])
+
+
+def _data_points_version(db: Session, project_id: str) -> str:
+    """Hash of the data points categorization would read for a project."""
+    from app.services.data_point_mapper import create_data_point_mapper
+
+    return hash_json(create_data_point_mapper(db, project_id).processing_version())
+
+
 def run_pipeline_phases(
     project_id: str,
     job_id: str,
     template_dict: Dict[str, Any],
-    db: Session
+    db: Session,
+    force: bool = False,
+    streaming: bool = False
 ):
     """
     Background task to run all pipeline phases sequentially with normalized data layer.
@@ -269,158 +682,362 @@ def run_pipeline_phases(
     data stored in normalized table, conflicts can be manually resolved,
     consistent results from same input data.
 
+    Stages are memoized (see app/services/pipeline_stages.py): a stage whose
+    input fingerprint matches the previous run is skipped, and the run
+    resumes from the first stage whose inputs changed.
+
     Args:
         project_id: Project identifier
         job_id: Extraction job ID
         template_dict: Parsed template dictionary
         db: Database session
+        force: Ignore cached stage results and run every phase
+        streaming: Run phases 1-5 as a streaming pipeline
+            (see app/services/pipeline_stream.py)
     """
+    bus = get_progress_bus()
+    channel = job_channel(job_id)
+    metrics = PipelineMetrics(trace_memory=get_config().pipeline_trace_memory)
+
     try:
         logger.info(f"[{project_id}] Pipeline started - Job ID: {job_id}")
+        metrics.start("fingerprint")
 
-        # Phase 1: Extract files
-        logger.info(f"[{project_id}] Phase 1: Extracting files...")
-        try:
-            extractor = FileExtractor(project_id, db)
-            extractor.run_extraction(job_id)
+        # Use /tmp for cloud deployments (Render, etc.) where file system is ephemeral
+        base_dir = Path("/tmp") if os.getenv("RENDER") else Path("data")
+        project_dir = base_dir / "projects" / project_id
+
+        # Fingerprint every stage's inputs and find where this run has to start
+        extractor = FileExtractor(project_id, db)
+        categorizer = create_categorizer(template_dict)
+        stage_cache = PipelineStageCache(project_id, project_dir / "pipeline")
+        stage_inputs = {
+            "files": stage_cache.hash_files(extractor.scan_files()),
+            "validation_rules": _validation_rules_version(db, project_id),
+            "template": hash_json(template_dict),
+            "keyword_map": categorizer.keyword_map_version(),
+            "data_points": _data_points_version(db, project_id),
+        }
+        fingerprints = stage_cache.fingerprints(stage_inputs)
+        fresh = stage_cache.fresh_stages(fingerprints, force=force)
+        stage_results = {stage: ("cached" if stage in fresh else "ran") for stage in STAGES}
+
+        if fresh:
+            logger.info(f"[{project_id}] Reusing cached stages: {', '.join(fresh)}")
+        metrics.finish(cached_stages=len(fresh))
+
+        mode = "streaming" if streaming and "extract" not in fresh else "batch"
+        first_categorized_seconds = None
+
+        if mode == "streaming":
+            # Phases 1-5 as overlapping stages: each file is parsed, deduplicated
+            # and categorized while the remaining files are still extracting
+            logger.info(f"[{project_id}] Phases 1-5: Streaming extraction through categorization...")
+            metrics.start("stream")
+            result = run_streaming_pipeline(project_id, job_id, db, categorizer, incremental=not force)
 
-            # Wait for extraction to complete
             job = db.query(ExtractionJob).filter(ExtractionJob.job_id == job_id).first()
             if not job or job.status != JobStatus.COMPLETED:
                 logger.error(f"[{project_id}] Extraction phase failed or incomplete")
+                bus.publish(
+                    channel, "failed",
+                    status=JobStatus.FAILED.value,
+                    error_message="Extraction phase failed or incomplete"
+                )
                 return
 
-            logger.info(f"[{project_id}] Phase 1 complete: {job.processed_files} files extracted")
-        except Exception as e:
-            logger.error(f"[{project_id}] Phase 1 ERROR: {e}", exc_info=True)
-            raise Exception(f"File extraction failed: {str(e)}")
-
-        # Phase 2: Parse extracted data into normalized data points
-        logger.info(f"[{project_id}] Phase 2: Parsing extracted data into normalized data points...")
-        from app.services.transaction_parser import create_transaction_parser
-        from app.services.data_point_mapper import create_data_point_mapper
-
-        extracted_data = db.query(ExtractedData).filter(
-            ExtractedData.project_id == project_id,
-            ExtractedData.extraction_status == "success"
-        ).all()
-
-        # Parse each extracted file into data points
-        parser = create_transaction_parser(project_id)
-        all_data_points = []
+            categorized_transactions = result.categorized_transactions
+            transactions_count = len(categorized_transactions)
+            summary = categorizer.get_category_summary(categorized_transactions)
+            first_categorized_seconds = result.first_categorized_seconds
+            metrics.finish(
+                items_in=job.total_files,
+                items_out=transactions_count,
+                failed_files=job.failed_files,
+                data_points=result.parsed,
+                conflicts=result.conflicts,
+                first_output_s=first_categorized_seconds
+            )
 
-        for data_record in extracted_data:
-            try:
-                data_points = parser.parse_extracted_data(data_record, data_record.id)
-                all_data_points.extend(data_points)
-            except Exception as e:
-                logger.error(f"Error parsing {data_record.file_name}: {e}", exc_info=True)
-
-        logger.info(f"[{project_id}] Phase 2 complete: {len(all_data_points)} data points parsed")
-
-        # Phase 3: Process data points (deduplicate, detect conflicts, validate)
-        logger.info(f"[{project_id}] Phase 3: Processing data points (dedup, conflicts, validation)...")
-        mapper = create_data_point_mapper(db, project_id)
-        processed_points, conflicts = mapper.process_data_points(all_data_points)
-
-        logger.info(f"[{project_id}] Phase 3 complete: {len(processed_points)} data points processed, "
-                   f"{len(conflicts)} conflicts detected")
-
-        # Phase 4: Get validated data points for categorization
-        logger.info(f"[{project_id}] Phase 4: Retrieving validated data points...")
-        valid_data_points = mapper.get_data_points_for_processing()
-
-        # Convert data points to transaction format for categorization
-        transactions = []
-        for dp in valid_data_points:
-            transactions.append({
-                'description': dp.description,
-                'amount': dp.amount,
-                'vendor': dp.vendor or '',
-                'date': dp.transaction_date.isoformat() if dp.transaction_date else '',
-                'source_file': dp.source_file_name
+            # Categorization read the data points this run just produced
+            stage_inputs["data_points"] = _data_points_version(db, project_id)
+            fingerprints = stage_cache.fingerprints(stage_inputs)
+            stage_cache.record("extract", fingerprints["extract"], {
+                "total_files": job.total_files,
+                "failed_files": job.failed_files
             })
-
-        logger.info(f"[{project_id}] Phase 4 complete: {len(transactions)} transactions ready for categorization")
-
-        # Phase 5: Categorize transactions
-        logger.info(f"[{project_id}] Phase 5: Categorizing {len(transactions)} transactions...")
-        categorizer = create_categorizer(template_dict)
-        categorized_transactions = categorizer.categorize_batch(transactions, use_llm=False)
-
-        # Get summary statistics
-        summary = categorizer.get_category_summary(categorized_transactions)
-        logger.info(f"[{project_id}] Phase 5 complete: {summary['total_transactions']} categorized, "
-                   f"{summary['uncategorized_count']} uncategorized, "
-                   f"avg confidence {summary['average_confidence']:.2%}")
+            stage_cache.record("data_points", fingerprints["data_points"], {
+                "parsed": result.parsed,
+                "processed": result.processed,
+                "conflicts": result.conflicts
+            })
+            stage_cache.record("categorize", fingerprints["categorize"], {
+                "path": stage_cache.write_json("categorized.json", {
+                    "total_transactions": transactions_count,
+                    "categorized_transactions": categorized_transactions,
+                    "summary": summary
+                })
+            })
+            logger.info(f"[{project_id}] Phases 1-5 complete: {transactions_count} categorized, "
+                       f"first after {first_categorized_seconds}s")
+        else:
+            # Phase 1: Extract files
+            job = db.query(ExtractionJob).filter(ExtractionJob.job_id == job_id).first()
+            metrics.start("extract")
+            if "extract" in fresh:
+                cached = stage_cache.output("extract")
+                logger.info(f"[{project_id}] Phase 1: Files unchanged, skipping extraction")
+                job.status = JobStatus.COMPLETED
+                job.total_files = cached["total_files"]
+                job.processed_files = cached["total_files"]
+                job.failed_files = cached["failed_files"]
+                job.progress_percent = 100.0
+                db.commit()
+                bus.publish(
+                    channel, "phase",
+                    job_id=job_id,
+                    project_id=project_id,
+                    status=JobStatus.COMPLETED.value,
+                    phase="extraction_complete",
+                    cached=True,
+                    total_files=job.total_files,
+                    processed_files=job.processed_files,
+                    failed_files=job.failed_files,
+                    progress_percent=100.0
+                )
+                metrics.finish(items_in=job.total_files, cached=True)
+            else:
+                logger.info(f"[{project_id}] Phase 1: Extracting files...")
+                try:
+                    extractor.run_extraction(job_id, final=False, incremental=not force)
+
+                    # Wait for extraction to complete
+                    job = db.query(ExtractionJob).filter(ExtractionJob.job_id == job_id).first()
+                    if not job or job.status != JobStatus.COMPLETED:
+                        logger.error(f"[{project_id}] Extraction phase failed or incomplete")
+                        bus.publish(
+                            channel, "failed",
+                            status=JobStatus.FAILED.value,
+                            error_message="Extraction phase failed or incomplete"
+                        )
+                        return
+
+                    stage_cache.record("extract", fingerprints["extract"], {
+                        "total_files": job.total_files,
+                        "failed_files": job.failed_files
+                    })
+                    metrics.finish(
+                        items_in=job.total_files,
+                        items_out=job.total_files - job.failed_files,
+                        failed_files=job.failed_files
+                    )
+                    logger.info(f"[{project_id}] Phase 1 complete: {job.processed_files} files extracted")
+                except Exception as e:
+                    logger.error(f"[{project_id}] Phase 1 ERROR: {e}", exc_info=True)
+                    raise Exception(f"File extraction failed: {str(e)}")
+
+            # Phases 2-3: Parse extracted data into normalized data points, then
+            # deduplicate, detect conflicts and validate
+            from app.services.transaction_parser import create_transaction_parser
+            from app.services.data_point_mapper import create_data_point_mapper
+
+            mapper = create_data_point_mapper(db, project_id)
+
+            if "data_points" in fresh:
+                logger.info(f"[{project_id}] Phases 2-3: Extracted data unchanged, reusing data points")
+                bus.publish(channel, "phase", phase="processing_data_points", cached=True)
+                metrics.start("data_points")
+                metrics.finish(cached=True)
+            else:
+                metrics.start("parse")
+                logger.info(f"[{project_id}] Phase 2: Parsing extracted data into normalized data points...")
+                bus.publish(channel, "phase", phase="parsing")
+
+                # Only rows that haven't produced data points yet; rows of
+                # unchanged files were parsed by an earlier run
+                parsed_sources = select(DataPoint.source_file_id).where(
+                    DataPoint.project_id == project_id
+                )
+                extracted_data = db.query(ExtractedData).options(
+                    undefer_group("payload")
+                ).filter(
+                    ExtractedData.project_id == project_id,
+                    ExtractedData.extraction_status == "success",
+                    cast(ExtractedData.id, String).not_in(parsed_sources)
+                ).all()
+
+                # Parse each extracted file into data points
+                parser = create_transaction_parser(project_id)
+                all_data_points = []
+
+                for data_record in extracted_data:
+                    try:
+                        data_points = parser.parse_extracted_data(data_record, data_record.id)
+                        all_data_points.extend(data_points)
+                    except Exception as e:
+                        logger.error(f"Error parsing {data_record.file_name}: {e}", exc_info=True)
+
+                metrics.finish(items_in=len(extracted_data), items_out=len(all_data_points))
+                logger.info(f"[{project_id}] Phase 2 complete: {len(all_data_points)} data points parsed")
+
+                # Phase 3: Process data points (deduplicate, detect conflicts, validate)
+                logger.info(f"[{project_id}] Phase 3: Processing data points (dedup, conflicts, validation)...")
+                bus.publish(channel, "phase", phase="processing_data_points", data_points=len(all_data_points))
+                metrics.start("dedup")
+                processed_points, conflicts = mapper.process_data_points(all_data_points)
+                metrics.finish(
+                    items_in=len(all_data_points),
+                    items_out=len(processed_points),
+                    conflicts=len(conflicts)
+                )
+
+                stage_cache.record("data_points", fingerprints["data_points"], {
+                    "parsed": len(all_data_points),
+                    "processed": len(processed_points),
+                    "conflicts": len(conflicts)
+                })
+                logger.info(f"[{project_id}] Phase 3 complete: {len(processed_points)} data points processed, "
+                           f"{len(conflicts)} conflicts detected")
+
+            if "categorize" in fresh:
+                # Phases 4-5 unchanged: reuse categorized transactions
+                logger.info(f"[{project_id}] Phases 4-5: Inputs unchanged, reusing categorized transactions")
+                bus.publish(channel, "phase", phase="categorizing", cached=True)
+                metrics.start("categorize")
+                categorized_result = stage_cache.read_json(stage_cache.output("categorize")["path"])
+                transactions_count = categorized_result["total_transactions"]
+                categorized_transactions = categorized_result["categorized_transactions"]
+                summary = categorized_result["summary"]
+                metrics.finish(items_out=len(categorized_transactions), cached=True)
+            else:
+                metrics.start("categorize")
+                # Phase 4: Get validated data points for categorization
+                logger.info(f"[{project_id}] Phase 4: Retrieving validated data points...")
+                bus.publish(channel, "phase", phase="retrieving_validated")
+                valid_data_points = mapper.get_data_points_for_processing()
+
+                # Convert data points to transaction format for categorization
+                transactions = [data_point_transaction(dp) for dp in valid_data_points]
+
+                logger.info(f"[{project_id}] Phase 4 complete: {len(transactions)} transactions ready for categorization")
+
+                # Phase 5: Categorize transactions
+                logger.info(f"[{project_id}] Phase 5: Categorizing {len(transactions)} transactions...")
+                bus.publish(channel, "phase", phase="categorizing", transactions=len(transactions))
+                categorized_transactions = categorizer.categorize_batch(transactions, use_llm=False)
+
+                # Get summary statistics
+                summary = categorizer.get_category_summary(categorized_transactions)
+                transactions_count = len(transactions)
+                logger.info(f"[{project_id}] Phase 5 complete: {summary['total_transactions']} categorized, "
+                           f"{summary['uncategorized_count']} uncategorized, "
+                           f"avg confidence {summary['average_confidence']:.2%}")
+
+                # Phases 2-3 may have changed the data points since the run started
+                stage_inputs["data_points"] = _data_points_version(db, project_id)
+                fingerprints = stage_cache.fingerprints(stage_inputs)
+                stage_cache.record("categorize", fingerprints["categorize"], {
+                    "path": stage_cache.write_json("categorized.json", {
+                        "total_transactions": transactions_count,
+                        "categorized_transactions": categorized_transactions,
+                        "summary": summary
+                    })
+                })
+                metrics.finish(
+                    items_in=transactions_count,
+                    items_out=len(categorized_transactions),
+                    uncategorized=summary['uncategorized_count']
+                )
 
         # Phase 6: Populate Excel
-        logger.info(f"[{project_id}] Phase 6: Populating Excel financial model...")
-
-        # Prepare data for Excel
-        excel_data = {
-            'categorized_transactions': categorized_transactions,
-            'summary': summary
-        }
+        metrics.start("populate")
+        if "populate" in fresh:
+            excel_path = stage_cache.output("populate")["path"]
+            logger.info(f"[{project_id}] Phase 6: Inputs unchanged, reusing {excel_path}")
+            bus.publish(channel, "phase", phase="populating_excel", cached=True)
+            metrics.finish(cached=True)
+        else:
+            logger.info(f"[{project_id}] Phase 6: Populating Excel financial model...")
+            bus.publish(channel, "phase", phase="populating_excel")
+
+            # Prepare data for Excel
+            excel_data = {
+                'categorized_transactions': categorized_transactions,
+                'summary': summary
+            }
 
-        # Generate output path
-        # Use /tmp for cloud deployments (Render, etc.) where file system is ephemeral
-        base_dir = Path("/tmp") if os.getenv("RENDER") else Path("data")
-        output_dir = base_dir / "projects" / project_id / "output"
-        output_dir.mkdir(parents=True, exist_ok=True)
-        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-        output_path = output_dir / f"Financial_Model_{timestamp}.xlsx"
+            # Generate output path
+            output_dir = project_dir / "output"
+            output_dir.mkdir(parents=True, exist_ok=True)
+            timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+            output_path = output_dir / f"Financial_Model_{timestamp}.xlsx"
 
-        # Create Excel file with error handling
-        try:
-            populator = create_excel_populator()
-            excel_path = populator.create_financial_model(
-                excel_data,
-                str(output_path),
-                project_name=project_id
-            )
-            logger.info(f"[{project_id}] Phase 6 complete: Excel generated at {excel_path}")
-        except Exception as excel_error:
-            # Log the error but continue - we still have the categorized data
-            logger.error(f"[{project_id}] Excel generation error: {excel_error}", exc_info=True)
-            # Create a minimal Excel file as fallback
-            import openpyxl
-            wb = openpyxl.Workbook()
-            ws = wb.active
-            ws.title = "Summary"
-            ws['A1'] = "Financial Model Generation Partially Failed"
-            ws['A2'] = f"Error: {str(excel_error)}"
-            ws['A3'] = f"Total Transactions: {len(transactions)}"
-            ws['A4'] = f"Categorized: {len(categorized_transactions)}"
-            wb.save(str(output_path))
-            excel_path = str(output_path)
-            logger.info(f"[{project_id}] Fallback Excel created at {excel_path}")
+            # Create Excel file with error handling
+            try:
+                populator = create_excel_populator()
+                excel_path = populator.create_financial_model(
+                    excel_data,
+                    str(output_path),
+                    project_name=project_id
+                )
+                logger.info(f"[{project_id}] Phase 6 complete: Excel generated at {excel_path}")
+                stage_cache.record("populate", fingerprints["populate"], {"path": excel_path})
+            except Exception as excel_error:
+                # Log the error but continue - we still have the categorized data
+                logger.error(f"[{project_id}] Excel generation error: {excel_error}", exc_info=True)
+                # Create a minimal Excel file as fallback
+                import openpyxl
+                wb = openpyxl.Workbook()
+                ws = wb.active
+                ws.title = "Summary"
+                ws['A1'] = "Financial Model Generation Partially Failed"
+                ws['A2'] = f"Error: {str(excel_error)}"
+                ws['A3'] = f"Total Transactions: {transactions_count}"
+                ws['A4'] = f"Categorized: {len(categorized_transactions)}"
+                wb.save(str(output_path))
+                excel_path = str(output_path)
+                logger.info(f"[{project_id}] Fallback Excel created at {excel_path}")
+
+            metrics.finish(items_in=len(categorized_transactions))
 
         # Update job with final results
         job.status = JobStatus.COMPLETED
         job.job_metadata = json.dumps({
-            'total_transactions': len(transactions),
+            'total_transactions': transactions_count,
             'categorized': len(categorized_transactions),
             'uncategorized_count': summary['uncategorized_count'],
             'average_confidence': summary['average_confidence'],
             'excel_path': excel_path,
+            'stages': stage_results,
+            'mode': mode,
+            'first_categorized_seconds': first_categorized_seconds,
+            'metrics': metrics.close(),
             'pipeline_complete': True
         })
         db.commit()
 
+        bus.publish(channel, "completed", status=job.status.value, metadata=job.job_metadata)
         logger.info(f"[{project_id}] Full pipeline COMPLETE!")
 
     except Exception as e:
         logger.error(f"[{project_id}] Pipeline failed: {str(e)}", exc_info=True)
+        bus.publish(
+            channel, "failed",
+            status=JobStatus.FAILED.value,
+            error_message=f"Pipeline failed: {str(e)}"
+        )
         # Update job status to failed
         try:
             job = db.query(ExtractionJob).filter(ExtractionJob.job_id == job_id).first()
             if job:
                 job.status = JobStatus.FAILED
                 job.error_message = f"Pipeline failed: {str(e)}"
+                job.job_metadata = json.dumps({'metrics': metrics.close(failed=True)})
                 db.commit()
         except:
             pass
+    finally:
+        metrics.close()
 
 
 @router.get("/{project_id}/excel-data")
@@ -436,7 +1053,7 @@ async def get_excel_data(project_id: str):
     """
     try:
         from app.database import SessionLocal
-        import openpyxl
+        from app.services.workbook_reader import load_workbook
 
         db = SessionLocal()
 
@@ -466,8 +1083,8 @@ async def get_excel_data(project_id: str):
         if not file_path.exists():
             raise HTTPException(status_code=404, detail=f"Excel file not found: {excel_path}")
 
-        # Read Excel file and convert to JSON with formatting
-        wb = openpyxl.load_workbook(str(file_path), data_only=True)
+        # Read Excel file and convert to JSON with formatting (bold headers need styles)
+        wb = load_workbook(file_path, styles=True)
         excel_data = {}
 
         for sheet_name in wb.sheetnames:
@@ -626,9 +1243,10 @@ async def get_excel_data(project_id: str):
 
 
 @router.get("/{project_id}/download")
-async def download_excel(project_id: str):
+async def download_excel(request: Request, project_id: str):
     """
     Download the generated Excel financial model.
+    Supports Range requests and ETag/Last-Modified revalidation.
 
     Args:
         project_id: Project identifier
@@ -670,10 +1288,11 @@ async def download_excel(project_id: str):
             raise HTTPException(status_code=404, detail=f"Excel file not found: {excel_path}")
 
         # Return file
-        return FileResponse(
-            path=str(file_path),
-            filename=f"Financial_Model_{project_id}.xlsx",
-            media_type="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet"
+        return serve_file(
+            request,
+            file_path,
+            media_type="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
+            filename=f"Financial_Model_{project_id}.xlsx"
         )
 
     except HTTPException:
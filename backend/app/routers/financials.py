@@ -2,9 +2,10 @@
 Financial consolidation endpoints
 Serves AI-consolidated financial data to the dashboard
 """
-from fastapi import APIRouter, HTTPException, Depends
+from fastapi import APIRouter, HTTPException, Depends, Query, Response
 from app.routers.auth import get_current_user, User
-from typing import Dict, Any
+from app.pagination import decode_cursor, encode_cursor, parse_fields, project, set_next_cursor
+from typing import Dict, Any, Optional
 from pathlib import Path
 import json
 
@@ -54,17 +55,52 @@ async def get_consolidated_financials(
         raise HTTPException(status_code=500, detail=str(e))
 
 
+# Parsed classified_items.json, reused until the file changes on disk
+_line_items_cache: Dict[str, Any] = {}
+
+
+def _load_line_items(classified_file: Path) -> Dict[str, Any]:
+    """Load classified items once per file version (path + mtime)."""
+    mtime = classified_file.stat().st_mtime_ns
+    cached = _line_items_cache.get(str(classified_file))
+
+    if cached is None or cached["version"] != mtime:
+        with open(classified_file, 'r') as f:
+            data = json.load(f)
+
+        items = data.get("classified_items", [])
+        cached = {
+            "version": mtime,
+            "items": items,
+            "fields": list(dict.fromkeys(key for item in items for key in item))
+        }
+        _line_items_cache[str(classified_file)] = cached
+
+    return cached
+
+
 @router.get("/line-items")
 async def get_classified_line_items(
+    response: Response,
     project_id: str = "project-a-123-sunset-blvd",
-    limit: int = 100,
+    limit: int = Query(100, ge=1, le=5000),
+    cursor: Optional[str] = Query(None, description="next_cursor value from the previous page"),
+    fields: Optional[str] = Query(None, description="Comma-separated fields to return"),
     current_user: User = Depends(get_current_user)
 ) -> Dict[str, Any]:
     """
     Get classified line items with confidence scores
 
+    The cursor is positional: classified items carry no id or other unique
+    ordering column, so it records the offset into classified_items.json and
+    the file's version (mtime). Pages are slices of the cached list; a
+    cursor issued for an older version of the file gets 409 rather than a
+    shifted page.
+
     Args:
         limit: Maximum number of items to return (default 100)
+        cursor: Cursor returned with the previous page
+        fields: Optional projection (e.g. "description,confidence")
     """
     try:
         classified_file = Path(__file__).parent.parent.parent / "financial_consolidation" / "output" / "classified_items.json"
@@ -75,18 +111,35 @@ async def get_classified_line_items(
                 detail="Classified items not found"
             )
 
-        with open(classified_file, 'r') as f:
-            data = json.load(f)
-
-        items = data.get("classified_items", [])
-
+        cached = _load_line_items(classified_file)
+        items = cached["items"]
+        projection = parse_fields(fields, cached["fields"])
+
+        start = 0
+        after = decode_cursor(cursor)
+        if after:
+            if after.get("version") != cached["version"]:
+                raise HTTPException(
+                    status_code=409,
+                    detail="Line items changed since this cursor was issued; restart from the first page"
+                )
+            start = int(after.get("position", 0))
+
+        page = items[start:start + limit]
+        end = start + len(page)
+        next_cursor = encode_cursor({"position": end, "version": cached["version"]}) if end < len(items) else None
+
+        set_next_cursor(response, next_cursor)
         return {
             "project_id": project_id,
             "total_items": len(items),
-            "items": items[:limit],
-            "showing": min(limit, len(items))
+            "items": [project(item, projection) for item in page],
+            "showing": len(page),
+            "next_cursor": next_cursor
         }
 
+    except HTTPException:
+        raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
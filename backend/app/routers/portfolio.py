@@ -0,0 +1,187 @@
+"""
+Portfolio API Endpoints
+Runs the financial builder pipeline across every project and reports on
+the portfolio as a whole
+"""
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+from typing import Any, Dict, List, Optional, Tuple
+import asyncio
+import hashlib
+import logging
+
+from app.database import get_db, get_async_db
+from app.models.extraction import ExtractionJob
+from app.responses import dumps
+from app.routers.auth import User, get_current_user
+from app.services.dashboard_snapshot import DashboardSnapshotStore, get_dashboard_snapshots
+from app.services.portfolio_runner import PortfolioRun, discover_projects, get_portfolio_runner
+from app.services.project_registry import get_project_registry
+
+logger = logging.getLogger(__name__)
+
+router = APIRouter(prefix="/api/portfolio", tags=["portfolio"])
+
+
+async def _run_status(run: PortfolioRun, db: AsyncSession) -> Dict[str, Any]:
+    """Portfolio run state merged with the live progress of its jobs."""
+    status = run.to_dict()
+    job_ids = [project['job_id'] for project in status['projects'] if project['job_id']]
+
+    jobs = {}
+    if job_ids:
+        result = await db.execute(select(ExtractionJob).where(ExtractionJob.job_id.in_(job_ids)))
+        jobs = {job.job_id: job for job in result.scalars()}
+
+    total_files = 0
+    processed_files = 0
+    for project in status['projects']:
+        job = jobs.get(project['job_id'])
+        if job is None:
+            continue
+        project['job_status'] = job.status.value if job.status else None
+        project['progress_percent'] = job.progress_percent
+        project['processed_files'] = job.processed_files
+        project['failed_files'] = job.failed_files
+        if project['error'] is None and job.error_message:
+            project['error'] = job.error_message
+
+        total_files += project['total_files']
+        processed_files += min(job.processed_files or 0, project['total_files'])
+
+    status['total_files'] = total_files
+    status['processed_files'] = processed_files
+    status['progress_percent'] = round(processed_files / total_files * 100, 1) if total_files else 100.0
+    return status
+
+
+# KPIs summed across the portfolio
+_TOTAL_KPIS = ("total_costs_to_date", "forecast_final_cost", "revenue_leakage")
+
+
+def _project_summary(snapshots: DashboardSnapshotStore, project_id: str) -> Tuple[str, Dict[str, Any]]:
+    """ETag and compact summary of one project, from its (possibly rebuilt) dashboard snapshot."""
+    project = {"project_id": project_id, "project_name": project_id}
+    info = get_project_registry().project_info(project_id)
+    if info:
+        project["project_name"] = info.get("project_name", project_id)
+
+    try:
+        snapshot = snapshots.get(project_id)
+    except Exception as e:
+        logger.error(f"[{project_id}] Portfolio summary failed: {e}")
+        return f"error:{project_id}", {**project, "error": str(e)}
+
+    return snapshot.etag, {**project, "built_at": snapshot.built_at.isoformat(), **snapshot.summary}
+
+
+@router.get("/summary")
+async def get_portfolio_summary(request: Request, current_user: User = Depends(get_current_user)) -> Response:
+    """
+    KPIs, budget totals and critical-issue counts of every project in one payload.
+
+    Projects are summarized concurrently from their dashboard snapshots, so
+    only projects whose workbooks changed are re-read. The response carries
+    an ETag over every project's name and snapshot; a matching If-None-Match
+    gets 304.
+
+    Returns:
+        Per-project summaries (or errors) and portfolio totals
+    """
+    snapshots = get_dashboard_snapshots()
+    loop = asyncio.get_running_loop()
+    results = await asyncio.gather(*(
+        loop.run_in_executor(None, _project_summary, snapshots, project_id)
+        for project_id in discover_projects()
+    ))
+
+    # Snapshot ETags cover the KPIs; names come from project_info.json
+    tags = "|".join(f"{summary['project_id']}:{summary['project_name']}:{tag}" for tag, summary in results)
+    etag = '"' + hashlib.sha256(tags.encode()).hexdigest()[:32] + '"'
+    headers = {"ETag": etag, "Cache-Control": "private, no-cache", "Vary": "Authorization"}
+    if etag in [tag.strip() for tag in request.headers.get("if-none-match", "").split(",")]:
+        return Response(status_code=304, headers=headers)
+
+    projects = [summary for _, summary in results]
+    summarized = [project for project in projects if "error" not in project]
+    totals = {key: sum(project["kpis"][key] for project in summarized) for key in _TOTAL_KPIS}
+    totals["critical_issues"] = sum(project["critical_issues"]["total"] for project in summarized)
+
+    payload = {"total_projects": len(projects), "totals": totals, "projects": projects}
+    return Response(content=dumps(payload), media_type="application/json", headers=headers)
+
+
+@router.get("/projects")
+async def list_portfolio_projects(current_user: User = Depends(get_current_user)):
+    """Project IDs a portfolio run covers by default."""
+    return {"projects": discover_projects()}
+
+
+@router.post("/run")
+async def run_portfolio_pipeline(
+    project_ids: Optional[List[str]] = Query(None, description="Projects to run (default: all)"),
+    force: bool = Query(False, description="Ignore cached stage results and re-run every phase"),
+    streaming: bool = Query(False, description="Overlap extraction, parsing, dedup and categorization"),
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user)
+):
+    """
+    Run the full pipeline for every project (month-end close) on the shared worker pool.
+
+    Each project gets its own extraction job; at most PORTFOLIO_WORKERS
+    pipelines run at once and one project never takes more than one worker.
+
+    Args:
+        project_ids: Projects to include (default: every project with a data folder)
+        force: Re-run every stage even if its inputs are unchanged
+        streaming: Use the streaming pipeline for phases 1-5
+        db: Database session
+
+    Returns:
+        Portfolio run ID and the initial state of each project
+    """
+    if project_ids is None and not discover_projects():
+        raise HTTPException(status_code=404, detail="No projects found")
+
+    try:
+        run = get_portfolio_runner().start_run(db, project_ids, force=force, streaming=streaming)
+    except Exception as e:
+        logger.error(f"Portfolio run failed to start: {e}", exc_info=True)
+        raise HTTPException(status_code=500, detail=f"Portfolio run failed: {str(e)}")
+
+    return {"success": True, **run.to_dict()}
+
+
+@router.get("/runs")
+async def list_portfolio_runs(current_user: User = Depends(get_current_user)):
+    """Portfolio runs started since the server started, newest first."""
+    runner = get_portfolio_runner()
+    return {
+        "max_workers": runner.max_workers,
+        "runs": [
+            {key: value for key, value in run.to_dict().items() if key != 'projects'}
+            for run in runner.list_runs()
+        ]
+    }
+
+
+@router.get("/runs/{run_id}")
+async def get_portfolio_run(
+    run_id: str,
+    db: AsyncSession = Depends(get_async_db),
+    current_user: User = Depends(get_current_user)
+):
+    """
+    Consolidated status of a portfolio run.
+
+    Returns:
+        Run state, per-state project counts, overall file progress and each
+        project's job status and progress
+    """
+    run = get_portfolio_runner().get_run(run_id)
+    if run is None:
+        raise HTTPException(status_code=404, detail=f"Portfolio run {run_id} not found")
+
+    return await _run_status(run, db)
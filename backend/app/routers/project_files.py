@@ -1,60 +1,61 @@
 """
 API endpoint to get project file structure for the AI animation
 """
-import os
 from pathlib import Path
 from typing import List, Dict, Any
 from fastapi import APIRouter, HTTPException
 
-router = APIRouter(prefix="/api/projects", tags=["project-files"])
+from app.services.project_registry import FileEntry, get_project_registry
 
-PROJECTS_BASE_DIR = Path(__file__).parent.parent.parent / "projects"
+router = APIRouter(prefix="/api/projects", tags=["project-files"])
 
 
-def build_file_tree(directory: Path, relative_to: Path = None) -> Dict[str, Any]:
+def build_file_tree(entries: List[FileEntry]) -> Dict[str, Any]:
     """
-    Build a nested file tree structure from a directory.
+    Build a nested file tree structure from a data folder's registry entries.
 
     Returns FileNode structure compatible with AIDataMappingAnimation component.
     """
-    if relative_to is None:
-        relative_to = directory
-
-    # Get relative path for display
-    rel_path = str(directory.relative_to(relative_to)) if directory != relative_to else "/"
-
     result = {
-        "name": directory.name if directory != relative_to else "Project Files",
+        "name": "Project Files",
         "type": "folder",
-        "path": rel_path,
+        "path": "/",
         "isExpanded": True,
         "children": []
     }
-
-    try:
-        # Get all items in directory
-        items = sorted(directory.iterdir(), key=lambda x: (not x.is_dir(), x.name.lower()))
-
-        for item in items:
-            # Skip hidden files and __pycache__
-            if item.name.startswith('.') or item.name == '__pycache__':
-                continue
-
-            if item.is_dir():
-                # Recursively build tree for subdirectories
-                child_tree = build_file_tree(item, relative_to)
-                result["children"].append(child_tree)
-            else:
-                # Add file
-                file_type = get_file_type(item.suffix)
-                result["children"].append({
-                    "name": item.name,
-                    "type": file_type,
-                    "path": str(item.relative_to(relative_to))
-                })
-
-    except PermissionError:
-        pass  # Skip directories we can't read
+    folders = {(): result}
+
+    # Entries are sorted by path, so a folder comes before its contents
+    for entry in entries:
+        parts = entry.parts
+        # Skip hidden files and __pycache__ (and everything under them)
+        if any(part.startswith('.') or part == '__pycache__' for part in parts):
+            continue
+
+        parent = folders.get(parts[:-1])
+        if parent is None:
+            continue
+
+        if entry.is_dir:
+            node = {
+                "name": entry.name,
+                "type": "folder",
+                "path": entry.path,
+                "isExpanded": True,
+                "children": []
+            }
+            folders[parts] = node
+        else:
+            node = {
+                "name": entry.name,
+                "type": get_file_type(Path(entry.name).suffix),
+                "path": entry.path
+            }
+        parent["children"].append(node)
+
+    # Folders first, then by name
+    for folder in folders.values():
+        folder["children"].sort(key=lambda x: (x["type"] != "folder", x["name"].lower()))
 
     return result
 
@@ -89,27 +90,21 @@ async def get_project_file_structure(project_id: str):
     Returns a nested FileNode structure for the AI animation.
     """
     # Convert project_id to directory name (e.g., "proj_123" -> "project-123")
+    registry = get_project_registry()
     project_dir_name = project_id.replace('_', '-').lower()
-    project_path = PROJECTS_BASE_DIR / project_dir_name / "data"
 
-    if not project_path.exists():
+    if not registry.has_data(project_dir_name):
         # Try alternate format
-        project_path = PROJECTS_BASE_DIR / project_id / "data"
+        project_dir_name = project_id
 
-    if not project_path.exists():
+    if not registry.has_data(project_dir_name):
         raise HTTPException(
             status_code=404,
             detail=f"Project directory not found: {project_id}"
         )
 
-    if not project_path.is_dir():
-        raise HTTPException(
-            status_code=400,
-            detail=f"Path is not a directory: {project_id}"
-        )
-
     # Build the file tree
-    file_tree = build_file_tree(project_path)
+    file_tree = build_file_tree(registry.entries(project_dir_name))
 
     return {
         "project_id": project_id,
@@ -120,17 +115,14 @@ async def get_project_file_structure(project_id: str):
 @router.get("/list")
 async def list_available_projects():
     """List all available project directories."""
-    if not PROJECTS_BASE_DIR.exists():
-        return {"projects": []}
-
-    projects = []
-    for item in PROJECTS_BASE_DIR.iterdir():
-        if item.is_dir() and not item.name.startswith('.'):
-            data_dir = item / "data"
-            projects.append({
-                "id": item.name,
-                "name": item.name.replace('-', ' ').title(),
-                "has_data": data_dir.exists()
-            })
+    registry = get_project_registry()
+    projects = [
+        {
+            "id": project_id,
+            "name": project_id.replace('-', ' ').title(),
+            "has_data": registry.has_data(project_id)
+        }
+        for project_id in registry.all_project_ids()
+    ]
 
     return {"projects": projects}
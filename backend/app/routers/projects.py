@@ -1,14 +1,16 @@
 """
 Project data endpoints
 """
-from fastapi import APIRouter, HTTPException, Depends
+from fastapi import APIRouter, HTTPException, Depends, Query, Request, Response
 from app.services.excel_processor import ExcelProcessor
+from app.services.dashboard_snapshot import get_dashboard_snapshots
 from app.services.data_aggregator import DataAggregator
+from app.services.project_registry import get_project_registry
+from app.services.workbook_cache import get_workbook_cache, get_workbook_executor
 from app.models.schemas import DashboardData, HealthCheck
 from app.routers.auth import get_current_user, User
-from typing import Dict, Any, List
-from pathlib import Path
-import json
+from typing import Callable, Dict, Any, List
+import asyncio
 
 router = APIRouter(prefix="/api/projects", tags=["projects"])
 
@@ -16,24 +18,28 @@ router = APIRouter(prefix="/api/projects", tags=["projects"])
 data_aggregator = DataAggregator()
 
 
+async def read_workbooks(*readers: Callable[[], Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """
+    Run ExcelProcessor readers concurrently on the workbook thread pool.
+
+    Keeps the event loop free while workbooks are parsed; results come back
+    in the order the readers were given.
+    """
+    loop = asyncio.get_running_loop()
+    executor = get_workbook_executor()
+    return await asyncio.gather(*(loop.run_in_executor(executor, reader) for reader in readers))
+
+
+async def read_workbook(reader: Callable[[], Any]) -> Any:
+    """Run a single ExcelProcessor reader on the workbook thread pool."""
+    return await asyncio.get_running_loop().run_in_executor(get_workbook_executor(), reader)
+
+
 @router.get("/list")
 async def list_projects(current_user: User = Depends(get_current_user)) -> List[Dict[str, Any]]:
     """List all available projects"""
     try:
-        projects_dir = Path(__file__).parent.parent.parent / "projects"
-
-        if not projects_dir.exists():
-            return []
-
-        projects = []
-        for project_folder in projects_dir.iterdir():
-            if project_folder.is_dir():
-                project_info_file = project_folder / "project_info.json"
-
-                if project_info_file.exists():
-                    with open(project_info_file, 'r') as f:
-                        project_info = json.load(f)
-                        projects.append(project_info)
+        projects = get_project_registry().project_infos()
 
         # Sort by project name
         projects.sort(key=lambda x: x.get('project_name', ''))
@@ -44,6 +50,24 @@ async def list_projects(current_user: User = Depends(get_current_user)) -> List[
         raise HTTPException(status_code=500, detail=str(e))
 
 
+@router.get("/registry/changes")
+async def get_registry_changes(
+    since: int = Query(0, ge=0, description="Registry version from an earlier response"),
+    current_user: User = Depends(get_current_user)
+) -> Dict[str, Any]:
+    """
+    Project and file changes after a registry version.
+
+    Poll with the returned version to learn which projects and files were
+    added, modified or deleted since; reset=true means the changes are no
+    longer all kept and project lists and file trees should be reloaded.
+    """
+    try:
+        return get_project_registry().changes_since(since)
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+
 @router.get("/health", response_model=HealthCheck)
 async def health_check(
     project_id: str = "project-a-123-sunset-blvd",
@@ -51,7 +75,7 @@ async def health_check(
 ):
     """Check if backend is running and Excel files are accessible"""
     excel_processor = ExcelProcessor(project_id=project_id)
-    files = excel_processor.check_files_exist()
+    files = await read_workbook(excel_processor.check_files_exist)
     files_found = sum(1 for exists in files.values() if exists)
 
     return {
@@ -61,74 +85,51 @@ async def health_check(
     }
 
 
+@router.get("/cache-stats")
+async def get_cache_stats(current_user: User = Depends(get_current_user)) -> Dict[str, Any]:
+    """Hit/miss counts and size of the parsed workbook cache"""
+    return get_workbook_cache().stats()
+
+
 @router.get("/dashboard")
 async def get_dashboard_data(
+    request: Request,
     project_id: str = "project-a-123-sunset-blvd",
     current_user: User = Depends(get_current_user)
-) -> Dict[str, Any]:
+) -> Response:
     """
     Get complete dashboard data from Excel files for a specific project
     Returns KPIs, budget, subcontractors, payments, variations, defects, insights
+
+    Served from a precomputed snapshot that is rebuilt when the project's
+    workbooks change. Responses carry a strong ETag; clients sending it back
+    in If-None-Match get 304 Not Modified.
     """
     try:
-        # Initialize processor for this project
-        excel_processor = ExcelProcessor(project_id=project_id)
-
-        # Read all Excel files
-        print(f"Reading Excel files for project: {project_id}")
-
-        budget_data = excel_processor.read_budget_file()
-        budget_items = budget_data.get("items", [])
-
-        subcontractor_data = excel_processor.read_subcontractors()
-        subcontractors = subcontractor_data.get("subcontractors", [])
-        payments = subcontractor_data.get("payments", [])
-
-        client_data = excel_processor.read_client_payments()
-        milestones = client_data.get("milestones", [])
-        variations = client_data.get("variations", [])
-
-        defects_data = excel_processor.read_defects()
-        defects = defects_data.get("defects", [])
+        snapshots = get_dashboard_snapshots()
+        snapshot = snapshots.current(project_id)
+        if snapshot is None:
+            loop = asyncio.get_running_loop()
+            snapshot = await loop.run_in_executor(None, snapshots.get, project_id)
+    except Exception as e:
+        print(f"Error in get_dashboard_data: {e}")
+        raise HTTPException(status_code=500, detail=f"Error reading Excel files: {str(e)}")
 
-        # Calculate KPIs and aggregations
-        kpis = data_aggregator.calculate_kpis(budget_items, variations)
-        budget_summary = data_aggregator.get_budget_summary(budget_items)
-        critical_issues = data_aggregator.identify_critical_issues(
-            payments, milestones, defects, variations
-        )
-        cashflow = data_aggregator.get_cashflow_forecast(budget_items, milestones, variations)
-        insights = data_aggregator.generate_insights(
-            budget_items, subcontractors, payments, milestones, variations, defects
-        )
+    headers = {
+        "ETag": snapshot.etag,
+        "Cache-Control": "private, no-cache",  # Always revalidate; revalidation is a 304
+        "Vary": "Accept-Encoding, Authorization",
+    }
 
-        print(f"Dashboard data prepared:")
-        print(f"  - Budget items: {len(budget_items)}")
-        print(f"  - Subcontractors: {len(subcontractors)}")
-        print(f"  - Payments: {len(payments)}")
-        print(f"  - Milestones: {len(milestones)}")
-        print(f"  - Variations: {len(variations)}")
-        print(f"  - Defects: {len(defects)}")
-        print(f"  - Critical issues: {len(critical_issues)}")
-        print(f"  - Insights: {len(insights)}")
+    if_none_match = request.headers.get("if-none-match", "")
+    if snapshot.etag in [tag.strip() for tag in if_none_match.split(",")] or if_none_match.strip() == "*":
+        return Response(status_code=304, headers=headers)
 
-        return {
-            "kpis": kpis,
-            "budget_summary": budget_summary,
-            "budget_items": budget_items[:20],  # Limit to first 20 for initial load
-            "subcontractors": subcontractors,
-            "payments": payments,
-            "milestones": milestones,
-            "variations": variations,
-            "defects": defects,
-            "critical_issues": critical_issues,
-            "cashflow": cashflow,
-            "insights": insights
-        }
+    if "gzip" in request.headers.get("accept-encoding", "").lower():
+        headers["Content-Encoding"] = "gzip"
+        return Response(content=snapshot.gzip_body, media_type="application/json", headers=headers)
 
-    except Exception as e:
-        print(f"Error in get_dashboard_data: {e}")
-        raise HTTPException(status_code=500, detail=f"Error reading Excel files: {str(e)}")
+    return Response(content=snapshot.body, media_type="application/json", headers=headers)
 
 
 @router.get("/budget")
@@ -139,7 +140,7 @@ async def get_budget_data(
     """Get budget data for a specific project"""
     try:
         excel_processor = ExcelProcessor(project_id=project_id)
-        budget_data = excel_processor.read_budget_file()
+        budget_data = await read_workbook(excel_processor.read_budget_file)
         budget_items = budget_data.get("items", [])
         budget_summary = data_aggregator.get_budget_summary(budget_items)
 
@@ -159,7 +160,7 @@ async def get_subcontractors(
     """Get subcontractor data"""
     try:
         excel_processor = ExcelProcessor(project_id=project_id)
-        return excel_processor.read_subcontractors()
+        return await read_workbook(excel_processor.read_subcontractors)
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
@@ -172,7 +173,7 @@ async def get_client_payments(
     """Get client payment data"""
     try:
         excel_processor = ExcelProcessor(project_id=project_id)
-        return excel_processor.read_client_payments()
+        return await read_workbook(excel_processor.read_client_payments)
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
@@ -185,7 +186,7 @@ async def get_defects(
     """Get defects data"""
     try:
         excel_processor = ExcelProcessor(project_id=project_id)
-        return excel_processor.read_defects()
+        return await read_workbook(excel_processor.read_defects)
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
@@ -198,7 +199,7 @@ async def get_timesheets(
     """Get timesheet data"""
     try:
         excel_processor = ExcelProcessor(project_id=project_id)
-        return excel_processor.read_timesheets()
+        return await read_workbook(excel_processor.read_timesheets)
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
@@ -211,7 +212,7 @@ async def get_purchase_orders(
     """Get purchase orders data"""
     try:
         excel_processor = ExcelProcessor(project_id=project_id)
-        return excel_processor.read_purchase_orders()
+        return await read_workbook(excel_processor.read_purchase_orders)
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
@@ -226,10 +227,12 @@ async def get_cashflow(
     try:
         excel_processor = ExcelProcessor(project_id=project_id)
 
-        budget_data = excel_processor.read_budget_file()
+        budget_data, client_data = await read_workbooks(
+            excel_processor.read_budget_file,
+            excel_processor.read_client_payments
+        )
         budget_items = budget_data.get("items", [])
 
-        client_data = excel_processor.read_client_payments()
         milestones = client_data.get("milestones", [])
         variations = client_data.get("variations", [])
 
@@ -249,18 +252,20 @@ async def get_insights(
         excel_processor = ExcelProcessor(project_id=project_id)
 
         # Read all Excel files
-        budget_data = excel_processor.read_budget_file()
+        budget_data, subcontractor_data, client_data, defects_data = await read_workbooks(
+            excel_processor.read_budget_file,
+            excel_processor.read_subcontractors,
+            excel_processor.read_client_payments,
+            excel_processor.read_defects
+        )
         budget_items = budget_data.get("items", [])
 
-        subcontractor_data = excel_processor.read_subcontractors()
         subcontractors = subcontractor_data.get("subcontractors", [])
         payments = subcontractor_data.get("payments", [])
 
-        client_data = excel_processor.read_client_payments()
         milestones = client_data.get("milestones", [])
         variations = client_data.get("variations", [])
 
-        defects_data = excel_processor.read_defects()
         defects = defects_data.get("defects", [])
 
         insights = data_aggregator.generate_insights(
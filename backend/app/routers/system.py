@@ -237,6 +237,11 @@ async def system_metrics(
     webhook_handler = get_webhook_handler()
     webhook_stats = webhook_handler.get_statistics()
 
+    from app.services.workbook_cache import get_workbook_cache
+    from app.services.document_viewer import get_viewer_cache
+    workbook_cache_stats = get_workbook_cache().stats()
+    viewer_cache_stats = get_viewer_cache().stats()
+
     return {
         "timestamp": datetime.now().isoformat(),
         "resources": {
@@ -251,7 +256,9 @@ async def system_metrics(
                 "active_jobs": len([j for j in jobs if j["status"] == "running"])
             },
             "email": email_stats,
-            "webhooks": webhook_stats
+            "webhooks": webhook_stats,
+            "workbook_cache": workbook_cache_stats,
+            "document_viewer_cache": viewer_cache_stats
         }
     }
 
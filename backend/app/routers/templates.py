@@ -3,8 +3,8 @@ Template Population API
 
 Endpoints for generating populated Excel templates from aggregated financial data.
 """
-from fastapi import APIRouter, Depends, HTTPException, BackgroundTasks
-from fastapi.responses import FileResponse
+from fastapi import APIRouter, Depends, HTTPException, BackgroundTasks, Request
+from fastapi.responses import StreamingResponse
 from pydantic import BaseModel
 from typing import Optional, Dict, Any
 from pathlib import Path
@@ -12,16 +12,16 @@ import logging
 from datetime import datetime
 import json
 
-from app.auth_utils import get_current_user
+from app.auth_utils import get_current_user, get_stream_user
+from app.file_serving import serve_file
 from app.services.template_populator import TemplatePopulator, populate_template_from_aggregation
+from app.services.progress_bus import SSE_HEADERS, event_stream, get_progress_bus, template_channel
 
 logger = logging.getLogger(__name__)
 
-router = APIRouter(
-    prefix="/api/templates",
-    tags=["templates"],
-    dependencies=[Depends(get_current_user)]
-)
+# Each route authenticates itself: the events stream takes its token from
+# the query string, which a router-wide header dependency would reject
+router = APIRouter(prefix="/api/templates", tags=["templates"])
 
 # In-memory storage for template generation jobs (replace with Redis in production)
 template_jobs = {}
@@ -95,6 +95,7 @@ async def populate_template(
             "started_at": datetime.now().isoformat(),
             "user": user.get("email", "unknown")
         }
+        get_progress_bus().publish(template_channel(job_id), "phase", job_id=job_id, **template_jobs[job_id])
 
         # Populate template in background
         background_tasks.add_task(
@@ -141,6 +142,7 @@ def _populate_template_background(
             "completed_at": datetime.now().isoformat(),
             "output_path": output_path
         })
+        get_progress_bus().publish(template_channel(job_id), "completed", **template_jobs[job_id])
 
         logger.info(f"✅ Template population job {job_id} completed: {output_path}")
 
@@ -151,6 +153,7 @@ def _populate_template_background(
             "completed_at": datetime.now().isoformat(),
             "error": str(e)
         })
+        get_progress_bus().publish(template_channel(job_id), "failed", **template_jobs[job_id])
 
 
 @router.get("/jobs/{job_id}")
@@ -164,10 +167,37 @@ async def get_job_status(job_id: str, user: dict = Depends(get_current_user)):
     return template_jobs[job_id]
 
 
+@router.get("/jobs/{job_id}/events")
+async def stream_job_events(job_id: str, user: dict = Depends(get_stream_user)):
+    """
+    Stream template population progress as Server-Sent Events.
+
+    EventSource clients pass their access token as the `token` query parameter.
+    """
+    if job_id not in template_jobs:
+        raise HTTPException(status_code=404, detail="Job not found")
+
+    job = template_jobs[job_id]
+    status = job.get("status")
+    snapshot = get_progress_bus().snapshot(template_channel(job_id)) or {
+        "event": status if status in ("completed", "failed") else "snapshot",
+        "seq": 0,
+        "job_id": job_id,
+        **job
+    }
+
+    return StreamingResponse(
+        event_stream(template_channel(job_id), initial=[snapshot]),
+        media_type="text/event-stream",
+        headers=SSE_HEADERS
+    )
+
+
 @router.get("/download/{job_id}")
-async def download_template(job_id: str, user: dict = Depends(get_current_user)):
+async def download_template(request: Request, job_id: str, user: dict = Depends(get_current_user)):
     """
     Download a populated template.
+    Supports Range requests and ETag/Last-Modified revalidation.
     """
     if job_id not in template_jobs:
         raise HTTPException(status_code=404, detail="Job not found")
@@ -185,8 +215,9 @@ async def download_template(job_id: str, user: dict = Depends(get_current_user))
     if not output_path.exists():
         raise HTTPException(status_code=404, detail="Template file not found")
 
-    return FileResponse(
-        path=output_path,
+    return serve_file(
+        request,
+        output_path,
         media_type="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
         filename=output_path.name
     )
@@ -8,11 +8,15 @@ import sys
 from pathlib import Path
 sys.path.append(str(Path(__file__).parent.parent.parent))
 
-from fastapi import APIRouter, Depends, HTTPException, Request, Query, Header
+from fastapi import APIRouter, Depends, HTTPException, Request, Query, Header, Response
+from fastapi.responses import JSONResponse
 from typing import List, Optional, Dict, Any
 from pydantic import BaseModel
 
 from app.auth_utils import get_current_user
+from app.pagination import (
+    NEXT_CURSOR_HEADER, decode_cursor, encode_cursor, parse_fields, project, set_next_cursor
+)
 from cloud_webhooks.webhook_handler import get_webhook_handler
 
 router = APIRouter(prefix="/api/webhooks", tags=["webhooks"])
@@ -28,6 +32,7 @@ class WebhookEvent(BaseModel):
     provider: str
     event_type: str
     data: Dict[str, Any]
+    sequence: int
 
 
 class WebhookStatistics(BaseModel):
@@ -184,18 +189,42 @@ async def onedrive_webhook(
 
 @router.get("/events", response_model=List[WebhookEvent])
 async def list_webhook_events(
+    response: Response,
     provider: Optional[str] = Query(None, description="Filter by provider (dropbox, google_drive, onedrive)"),
     limit: int = Query(100, ge=1, le=1000, description="Maximum number of events to return"),
+    cursor: Optional[str] = Query(None, description="X-Next-Cursor value from the previous page (older events)"),
+    fields: Optional[str] = Query(None, description="Comma-separated fields to return"),
     user: dict = Depends(get_current_user)
 ):
     """
     List webhook events.
 
-    Returns history of received webhook notifications.
+    Returns history of received webhook notifications. Each page holds the
+    most recent events older than the cursor; X-Next-Cursor points to the
+    next older page.
     """
+    projection = parse_fields(fields, WebhookEvent.model_fields)
+    after = decode_cursor(cursor)
+
     handler = get_webhook_handler()
-    events = handler.get_events(provider=provider, limit=limit)
+    events, has_more = handler.get_events_page(
+        provider=provider,
+        limit=limit,
+        before=after.get("timestamp") if after else None,
+        before_sequence=after.get("sequence") if after else None
+    )
+
+    next_cursor = None
+    if has_more and events:
+        next_cursor = encode_cursor({"timestamp": events[0]["timestamp"], "sequence": events[0]["sequence"]})
+
+    if projection:
+        return JSONResponse(
+            content=[project(event, projection) for event in events],
+            headers={NEXT_CURSOR_HEADER: next_cursor} if next_cursor else None
+        )
 
+    set_next_cursor(response, next_cursor)
     return [WebhookEvent(**event) for event in events]
 
 
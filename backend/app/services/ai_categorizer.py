@@ -7,6 +7,7 @@ using keyword matching and LLM-based classification.
 
 import os
 import json
+import hashlib
 import logging
 from typing import List, Dict, Any, Optional, Tuple
 from pathlib import Path
@@ -121,6 +122,19 @@ class AICategorizer:
 
         return keyword_map
 
+    def keyword_map_version(self) -> str:
+        """
+        Hash of the categories and keyword map.
+
+        Used by the pipeline stage cache to tell whether categorized results
+        from a previous run are still valid.
+        """
+        payload = json.dumps({
+            'categories': self.categories,
+            'keyword_map': self.keyword_map
+        }, sort_keys=True)
+        return hashlib.sha256(payload.encode()).hexdigest()
+
     def categorize_transaction(
         self,
         description: str,
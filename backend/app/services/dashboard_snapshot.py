@@ -0,0 +1,266 @@
+"""
+Dashboard Snapshots
+
+Precomputed /api/projects/dashboard responses. A project's snapshot is the
+serialized dashboard JSON (plus a gzip copy and a strong ETag), built from
+its source workbooks and rebuilt only when one of them changes (mtime or
+size) or the day rolls over (the cashflow forecast is dated from today).
+
+Snapshots are kept fresh two ways:
+- A background materializer polls the source workbooks of every project
+  every DASHBOARD_SNAPSHOT_POLL_SECONDS and rebuilds changed snapshots, so
+  requests usually find one ready.
+- A request re-checks the workbook stats (a few stat calls) and rebuilds
+  inline if the materializer hasn't caught up yet.
+
+Unchanged clients get a 304 from the ETag, so a wallboard refreshing every
+30 seconds costs a handful of stat calls per refresh.
+
+Each snapshot also keeps a compact summary (KPIs, budget totals and
+critical-issue counts) that the portfolio overview serves for every
+project at once.
+"""
+
+import gzip
+import hashlib
+import logging
+import threading
+from dataclasses import dataclass
+from datetime import date, datetime
+from typing import Any, Callable, Dict, Optional, Tuple
+
+import pandas as pd
+
+from app.config import get_config
+from app.responses import dumps
+from app.services.data_aggregator import DataAggregator
+from app.services.excel_processor import (
+    BUDGET_FILE,
+    CLIENT_PAYMENTS_FILE,
+    DEFECTS_FILE,
+    SUBCONTRACTORS_FILE,
+    ExcelProcessor,
+    records,
+)
+from app.services.portfolio_runner import discover_projects
+from app.services.workbook_cache import get_workbook_executor
+
+logger = logging.getLogger(__name__)
+
+# Workbooks the dashboard is computed from
+SOURCE_FILES = (BUDGET_FILE, SUBCONTRACTORS_FILE, CLIENT_PAYMENTS_FILE, DEFECTS_FILE)
+
+
+@dataclass
+class DashboardSnapshot:
+    """Serialized dashboard of one project."""
+    project_id: str
+    version: Tuple[Any, ...]
+    body: bytes
+    gzip_body: bytes
+    etag: str
+    built_at: datetime
+    summary: Dict[str, Any]
+
+
+def source_version(project_id: str) -> Tuple[Any, ...]:
+    """Identity of a project's dashboard inputs: workbook stats and today's date."""
+    base_dir = ExcelProcessor.data_dir(project_id)
+    stats = []
+    for relative_path in SOURCE_FILES:
+        try:
+            stat = (base_dir / relative_path).stat()
+            stats.append((stat.st_mtime_ns, stat.st_size))
+        except OSError:
+            stats.append(None)
+    return (date.today().isoformat(), *stats)
+
+
+def _read_frames(project_id: str, reader: Callable[[], Any], count: int = 1) -> Any:
+    """Result of an ExcelProcessor frame reader, or empty frames if it fails."""
+    try:
+        return reader()
+    except FileNotFoundError as e:
+        logger.debug(f"[{project_id}] Dashboard workbook missing: {e}")
+    except Exception as e:
+        logger.warning(f"[{project_id}] Dashboard workbook unreadable ({reader.__name__}): {e}")
+    return pd.DataFrame() if count == 1 else tuple(pd.DataFrame() for _ in range(count))
+
+
+def build_dashboard(project_id: str) -> Dict[str, Any]:
+    """Read a project's workbooks and compute the dashboard payload."""
+    excel_processor = ExcelProcessor(project_id=project_id)
+    aggregator = DataAggregator()
+
+    # Reads go through the workbook cache and run concurrently
+    executor = get_workbook_executor()
+    budget_future = executor.submit(_read_frames, project_id, excel_processor.budget_frame)
+    subcontractor_future = executor.submit(_read_frames, project_id, excel_processor.subcontractor_frames, 2)
+    client_future = executor.submit(_read_frames, project_id, excel_processor.client_payment_frames, 2)
+    defects_future = executor.submit(_read_frames, project_id, excel_processor.defects_frame)
+
+    # Aggregations run on the frames; rows become dicts only for the response
+    budget_items = budget_future.result()
+    subcontractors, payments = subcontractor_future.result()
+    milestones, variations = client_future.result()
+    defects = defects_future.result()
+
+    # Calculate KPIs and aggregations
+    kpis = aggregator.calculate_kpis(budget_items, variations)
+    budget_summary = aggregator.get_budget_summary(budget_items)
+    critical_issues = aggregator.identify_critical_issues(payments, milestones, defects, variations)
+    cashflow = aggregator.get_cashflow_forecast(budget_items, milestones, variations)
+    insights = aggregator.generate_insights(
+        budget_items, subcontractors, payments, milestones, variations, defects
+    )
+
+    logger.info(
+        f"[{project_id}] Dashboard built: {len(budget_items)} budget items, "
+        f"{len(subcontractors)} subcontractors, {len(payments)} payments, "
+        f"{len(milestones)} milestones, {len(variations)} variations, {len(defects)} defects, "
+        f"{len(critical_issues)} critical issues, {len(insights)} insights"
+    )
+
+    return {
+        "kpis": kpis,
+        "budget_summary": budget_summary,
+        "budget_items": records(budget_items.head(20)),  # Limit to first 20 for initial load
+        "subcontractors": records(subcontractors),
+        "payments": records(payments),
+        "milestones": records(milestones),
+        "variations": records(variations),
+        "defects": records(defects),
+        "critical_issues": critical_issues,
+        "cashflow": cashflow,
+        "insights": insights
+    }
+
+
+def summarize_dashboard(dashboard: Dict[str, Any]) -> Dict[str, Any]:
+    """Compact portfolio view of a dashboard: KPIs, budget totals and issue counts."""
+    issues = dashboard["critical_issues"]
+    by_severity: Dict[str, int] = {}
+    for issue in issues:
+        by_severity[issue["severity"]] = by_severity.get(issue["severity"], 0) + 1
+
+    return {
+        "kpis": dashboard["kpis"],
+        "budget_summary": {
+            key: value for key, value in dashboard["budget_summary"].items() if key != "categories"
+        },
+        "critical_issues": {
+            "total": len(issues),
+            "by_severity": by_severity,
+            "by_type": {issue["type"]: issue.get("count", 1) for issue in issues},
+        },
+    }
+
+
+class DashboardSnapshotStore:
+    """Per-project dashboard snapshots plus the background materializer."""
+
+    def __init__(self, poll_seconds: float = 10.0):
+        self.poll_seconds = poll_seconds
+        self._snapshots: Dict[str, DashboardSnapshot] = {}
+        self._lock = threading.Lock()
+        self._build_locks: Dict[str, threading.Lock] = {}
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self.builds = 0
+
+    def current(self, project_id: str) -> Optional[DashboardSnapshot]:
+        """Snapshot of a project if it matches its inputs (only stats the workbooks)."""
+        snapshot = self._snapshots.get(project_id)
+        if snapshot is not None and snapshot.version == source_version(project_id):
+            return snapshot
+        return None
+
+    def get(self, project_id: str) -> DashboardSnapshot:
+        """Current snapshot of a project, rebuilt first if its inputs changed."""
+        return self.current(project_id) or self.refresh(project_id)
+
+    def refresh(self, project_id: str, version: Optional[Tuple[Any, ...]] = None) -> DashboardSnapshot:
+        """Rebuild a project's snapshot unless an up-to-date one exists."""
+        with self._lock:
+            build_lock = self._build_locks.setdefault(project_id, threading.Lock())
+
+        # Concurrent requests for a stale project wait for one rebuild
+        with build_lock:
+            try:
+                version = version or source_version(project_id)
+                snapshot = self._snapshots.get(project_id)
+                if snapshot is not None and snapshot.version == version:
+                    return snapshot
+
+                dashboard = build_dashboard(project_id)
+                body = dumps(dashboard)
+                snapshot = DashboardSnapshot(
+                    project_id=project_id,
+                    version=version,
+                    body=body,
+                    gzip_body=gzip.compress(body, compresslevel=6),
+                    etag=f'"{hashlib.sha256(body).hexdigest()[:32]}"',
+                    built_at=datetime.now(),
+                    summary=summarize_dashboard(dashboard),
+                )
+                with self._lock:
+                    self.builds += 1
+                    # Unknown project IDs (no data folder or workbooks) aren't kept
+                    if any(version[1:]) or ExcelProcessor.data_dir(project_id).is_dir():
+                        self._snapshots[project_id] = snapshot
+                return snapshot
+            finally:
+                with self._lock:
+                    # Only projects with a kept snapshot keep their build lock
+                    if project_id not in self._snapshots:
+                        self._build_locks.pop(project_id, None)
+
+    def start(self):
+        """Start the background materializer thread."""
+        if self._thread is not None or self.poll_seconds <= 0:
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="dashboard-materializer", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout=5.0)
+            self._thread = None
+
+    def _run(self):
+        while not self._stop.is_set():
+            for project_id in discover_projects():
+                if self._stop.is_set():
+                    break
+                try:
+                    version = source_version(project_id)
+                    snapshot = self._snapshots.get(project_id)
+                    if snapshot is None or snapshot.version != version:
+                        self.refresh(project_id, version)
+                except Exception as e:
+                    logger.error(f"[{project_id}] Dashboard snapshot rebuild failed: {e}")
+            self._stop.wait(self.poll_seconds)
+
+
+_store: Optional[DashboardSnapshotStore] = None
+_store_lock = threading.Lock()
+
+
+def get_dashboard_snapshots() -> DashboardSnapshotStore:
+    """Get or create the dashboard snapshot store singleton."""
+    global _store
+    with _store_lock:
+        if _store is None:
+            _store = DashboardSnapshotStore(get_config().dashboard_snapshot_poll_seconds)
+        return _store
+
+
+def shutdown_dashboard_snapshots():
+    """Stop the background materializer."""
+    global _store
+    with _store_lock:
+        store, _store = _store, None
+    if store is not None:
+        store.stop()
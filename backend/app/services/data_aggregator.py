@@ -1,38 +1,70 @@
 """
 Data aggregation service
 Calculate KPIs and aggregate data from Excel files
+
+Inputs are reader rows (lists of dicts) or the ExcelProcessor frames;
+totals and issue detection run as column sums and boolean masks, and
+results are native Python numbers.
 """
-from typing import Dict, List, Any
+from typing import Dict, List, Any, Sequence, Union
+
+import pandas as pd
+
+Rows = Union[List[Dict], pd.DataFrame]
+
+BUDGET_COLUMNS = ('category', 'budget', 'actual_spent', 'committed', 'forecast', 'variance', 'percent_complete')
+VARIATION_COLUMNS = ('client_price', 'status', 'invoiced')
+
+
+def _frame(rows: Rows, columns: Sequence[str]) -> pd.DataFrame:
+    """Rows as a DataFrame with at least the given columns."""
+    df = rows if isinstance(rows, pd.DataFrame) else pd.DataFrame(rows)
+    missing = [col for col in columns if col not in df.columns]
+    if missing:
+        df = df.assign(**{col: pd.Series(dtype=object, index=df.index) for col in missing})
+    return df
+
+
+def _total(series: pd.Series) -> float:
+    return series.sum().item() if len(series) else 0
+
+
+def _mean(series: pd.Series) -> float:
+    return series.mean().item() if len(series) else 0
+
+
+def _is(series: pd.Series, *values: str) -> pd.Series:
+    """Mask of cells equal to one of values, ignoring case."""
+    return series.astype(object).map(str).str.upper().isin(values)
+
+
+def _uninvoiced(variations: pd.DataFrame) -> pd.Series:
+    """Approved variations not yet invoiced (revenue leakage)."""
+    return _is(variations['status'], 'APPROVED') & _is(variations['invoiced'], 'NO')
 
 
 class DataAggregator:
     """Aggregate and calculate KPIs from Excel data"""
 
     @staticmethod
-    def calculate_kpis(budget_items: List[Dict], variations: List[Dict]) -> Dict[str, Any]:
+    def calculate_kpis(budget_items: Rows, variations: Rows) -> Dict[str, Any]:
         """Calculate dashboard KPIs"""
+        budget = _frame(budget_items, BUDGET_COLUMNS)
+        variations = _frame(variations, VARIATION_COLUMNS)
 
         # Calculate totals from budget
         total_budget = 650000  # Contract value
-        total_spent = sum(item['actual_spent'] for item in budget_items)
-        total_committed = sum(item['committed'] for item in budget_items)
-        total_forecast = sum(item['forecast'] for item in budget_items)
-        total_variance = sum(item['variance'] for item in budget_items)
+        total_spent = _total(budget['actual_spent'])
+        total_forecast = _total(budget['forecast'])
 
         # Calculate projected profit
         projected_profit = total_budget - total_forecast
 
         # Calculate overall completion percentage
-        if budget_items:
-            overall_completion = sum(item['percent_complete'] for item in budget_items) / len(budget_items)
-        else:
-            overall_completion = 0
+        overall_completion = _mean(budget['percent_complete'])
 
         # Calculate revenue leakage from uninvoiced variations
-        revenue_leakage = sum(
-            var['client_price'] for var in variations
-            if var['status'].upper() == 'APPROVED' and var['invoiced'].upper() == 'NO'
-        )
+        revenue_leakage = _total(variations.loc[_uninvoiced(variations), 'client_price'])
 
         return {
             "project_name": "Project A - 123 Sunset Boulevard",
@@ -47,63 +79,51 @@ class DataAggregator:
         }
 
     @staticmethod
-    def get_budget_summary(budget_items: List[Dict]) -> Dict[str, Any]:
+    def get_budget_summary(budget_items: Rows) -> Dict[str, Any]:
         """Generate budget summary with category breakdowns"""
-
-        total_budget = sum(item['budget'] for item in budget_items)
-        total_spent = sum(item['actual_spent'] for item in budget_items)
-        total_committed = sum(item['committed'] for item in budget_items)
-        total_forecast = sum(item['forecast'] for item in budget_items)
-        total_variance = sum(item['variance'] for item in budget_items)
-
-        # Group by category
-        categories = {}
-        for item in budget_items:
-            cat = item['category']
-            if cat not in categories:
-                categories[cat] = {
-                    "category": cat,
-                    "budget": 0,
-                    "actual": 0,
-                    "forecast": 0,
-                    "variance": 0
-                }
-            categories[cat]["budget"] += item['budget']
-            categories[cat]["actual"] += item['actual_spent']
-            categories[cat]["forecast"] += item['forecast']
-            categories[cat]["variance"] += item['variance']
+        budget = _frame(budget_items, BUDGET_COLUMNS)
+
+        # Group by category, in order of first appearance
+        categories = (
+            budget[['category', 'budget', 'actual_spent', 'forecast', 'variance']]
+            .rename(columns={'actual_spent': 'actual'})
+            .groupby('category', sort=False, dropna=False)
+            .sum()
+            .reset_index()
+        )
 
         # Calculate overall completion
-        if budget_items:
-            overall_percent = sum(item['percent_complete'] for item in budget_items) / len(budget_items)
-        else:
-            overall_percent = 0
+        overall_percent = _mean(budget['percent_complete'])
 
         return {
-            "total_budget": total_budget,
-            "total_spent": total_spent,
-            "total_committed": total_committed,
-            "total_forecast": total_forecast,
-            "total_variance": total_variance,
+            "total_budget": _total(budget['budget']),
+            "total_spent": _total(budget['actual_spent']),
+            "total_committed": _total(budget['committed']),
+            "total_forecast": _total(budget['forecast']),
+            "total_variance": _total(budget['variance']),
             "overall_percent_complete": int(overall_percent),
-            "categories": list(categories.values())
+            "categories": categories.to_dict('records')
         }
 
     @staticmethod
     def identify_critical_issues(
-        payments: List[Dict],
-        milestones: List[Dict],
-        defects: List[Dict],
-        variations: List[Dict]
+        payments: Rows,
+        milestones: Rows,
+        defects: Rows,
+        variations: Rows
     ) -> List[Dict[str, Any]]:
         """Identify critical issues that need attention"""
+        payments = _frame(payments, ('total', 'status'))
+        milestones = _frame(milestones, ('amount', 'status'))
+        defects = _frame(defects, ('severity', 'status'))
+        variations = _frame(variations, VARIATION_COLUMNS)
 
         issues = []
 
         # Overdue subcontractor payments
-        overdue_payments = [p for p in payments if p['status'].upper() == 'OVERDUE']
-        if overdue_payments:
-            total_overdue = sum(p['total'] for p in overdue_payments)
+        overdue_payments = payments[_is(payments['status'], 'OVERDUE')]
+        if len(overdue_payments):
+            total_overdue = _total(overdue_payments['total'])
             issues.append({
                 "type": "overdue_payment",
                 "severity": "high",
@@ -113,9 +133,9 @@ class DataAggregator:
             })
 
         # Overdue client payments
-        overdue_milestones = [m for m in milestones if m['status'].upper() == 'OVERDUE']
-        if overdue_milestones:
-            total_client_overdue = sum(m['amount'] for m in overdue_milestones)
+        overdue_milestones = milestones[_is(milestones['status'], 'OVERDUE')]
+        if len(overdue_milestones):
+            total_client_overdue = _total(overdue_milestones['amount'])
             issues.append({
                 "type": "client_overdue",
                 "severity": "critical",
@@ -125,12 +145,9 @@ class DataAggregator:
             })
 
         # Uninvoiced variations (revenue leakage)
-        uninvoiced_vars = [
-            v for v in variations
-            if v['status'].upper() == 'APPROVED' and v['invoiced'].upper() == 'NO'
-        ]
-        if uninvoiced_vars:
-            revenue_loss = sum(v['client_price'] for v in uninvoiced_vars)
+        uninvoiced_vars = variations[_uninvoiced(variations)]
+        if len(uninvoiced_vars):
+            revenue_loss = _total(uninvoiced_vars['client_price'])
             issues.append({
                 "type": "revenue_leakage",
                 "severity": "high",
@@ -141,50 +158,54 @@ class DataAggregator:
             })
 
         # Critical defects
-        critical_defects = [d for d in defects if d['severity'].upper() == 'CRITICAL']
+        critical_defects = int(_is(defects['severity'], 'CRITICAL').sum())
         if critical_defects:
             issues.append({
                 "type": "critical_defect",
                 "severity": "critical",
-                "title": f"{len(critical_defects)} Critical Defect(s)",
+                "title": f"{critical_defects} Critical Defect(s)",
                 "description": "Blocking project handover",
-                "count": len(critical_defects)
+                "count": critical_defects
             })
 
         # Overdue defects
-        overdue_defects = [d for d in defects if d['status'].upper() == 'OVERDUE']
+        overdue_defects = int(_is(defects['status'], 'OVERDUE').sum())
         if overdue_defects:
             issues.append({
                 "type": "overdue_defect",
                 "severity": "high",
-                "title": f"{len(overdue_defects)} Overdue Defect(s)",
+                "title": f"{overdue_defects} Overdue Defect(s)",
                 "description": "Defects past due date",
-                "count": len(overdue_defects)
+                "count": overdue_defects
             })
 
         return issues
 
     @staticmethod
     def get_cashflow_forecast(
-        budget_items: List[Dict],
-        milestones: List[Dict],
-        variations: List[Dict],
+        budget_items: Rows,
+        milestones: Rows,
+        variations: Rows,
         weeks: int = 12
     ) -> Dict[str, Any]:
         """Generate cashflow forecast for next N weeks"""
         from datetime import datetime, timedelta
 
+        budget = _frame(budget_items, BUDGET_COLUMNS)
+        milestones = _frame(milestones, ('amount', 'status'))
+        variations = _frame(variations, VARIATION_COLUMNS)
+
         # Calculate weekly burn rate from budget
-        total_forecast = sum(item['forecast'] for item in budget_items)
-        total_spent = sum(item['actual_spent'] for item in budget_items)
+        total_forecast = _total(budget['forecast'])
+        total_spent = _total(budget['actual_spent'])
         remaining_spend = total_forecast - total_spent
 
         # Average weekly burn rate
         weekly_burn_rate = remaining_spend / weeks if weeks > 0 else 0
 
         # Expected income from milestones and variations
-        expected_income = sum(m['amount'] for m in milestones if m['status'].upper() in ['PENDING', 'SUBMITTED'])
-        expected_income += sum(v['client_price'] for v in variations if v['status'].upper() == 'APPROVED' and v['invoiced'].upper() == 'NO')
+        expected_income = _total(milestones.loc[_is(milestones['status'], 'PENDING', 'SUBMITTED'), 'amount'])
+        expected_income += _total(variations.loc[_uninvoiced(variations), 'client_price'])
 
         # Generate weekly forecast
         weekly_forecast = []
@@ -220,36 +241,40 @@ class DataAggregator:
 
     @staticmethod
     def generate_insights(
-        budget_items: List[Dict],
-        subcontractors: List[Dict],
-        payments: List[Dict],
-        milestones: List[Dict],
-        variations: List[Dict],
-        defects: List[Dict]
+        budget_items: Rows,
+        subcontractors: Rows,
+        payments: Rows,
+        milestones: Rows,
+        variations: Rows,
+        defects: Rows
     ) -> List[Dict[str, Any]]:
         """Generate AI-style insights from project data"""
+        budget = _frame(budget_items, BUDGET_COLUMNS)
+        payments = _frame(payments, ('total', 'status'))
+        variations = _frame(variations, VARIATION_COLUMNS)
+        defects = _frame(defects, ('severity', 'status'))
 
         insights = []
 
         # Budget variance insights
-        over_budget_items = [item for item in budget_items if item['variance'] < -1000]
-        if over_budget_items:
-            total_overrun = sum(abs(item['variance']) for item in over_budget_items)
+        over_budget = budget.loc[budget['variance'] < -1000, 'variance']
+        if len(over_budget):
+            total_overrun = _total(over_budget.abs())
             insights.append({
                 "type": "budget_variance",
                 "priority": "high",
                 "title": "Budget Overruns Detected",
-                "message": f"{len(over_budget_items)} line items are over budget by ${total_overrun:,.2f} total",
+                "message": f"{len(over_budget)} line items are over budget by ${total_overrun:,.2f} total",
                 "recommendation": "Review cost allocation and consider value engineering opportunities",
-                "data": {"count": len(over_budget_items), "amount": total_overrun}
+                "data": {"count": len(over_budget), "amount": total_overrun}
             })
 
         # Cash flow insight
         total_budget = 650000
-        total_spent = sum(item['actual_spent'] for item in budget_items)
+        total_spent = _total(budget['actual_spent'])
         burn_rate = (total_spent / total_budget * 100) if total_budget > 0 else 0
 
-        completion_rate = sum(item['percent_complete'] for item in budget_items) / len(budget_items) if budget_items else 0
+        completion_rate = _mean(budget['percent_complete'])
 
         if burn_rate > completion_rate + 10:
             insights.append({
@@ -262,9 +287,9 @@ class DataAggregator:
             })
 
         # Revenue leakage insight
-        uninvoiced_variations = [v for v in variations if v['status'].upper() == 'APPROVED' and v['invoiced'].upper() == 'NO']
-        if uninvoiced_variations:
-            revenue_loss = sum(v['client_price'] for v in uninvoiced_variations)
+        uninvoiced_variations = variations[_uninvoiced(variations)]
+        if len(uninvoiced_variations):
+            revenue_loss = _total(uninvoiced_variations['client_price'])
             insights.append({
                 "type": "revenue_opportunity",
                 "priority": "high",
@@ -275,9 +300,9 @@ class DataAggregator:
             })
 
         # Subcontractor payment insight
-        overdue_payments = [p for p in payments if p['status'].upper() == 'OVERDUE']
-        if overdue_payments:
-            total_overdue = sum(p['total'] for p in overdue_payments)
+        overdue_payments = payments[_is(payments['status'], 'OVERDUE')]
+        if len(overdue_payments):
+            total_overdue = _total(overdue_payments['total'])
             insights.append({
                 "type": "payment_risk",
                 "priority": "high",
@@ -288,20 +313,20 @@ class DataAggregator:
             })
 
         # Defect trend insight
-        critical_defects = [d for d in defects if d['severity'].upper() == 'CRITICAL']
+        critical_defects = int(_is(defects['severity'], 'CRITICAL').sum())
         if critical_defects:
             insights.append({
                 "type": "quality_risk",
                 "priority": "critical",
                 "title": "Critical Defects Require Attention",
-                "message": f"{len(critical_defects)} critical defect(s) blocking project handover",
+                "message": f"{critical_defects} critical defect(s) blocking project handover",
                 "recommendation": "Mobilize resources to resolve critical defects immediately",
-                "data": {"count": len(critical_defects)}
+                "data": {"count": critical_defects}
             })
 
         # Completion forecast
-        if budget_items:
-            avg_completion = sum(item['percent_complete'] for item in budget_items) / len(budget_items)
+        if len(budget):
+            avg_completion = _mean(budget['percent_complete'])
             if avg_completion > 80:
                 insights.append({
                     "type": "milestone",
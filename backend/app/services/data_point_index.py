@@ -0,0 +1,203 @@
+"""
+Data Point Index
+
+In-memory index of a project's live data points used for deduplication and
+conflict detection. The project's points are loaded once and indexed by:
+- amount (sorted array, binary search over the ±1% tolerance band)
+- transaction date (7-day buckets)
+
+Descriptions and vendors are normalized and tokenized up front, so checking
+an incoming point costs a couple of bisects plus a scan over the few
+candidates that actually overlap, instead of one query per point.
+"""
+
+import bisect
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from typing import Any, Dict, FrozenSet, List, Optional
+
+from sqlalchemy.orm import Session
+
+from app.models.data_points import DataPoint
+
+# Matching windows (kept in sync with DataPointMapper)
+AMOUNT_TOLERANCE = 0.01  # ±1% of the incoming amount
+DATE_WINDOW = timedelta(days=7)
+BUCKET_DAYS = 7
+
+
+@dataclass
+class IndexedPoint:
+    """Normalized view of a data point held by the index."""
+    seq: int
+    point: Any  # DataPoint or row exposing .id/.amount
+    amount: float
+    description: str
+    tokens: FrozenSet[str]
+    transaction_date: Optional[datetime]
+    day: Optional[Any]  # transaction_date.date()
+    vendor: Optional[str]
+
+
+def normalize_text(value: Optional[str]) -> str:
+    """Lowercase and strip a description/vendor for comparison."""
+    return (value or '').lower().strip()
+
+
+def token_similarity(tokens1: FrozenSet[str], tokens2: FrozenSet[str]) -> float:
+    """Jaccard similarity of two word sets (0.0 to 1.0)."""
+    if not tokens1 or not tokens2:
+        return 0.0
+
+    common = len(tokens1 & tokens2)
+    total = len(tokens1) + len(tokens2) - common
+
+    return common / total if total else 0.0
+
+
+def _bucket(value: datetime) -> int:
+    return value.toordinal() // BUCKET_DAYS
+
+
+class DataPointIndex:
+    """Amount- and date-indexed set of live data points for one project."""
+
+    def __init__(self):
+        self._amounts: List[float] = []  # sorted
+        self._by_amount: List[IndexedPoint] = []  # parallel to _amounts
+        self._date_buckets: Dict[int, List[IndexedPoint]] = {}
+        self._undated: List[IndexedPoint] = []
+        self._seq = 0
+
+    @classmethod
+    def load(cls, db: Session, project_id: str) -> 'DataPointIndex':
+        """
+        Build an index from the project's live (non-duplicate, non-superseded) points.
+
+        Args:
+            db: Database session
+            project_id: Project identifier
+
+        Returns:
+            Populated DataPointIndex
+        """
+        index = cls()
+
+        rows = db.query(
+            DataPoint.id,
+            DataPoint.amount,
+            DataPoint.description,
+            DataPoint.transaction_date,
+            DataPoint.vendor
+        ).filter(
+            DataPoint.project_id == project_id,
+            DataPoint.is_duplicate == False,
+            DataPoint.superseded_by == None
+        ).all()
+
+        # Rows come back in storage order; seq preserves it so candidates are
+        # visited in the same order the per-point query used to return them
+        entries = []
+        for seq, row in enumerate(rows):
+            entry = cls.make_probe(row)
+            entry.seq = seq
+            entries.append(entry)
+
+            if entry.transaction_date:
+                index._date_buckets.setdefault(_bucket(entry.transaction_date), []).append(entry)
+            else:
+                index._undated.append(entry)
+
+        # Sort once instead of inserting row by row
+        entries.sort(key=lambda entry: entry.amount)
+        index._by_amount = entries
+        index._amounts = [entry.amount for entry in entries]
+        index._seq = len(entries)
+
+        return index
+
+    def __len__(self) -> int:
+        return len(self._by_amount)
+
+    def add(self, point: Any) -> IndexedPoint:
+        """Add a data point (ORM object or row) to the index."""
+        entry = self.make_probe(point)
+        entry.seq = self._seq
+        self._seq += 1
+
+        position = bisect.bisect_right(self._amounts, entry.amount)
+        self._amounts.insert(position, entry.amount)
+        self._by_amount.insert(position, entry)
+
+        if entry.transaction_date:
+            self._date_buckets.setdefault(_bucket(entry.transaction_date), []).append(entry)
+        else:
+            self._undated.append(entry)
+
+        return entry
+
+    @staticmethod
+    def make_probe(point: Any) -> IndexedPoint:
+        """Normalize an incoming point without adding it to the index."""
+        description = normalize_text(point.description)
+        transaction_date = point.transaction_date
+
+        return IndexedPoint(
+            seq=-1,
+            point=point,
+            amount=point.amount,
+            description=description,
+            tokens=frozenset(description.split()),
+            transaction_date=transaction_date,
+            day=transaction_date.date() if transaction_date else None,
+            vendor=normalize_text(point.vendor) if point.vendor else None
+        )
+
+    def candidates(self, probe: IndexedPoint) -> List[IndexedPoint]:
+        """
+        Find indexed points within ±1% of the amount and ±7 days of the date.
+
+        Points without a date match any date, and an undated probe matches
+        every date. Results are returned in insertion order.
+        """
+        tolerance = abs(probe.amount * AMOUNT_TOLERANCE)
+        low = probe.amount - tolerance
+        high = probe.amount + tolerance
+
+        start = bisect.bisect_left(self._amounts, low)
+        end = bisect.bisect_right(self._amounts, high)
+
+        if probe.transaction_date is None:
+            matches = self._by_amount[start:end]
+        else:
+            window_start = probe.transaction_date - DATE_WINDOW
+            window_end = probe.transaction_date + DATE_WINDOW
+            first_bucket = _bucket(window_start)
+            last_bucket = _bucket(window_end)
+
+            dated_count = sum(
+                len(self._date_buckets.get(b, ())) for b in range(first_bucket, last_bucket + 1)
+            )
+
+            if end - start <= dated_count + len(self._undated):
+                # Amount band is the narrower side - filter it by date
+                matches = [
+                    entry for entry in self._by_amount[start:end]
+                    if entry.transaction_date is None
+                    or window_start <= entry.transaction_date <= window_end
+                ]
+            else:
+                # Date window is narrower - filter it by amount
+                matches = [
+                    entry for entry in self._undated
+                    if low <= entry.amount <= high
+                ]
+                for b in range(first_bucket, last_bucket + 1):
+                    matches.extend(
+                        entry for entry in self._date_buckets.get(b, ())
+                        if low <= entry.amount <= high
+                        and window_start <= entry.transaction_date <= window_end
+                    )
+
+        matches.sort(key=lambda entry: entry.seq)
+        return matches
@@ -12,14 +12,14 @@ import logging
 import uuid
 import json
 from typing import List, Dict, Any, Optional, Tuple
-from datetime import datetime, timedelta
+from datetime import datetime
 from sqlalchemy.orm import Session
-from sqlalchemy import and_, or_
 
 from app.models.data_points import (
-    DataPoint, DataPointConflict, DataPointStatus,
-    DataPointType, DataPointValidationRule
+    DataPoint, DataPointConflict, DataPointStatus, DataPointType
 )
+from app.services.data_point_index import DataPointIndex, IndexedPoint, token_similarity
+from app.services.validation_rules import ValidationRuleEngine
 
 logger = logging.getLogger(__name__)
 
@@ -30,14 +30,23 @@ class DataPointMapper:
     def __init__(self, db: Session, project_id: str):
         self.db = db
         self.project_id = project_id
+        self._rule_engine: Optional[ValidationRuleEngine] = None
 
     def process_data_points(
         self,
-        data_points: List[DataPoint]
+        data_points: List[DataPoint],
+        index: Optional[DataPointIndex] = None,
+        rule_engine: Optional[ValidationRuleEngine] = None
     ) -> Tuple[List[DataPoint], List[DataPointConflict]]:
         """
         Process data points: deduplicate, detect conflicts, validate.
 
+        Args:
+            data_points: Incoming data points
+            index: Index of live points to check against and extend; pass the
+                same index across calls when processing a stream of batches
+            rule_engine: Compiled validation rules to reuse across calls
+
         Returns:
             Tuple of (processed_data_points, conflicts)
         """
@@ -47,9 +56,15 @@ class DataPointMapper:
         processed_points = []
         conflicts = []
 
+        # Load the project's live points once; points kept from this batch are
+        # added as we go so duplicates within the same batch are caught too
+        if index is None:
+            index = DataPointIndex.load(self.db, self.project_id)
+
         for dp in data_points:
             # Check for duplicates
-            duplicate_check = self._check_duplicate(dp)
+            probe = index.make_probe(dp)
+            duplicate_check = self._check_duplicate(dp, index=index, probe=probe)
 
             if duplicate_check:
                 # Found potential duplicate
@@ -68,8 +83,14 @@ class DataPointMapper:
                     dp.conflict_group_id = conflict.conflict_group_id
                     logger.warning(f"Conflict detected: {dp.description[:50]}")
 
-            # Validate data point
-            validation_errors = self._validate_data_point(dp)
+            index.add(dp)
+            processed_points.append(dp)
+
+        # Validate the whole batch against the project's rules (loaded once)
+        self._rule_engine = rule_engine or ValidationRuleEngine.load(self.db, self.project_id)
+        batch_errors = self._rule_engine.validate(processed_points)
+
+        for dp, validation_errors in zip(processed_points, batch_errors):
             if validation_errors:
                 logger.warning(f"Validation errors for {dp.id}: {validation_errors}")
                 dp.structured_metadata = json.dumps({
@@ -81,8 +102,6 @@ class DataPointMapper:
             if not validation_errors and not dp.conflict_group_id:
                 dp.status = DataPointStatus.VALIDATED
 
-            processed_points.append(dp)
-
         # Bulk save data points
         if processed_points:
             self.db.add_all(processed_points)
@@ -99,95 +118,78 @@ class DataPointMapper:
 
     def _check_duplicate(
         self,
-        data_point: DataPoint
+        data_point: DataPoint,
+        index: Optional[DataPointIndex] = None,
+        probe: Optional[IndexedPoint] = None
     ) -> Optional[Tuple[bool, DataPoint]]:
         """
         Check if data point is duplicate or conflict.
 
+        Args:
+            data_point: Incoming data point
+            index: Index of live points (loaded from the database if omitted)
+            probe: Pre-normalized form of data_point
+
         Returns:
             None if no duplicate found
             (True, existing_dp) if exact duplicate
             (False, existing_dp) if potential conflict
         """
         # Look for similar data points in same project
-        # within reasonable time window (±7 days)
-        date_window = timedelta(days=7)
-
-        query = self.db.query(DataPoint).filter(
-            DataPoint.project_id == self.project_id,
-            DataPoint.is_duplicate == False,
-            DataPoint.superseded_by == None
-        )
-
-        # Add date filter if transaction has date
-        if data_point.transaction_date:
-            query = query.filter(
-                or_(
-                    DataPoint.transaction_date == None,
-                    and_(
-                        DataPoint.transaction_date >= data_point.transaction_date - date_window,
-                        DataPoint.transaction_date <= data_point.transaction_date + date_window
-                    )
-                )
-            )
-
-        # Search by similar amount (±1%)
-        amount_tolerance = abs(data_point.amount * 0.01)
-        query = query.filter(
-            DataPoint.amount >= data_point.amount - amount_tolerance,
-            DataPoint.amount <= data_point.amount + amount_tolerance
-        )
-
-        similar_points = query.all()
+        # within reasonable time window (±7 days) and ±1% of the amount
+        if index is None:
+            index = DataPointIndex.load(self.db, self.project_id)
+        if probe is None:
+            probe = index.make_probe(data_point)
 
-        for existing_dp in similar_points:
+        for candidate in index.candidates(probe):
             # Check for exact match
-            if self._is_exact_match(data_point, existing_dp):
-                return (True, existing_dp)
+            if self._entries_match(probe, candidate):
+                return (True, candidate.point)
 
             # Check for conflict (similar but different)
-            if self._is_conflicting(data_point, existing_dp):
-                return (False, existing_dp)
+            if self._entries_conflict(probe, candidate):
+                return (False, candidate.point)
 
         return None
 
     def _is_exact_match(self, dp1: DataPoint, dp2: DataPoint) -> bool:
         """Check if two data points are exact duplicates."""
+        return self._entries_match(DataPointIndex.make_probe(dp1), DataPointIndex.make_probe(dp2))
+
+    def _is_conflicting(self, dp1: DataPoint, dp2: DataPoint) -> bool:
+        """Check if two data points are conflicting (similar but not identical)."""
+        return self._entries_conflict(DataPointIndex.make_probe(dp1), DataPointIndex.make_probe(dp2))
+
+    def _entries_match(self, p1: IndexedPoint, p2: IndexedPoint) -> bool:
+        """Exact-duplicate check on normalized points."""
         # Same amount
-        if abs(dp1.amount - dp2.amount) > 0.01:
+        if abs(p1.amount - p2.amount) > 0.01:
             return False
 
         # Same or very similar description
-        desc1 = dp1.description.lower().strip()
-        desc2 = dp2.description.lower().strip()
-        if desc1 != desc2:
+        if p1.description != p2.description:
             # Check similarity (simple approach)
-            similarity = self._string_similarity(desc1, desc2)
-            if similarity < 0.9:
+            if token_similarity(p1.tokens, p2.tokens) < 0.9:
                 return False
 
         # Same date (if both have dates)
-        if dp1.transaction_date and dp2.transaction_date:
-            if dp1.transaction_date.date() != dp2.transaction_date.date():
-                return False
+        if p1.day and p2.day and p1.day != p2.day:
+            return False
 
         # Same vendor (if both have vendors)
-        if dp1.vendor and dp2.vendor:
-            if dp1.vendor.lower().strip() != dp2.vendor.lower().strip():
-                return False
+        if p1.vendor is not None and p2.vendor is not None and p1.vendor != p2.vendor:
+            return False
 
         return True
 
-    def _is_conflicting(self, dp1: DataPoint, dp2: DataPoint) -> bool:
-        """Check if two data points are conflicting (similar but not identical)."""
+    def _entries_conflict(self, p1: IndexedPoint, p2: IndexedPoint) -> bool:
+        """Conflict check on normalized points."""
         # Similar amount but not exact
-        amount_diff = abs(dp1.amount - dp2.amount)
-        if 0.01 < amount_diff < abs(dp1.amount * 0.05):  # 0.01 to 5% difference
+        amount_diff = abs(p1.amount - p2.amount)
+        if 0.01 < amount_diff < abs(p1.amount * 0.05):  # 0.01 to 5% difference
             # Similar description
-            desc1 = dp1.description.lower().strip()
-            desc2 = dp2.description.lower().strip()
-            similarity = self._string_similarity(desc1, desc2)
-            if similarity > 0.7:
+            if token_similarity(p1.tokens, p2.tokens) > 0.7:
                 return True
 
         return False
@@ -195,16 +197,7 @@ class DataPointMapper:
     def _string_similarity(self, s1: str, s2: str) -> float:
         """Calculate simple string similarity (0.0 to 1.0)."""
         # Simple approach: count common words
-        words1 = set(s1.split())
-        words2 = set(s2.split())
-
-        if not words1 or not words2:
-            return 0.0
-
-        common = words1.intersection(words2)
-        total = words1.union(words2)
-
-        return len(common) / len(total) if total else 0.0
+        return token_similarity(frozenset(s1.split()), frozenset(s2.split()))
 
     def _create_conflict(
         self,
@@ -245,60 +238,10 @@ class DataPointMapper:
         Returns:
             List of validation error messages
         """
-        errors = []
-
-        # Load validation rules for this project/type
-        rules = self.db.query(DataPointValidationRule).filter(
-            or_(
-                DataPointValidationRule.project_id == self.project_id,
-                DataPointValidationRule.project_id == None
-            ),
-            or_(
-                DataPointValidationRule.data_point_type == data_point.data_point_type,
-                DataPointValidationRule.data_point_type == None
-            ),
-            DataPointValidationRule.active == True
-        ).all()
-
-        # Apply validation rules
-        for rule in rules:
-            try:
-                params = json.loads(rule.rule_parameters)
-
-                if rule.rule_type == 'range_check':
-                    if 'min_amount' in params and data_point.amount < params['min_amount']:
-                        errors.append(f"{rule.rule_name}: Amount below minimum (${params['min_amount']})")
-                    if 'max_amount' in params and data_point.amount > params['max_amount']:
-                        errors.append(f"{rule.rule_name}: Amount exceeds maximum (${params['max_amount']})")
-
-                elif rule.rule_type == 'required_field':
-                    field_name = params.get('field_name')
-                    if field_name and not getattr(data_point, field_name, None):
-                        errors.append(f"{rule.rule_name}: Required field '{field_name}' is missing")
+        if self._rule_engine is None:
+            self._rule_engine = ValidationRuleEngine.load(self.db, self.project_id)
 
-                elif rule.rule_type == 'format_check':
-                    field_name = params.get('field_name')
-                    pattern = params.get('pattern')
-                    if field_name and pattern:
-                        import re
-                        value = str(getattr(data_point, field_name, ''))
-                        if value and not re.match(pattern, value):
-                            errors.append(f"{rule.rule_name}: Field '{field_name}' format invalid")
-
-            except Exception as e:
-                logger.error(f"Error applying validation rule {rule.id}: {e}")
-
-        # Built-in validations
-        if data_point.amount == 0:
-            errors.append("Amount cannot be zero")
-
-        if not data_point.description or data_point.description.strip() == '':
-            errors.append("Description is required")
-
-        if len(data_point.description) > 500:
-            errors.append("Description too long (max 500 characters)")
-
-        return errors
+        return self._rule_engine.validate([data_point])[0]
 
     def get_unresolved_conflicts(self) -> List[DataPointConflict]:
         """Get all unresolved conflicts for this project."""
@@ -432,6 +375,21 @@ class DataPointMapper:
         logger.info(f"Manually corrected data point {data_point_id} by {edited_by}")
         return data_point
 
+    def _processing_query(self, include_statuses: Optional[List[DataPointStatus]], *columns):
+        if include_statuses is None:
+            include_statuses = [
+                DataPointStatus.VALIDATED,
+                DataPointStatus.MANUALLY_CORRECTED,
+                DataPointStatus.APPROVED
+            ]
+
+        return self.db.query(*(columns or (DataPoint,))).filter(
+            DataPoint.project_id == self.project_id,
+            DataPoint.status.in_(include_statuses),
+            DataPoint.is_duplicate == False,
+            DataPoint.superseded_by == None
+        )
+
     def get_data_points_for_processing(
         self,
         include_statuses: Optional[List[DataPointStatus]] = None
@@ -445,23 +403,24 @@ class DataPointMapper:
         Returns:
             List of data points
         """
-        if include_statuses is None:
-            include_statuses = [
-                DataPointStatus.VALIDATED,
-                DataPointStatus.MANUALLY_CORRECTED,
-                DataPointStatus.APPROVED
-            ]
-
-        data_points = self.db.query(DataPoint).filter(
-            DataPoint.project_id == self.project_id,
-            DataPoint.status.in_(include_statuses),
-            DataPoint.is_duplicate == False,
-            DataPoint.superseded_by == None
-        ).all()
+        data_points = self._processing_query(include_statuses).all()
 
         logger.info(f"Retrieved {len(data_points)} data points for processing")
         return data_points
 
+    def processing_version(self) -> List[List[Any]]:
+        """
+        Identity of the data points get_data_points_for_processing() returns.
+
+        One [id, updated_at, manually_edited] row per point, without loading
+        the points themselves; it changes whenever a point is added, removed,
+        edited or changes status.
+        """
+        rows = self._processing_query(
+            None, DataPoint.id, DataPoint.updated_at, DataPoint.manually_edited
+        ).order_by(DataPoint.id).all()
+        return [[row.id, row.updated_at, row.manually_edited] for row in rows]
+
 
 def create_data_point_mapper(db: Session, project_id: str) -> DataPointMapper:
     """Factory function to create data point mapper."""
@@ -0,0 +1,153 @@
+"""
+Bounded Disk Cache
+
+Stores generated files (rendered page thumbnails) under a directory, one
+file per key, and deletes the least recently used files once the total
+size passes a byte budget.
+
+Recency is kept in file mtimes (touched on every hit), so the LRU order
+survives restarts: existing files are picked up oldest first when the
+cache is created. Files are written to a temporary name and renamed into
+place, so readers never see a partial file.
+"""
+
+import hashlib
+import logging
+import os
+import threading
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any, Callable, Dict, Optional
+
+logger = logging.getLogger(__name__)
+
+_TEMP_SUFFIX = ".tmp"
+
+
+class BoundedDiskCache:
+    """Files on disk keyed by string, least recently used evicted past max_bytes."""
+
+    def __init__(self, directory: Path, max_bytes: int, suffix: str = ""):
+        self.directory = Path(directory)
+        self.max_bytes = max_bytes
+        self.suffix = suffix
+        self._entries: "OrderedDict[str, int]" = OrderedDict()  # file name -> size, oldest first
+        self._size = 0
+        self._lock = threading.Lock()
+        self._key_locks: Dict[str, threading.Lock] = {}
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._load()
+
+    def _load(self):
+        """Index files left by earlier runs, oldest first."""
+        self.directory.mkdir(parents=True, exist_ok=True)
+        files = []
+        for path in self.directory.iterdir():
+            if not path.is_file():
+                continue
+            if path.name.endswith(_TEMP_SUFFIX):
+                # Interrupted write
+                path.unlink(missing_ok=True)
+                continue
+            stat = path.stat()
+            files.append((stat.st_mtime, path.name, stat.st_size))
+
+        for _, name, size in sorted(files):
+            self._entries[name] = size
+            self._size += size
+        with self._lock:
+            self._evict()
+
+    def _name(self, key: str) -> str:
+        return hashlib.sha256(key.encode()).hexdigest()[:40] + self.suffix
+
+    def _evict(self):
+        """Delete least recently used files until within budget (lock held)."""
+        while self._size > self.max_bytes and len(self._entries) > 1:
+            name, size = self._entries.popitem(last=False)
+            (self.directory / name).unlink(missing_ok=True)
+            self._key_locks.pop(name, None)
+            self._size -= size
+            self.evictions += 1
+
+    def get(self, key: str) -> Optional[bytes]:
+        """Cached bytes for key, or None."""
+        name = self._name(key)
+        path = self.directory / name
+        with self._lock:
+            if name not in self._entries:
+                return None
+            self._entries.move_to_end(name)
+        try:
+            data = path.read_bytes()
+            os.utime(path)
+        except OSError:
+            # Deleted behind the cache's back
+            with self._lock:
+                size = self._entries.pop(name, 0)
+                self._size -= size
+            return None
+        return data
+
+    def put(self, key: str, data: bytes):
+        """Store bytes under key, evicting older files past the budget."""
+        name = self._name(key)
+        path = self.directory / name
+        temp_path = path.with_name(f"{name}.{os.getpid()}.{threading.get_ident()}{_TEMP_SUFFIX}")
+        temp_path.write_bytes(data)
+        os.replace(temp_path, path)
+
+        with self._lock:
+            self._size += len(data) - self._entries.pop(name, 0)
+            self._entries[name] = len(data)
+            self._evict()
+
+    def get_or_create(self, key: str, create: Callable[[], bytes]) -> bytes:
+        """
+        Cached bytes for key, or create() and store them.
+
+        Concurrent requests for the same key create it once.
+        """
+        name = self._name(key)
+        with self._lock:
+            key_lock = self._key_locks.setdefault(name, threading.Lock())
+
+        with key_lock:
+            data = self.get(key)
+            if data is not None:
+                with self._lock:
+                    self.hits += 1
+                return data
+
+            with self._lock:
+                self.misses += 1
+            data = create()
+            self.put(key, data)
+            return data
+
+    def clear(self) -> int:
+        """Delete every cached file; returns the number deleted."""
+        with self._lock:
+            count = len(self._entries)
+            for name in self._entries:
+                (self.directory / name).unlink(missing_ok=True)
+            self._entries.clear()
+            self._key_locks.clear()
+            self._size = 0
+            return count
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                'directory': str(self.directory),
+                'files': len(self._entries),
+                'bytes': self._size,
+                'max_bytes': self.max_bytes,
+                'hits': self.hits,
+                'misses': self.misses,
+                'hit_rate': round(self.hits / lookups, 3) if lookups else None,
+                'evictions': self.evictions,
+            }
@@ -3,12 +3,57 @@ Document viewer service
 Converts Excel, PDF, and images to viewable formats
 """
 import base64
-import os
+import threading
 from pathlib import Path
-from typing import Dict, Any, List, Optional
-import pandas as pd
+from typing import Dict, Any, List, Optional, Tuple
 from PyPDF2 import PdfReader
 
+from app.config import get_config
+from app.services.project_registry import get_project_registry
+from app.services.workbook_cache import WorkbookCache
+from app.services.workbook_reader import read_window, sheet_dimensions
+
+IMAGE_EXTENSIONS = {'.png', '.jpg', '.jpeg', '.gif', '.webp'}
+
+# Pages in a PDF preview when no range is given
+PDF_PREVIEW_PAGES = 10
+
+
+def parse_page_range(pages: str) -> Tuple[int, Optional[int]]:
+    """
+    Parse a 1-based page range: '11-20', '5' or '30-' (to the last page)
+
+    Returns:
+        (first page, last page or None for the end of the document)
+
+    Raises:
+        ValueError: Malformed or empty range
+    """
+    first, dash, last = pages.strip().partition("-")
+    try:
+        first_page = int(first)
+        last_page = (int(last) if last.strip() else None) if dash else first_page
+    except ValueError:
+        raise ValueError(f"Invalid page range '{pages}' (expected e.g. 11-20)")
+    if first_page < 1 or (last_page is not None and last_page < first_page):
+        raise ValueError(f"Invalid page range '{pages}'")
+    return first_page, last_page
+
+
+def _column_names(header: List[Any]) -> List[str]:
+    """Header cells as column names, pandas style ('Unnamed: 3', 'Amount.1')"""
+    names = []
+    seen: Dict[str, int] = {}
+    for index, value in enumerate(header):
+        name = str(value) if value not in (None, "") else f"Unnamed: {index}"
+        if name in seen:
+            seen[name] += 1
+            name = f"{name}.{seen[name]}"
+        else:
+            seen[name] = 0
+        names.append(name)
+    return names
+
 
 class DocumentViewer:
     """Service for viewing documents in the browser"""
@@ -18,52 +63,144 @@ class DocumentViewer:
         self.base_dir = Path(__file__).parent.parent.parent / "projects" / project_id / "data"
 
     def get_file_tree(self, project_id: str = "project-a-123-sunset-blvd") -> List[Dict[str, Any]]:
-        """Get file tree structure from dummy_data folders"""
+        """Get file tree structure from the project registry's inventory of the data folder"""
         files = []
 
-        if not self.base_dir.exists():
-            return files
+        for entry in get_project_registry().files(self.project_id):
+            # Skip hidden files and non-relevant files
+            if entry.name.startswith('.'):
+                continue
+
+            relative_path = Path(entry.path)
+
+            # Determine file type
+            file_ext = entry.name.lower().split('.')[-1]
+            if file_ext in ['xlsx', 'xls']:
+                file_type = 'excel'
+            elif file_ext == 'pdf':
+                file_type = 'pdf'
+            elif file_ext in ['png', 'jpg', 'jpeg', 'gif', 'webp']:
+                file_type = 'image'
+            else:
+                file_type = 'other'
+
+            files.append({
+                "filename": entry.name,
+                "path": str(relative_path),
+                "type": file_type,
+                "size": entry.size,
+                "modified": entry.mtime_ns / 1e9,
+                "folder": str(relative_path.parent)
+            })
 
-        # Walk through all directories
-        for root, dirs, filenames in os.walk(self.base_dir):
-            for filename in filenames:
-                # Skip hidden files and non-relevant files
-                if filename.startswith('.') or filename == '.DS_Store':
-                    continue
+        return files
 
-                file_path = Path(root) / filename
-                relative_path = file_path.relative_to(self.base_dir)
-
-                # Determine file type
-                file_ext = filename.lower().split('.')[-1]
-                if file_ext in ['xlsx', 'xls']:
-                    file_type = 'excel'
-                elif file_ext == 'pdf':
-                    file_type = 'pdf'
-                elif file_ext in ['png', 'jpg', 'jpeg', 'gif', 'webp']:
-                    file_type = 'image'
-                else:
-                    file_type = 'other'
-
-                # Get file stats
-                try:
-                    stat = file_path.stat()
-                    size = stat.st_size
-                    modified = stat.st_mtime
-                except:
-                    size = 0
-                    modified = 0
-
-                files.append({
-                    "filename": filename,
-                    "path": str(relative_path),
-                    "type": file_type,
-                    "size": size,
-                    "modified": modified,
-                    "folder": str(relative_path.parent)
-                })
+    def _sheet_dimensions(self, full_path: Path) -> Dict[str, Tuple[int, int]]:
+        """Rows and columns per sheet, cached until the file changes"""
+        return get_viewer_cache().get_or_load(
+            (self.project_id, "sheet_dimensions", str(full_path)),
+            full_path,
+            lambda: sheet_dimensions(full_path)
+        )
+
+    def _sheet_window(
+        self,
+        full_path: Path,
+        sheet: str,
+        offset: int,
+        limit: int,
+        total_rows: int
+    ) -> Tuple[List[Any], List[List[Any]]]:
+        """
+        Header row and data rows offset to offset + limit - 1 of a sheet.
+
+        Parsed windows are cached by file version, so scrolling back to a
+        window doesn't read the workbook again.
+        """
+        def load():
+            if offset == 0:
+                rows = read_window(full_path, sheet, 0, limit + 1, total_rows=total_rows)
+                return (rows[0] if rows else []), rows[1:]
+            # The header is one streamed row; the window is read on its own
+            header = read_window(full_path, sheet, 0, 1, total_rows=total_rows)
+            rows = read_window(full_path, sheet, offset + 1, offset + 1 + limit, total_rows=total_rows)
+            return (header[0] if header else []), rows
+
+        return get_viewer_cache().get_or_load(
+            (self.project_id, "sheet_window", str(full_path), sheet, offset, limit),
+            full_path,
+            load
+        )
+
+    def excel_window(
+        self,
+        file_path: Path,
+        sheet: Optional[str] = None,
+        offset: int = 0,
+        limit: int = 100,
+        columns: Optional[List[str]] = None
+    ) -> Dict[str, Any]:
+        """
+        Page of rows from one sheet, for scrolling through large registers.
+
+        The first row of the sheet is the header; offset counts data rows
+        below it. Only the rows of the window are converted to values, and
+        total_rows comes from the sheet dimensions.
+
+        Args:
+            file_path: Workbook path relative to the project data folder
+            sheet: Sheet name (default: first sheet)
+            offset: First data row of the window
+            limit: Rows in the window
+            columns: Column names to return (default: all)
+
+        Returns:
+            Window of rows, or {"error": ...}
+        """
+        try:
+            full_path = self.base_dir / file_path
 
-        return files
+            if not full_path.exists():
+                return {"error": f"File not found: {file_path}"}
+
+            dimensions = self._sheet_dimensions(full_path)
+            if not dimensions:
+                return {"error": f"No sheets in {file_path}"}
+            sheet = sheet or next(iter(dimensions))
+            if sheet not in dimensions:
+                return {"error": f"Sheet not found: {sheet}"}
+
+            sheet_rows, sheet_columns = dimensions[sheet]
+            header, rows = self._sheet_window(full_path, sheet, offset, limit, sheet_rows)
+
+            width = max(sheet_columns, len(header))
+            names = _column_names(list(header) + [None] * (width - len(header)))
+            indexes = list(range(width))
+            if columns:
+                unknown = [name for name in columns if name not in names]
+                if unknown:
+                    return {"error": f"Unknown columns: {', '.join(unknown)}"}
+                indexes = [names.index(name) for name in columns]
+
+            data = [
+                ["" if index >= len(row) or row[index] is None else row[index] for index in indexes]
+                for row in rows
+            ]
+
+            return {
+                "type": "excel",
+                "filename": file_path.name,
+                "sheet": sheet,
+                "columns": [names[index] for index in indexes],
+                "data": data,
+                "offset": offset,
+                "row_count": len(data),
+                "total_rows": max(sheet_rows - 1, 0),
+                "sheet_names": list(dimensions)
+            }
+
+        except Exception as e:
+            return {"error": f"Error reading Excel file: {str(e)}"}
 
     def excel_to_json(self, file_path: Path, max_rows: int = 50) -> Dict[str, Any]:
         """Convert Excel file to JSON table data (first N rows of each sheet)"""
@@ -73,70 +210,86 @@ class DocumentViewer:
             if not full_path.exists():
                 return {"error": f"File not found: {file_path}"}
 
-            # Read all sheet names
-            excel_file = pd.ExcelFile(full_path)
+            # Row counts come from the sheet dimensions; only the first
+            # max_rows of each sheet are read
+            dimensions = self._sheet_dimensions(full_path)
             sheets = {}
 
-            for sheet_name in excel_file.sheet_names:
-                try:
-                    df = pd.read_excel(full_path, sheet_name=sheet_name, nrows=max_rows)
-
-                    # Convert to JSON-serializable format
-                    df = df.fillna("")  # Replace NaN with empty string
+            for sheet_name in dimensions:
+                window = self.excel_window(file_path, sheet_name, 0, max_rows)
+                if "error" in window:
+                    sheets[sheet_name] = {"error": f"Error reading sheet: {window['error']}"}
+                    continue
 
-                    sheets[sheet_name] = {
-                        "columns": df.columns.tolist(),
-                        "data": df.values.tolist(),
-                        "row_count": len(df),
-                        "total_rows": len(pd.read_excel(full_path, sheet_name=sheet_name))
-                    }
-                except Exception as e:
-                    sheets[sheet_name] = {"error": f"Error reading sheet: {str(e)}"}
+                sheets[sheet_name] = {
+                    "columns": window["columns"],
+                    "data": window["data"],
+                    "row_count": window["row_count"],
+                    "total_rows": window["total_rows"]
+                }
 
             return {
                 "type": "excel",
                 "filename": file_path.name,
                 "sheets": sheets,
-                "sheet_names": excel_file.sheet_names
+                "sheet_names": list(dimensions)
             }
 
         except Exception as e:
             return {"error": f"Error reading Excel file: {str(e)}"}
 
-    def pdf_to_preview(self, file_path: Path) -> Dict[str, Any]:
-        """Extract PDF content with formatting"""
+    def pdf_to_preview(self, file_path: Path, first_page: int = 1, last_page: Optional[int] = None) -> Dict[str, Any]:
+        """
+        Extract the text of a range of PDF pages (first 10 by default)
+
+        Only the requested pages are parsed, so opening a long contract
+        costs the pages shown rather than the whole document. Extracted
+        pages are cached until the file changes.
+        """
         try:
             full_path = self.base_dir / file_path
 
             if not full_path.exists():
                 return {"error": f"File not found: {file_path}"}
 
-            reader = PdfReader(str(full_path))
-
-            pages = []
-            for i, page in enumerate(reader.pages):
-                text = page.extract_text()
-                pages.append({
-                    "page_number": i + 1,
-                    "text": text
-                })
-
-            return {
-                "type": "pdf",
-                "filename": file_path.name,
-                "page_count": len(reader.pages),
-                "pages": pages[:10],  # First 10 pages only
-                "metadata": {
-                    "title": reader.metadata.get("/Title", "") if reader.metadata else "",
-                    "author": reader.metadata.get("/Author", "") if reader.metadata else "",
+            if last_page is None:
+                last_page = first_page + PDF_PREVIEW_PAGES - 1
+
+            def load():
+                reader = PdfReader(str(full_path))
+                page_count = len(reader.pages)
+                pages = [
+                    {"page_number": number, "text": reader.pages[number - 1].extract_text()}
+                    for number in range(first_page, min(last_page, page_count) + 1)
+                ]
+                metadata = reader.metadata
+                return {
+                    "type": "pdf",
+                    "filename": file_path.name,
+                    "page_count": page_count,
+                    "pages": pages,
+                    "metadata": {
+                        "title": metadata.get("/Title", "") if metadata else "",
+                        "author": metadata.get("/Author", "") if metadata else "",
+                    }
                 }
-            }
+
+            return get_viewer_cache().get_or_load(
+                (self.project_id, "pdf_pages", str(full_path), first_page, last_page),
+                full_path,
+                load
+            )
 
         except Exception as e:
             return {"error": f"Error reading PDF file: {str(e)}"}
 
     def image_to_base64(self, file_path: Path) -> Dict[str, Any]:
-        """Convert image to base64 for display"""
+        """
+        Convert image to base64 for display
+
+        Embedding makes the image a third larger and uncacheable; url points
+        to the streamed, cacheable file (add ?width= for a thumbnail).
+        """
         try:
             full_path = self.base_dir / file_path
 
@@ -161,7 +314,8 @@ class DocumentViewer:
                 "type": "image",
                 "filename": file_path.name,
                 "data": f"data:{mime_type};base64,{encoded}",
-                "mime_type": mime_type
+                "mime_type": mime_type,
+                "url": f"/api/documents/file/{self.project_id}/{file_path.as_posix()}"
             }
 
         except Exception as e:
@@ -199,7 +353,26 @@ class DocumentViewer:
             return self.excel_to_json(path, max_rows)
         elif ext == '.pdf':
             return self.pdf_to_preview(path)
-        elif ext in ['.png', '.jpg', '.jpeg', '.gif', '.webp']:
+        elif ext in IMAGE_EXTENSIONS:
             return self.image_to_base64(path)
         else:
             return {"error": f"Unsupported file type: {ext}"}
+
+
+_viewer_cache: Optional[WorkbookCache] = None
+_viewer_cache_lock = threading.Lock()
+
+
+def get_viewer_cache() -> WorkbookCache:
+    """
+    Get or create the document viewer's cache.
+
+    Sheet windows and PDF page ranges are many small entries per file, so
+    they get their own LRU (DOCUMENT_VIEWER_CACHE_SIZE entries) rather than
+    evicting the dashboard's parsed workbooks from the shared one.
+    """
+    global _viewer_cache
+    with _viewer_cache_lock:
+        if _viewer_cache is None:
+            _viewer_cache = WorkbookCache(get_config().document_viewer_cache_size)
+        return _viewer_cache
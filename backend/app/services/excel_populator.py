@@ -5,16 +5,35 @@ Populates Financial Model Excel spreadsheet with categorized and aggregated data
 """
 
 import os
+import re
 import logging
 from pathlib import Path
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Iterable, Optional
 from datetime import datetime
 import openpyxl
-from openpyxl.styles import Font, PatternFill, Alignment, Border, Side
+from openpyxl.cell import WriteOnlyCell
+from openpyxl.styles import Font, NamedStyle, PatternFill, Alignment, Border, Side
 from openpyxl.utils import get_column_letter
 
 logger = logging.getLogger(__name__)
 
+# Transaction count from which create_financial_model switches to the
+# write-only (streaming) writer
+WRITE_ONLY_THRESHOLD = 20000
+
+# Control characters Excel cannot store (ASCII 0-31 except tab, newline, carriage return)
+_ILLEGAL_CHARS = re.compile(r'[\x00-\x08\x0b\x0c\x0e-\x1f]')
+
+HEADER_FONT = Font(name='Arial', size=14, bold=True, color='FFFFFF')
+HEADER_FILL = PatternFill(start_color='366092', end_color='366092', fill_type='solid')
+COLUMN_HEADER_FILL = PatternFill(start_color='D9E1F2', end_color='D9E1F2', fill_type='solid')
+GOOD_COLOR = '006100'
+WARNING_COLOR = '9C5700'
+BAD_COLOR = '9C0006'
+
+TRANSACTION_HEADERS = ['Date', 'Description', 'Vendor', 'Amount', 'Category', 'Confidence', 'Source File']
+CATEGORY_HEADERS = ['Category', 'Transaction Count', 'Total Amount', 'Avg Confidence', '% of Total']
+
 
 def sanitize_sheet_name(name: str) -> str:
     """
@@ -69,15 +88,82 @@ def sanitize_cell_value(value):
         return value
 
     # Remove illegal control characters (0-31) except tab (9), newline (10), carriage return (13)
-    sanitized = ''
-    for char in value:
-        char_code = ord(char)
-        if char_code < 32 and char_code not in (9, 10, 13):
-            # Skip illegal control character
-            continue
-        sanitized += char
+    return _ILLEGAL_CHARS.sub('', value)
 
-    return sanitized
+
+def financial_model_styles() -> List[NamedStyle]:
+    """
+    Named styles shared by every cell of the write-only financial model.
+
+    Write-only cells can't be styled one attribute at a time without
+    creating a style record per cell; named styles are registered once per
+    workbook and referenced by name.
+    """
+    return [
+        NamedStyle(name='FM Title', font=Font(name='Arial', size=18, bold=True)),
+        NamedStyle(name='FM Subtitle', font=Font(name='Arial', size=10, color='666666')),
+        NamedStyle(name='FM Header', font=HEADER_FONT, fill=HEADER_FILL),
+        NamedStyle(name='FM Column Header', font=Font(bold=True), fill=COLUMN_HEADER_FILL),
+        NamedStyle(name='FM Label', font=Font(bold=True)),
+        NamedStyle(name='FM Number', number_format='#,##0.00'),
+        NamedStyle(name='FM Number Good', font=Font(color=GOOD_COLOR), number_format='#,##0.00'),
+        NamedStyle(name='FM Number Bad', font=Font(color=BAD_COLOR), number_format='#,##0.00'),
+        NamedStyle(name='FM Currency', number_format='$#,##0.00'),
+        NamedStyle(name='FM Currency Total', font=Font(bold=True), number_format='$#,##0.00'),
+        NamedStyle(name='FM Percent', number_format='0.00%'),
+        NamedStyle(name='FM Confidence Low', font=Font(color=BAD_COLOR), number_format='0.00%'),
+        NamedStyle(name='FM Confidence Medium', font=Font(color=WARNING_COLOR), number_format='0.00%'),
+        NamedStyle(name='FM Confidence High', font=Font(color=GOOD_COLOR), number_format='0.00%'),
+    ]
+
+
+class RunningSummary:
+    """
+    Category summary accumulated one transaction at a time.
+
+    Produces the same structure as AICategorizer.get_category_summary
+    without holding the transactions.
+    """
+
+    def __init__(self):
+        self.total_transactions = 0
+        self.uncategorized_count = 0
+        self.low_confidence_count = 0
+        self.confidence_sum = 0.0
+        self.categories: Dict[str, Dict[str, float]] = {}
+
+    def add(self, category: str, amount: float, confidence: float):
+        self.total_transactions += 1
+        self.confidence_sum += confidence
+        if category == 'Uncategorized':
+            self.uncategorized_count += 1
+        if confidence < 0.6:
+            self.low_confidence_count += 1
+
+        cat_data = self.categories.get(category)
+        if cat_data is None:
+            cat_data = self.categories[category] = {'count': 0, 'total_amount': 0.0, 'confidence_sum': 0.0}
+        cat_data['count'] += 1
+        cat_data['total_amount'] += amount
+        cat_data['confidence_sum'] += confidence
+
+    def to_summary(self) -> Dict[str, Any]:
+        return {
+            'total_transactions': self.total_transactions,
+            'categories': {
+                name: {
+                    'count': cat_data['count'],
+                    'total_amount': cat_data['total_amount'],
+                    'avg_confidence': cat_data['confidence_sum'] / cat_data['count'],
+                }
+                for name, cat_data in self.categories.items()
+            },
+            'uncategorized_count': self.uncategorized_count,
+            'low_confidence_count': self.low_confidence_count,
+            'average_confidence': (
+                self.confidence_sum / self.total_transactions if self.total_transactions else 0.0
+            ),
+        }
 
 
 class ExcelPopulator:
@@ -96,7 +182,8 @@ class ExcelPopulator:
         self,
         categorized_data: Dict[str, Any],
         output_path: str,
-        project_name: str = "Construction Project"
+        project_name: str = "Construction Project",
+        write_only: Optional[bool] = None
     ) -> str:
         """
         Create populated financial model Excel file.
@@ -105,10 +192,18 @@ class ExcelPopulator:
             categorized_data: Dictionary with categorized transactions
             output_path: Path where to save the Excel file
             project_name: Name of the project
+            write_only: Use the streaming writer (write_financial_model);
+                by default it is used from WRITE_ONLY_THRESHOLD transactions
 
         Returns:
             Path to created Excel file
         """
+        transactions = categorized_data.get('categorized_transactions', [])
+        if write_only is None:
+            write_only = len(transactions) >= WRITE_ONLY_THRESHOLD
+        if write_only:
+            return self.write_financial_model(transactions, output_path, project_name)
+
         try:
             # Create new workbook
             wb = openpyxl.Workbook()
@@ -364,6 +459,191 @@ class ExcelPopulator:
         ws.column_dimensions['F'].width = 12
         ws.column_dimensions['G'].width = 30
 
+    def write_financial_model(
+        self,
+        transactions: Iterable[Dict[str, Any]],
+        output_path: str,
+        project_name: str = "Construction Project"
+    ) -> str:
+        """
+        Create the financial model with openpyxl's write-only workbook.
+
+        Transaction rows are appended straight from the iterator and the
+        summary and category sheets are built from running totals, so
+        memory stays flat however many transactions there are. The layout
+        matches create_financial_model.
+
+        Args:
+            transactions: Categorized transactions (any iterable)
+            output_path: Path where to save the Excel file
+            project_name: Name of the project
+
+        Returns:
+            Path to created Excel file
+        """
+        try:
+            wb = openpyxl.Workbook(write_only=True)
+            for style in financial_model_styles():
+                wb.add_named_style(style)
+
+            # Sheets are created in display order; each streams to its own
+            # temporary file, so the summary can be written last
+            summary_ws = wb.create_sheet(sanitize_sheet_name("Summary"))
+            category_sheets = [
+                (wb.create_sheet(sanitize_sheet_name("Revenue")), "Revenue", "Revenue Categories"),
+                (wb.create_sheet(sanitize_sheet_name("Direct Costs")), "Direct Costs", "Direct Cost Categories"),
+                (wb.create_sheet(sanitize_sheet_name("Indirect Costs")), "Indirect Costs", "Indirect Cost Categories"),
+            ]
+            transactions_ws = wb.create_sheet(sanitize_sheet_name("Transactions"))
+
+            running = self._stream_transactions_sheet(transactions_ws, transactions)
+            data = {'summary': running.to_summary()}
+
+            self._write_summary_sheet(summary_ws, data, project_name)
+            for ws, category_type, title in category_sheets:
+                self._write_category_sheet(ws, data, category_type, title)
+
+            wb.save(output_path)
+            logger.info(f"Financial model created (write-only): {output_path} "
+                        f"({running.total_transactions} transactions)")
+
+            return output_path
+
+        except Exception as e:
+            logger.error(f"Error creating financial model: {e}")
+            raise
+
+    @staticmethod
+    def _styled(ws, value: Any, style: str) -> WriteOnlyCell:
+        cell = WriteOnlyCell(ws, value=value)
+        cell.style = style
+        return cell
+
+    def _stream_transactions_sheet(self, ws, transactions: Iterable[Dict[str, Any]]) -> RunningSummary:
+        """Append every transaction row and return the running totals."""
+        for column, width in zip('ABCDEFG', (12, 40, 25, 15, 30, 12, 30)):
+            ws.column_dimensions[column].width = width
+        ws.merged_cells.add('A1:G1')
+
+        ws.append([self._styled(ws, "All Transactions", 'FM Header')])
+        ws.append([])
+        ws.append([self._styled(ws, header, 'FM Column Header') for header in TRANSACTION_HEADERS])
+
+        running = RunningSummary()
+        styled = self._styled
+
+        for txn in transactions:
+            amount = txn.get('amount', 0)
+            category = txn.get('category', 'Uncategorized')
+            confidence = txn.get('confidence') or 0.0
+            running.add(category, amount or 0.0, confidence)
+
+            if confidence < 0.6:
+                confidence_style = 'FM Confidence Low'
+            elif confidence < 0.8:
+                confidence_style = 'FM Confidence Medium'
+            else:
+                confidence_style = 'FM Confidence High'
+
+            ws.append([
+                sanitize_cell_value(txn.get('date', '')),
+                sanitize_cell_value(txn.get('description', '')),
+                sanitize_cell_value(txn.get('vendor', '')),
+                styled(ws, amount, 'FM Currency'),
+                sanitize_cell_value(category),
+                styled(ws, confidence, confidence_style),
+                sanitize_cell_value(txn.get('source_file', '')),
+            ])
+
+        return running
+
+    def _write_summary_sheet(self, ws, data: Dict[str, Any], project_name: str):
+        """Write-only counterpart of _create_summary_sheet."""
+        styled = self._styled
+        ws.column_dimensions['A'].width = 25
+        ws.column_dimensions['B'].width = 20
+
+        ws.append([styled(ws, project_name, 'FM Title')])
+        ws.merged_cells.add('A1:D1')
+        ws.append([styled(ws, f"Generated: {datetime.now().strftime('%Y-%m-%d %H:%M')}", 'FM Subtitle')])
+        ws.append([])
+        ws.append([styled(ws, "FINANCIAL SUMMARY", 'FM Header')])
+        ws.merged_cells.add('A4:D4')
+        ws.append([])
+
+        total_revenue = self._calculate_category_total(data, 'Revenue')
+        total_direct_costs = self._calculate_category_total(data, 'Direct Costs')
+        total_indirect_costs = self._calculate_category_total(data, 'Indirect Costs')
+        gross_profit = total_revenue - total_direct_costs
+        net_profit = gross_profit - total_indirect_costs
+        gross_margin = (gross_profit / total_revenue * 100) if total_revenue > 0 else 0
+        net_margin = (net_profit / total_revenue * 100) if total_revenue > 0 else 0
+
+        metrics = [
+            ("Total Revenue", total_revenue),
+            ("Total Direct Costs", total_direct_costs),
+            ("Gross Profit", gross_profit),
+            ("Gross Margin", gross_margin),
+            ("Total Indirect Costs", total_indirect_costs),
+            ("Net Profit", net_profit),
+            ("Net Margin", net_margin),
+        ]
+        for label, value in metrics:
+            style = 'FM Number'
+            if 'Profit' in label or 'Margin' in label:
+                style = 'FM Number Good' if value >= 0 else 'FM Number Bad'
+            ws.append([styled(ws, label, 'FM Label'), styled(ws, value, style)])
+
+        ws.append([])
+        ws.append([])
+        ws.append([styled(ws, "DATA QUALITY", 'FM Header')])
+        ws.merged_cells.add(f'A{5 + len(metrics) + 3}:D{5 + len(metrics) + 3}')
+        ws.append([])
+
+        summary = data.get('summary', {})
+        quality_metrics = [
+            ("Total Transactions", summary.get('total_transactions', 0)),
+            ("Successfully Categorized", summary.get('total_transactions', 0) - summary.get('uncategorized_count', 0)),
+            ("Uncategorized", summary.get('uncategorized_count', 0)),
+            ("Average Confidence", summary.get('average_confidence', 0)),
+            ("Low Confidence Count", summary.get('low_confidence_count', 0)),
+        ]
+        for label, value in quality_metrics:
+            value_cell = styled(ws, value, 'FM Percent') if 'Confidence' in label else value
+            ws.append([styled(ws, label, 'FM Label'), value_cell])
+
+    def _write_category_sheet(self, ws, data: Dict[str, Any], category_type: str, title: str):
+        """Write-only counterpart of _populate_category_sheet."""
+        styled = self._styled
+        for column, width in zip('ABCDE', (30, 18, 18, 18, 15)):
+            ws.column_dimensions[column].width = width
+        ws.merged_cells.add('A1:E1')
+
+        ws.append([styled(ws, title, 'FM Header')])
+        ws.append([])
+        ws.append([styled(ws, header, 'FM Column Header') for header in CATEGORY_HEADERS])
+
+        categories = data.get('summary', {}).get('categories', {})
+        relevant_categories = self._get_categories_by_type(categories, category_type)
+        total_amount = sum(cat_data['total_amount'] for cat_data in relevant_categories.values())
+
+        for cat_name, cat_data in sorted(relevant_categories.items(), key=lambda x: x[1]['total_amount'], reverse=True):
+            percentage = (cat_data['total_amount'] / total_amount) if total_amount > 0 else 0
+            ws.append([
+                sanitize_cell_value(cat_name),
+                cat_data['count'],
+                styled(ws, cat_data['total_amount'], 'FM Currency'),
+                styled(ws, cat_data['avg_confidence'], 'FM Percent'),
+                styled(ws, percentage, 'FM Percent'),
+            ])
+
+        if relevant_categories:
+            ws.append([
+                styled(ws, "TOTAL", 'FM Label'),
+                None,
+                styled(ws, total_amount, 'FM Currency Total'),
+            ])
+
     def _calculate_category_total(self, data: Dict[str, Any], category_type: str) -> float:
         """Calculate total for a category type."""
         categories = data.get('summary', {}).get('categories', {})
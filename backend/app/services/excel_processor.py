@@ -5,7 +5,63 @@ Reads construction Excel files and extracts structured data
 import pandas as pd
 import os
 from pathlib import Path
-from typing import Dict, List, Any
+from typing import Dict, List, Any, Optional, Tuple
+
+from app.services.workbook_cache import cached_workbook
+from app.services.workbook_reader import read_excel
+
+# Workbooks read by the dashboard, relative to a project's data folder
+BUDGET_FILE = "12_BUDGET_TRACKING/MASTER_PROJECT_BUDGET.xlsx"
+SUBCONTRACTORS_FILE = "07_SUBCONTRACTORS/Subcontractor_Register.xlsx"
+CLIENT_PAYMENTS_FILE = "11_CLIENT_BILLING/Client_Payment_Tracker.xlsx"
+DEFECTS_FILE = "15_DEFECTS_SNAGGING/Defects_And_Snagging.xlsx"
+TIMESHEETS_FILE = "08_LABOUR_TIMESHEETS/Timesheets_September_2024.xlsx"
+PURCHASE_ORDERS_FILE = "06_PURCHASE_ORDERS_INVOICES/Purchase_Orders_Master.xlsx"
+
+
+# Reader output is built column-wise: cells are coerced per column (numbers
+# with NaN → 0, text with NaN → default) and derived fields are vector
+# expressions; rows become dicts only in records() at the API boundary.
+
+
+def number(series: pd.Series) -> pd.Series:
+    """Numeric column with missing or non-numeric cells as 0."""
+    return pd.to_numeric(series, errors='coerce').fillna(0).astype(float)
+
+
+def text(series: pd.Series, default: Optional[str] = None) -> pd.Series:
+    """
+    Column as str() of each cell.
+
+    Args:
+        series: Source column
+        default: Value for missing cells (None keeps str() of them, e.g. 'nan')
+    """
+    # str() per cell rather than astype(str): it keeps the time part of
+    # Timestamps and renders missing cells the same on every pandas version
+    values = series.map(str)
+    if default is not None:
+        values = values.where(series.notna(), default)
+    return values
+
+
+def column(df: pd.DataFrame, name: str) -> pd.Series:
+    """Column by name, all-missing if the sheet doesn't have it."""
+    if name in df.columns:
+        return df[name]
+    return pd.Series(float('nan'), index=df.index)
+
+
+def records(df: pd.DataFrame) -> List[Dict[str, Any]]:
+    """Rows as dicts of native Python values."""
+    return df.to_dict('records')
+
+
+def read_sheet(file_path: Path, sheet_name: str, header: int, key: str) -> pd.DataFrame:
+    """Sheet without empty rows and rows missing the key column."""
+    df = read_excel(file_path, sheet_name=sheet_name, header=header)
+    df = df.dropna(how='all')
+    return df[column(df, key).notna()]
 
 
 class ExcelProcessor:
@@ -14,59 +70,202 @@ class ExcelProcessor:
     def __init__(self, project_id: str = "project-a-123-sunset-blvd"):
         # Go up 3 levels from backend/app/services/ to backend/projects/{project_id}/data
         self.project_id = project_id
-        self.base_dir = Path(__file__).parent.parent.parent / "projects" / project_id / "data"
+        self.base_dir = self.data_dir(project_id)
         print(f"Excel Processor initialized for project: {project_id}")
         print(f"Base dir: {self.base_dir}")
 
+    @staticmethod
+    def data_dir(project_id: str) -> Path:
+        """Data folder of a project (backend/projects/{project_id}/data)"""
+        return Path(__file__).parent.parent.parent / "projects" / project_id / "data"
+
+    def _workbook(self, relative_path: str) -> Path:
+        file_path = self.base_dir / relative_path
+        if not file_path.exists():
+            raise FileNotFoundError(file_path)
+        return file_path
+
+    @cached_workbook(BUDGET_FILE)
+    def budget_frame(self) -> pd.DataFrame:
+        """Budget line items of MASTER_PROJECT_BUDGET.xlsx"""
+        file_path = self._workbook(BUDGET_FILE)
+
+        # Read Budget Summary sheet (headers at row 5, 0-indexed = 4)
+        df = read_sheet(file_path, "Budget Summary", header=4, key='Cost Category')
+
+        # Filter out total row
+        df = df[df['Cost Category'] != 'TOTAL']
+
+        budget = number(df['Budget Amount'])
+        actual = number(df['Actual Spent'])
+
+        # Calculate % Complete from actual spend (% Spent holds formulas like =C6/B6)
+        ratio = (actual / budget.where(budget > 0)) * 100
+        percent_complete = ratio.fillna(0).apply(int) if len(df) else ratio
+
+        return pd.DataFrame({
+            "category": text(df['Cost Category']).str.strip(),
+            "description": text(df['Notes'], default=""),
+            "budget": budget,
+            "actual_spent": actual,
+            "committed": 0,  # Not in new structure
+            "forecast": budget,  # Use budget as forecast
+            "variance": pd.to_numeric(df['Variance'], errors='coerce').fillna(budget - actual).astype(float),
+            "percent_complete": percent_complete,
+            "notes": text(df['Status'], default="")
+        })
+
+    @cached_workbook(SUBCONTRACTORS_FILE)
+    def subcontractor_frames(self) -> Tuple[pd.DataFrame, pd.DataFrame]:
+        """Subcontractors and their payment schedule from Subcontractor_Register.xlsx"""
+        file_path = self._workbook(SUBCONTRACTORS_FILE)
+
+        # Read Active Subbies sheet
+        df = read_sheet(file_path, "Active Subbies", header=2, key='ID')
+        subcontractors = pd.DataFrame({
+            "id": text(df['ID']),
+            "company_name": text(df['Company Name']),
+            "contact": text(df['Contact']),
+            "phone": text(df['Phone']),
+            "email": text(df['Email'], default=""),
+            "abn": text(df['ABN']),
+            "license": text(df['License']),
+            "insurance_expiry": text(df['Insurance Expiry']),
+            "contract_value": number(df['Contract Value']),
+            "status": text(df['Status'])
+        })
+
+        # Read Payment Schedule sheet
+        df = read_sheet(file_path, "Payment Schedule", header=2, key='Payment ID')
+        payments = pd.DataFrame({
+            "payment_id": text(df['Payment ID']),
+            "subcontractor": text(df['Subcontractor']),
+            "invoice_num": text(df['Invoice #']),
+            "description": text(df['Description']),
+            "amount": number(df['Amount']),
+            "gst": number(df['GST']),
+            "total": number(df['Total']),
+            "due_date": text(df['Due Date']),
+            "status": text(df['Status'])
+        })
+
+        return subcontractors, payments
+
+    @cached_workbook(CLIENT_PAYMENTS_FILE)
+    def client_payment_frames(self) -> Tuple[pd.DataFrame, pd.DataFrame]:
+        """Client milestones and variations from Client_Payment_Tracker.xlsx"""
+        file_path = self._workbook(CLIENT_PAYMENTS_FILE)
+
+        # Read Payment Schedule sheet
+        df = read_sheet(file_path, "Payment Schedule", header=2, key='Milestone')
+        milestones = pd.DataFrame({
+            "milestone": text(df['Milestone']),
+            "invoice_num": text(df['Invoice#']),
+            "description": text(df['Description']),
+            "amount": number(df['Amount']),
+            "due_date": text(df['Due Date']),
+            "paid_date": text(df['Paid Date'], default=""),
+            "status": text(df['Status'])
+        })
+
+        # Read Variations sheet
+        df = read_sheet(file_path, "Variations", header=2, key='VO#')
+        variations = pd.DataFrame({
+            "vo_num": text(df['VO#']),
+            "date": text(df['Date']),
+            "description": text(df['Description']),
+            "cost": number(df['Cost']),
+            "client_price": number(df['Client Price']),
+            "status": text(df['Status']),
+            "invoiced": text(df['Invoiced'])
+        })
+
+        return milestones, variations
+
+    @cached_workbook(DEFECTS_FILE)
+    def defects_frame(self) -> pd.DataFrame:
+        """Defects of Defects_And_Snagging.xlsx"""
+        file_path = self._workbook(DEFECTS_FILE)
+
+        df = read_sheet(file_path, "Defects List", header=2, key='ID')
+        return pd.DataFrame({
+            "id": text(df['ID']),
+            "location": text(df['Location']),
+            "trade": text(df['Trade']),
+            "description": text(df['Description']),
+            "severity": text(df['Severity']),
+            "reported_date": text(df['Reported Date']),
+            "due_date": text(df['Due Date']),
+            "status": text(df['Status']),
+            "notes": text(df['Notes'], default="")
+        })
+
+    @cached_workbook(TIMESHEETS_FILE)
+    def timesheet_frame(self) -> pd.DataFrame:
+        """Supervisor and labourer entries of Timesheets_September_2024.xlsx"""
+        file_path = self._workbook(TIMESHEETS_FILE)
+
+        # Read Site Supervisor sheet (header at row 4, 0-indexed)
+        df = read_sheet(file_path, "Site Supervisor", header=4, key='Date')
+        supervisor_hours = number(column(df, 'Hours'))
+        supervisor = pd.DataFrame({
+            "date": text(df['Date']),
+            "employee": "Tom Richards",  # From sheet title
+            "role": "Site Supervisor",
+            "hours": supervisor_hours,
+            "rate": 75.0,  # From sheet title
+            "cost": supervisor_hours * 75.0,
+            "task": text(column(df, 'Notes'), default="")
+        })
+
+        # Read Labourers sheet (header at row 2, 0-indexed)
+        df = read_sheet(file_path, "Labourers", header=2, key='Date')
+        labour = pd.DataFrame({
+            "date": text(df['Date']),
+            "employee": text(df['Name']),
+            "role": "Labourer",
+            "hours": number(column(df, 'Hours')),
+            "rate": number(column(df, 'Rate')),
+            "cost": number(column(df, 'Amount')),
+            "task": text(column(df, 'Task'), default="")
+        })
+
+        return pd.concat([supervisor, labour], ignore_index=True)
+
+    @cached_workbook(PURCHASE_ORDERS_FILE)
+    def purchase_order_frame(self) -> pd.DataFrame:
+        """PO register of Purchase_Orders_Master.xlsx"""
+        file_path = self._workbook(PURCHASE_ORDERS_FILE)
+
+        # Read PO Register sheet
+        df = read_sheet(file_path, "PO Register", header=2, key='PO#')
+        amount = number(column(df, 'Amount'))
+        gst = amount * 0.1  # Calculate 10% GST
+
+        return pd.DataFrame({
+            "po_num": text(df['PO#']),
+            "date": text(df['Date']),
+            "supplier": text(df['Supplier']),
+            "description": text(df['Description']),
+            "category": "Materials",  # Default category
+            "amount": amount,
+            "gst": gst,
+            "total": amount + gst,
+            "invoice_received": text(column(df, 'Invoice Received'), default="NO"),
+            "paid": text(column(df, 'Status'), default="PENDING"),
+            "notes": text(column(df, 'Delivery Date'), default="")
+        })
+
     def read_budget_file(self) -> Dict[str, Any]:
         """Read MASTER_PROJECT_BUDGET.xlsx and extract data"""
         try:
-            file_path = self.base_dir / "12_BUDGET_TRACKING" / "MASTER_PROJECT_BUDGET.xlsx"
-
-            if not file_path.exists():
-                print(f"Budget file not found at: {file_path}")
-                return {"error": "Budget file not found", "items": []}
-
-            # Read Budget Summary sheet (headers at row 5, 0-indexed = 4)
-            df = pd.read_excel(file_path, sheet_name="Budget Summary", header=4)
-
-            # Clean up data
-            df = df.dropna(how='all')  # Remove completely empty rows
-            df = df[df['Cost Category'].notna()]  # Remove rows without category
-
-            # Filter out total row
-            df = df[df['Cost Category'] != 'TOTAL']
-
-            budget_items = []
-            for _, row in df.iterrows():
-                try:
-                    # Calculate % Complete from % Spent (which has formulas like =C6/B6)
-                    budget = float(row['Budget Amount']) if pd.notna(row['Budget Amount']) else 0
-                    actual = float(row['Actual Spent']) if pd.notna(row['Actual Spent']) else 0
-
-                    # Calculate percent from actual data
-                    percent_complete = 0
-                    if budget > 0:
-                        percent_complete = int((actual / budget) * 100)
-
-                    budget_items.append({
-                        "category": str(row['Cost Category']).strip(),
-                        "description": str(row['Notes']) if pd.notna(row['Notes']) else "",
-                        "budget": budget,
-                        "actual_spent": actual,
-                        "committed": 0,  # Not in new structure
-                        "forecast": budget,  # Use budget as forecast
-                        "variance": float(row['Variance']) if pd.notna(row['Variance']) else (budget - actual),
-                        "percent_complete": percent_complete,
-                        "notes": str(row['Status']) if pd.notna(row['Status']) else ""
-                    })
-                except Exception as e:
-                    print(f"Error processing row: {e}")
-                    continue
-
+            budget_items = records(self.budget_frame())
             print(f"✓ Budget file processed: {len(budget_items)} items")
             return {"items": budget_items}
 
+        except FileNotFoundError as e:
+            print(f"Budget file not found at: {e}")
+            return {"error": "Budget file not found", "items": []}
         except Exception as e:
             print(f"Error reading budget file: {e}")
             return {"error": str(e), "items": []}
@@ -74,53 +273,12 @@ class ExcelProcessor:
     def read_subcontractors(self) -> Dict[str, Any]:
         """Read Subcontractor_Register.xlsx"""
         try:
-            file_path = self.base_dir / "07_SUBCONTRACTORS" / "Subcontractor_Register.xlsx"
-
-            if not file_path.exists():
-                return {"error": "Subcontractor file not found", "subcontractors": [], "payments": []}
-
-            # Read Active Subbies sheet
-            df_subbies = pd.read_excel(file_path, sheet_name="Active Subbies", header=2)
-            df_subbies = df_subbies.dropna(how='all')
-
-            subcontractors = []
-            for _, row in df_subbies.iterrows():
-                if pd.notna(row['ID']):
-                    subcontractors.append({
-                        "id": str(row['ID']),
-                        "company_name": str(row['Company Name']),
-                        "contact": str(row['Contact']),
-                        "phone": str(row['Phone']),
-                        "email": str(row['Email']) if pd.notna(row['Email']) else "",
-                        "abn": str(row['ABN']),
-                        "license": str(row['License']),
-                        "insurance_expiry": str(row['Insurance Expiry']),
-                        "contract_value": float(row['Contract Value']) if pd.notna(row['Contract Value']) else 0,
-                        "status": str(row['Status'])
-                    })
-
-            # Read Payment Schedule sheet
-            df_payments = pd.read_excel(file_path, sheet_name="Payment Schedule", header=2)
-            df_payments = df_payments.dropna(how='all')
-
-            payments = []
-            for _, row in df_payments.iterrows():
-                if pd.notna(row['Payment ID']):
-                    payments.append({
-                        "payment_id": str(row['Payment ID']),
-                        "subcontractor": str(row['Subcontractor']),
-                        "invoice_num": str(row['Invoice #']),
-                        "description": str(row['Description']),
-                        "amount": float(row['Amount']) if pd.notna(row['Amount']) else 0,
-                        "gst": float(row['GST']) if pd.notna(row['GST']) else 0,
-                        "total": float(row['Total']) if pd.notna(row['Total']) else 0,
-                        "due_date": str(row['Due Date']),
-                        "status": str(row['Status'])
-                    })
-
+            subcontractors, payments = self.subcontractor_frames()
             print(f"✓ Subcontractors: {len(subcontractors)}, Payments: {len(payments)}")
-            return {"subcontractors": subcontractors, "payments": payments}
+            return {"subcontractors": records(subcontractors), "payments": records(payments)}
 
+        except FileNotFoundError:
+            return {"error": "Subcontractor file not found", "subcontractors": [], "payments": []}
         except Exception as e:
             print(f"Error reading subcontractor file: {e}")
             return {"error": str(e), "subcontractors": [], "payments": []}
@@ -128,48 +286,12 @@ class ExcelProcessor:
     def read_client_payments(self) -> Dict[str, Any]:
         """Read Client_Payment_Tracker.xlsx"""
         try:
-            file_path = self.base_dir / "11_CLIENT_BILLING" / "Client_Payment_Tracker.xlsx"
-
-            if not file_path.exists():
-                return {"error": "Client payment file not found", "milestones": [], "variations": []}
-
-            # Read Payment Schedule sheet
-            df_milestones = pd.read_excel(file_path, sheet_name="Payment Schedule", header=2)
-            df_milestones = df_milestones.dropna(how='all')
-
-            milestones = []
-            for _, row in df_milestones.iterrows():
-                if pd.notna(row['Milestone']):
-                    milestones.append({
-                        "milestone": str(row['Milestone']),
-                        "invoice_num": str(row['Invoice#']),
-                        "description": str(row['Description']),
-                        "amount": float(row['Amount']) if pd.notna(row['Amount']) else 0,
-                        "due_date": str(row['Due Date']),
-                        "paid_date": str(row['Paid Date']) if pd.notna(row['Paid Date']) else "",
-                        "status": str(row['Status'])
-                    })
-
-            # Read Variations sheet
-            df_variations = pd.read_excel(file_path, sheet_name="Variations", header=2)
-            df_variations = df_variations.dropna(how='all')
-
-            variations = []
-            for _, row in df_variations.iterrows():
-                if pd.notna(row['VO#']):
-                    variations.append({
-                        "vo_num": str(row['VO#']),
-                        "date": str(row['Date']),
-                        "description": str(row['Description']),
-                        "cost": float(row['Cost']) if pd.notna(row['Cost']) else 0,
-                        "client_price": float(row['Client Price']) if pd.notna(row['Client Price']) else 0,
-                        "status": str(row['Status']),
-                        "invoiced": str(row['Invoiced'])
-                    })
-
+            milestones, variations = self.client_payment_frames()
             print(f"✓ Milestones: {len(milestones)}, Variations: {len(variations)}")
-            return {"milestones": milestones, "variations": variations}
+            return {"milestones": records(milestones), "variations": records(variations)}
 
+        except FileNotFoundError:
+            return {"error": "Client payment file not found", "milestones": [], "variations": []}
         except Exception as e:
             print(f"Error reading client payment file: {e}")
             return {"error": str(e), "milestones": [], "variations": []}
@@ -177,32 +299,12 @@ class ExcelProcessor:
     def read_defects(self) -> Dict[str, Any]:
         """Read Defects_And_Snagging.xlsx"""
         try:
-            file_path = self.base_dir / "15_DEFECTS_SNAGGING" / "Defects_And_Snagging.xlsx"
-
-            if not file_path.exists():
-                return {"error": "Defects file not found", "defects": []}
-
-            df = pd.read_excel(file_path, sheet_name="Defects List", header=2)
-            df = df.dropna(how='all')
-
-            defects = []
-            for _, row in df.iterrows():
-                if pd.notna(row['ID']):
-                    defects.append({
-                        "id": str(row['ID']),
-                        "location": str(row['Location']),
-                        "trade": str(row['Trade']),
-                        "description": str(row['Description']),
-                        "severity": str(row['Severity']),
-                        "reported_date": str(row['Reported Date']),
-                        "due_date": str(row['Due Date']),
-                        "status": str(row['Status']),
-                        "notes": str(row['Notes']) if pd.notna(row['Notes']) else ""
-                    })
-
+            defects = records(self.defects_frame())
             print(f"✓ Defects: {len(defects)}")
             return {"defects": defects}
 
+        except FileNotFoundError:
+            return {"error": "Defects file not found", "defects": []}
         except Exception as e:
             print(f"Error reading defects file: {e}")
             return {"error": str(e), "defects": []}
@@ -210,50 +312,12 @@ class ExcelProcessor:
     def read_timesheets(self) -> Dict[str, Any]:
         """Read Timesheets_September_2024.xlsx"""
         try:
-            file_path = self.base_dir / "08_LABOUR_TIMESHEETS" / "Timesheets_September_2024.xlsx"
-
-            if not file_path.exists():
-                return {"error": "Timesheets file not found", "entries": []}
-
-            # Read Site Supervisor sheet (header at row 4, 0-indexed)
-            df_supervisor = pd.read_excel(file_path, sheet_name="Site Supervisor", header=4)
-            df_supervisor = df_supervisor.dropna(how='all')
-
-            # Read Labourers sheet (header at row 2, 0-indexed)
-            df_labour = pd.read_excel(file_path, sheet_name="Labourers", header=2)
-            df_labour = df_labour.dropna(how='all')
-
-            timesheet_entries = []
-
-            # Process supervisor entries
-            for _, row in df_supervisor.iterrows():
-                if pd.notna(row.get('Date')):
-                    timesheet_entries.append({
-                        "date": str(row['Date']),
-                        "employee": "Tom Richards",  # From sheet title
-                        "role": "Site Supervisor",
-                        "hours": float(row['Hours']) if pd.notna(row.get('Hours')) else 0,
-                        "rate": 75.0,  # From sheet title
-                        "cost": float(row['Hours']) * 75.0 if pd.notna(row.get('Hours')) else 0,
-                        "task": str(row['Notes']) if pd.notna(row.get('Notes')) else ""
-                    })
-
-            # Process labour entries
-            for _, row in df_labour.iterrows():
-                if pd.notna(row.get('Date')):
-                    timesheet_entries.append({
-                        "date": str(row['Date']),
-                        "employee": str(row['Name']),
-                        "role": "Labourer",
-                        "hours": float(row['Hours']) if pd.notna(row.get('Hours')) else 0,
-                        "rate": float(row['Rate']) if pd.notna(row.get('Rate')) else 0,
-                        "cost": float(row['Amount']) if pd.notna(row.get('Amount')) else 0,
-                        "task": str(row['Task']) if pd.notna(row.get('Task')) else ""
-                    })
-
+            timesheet_entries = records(self.timesheet_frame())
             print(f"✓ Timesheets: {len(timesheet_entries)} entries")
             return {"entries": timesheet_entries}
 
+        except FileNotFoundError:
+            return {"error": "Timesheets file not found", "entries": []}
         except Exception as e:
             print(f"Error reading timesheets file: {e}")
             return {"error": str(e), "entries": []}
@@ -261,39 +325,12 @@ class ExcelProcessor:
     def read_purchase_orders(self) -> Dict[str, Any]:
         """Read Purchase_Orders_Master.xlsx"""
         try:
-            file_path = self.base_dir / "06_PURCHASE_ORDERS_INVOICES" / "Purchase_Orders_Master.xlsx"
-
-            if not file_path.exists():
-                return {"error": "Purchase orders file not found", "orders": []}
-
-            # Read PO Register sheet
-            df = pd.read_excel(file_path, sheet_name="PO Register", header=2)
-            df = df.dropna(how='all')
-
-            purchase_orders = []
-            for _, row in df.iterrows():
-                if pd.notna(row.get('PO#')):
-                    amount = float(row['Amount']) if pd.notna(row.get('Amount')) else 0
-                    gst = amount * 0.1  # Calculate 10% GST
-                    total = amount + gst
-
-                    purchase_orders.append({
-                        "po_num": str(row['PO#']),
-                        "date": str(row['Date']),
-                        "supplier": str(row['Supplier']),
-                        "description": str(row['Description']),
-                        "category": "Materials",  # Default category
-                        "amount": amount,
-                        "gst": gst,
-                        "total": total,
-                        "invoice_received": str(row['Invoice Received']) if pd.notna(row.get('Invoice Received')) else "NO",
-                        "paid": str(row['Status']) if pd.notna(row.get('Status')) else "PENDING",
-                        "notes": str(row['Delivery Date']) if pd.notna(row.get('Delivery Date')) else ""
-                    })
-
+            purchase_orders = records(self.purchase_order_frame())
             print(f"✓ Purchase Orders: {len(purchase_orders)}")
             return {"orders": purchase_orders}
 
+        except FileNotFoundError:
+            return {"error": "Purchase orders file not found", "orders": []}
         except Exception as e:
             print(f"Error reading purchase orders file: {e}")
             return {"error": str(e), "orders": []}
@@ -2,20 +2,31 @@
 Bulk File Extraction Service
 Extracts data from all PDFs and Excel files in a project folder
 """
-import os
+import time
 import uuid
+from concurrent.futures import Future
 from pathlib import Path
-from typing import Dict, List, Any, Optional
-import json
-from datetime import datetime
+from typing import Callable, Dict, List, Any, Optional
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 
+from app.database import get_db_writer
+from app.models.columnar import DEFAULT_TABLE
 from app.models.extraction import ExtractionJob, ExtractedData, JobStatus
+from app.services.file_manifest import FileManifest
 from app.services.mineru_service import extract_with_mineru
-import openpyxl
+from app.services.progress_bus import get_progress_bus, job_channel
+from app.services.project_registry import get_project_registry
+from app.services.workbook_reader import read_excel
 import pandas as pd
 
 
+# Minimum seconds between progress writes to the job row; live progress is
+# published on the progress bus after every file
+PROGRESS_PERSIST_INTERVAL = 2.0
+
+
 class FileExtractor:
     """Extract data from all files in a project directory"""
 
@@ -31,38 +42,46 @@ class FileExtractor:
 
     def scan_files(self) -> List[Dict[str, str]]:
         """
-        Scan project data folder for all supported files.
+        List the supported files in the project data folder.
+
+        The inventory comes from the project registry, which rescans the
+        folder only when it changed. Size and mtime are read from each file
+        here rather than taken from the registry: a file rewritten in place
+        doesn't change its folder, so the registry can hold stale stats
+        until its next rescan, and the manifest diff relies on them.
 
         Returns:
-            List of file info dicts with path, name, type
+            List of file info dicts with path, name, type, size, mtime_ns
         """
         files = []
 
-        if not self.base_path.exists():
-            return files
-
-        # Recursively scan all files
-        for root, dirs, filenames in os.walk(self.base_path):
-            for filename in filenames:
-                file_path = Path(root) / filename
-                extension = file_path.suffix.lower()
-
-                # Determine file type
-                file_type = None
-                if extension in self.supported_extensions['pdf']:
-                    file_type = 'pdf'
-                elif extension in self.supported_extensions['excel']:
-                    file_type = 'excel'
-                elif extension in self.supported_extensions['csv']:
-                    file_type = 'csv'
-
-                if file_type:
-                    files.append({
-                        'path': str(file_path),
-                        'name': filename,
-                        'type': file_type,
-                        'size': file_path.stat().st_size
-                    })
+        for entry in get_project_registry().files(self.project_id):
+            extension = Path(entry.name).suffix.lower()
+
+            # Determine file type
+            file_type = None
+            if extension in self.supported_extensions['pdf']:
+                file_type = 'pdf'
+            elif extension in self.supported_extensions['excel']:
+                file_type = 'excel'
+            elif extension in self.supported_extensions['csv']:
+                file_type = 'csv'
+
+            if file_type:
+                path = self.base_path / entry.path
+                try:
+                    stat = path.stat()
+                except OSError:
+                    # Removed since the registry last scanned the folder
+                    continue
+
+                files.append({
+                    'path': str(path),
+                    'name': entry.name,
+                    'type': file_type,
+                    'size': stat.st_size,
+                    'mtime_ns': stat.st_mtime_ns
+                })
 
         return files
 
@@ -135,29 +154,14 @@ class FileExtractor:
             file_path: Absolute path to Excel file
 
         Returns:
-            Dict with structured_data (JSON string) and extraction_status
+            Dict with tables (DataFrame per sheet) and extraction_status
         """
         try:
-            # Use pandas for robust Excel reading
-            df = pd.read_excel(file_path, sheet_name=None)  # Read all sheets
-
-            # Convert to structured format
-            structured_data = {}
-            raw_text_parts = []
-
-            for sheet_name, sheet_df in df.items():
-                # Convert sheet to dict
-                sheet_data = sheet_df.to_dict(orient='records')
-                structured_data[sheet_name] = sheet_data
-
-                # Also create text representation for searching
-                for row in sheet_data:
-                    row_text = ' | '.join([f"{k}: {v}" for k, v in row.items() if pd.notna(v)])
-                    raw_text_parts.append(row_text)
+            # Read all sheets with the configured engine
+            tables = read_excel(file_path, sheet_name=None)
 
             return {
-                'raw_text': '\n'.join(raw_text_parts),
-                'structured_data': json.dumps(structured_data),
+                'tables': tables,
                 'extraction_status': 'success',
                 'extraction_method': 'pandas',
                 'error_message': None
@@ -165,7 +169,7 @@ class FileExtractor:
         except Exception as e:
             return {
                 'raw_text': '',
-                'structured_data': None,
+                'tables': None,
                 'extraction_status': 'failed',
                 'extraction_method': 'pandas',
                 'error_message': str(e)
@@ -179,23 +183,13 @@ class FileExtractor:
             file_path: Absolute path to CSV file
 
         Returns:
-            Dict with structured_data and extraction_status
+            Dict with tables (a single DataFrame) and extraction_status
         """
         try:
             df = pd.read_csv(file_path)
 
-            # Convert to structured format
-            structured_data = df.to_dict(orient='records')
-
-            # Create text representation
-            raw_text_parts = []
-            for row in structured_data:
-                row_text = ' | '.join([f"{k}: {v}" for k, v in row.items() if pd.notna(v)])
-                raw_text_parts.append(row_text)
-
             return {
-                'raw_text': '\n'.join(raw_text_parts),
-                'structured_data': json.dumps(structured_data),
+                'tables': {DEFAULT_TABLE: df},
                 'extraction_status': 'success',
                 'extraction_method': 'pandas',
                 'error_message': None
@@ -203,22 +197,22 @@ class FileExtractor:
         except Exception as e:
             return {
                 'raw_text': '',
-                'structured_data': None,
+                'tables': None,
                 'extraction_status': 'failed',
                 'extraction_method': 'pandas',
                 'error_message': str(e)
             }
 
-    def process_single_file(self, file_info: Dict[str, str], job_id: str) -> bool:
+    def extract_file(self, file_info: Dict[str, str], job_id: str) -> Optional[ExtractedData]:
         """
-        Process a single file and store extracted data.
+        Extract a single file into an unsaved ExtractedData row.
 
         Args:
             file_info: Dict with file path, name, type
             job_id: Job identifier
 
         Returns:
-            True if successful, False if failed
+            ExtractedData instance, or None for unsupported file types
         """
         file_type = file_info['type']
         file_path = file_info['path']
@@ -231,9 +225,8 @@ class FileExtractor:
         elif file_type == 'csv':
             extraction_result = self.extract_csv(file_path)
         else:
-            return False
+            return None
 
-        # Store in database
         extracted_data = ExtractedData(
             job_id=job_id,
             project_id=self.project_id,
@@ -241,24 +234,106 @@ class FileExtractor:
             file_name=file_info['name'],
             file_type=file_type,
             extraction_method=extraction_result.get('extraction_method'),
-            raw_text=extraction_result.get('raw_text'),
-            structured_data=extraction_result.get('structured_data'),
             extraction_status=extraction_result.get('extraction_status'),
             error_message=extraction_result.get('error_message')
         )
 
-        self.db.add(extracted_data)
-        self.db.commit()
+        # Tables are stored columnar; their text rendering is derived on access
+        if extraction_result.get('tables') is not None:
+            extracted_data.tables = extraction_result['tables']
+        else:
+            extracted_data.raw_text = extraction_result.get('raw_text')
 
-        return extraction_result['extraction_status'] == 'success'
+        return extracted_data
 
-    def run_extraction(self, job_id: str):
+    def store_extracted_data(
+        self,
+        extracted_data: ExtractedData,
+        file_info: Optional[Dict[str, Any]] = None
+    ) -> Future:
+        """
+        Queue an extracted row on the shared writer.
+
+        The row is merged into the writer's session, so the instance passed
+        in stays usable (and unexpired) in the calling thread.
+
+        Args:
+            extracted_data: Unsaved row from extract_file()
+            file_info: Scanned file info; when given and the extraction
+                succeeded, the file's manifest entry is updated in the same
+                transaction
+
+        Returns:
+            Future resolving to the stored row's id once committed
+        """
+        def insert(session: Session) -> int:
+            row = session.merge(extracted_data)
+            session.flush()
+            if file_info is not None and extracted_data.extraction_status == 'success':
+                FileManifest.record(session, self.project_id, file_info, row.id)
+            return row.id
+
+        return get_db_writer().submit(insert)
+
+    def process_single_file(self, file_info: Dict[str, str], job_id: str) -> bool:
+        """
+        Process a single file and store extracted data.
+
+        Args:
+            file_info: Dict with file path, name, type
+            job_id: Job identifier
+
+        Returns:
+            True if successful, False if failed
+        """
+        extracted_data = self.extract_file(file_info, job_id)
+        if extracted_data is None:
+            return False
+
+        # Store in database (queued on the shared writer so background
+        # extraction doesn't hold the SQLite write lock once per file)
+        self.store_extracted_data(extracted_data)
+
+        return extracted_data.extraction_status == 'success'
+
+    def _queue_job_update(self, job_id: str, **values):
+        """Queue an update of the job row on the shared writer."""
+        get_db_writer().submit(
+            lambda session: session.query(ExtractionJob)
+            .filter(ExtractionJob.job_id == job_id)
+            .update(values, synchronize_session=False)
+        )
+
+    def run_extraction(
+        self,
+        job_id: str,
+        final: bool = True,
+        on_extracted: Optional[Callable[[ExtractedData, Future], None]] = None,
+        incremental: bool = True
+    ):
         """
         Run full extraction for all files in project.
 
+        Progress is published on the job's progress bus channel after every
+        file; the job row itself is only updated every
+        PROGRESS_PERSIST_INTERVAL seconds and when extraction finishes.
+
         Args:
             job_id: Job identifier
+            final: Publish a terminal 'completed' event when done (False when
+                extraction is the first phase of a longer pipeline)
+            on_extracted: Called with each extracted row and the future of its
+                stored id, so downstream stages can start on a file while the
+                rest are still being extracted. Exceptions it raises abort
+                the extraction.
+            incremental: Only extract files that are new or changed since
+                the last run (per the project's file manifest), retracting
+                rows of changed and deleted files. False re-extracts every
+                file.
         """
+        bus = get_progress_bus()
+        channel = job_channel(job_id)
+
         # Get job from database
         job = self.db.query(ExtractionJob).filter(ExtractionJob.job_id == job_id).first()
         if not job:
@@ -268,33 +343,98 @@ class FileExtractor:
         job.status = JobStatus.PROCESSING
         self.db.commit()
 
-        # Scan files
+        # Scan files and drop everything extracted from files that changed
         files = self.scan_files()
+        manifest = FileManifest(self.db, self.project_id)
+        diff = manifest.diff(files)
+        if incremental:
+            files = diff.changed
+        else:
+            diff.keep_ids.clear()
+        manifest.retract(diff)
+
         total_files = len(files)
+        failed_files = 0
+        job.total_files = total_files
+        self.db.commit()
+
+        bus.publish(
+            channel, "phase",
+            job_id=job_id,
+            project_id=self.project_id,
+            status=JobStatus.PROCESSING.value,
+            phase="extraction",
+            total_files=total_files,
+            unchanged_files=len(diff.unchanged) if incremental else 0,
+            deleted_files=len(diff.deleted),
+            processed_files=0,
+            failed_files=0,
+            progress_percent=0.0
+        )
+        last_persisted = time.monotonic()
 
         # Process each file
         for idx, file_info in enumerate(files):
+            error = None
+            extracted_data = None
             try:
-                success = self.process_single_file(file_info, job_id)
-
-                # Update progress
-                job.processed_files = idx + 1
+                extracted_data = self.extract_file(file_info, job_id)
+                success = False
+                if extracted_data is not None:
+                    stored = self.store_extracted_data(extracted_data, file_info)
+                    success = extracted_data.extraction_status == 'success'
                 if not success:
-                    job.failed_files += 1
-
-                job.progress_percent = (job.processed_files / total_files) * 100
-                self.db.commit()
-
+                    failed_files += 1
             except Exception as e:
-                job.failed_files += 1
-                job.processed_files = idx + 1
-                job.progress_percent = (job.processed_files / total_files) * 100
-                self.db.commit()
-
-        # Mark job as completed
-        job.status = JobStatus.COMPLETED
-        job.progress_percent = 100.0
-        self.db.commit()
+                success = False
+                error = str(e)
+                failed_files += 1
+
+            if on_extracted is not None and extracted_data is not None and error is None:
+                on_extracted(extracted_data, stored)
+
+            # Update progress
+            processed_files = idx + 1
+            progress_percent = (processed_files / total_files) * 100
+
+            bus.publish(
+                channel, "file_completed",
+                file_name=file_info['name'],
+                success=success,
+                error=error,
+                processed_files=processed_files,
+                failed_files=failed_files,
+                progress_percent=progress_percent
+            )
+
+            if time.monotonic() - last_persisted >= PROGRESS_PERSIST_INTERVAL:
+                self._queue_job_update(
+                    job_id,
+                    processed_files=processed_files,
+                    failed_files=failed_files,
+                    progress_percent=progress_percent
+                )
+                last_persisted = time.monotonic()
+
+        # Mark job as completed once every queued write has landed
+        self._queue_job_update(
+            job_id,
+            status=JobStatus.COMPLETED,
+            processed_files=total_files,
+            failed_files=failed_files,
+            progress_percent=100.0
+        )
+        get_db_writer().flush()
+        self.db.expire_all()
+
+        bus.publish(
+            channel, "completed" if final else "phase",
+            status=JobStatus.COMPLETED.value,
+            phase="extraction_complete",
+            processed_files=total_files,
+            failed_files=failed_files,
+            progress_percent=100.0
+        )
 
     def get_job_status(self, job_id: str) -> Optional[Dict[str, Any]]:
         """
@@ -311,19 +451,24 @@ class FileExtractor:
         if not job:
             return None
 
-        return {
-            'job_id': job.job_id,
-            'project_id': job.project_id,
-            'status': job.status.value,
-            'total_files': job.total_files,
-            'processed_files': job.processed_files,
-            'failed_files': job.failed_files,
-            'progress_percent': job.progress_percent,
-            'error_message': job.error_message,
-            'metadata': job.job_metadata,  # JSON string with pipeline results
-            'created_at': job.created_at.isoformat() if job.created_at else None,
-            'updated_at': job.updated_at.isoformat() if job.updated_at else None
-        }
+        return job_status_dict(job)
+
+
+def job_status_dict(job: ExtractionJob) -> Dict[str, Any]:
+    """Serialize an extraction job for status responses."""
+    return {
+        'job_id': job.job_id,
+        'project_id': job.project_id,
+        'status': job.status.value,
+        'total_files': job.total_files,
+        'processed_files': job.processed_files,
+        'failed_files': job.failed_files,
+        'progress_percent': job.progress_percent,
+        'error_message': job.error_message,
+        'metadata': job.job_metadata,  # JSON string with pipeline results
+        'created_at': job.created_at.isoformat() if job.created_at else None,
+        'updated_at': job.updated_at.isoformat() if job.updated_at else None
+    }
 
 
 def start_extraction(project_id: str, db: Session) -> str:
@@ -359,3 +504,20 @@ def get_extraction_status(job_id: str, db: Session) -> Optional[Dict[str, Any]]:
     """
     extractor = FileExtractor("", db)  # project_id not needed for status check
     return extractor.get_job_status(job_id)
+
+
+async def get_extraction_status_async(job_id: str, db: AsyncSession) -> Optional[Dict[str, Any]]:
+    """
+    Get status of an extraction job without blocking the event loop.
+
+    Args:
+        job_id: Job identifier
+        db: Async database session
+
+    Returns:
+        Job status dict or None
+    """
+    result = await db.execute(select(ExtractionJob).where(ExtractionJob.job_id == job_id))
+    job = result.scalars().first()
+
+    return job_status_dict(job) if job else None
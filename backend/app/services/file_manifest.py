@@ -0,0 +1,178 @@
+"""
+Project File Manifest
+
+Persistent record of every file extracted from a project's data folder
+(path, size, mtime, content hash and the ExtractedData row it produced).
+Each scan is diffed against it so extraction only runs for new or modified
+files, and rows extracted from files that changed or disappeared are
+retracted instead of accumulating run after run.
+
+Size and mtime are compared first; a file is only hashed when they differ,
+so a rescan of an unchanged 2,000-file project reads no file contents.
+"""
+
+import logging
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Dict, List, Set
+
+from sqlalchemy.orm import Session
+
+from app.models.data_points import DataPoint, DataPointStatus
+from app.models.extraction import ExtractedData, FileManifestEntry
+from app.services.pipeline_stages import hash_file
+
+logger = logging.getLogger(__name__)
+
+# Data points from retracted files with these statuses are deleted; points a
+# person corrected or approved are kept
+RETRACTABLE_STATUSES = [
+    DataPointStatus.EXTRACTED,
+    DataPointStatus.VALIDATED,
+    DataPointStatus.CONFLICTED,
+]
+
+
+@dataclass
+class ManifestDiff:
+    """Result of comparing a scan with the manifest."""
+    added: List[Dict[str, Any]] = field(default_factory=list)
+    modified: List[Dict[str, Any]] = field(default_factory=list)
+    unchanged: List[Dict[str, Any]] = field(default_factory=list)
+    deleted: List[FileManifestEntry] = field(default_factory=list)
+    keep_ids: Set[int] = field(default_factory=set)  # ExtractedData rows still current
+
+    @property
+    def changed(self) -> List[Dict[str, Any]]:
+        """Files that need extracting."""
+        return self.added + self.modified
+
+
+class FileManifest:
+    """File manifest of one project."""
+
+    def __init__(self, db: Session, project_id: str):
+        self.db = db
+        self.project_id = project_id
+
+    def diff(self, files: List[Dict[str, Any]]) -> ManifestDiff:
+        """
+        Compare scanned files with the manifest.
+
+        Changed and added files get a 'sha256' key, used by record() once
+        they are extracted.
+
+        Args:
+            files: File info dicts from FileExtractor.scan_files()
+
+        Returns:
+            ManifestDiff
+        """
+        entries = {
+            entry.file_path: entry
+            for entry in self.db.query(FileManifestEntry).filter(
+                FileManifestEntry.project_id == self.project_id
+            )
+        }
+        existing_ids = {
+            row_id for (row_id,) in self.db.query(ExtractedData.id).filter(
+                ExtractedData.project_id == self.project_id
+            )
+        }
+
+        result = ManifestDiff()
+        touched = False
+
+        for file_info in files:
+            entry = entries.pop(file_info['path'], None)
+            current = entry is not None and entry.extracted_data_id in existing_ids
+
+            if current and entry.file_size == file_info['size'] and entry.file_mtime_ns == file_info['mtime_ns']:
+                result.unchanged.append(file_info)
+                result.keep_ids.add(entry.extracted_data_id)
+                continue
+
+            file_info['sha256'] = hash_file(Path(file_info['path']))
+
+            if current and entry.content_hash == file_info['sha256']:
+                # Touched but not modified
+                entry.file_size = file_info['size']
+                entry.file_mtime_ns = file_info['mtime_ns']
+                touched = True
+                result.unchanged.append(file_info)
+                result.keep_ids.add(entry.extracted_data_id)
+            elif entry is None:
+                result.added.append(file_info)
+            else:
+                result.modified.append(file_info)
+
+        result.deleted = list(entries.values())
+
+        if touched:
+            self.db.commit()
+
+        return result
+
+    def retract(self, diff: ManifestDiff) -> int:
+        """
+        Remove everything extracted from files that are no longer current.
+
+        Deletes the project's ExtractedData rows other than those of
+        unchanged files (covering modified and deleted files as well as
+        duplicate rows from earlier full rescans), their data points, and
+        the manifest entries of deleted files.
+
+        Returns:
+            Number of ExtractedData rows retracted
+        """
+        stale_ids = [
+            row_id for (row_id,) in self.db.query(ExtractedData.id).filter(
+                ExtractedData.project_id == self.project_id
+            )
+            if row_id not in diff.keep_ids
+        ]
+
+        if stale_ids:
+            self.db.query(DataPoint).filter(
+                DataPoint.project_id == self.project_id,
+                DataPoint.source_file_id.in_([str(row_id) for row_id in stale_ids]),
+                DataPoint.status.in_(RETRACTABLE_STATUSES)
+            ).delete(synchronize_session=False)
+
+            self.db.query(ExtractedData).filter(
+                ExtractedData.id.in_(stale_ids)
+            ).delete(synchronize_session=False)
+
+        for entry in diff.deleted:
+            self.db.delete(entry)
+
+        if stale_ids or diff.deleted:
+            self.db.commit()
+            logger.info(
+                f"[{self.project_id}] Retracted {len(stale_ids)} extracted rows "
+                f"({len(diff.modified)} modified, {len(diff.deleted)} deleted files)"
+            )
+
+        return len(stale_ids)
+
+    @staticmethod
+    def record(session: Session, project_id: str, file_info: Dict[str, Any], extracted_data_id: int):
+        """Insert or update a file's manifest entry after it was extracted."""
+        entry = session.query(FileManifestEntry).filter(
+            FileManifestEntry.project_id == project_id,
+            FileManifestEntry.file_path == file_info['path']
+        ).first()
+
+        if entry is None:
+            entry = FileManifestEntry(project_id=project_id, file_path=file_info['path'])
+            session.add(entry)
+
+        entry.file_size = file_info['size']
+        entry.file_mtime_ns = file_info['mtime_ns']
+        entry.content_hash = file_info.get('sha256') or hash_file(Path(file_info['path']))
+        entry.extracted_data_id = extracted_data_id
+
+
+def create_file_manifest(db: Session, project_id: str) -> FileManifest:
+    """Factory function to create a project file manifest."""
+    return FileManifest(db, project_id)
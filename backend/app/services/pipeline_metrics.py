@@ -0,0 +1,254 @@
+"""
+Pipeline Metrics
+
+Structured per-stage telemetry for the financial builder pipeline: wall
+time, process CPU time, memory, input/output counts, throughput and
+whether the stage was served from the stage cache. Metrics are stored in
+ExtractionJob.job_metadata under 'metrics' and can be compared across runs
+to spot the bottleneck stage of a project and regressions between deploys.
+
+Memory:
+- RSS is sampled by a background thread while the pipeline runs, giving
+  the process's peak resident memory per stage.
+- Python allocation peaks (tracemalloc) are only recorded when
+  PIPELINE_TRACE_MEMORY is enabled; tracing slows allocation-heavy code
+  noticeably and is process-wide, so it is off by default.
+
+CPU time is process-wide, so it includes work done by helper threads (the
+database writer, streaming stages) during the stage.
+"""
+
+import logging
+import statistics
+import threading
+import time
+import tracemalloc
+from datetime import datetime
+from typing import Any, Dict, List, Optional
+
+import psutil
+
+logger = logging.getLogger(__name__)
+
+MB = 1024 * 1024
+
+# A stage counts as regressed when it takes this much longer than the
+# median of earlier runs (and at least REGRESSION_MIN_SECONDS longer)
+REGRESSION_THRESHOLD = 1.25
+REGRESSION_MIN_SECONDS = 0.5
+
+
+class _RssSampler:
+    """Background thread tracking peak RSS since the last reset."""
+
+    def __init__(self, interval: float):
+        self.interval = interval
+        self._process = psutil.Process()
+        self._peak = self.current()
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, name="pipeline-rss-sampler", daemon=True)
+        self._thread.start()
+
+    def current(self) -> int:
+        return self._process.memory_info().rss
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            rss = self.current()
+            with self._lock:
+                self._peak = max(self._peak, rss)
+
+    def reset(self) -> int:
+        """Start a new peak window; returns the current RSS."""
+        rss = self.current()
+        with self._lock:
+            self._peak = rss
+        return rss
+
+    def peak(self) -> int:
+        rss = self.current()
+        with self._lock:
+            self._peak = max(self._peak, rss)
+            return self._peak
+
+    def stop(self):
+        self._stop.set()
+        self._thread.join(timeout=1.0)
+
+
+class PipelineMetrics:
+    """Collects stage metrics for one pipeline run."""
+
+    def __init__(self, trace_memory: bool = False, sample_interval: float = 0.05):
+        self.stages: List[Dict[str, Any]] = []
+        self.started_at = datetime.now()
+        self._wall_start = time.perf_counter()
+        self._cpu_start = time.process_time()
+        self._sampler = _RssSampler(sample_interval)
+        self._run_peak_rss = self._sampler.current()
+        self._current: Optional[Dict[str, Any]] = None
+
+        # Only stop tracemalloc on close if we were the ones to start it
+        self._owns_tracing = trace_memory and not tracemalloc.is_tracing()
+        if self._owns_tracing:
+            tracemalloc.start()
+        self.trace_memory = trace_memory
+
+    def start(self, stage: str):
+        """Begin timing a stage (closing the previous one if still open)."""
+        if self._current is not None:
+            self.finish()
+
+        if self.trace_memory:
+            tracemalloc.reset_peak()
+
+        self._current = {
+            'name': stage,
+            'wall_start': time.perf_counter(),
+            'cpu_start': time.process_time(),
+            'rss_start': self._sampler.reset(),
+        }
+
+    def finish(
+        self,
+        items_in: Optional[int] = None,
+        items_out: Optional[int] = None,
+        cached: bool = False,
+        failed: bool = False,
+        **extra
+    ) -> Optional[Dict[str, Any]]:
+        """
+        Record the open stage.
+
+        Args:
+            items_in: Items the stage consumed (files, data points, ...)
+            items_out: Items it produced
+            cached: Stage output came from the stage cache
+            failed: Stage raised
+            **extra: Additional stage-specific counters
+
+        Returns:
+            The recorded stage metrics (None if no stage was open)
+        """
+        current, self._current = self._current, None
+        if current is None:
+            return None
+
+        duration = time.perf_counter() - current['wall_start']
+        rss_peak = self._sampler.peak()
+        self._run_peak_rss = max(self._run_peak_rss, rss_peak)
+        throughput_items = items_in if items_in is not None else items_out
+
+        stage = {
+            'name': current['name'],
+            'duration_s': round(duration, 4),
+            'cpu_s': round(time.process_time() - current['cpu_start'], 4),
+            'rss_start_mb': round(current['rss_start'] / MB, 1),
+            'rss_peak_mb': round(rss_peak / MB, 1),
+            'rss_delta_mb': round((rss_peak - current['rss_start']) / MB, 1),
+            'py_peak_mb': round(tracemalloc.get_traced_memory()[1] / MB, 1) if self.trace_memory else None,
+            'items_in': items_in,
+            'items_out': items_out,
+            'items_per_second': (
+                round(throughput_items / duration, 2) if throughput_items and duration > 0 else None
+            ),
+            'cached': cached,
+            'failed': failed,
+            **extra
+        }
+        self.stages.append(stage)
+        return stage
+
+    def close(self, failed: bool = False) -> Dict[str, Any]:
+        """
+        Finish the run (closing any open stage) and return its metrics.
+
+        Args:
+            failed: The pipeline stopped with an error
+        """
+        if self._current is not None:
+            self.finish(failed=failed)
+
+        self._sampler.stop()
+        if self._owns_tracing:
+            tracemalloc.stop()
+            self._owns_tracing = False
+
+        return self.to_dict()
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Metrics of the run so far, as stored in job metadata."""
+        ran = [stage for stage in self.stages if not stage['cached']]
+        bottleneck = max(ran, key=lambda stage: stage['duration_s'])['name'] if ran else None
+
+        return {
+            'started_at': self.started_at.isoformat(),
+            'total_duration_s': round(time.perf_counter() - self._wall_start, 4),
+            'total_cpu_s': round(time.process_time() - self._cpu_start, 4),
+            'peak_rss_mb': round(self._run_peak_rss / MB, 1),
+            'memory_tracing': self.trace_memory,
+            'bottleneck': bottleneck,
+            'stages': self.stages,
+        }
+
+
+def compare_runs(runs: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """
+    Compare stage metrics across pipeline runs.
+
+    Args:
+        runs: Runs newest first, each with 'job_id', 'created_at' and 'metrics'
+
+    Returns:
+        Dict with a per-run overview, per-stage latest vs baseline (median of
+        the earlier runs, cached stages excluded) and flagged regressions
+    """
+    overview = []
+    durations: Dict[str, List[Optional[float]]] = {}
+
+    for index, run in enumerate(runs):
+        metrics = run['metrics']
+        stage_durations = {}
+        for stage in metrics.get('stages', []):
+            if not stage.get('cached') and not stage.get('failed'):
+                stage_durations[stage['name']] = stage['duration_s']
+
+        overview.append({
+            'job_id': run['job_id'],
+            'created_at': run['created_at'],
+            'mode': run.get('mode'),
+            'total_duration_s': metrics.get('total_duration_s'),
+            'peak_rss_mb': metrics.get('peak_rss_mb'),
+            'bottleneck': metrics.get('bottleneck'),
+            'stage_durations': stage_durations,
+        })
+        for name, duration in stage_durations.items():
+            durations.setdefault(name, [None] * len(runs))[index] = duration
+
+    stages = {}
+    regressions = []
+    for name, series in durations.items():
+        latest = series[0]
+        earlier = [duration for duration in series[1:] if duration is not None]
+        baseline = statistics.median(earlier) if earlier else None
+
+        change_pct = None
+        if latest is not None and baseline:
+            change_pct = round((latest - baseline) / baseline * 100, 1)
+
+        stages[name] = {
+            'latest_s': latest,
+            'baseline_s': baseline,
+            'change_pct': change_pct,
+            'runs': len(earlier) + (latest is not None),
+        }
+
+        if (
+            latest is not None and baseline is not None
+            and latest > baseline * REGRESSION_THRESHOLD
+            and latest - baseline >= REGRESSION_MIN_SECONDS
+        ):
+            regressions.append({'stage': name, 'latest_s': latest, 'baseline_s': baseline, 'change_pct': change_pct})
+
+    return {'runs': overview, 'stages': stages, 'regressions': regressions}
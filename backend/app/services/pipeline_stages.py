@@ -0,0 +1,200 @@
+"""
+Pipeline Stage Cache
+
+Memoizes the financial builder pipeline stage by stage. Each stage records
+a fingerprint of its inputs and a small description of its output; a re-run
+skips every stage whose fingerprint still matches and resumes from the
+first invalidated one.
+
+Stages and their inputs (each fingerprint also chains the upstream one):
+- extract:      content hashes of the project's source files
+- data_points:  active validation rules
+- categorize:   template hash, categorizer keyword-map version, the data
+                points it reads (ids, update times and manual edits), so
+                edits made between runs are picked up
+- populate:     (upstream only)
+
+File hashes are cached by (size, mtime), so fingerprinting an unchanged
+project folder does not re-read any file.
+"""
+
+import hashlib
+import json
+import logging
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, List
+
+logger = logging.getLogger(__name__)
+
+STAGES = ["extract", "data_points", "categorize", "populate"]
+
+# Bump a stage's version when its logic changes so cached results are invalidated
+STAGE_VERSIONS = {
+    "extract": 1,
+    "data_points": 1,
+    "categorize": 1,
+    "populate": 1,
+}
+
+# Stage-specific inputs (keys of the `inputs` dict passed to fingerprints())
+STAGE_INPUTS = {
+    "extract": ["files"],
+    "data_points": ["validation_rules"],
+    "categorize": ["template", "keyword_map", "data_points"],
+    "populate": [],
+}
+
+
+def hash_json(value: Any) -> str:
+    """Stable SHA-256 of a JSON-serializable value."""
+    return hashlib.sha256(json.dumps(value, sort_keys=True, default=str).encode()).hexdigest()
+
+
+def hash_file(path: Path, chunk_size: int = 1024 * 1024) -> str:
+    """SHA-256 of a file's contents."""
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(chunk_size), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+class PipelineStageCache:
+    """Per-project record of stage fingerprints and outputs."""
+
+    def __init__(self, project_id: str, cache_dir: Path):
+        self.project_id = project_id
+        self.cache_dir = Path(cache_dir)
+        self.cache_file = self.cache_dir / "stages.json"
+        self.state = self._load()
+
+    def _load(self) -> Dict[str, Any]:
+        if self.cache_file.exists():
+            try:
+                with open(self.cache_file, "r") as f:
+                    state = json.load(f)
+                state.setdefault("file_hashes", {})
+                state.setdefault("stages", {})
+                return state
+            except Exception as e:
+                logger.warning(f"[{self.project_id}] Ignoring unreadable stage cache: {e}")
+        return {"file_hashes": {}, "stages": {}}
+
+    def save(self):
+        """Persist the cache atomically."""
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        tmp_file = self.cache_file.with_suffix(".tmp")
+        with open(tmp_file, "w") as f:
+            json.dump(self.state, f, indent=2, default=str)
+        tmp_file.replace(self.cache_file)
+
+    def hash_files(self, files: List[Dict[str, Any]]) -> Dict[str, str]:
+        """
+        Content hashes for the project's files, reusing cached hashes for
+        files whose size and mtime are unchanged.
+
+        Args:
+            files: File info dicts from FileExtractor.scan_files()
+
+        Returns:
+            Mapping of file path to SHA-256
+        """
+        cached = self.state["file_hashes"]
+        hashes = {}
+        refreshed = {}
+
+        for file_info in files:
+            path = file_info["path"]
+            stat = Path(path).stat()
+            entry = cached.get(path)
+
+            if entry and entry["size"] == stat.st_size and entry["mtime_ns"] == stat.st_mtime_ns:
+                digest = entry["sha256"]
+            else:
+                digest = hash_file(Path(path))
+
+            hashes[path] = digest
+            refreshed[path] = {"size": stat.st_size, "mtime_ns": stat.st_mtime_ns, "sha256": digest}
+
+        self.state["file_hashes"] = refreshed
+        return hashes
+
+    def fingerprints(self, inputs: Dict[str, Any]) -> Dict[str, str]:
+        """
+        Chained fingerprint for every stage.
+
+        Args:
+            inputs: Stage inputs keyed as in STAGE_INPUTS
+
+        Returns:
+            Mapping of stage name to fingerprint
+        """
+        result = {}
+        upstream = None
+
+        for stage in STAGES:
+            upstream = hash_json({
+                "stage": stage,
+                "version": STAGE_VERSIONS[stage],
+                "upstream": upstream,
+                "inputs": {key: inputs.get(key) for key in STAGE_INPUTS[stage]},
+            })
+            result[stage] = upstream
+
+        return result
+
+    def fresh_stages(self, fingerprints: Dict[str, str], force: bool = False) -> List[str]:
+        """
+        Leading stages that can be skipped.
+
+        A stage is fresh when its recorded fingerprint matches and its output
+        is still available; everything from the first stale stage onward
+        has to run again.
+        """
+        if force:
+            return []
+
+        fresh = []
+        for stage in STAGES:
+            record = self.state["stages"].get(stage)
+            if not record or record.get("fingerprint") != fingerprints[stage]:
+                break
+            if not self._output_available(record.get("output") or {}):
+                break
+            fresh.append(stage)
+
+        return fresh
+
+    @staticmethod
+    def _output_available(output: Dict[str, Any]) -> bool:
+        path = output.get("path")
+        return path is None or Path(path).exists()
+
+    def output(self, stage: str) -> Dict[str, Any]:
+        """Recorded output of a stage."""
+        return (self.state["stages"].get(stage) or {}).get("output") or {}
+
+    def record(self, stage: str, fingerprint: str, output: Dict[str, Any]):
+        """Record a completed stage and drop everything downstream of it."""
+        self.state["stages"][stage] = {
+            "fingerprint": fingerprint,
+            "output": output,
+            "completed_at": datetime.now().isoformat(),
+        }
+        for downstream in STAGES[STAGES.index(stage) + 1:]:
+            self.state["stages"].pop(downstream, None)
+        self.save()
+
+    def write_json(self, name: str, data: Any) -> str:
+        """Store a stage artifact next to the cache and return its path."""
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        path = self.cache_dir / name
+        with open(path, "w") as f:
+            json.dump(data, f, default=str)
+        return str(path)
+
+    @staticmethod
+    def read_json(path: str) -> Any:
+        with open(path, "r") as f:
+            return json.load(f)
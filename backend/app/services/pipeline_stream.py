@@ -0,0 +1,280 @@
+"""
+Streaming Pipeline
+
+Runs the extraction, parsing, deduplication and categorization phases of
+the financial builder as overlapping stages connected by bounded queues:
+
+    extract (caller thread) → parse → dedup/validate → categorize
+
+Each extracted file flows through the whole chain on its own instead of
+waiting for every file to clear the previous phase, so the first
+transactions are categorized while later files are still being extracted.
+Queues hold at most STREAM_QUEUE_SIZE files per stage; a slow stage blocks
+the ones feeding it, which keeps memory bounded by queue depth rather than
+project size.
+
+Deduplication runs in a single thread against one DataPointIndex, so
+points are still checked against everything kept earlier in the run.
+"""
+
+import logging
+import queue
+import threading
+import time
+from concurrent.futures import Future
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, List, Optional, Set, Tuple
+
+from sqlalchemy.orm import Session
+
+from app.models.data_points import DataPoint, DataPointStatus
+from app.models.extraction import ExtractedData
+from app.services.ai_categorizer import AICategorizer
+from app.services.data_point_index import DataPointIndex
+from app.services.data_point_mapper import create_data_point_mapper
+from app.services.file_extractor import FileExtractor
+from app.services.progress_bus import get_progress_bus, job_channel
+from app.services.transaction_parser import create_transaction_parser
+from app.services.validation_rules import ValidationRuleEngine
+
+logger = logging.getLogger(__name__)
+
+# Files in flight between two stages
+STREAM_QUEUE_SIZE = 4
+
+_DONE = object()
+
+
+class PipelineAborted(Exception):
+    """Raised in the producer when a downstream stage has failed."""
+
+
+def data_point_transaction(dp: DataPoint) -> Dict[str, Any]:
+    """Convert a data point to the transaction dict the categorizer expects."""
+    return {
+        'description': dp.description,
+        'amount': dp.amount,
+        'vendor': dp.vendor or '',
+        'date': dp.transaction_date.isoformat() if dp.transaction_date else '',
+        'source_file': dp.source_file_name
+    }
+
+
+@dataclass
+class StreamResult:
+    """Counts and output of a streaming run."""
+    parsed: int = 0
+    processed: int = 0
+    conflicts: int = 0
+    categorized_transactions: List[Dict[str, Any]] = field(default_factory=list)
+    first_categorized_seconds: Optional[float] = None
+
+
+class StreamingPipeline:
+    """Extract → parse → dedup → categorize over bounded queues."""
+
+    def __init__(
+        self,
+        project_id: str,
+        job_id: str,
+        db: Session,
+        categorizer: AICategorizer,
+        queue_size: int = STREAM_QUEUE_SIZE,
+        incremental: bool = True
+    ):
+        self.project_id = project_id
+        self.job_id = job_id
+        self.db = db
+        self.categorizer = categorizer
+        self.queue_size = queue_size
+        self.incremental = incremental
+        self.result = StreamResult()
+
+        self._channel = job_channel(job_id)
+        self._error: Optional[BaseException] = None
+        self._error_lock = threading.Lock()
+        self._emitted: Set[str] = set()
+        self._started = 0.0
+
+    def run(self) -> StreamResult:
+        """
+        Run every streaming stage to completion.
+
+        Returns:
+            StreamResult with counts and categorized transactions
+
+        Raises:
+            Exception: The first error raised by any stage
+        """
+        self._started = time.monotonic()
+        parse_queue: "queue.Queue" = queue.Queue(maxsize=self.queue_size)
+        dedup_queue: "queue.Queue" = queue.Queue(maxsize=self.queue_size)
+        categorize_queue: "queue.Queue" = queue.Queue(maxsize=self.queue_size)
+
+        # Deduplication gets its own session; the caller's session stays with
+        # the extraction loop running in this thread
+        dedup_db = Session(bind=self.db.get_bind(), expire_on_commit=False)
+        mapper = create_data_point_mapper(dedup_db, self.project_id)
+        parser = create_transaction_parser(self.project_id)
+
+        workers = [
+            self._start_stage("parse", parse_queue, dedup_queue, lambda item: self._parse(parser, item)),
+            self._start_stage("dedup", dedup_queue, categorize_queue, self._dedup_handler(dedup_db, mapper)),
+            self._start_stage("categorize", categorize_queue, None, self._categorize),
+        ]
+
+        def on_extracted(extracted_data: ExtractedData, stored: Future):
+            if self._error is not None:
+                raise PipelineAborted()
+            if extracted_data.extraction_status == 'success':
+                parse_queue.put((extracted_data, stored))
+
+        try:
+            get_progress_bus().publish(self._channel, "phase", phase="streaming")
+            extractor = FileExtractor(self.project_id, self.db)
+            try:
+                extractor.run_extraction(
+                    self.job_id, final=False, on_extracted=on_extracted, incremental=self.incremental
+                )
+            except PipelineAborted:
+                pass
+            except Exception as e:
+                self._fail("extract", e)
+            finally:
+                parse_queue.put(_DONE)
+                for worker in workers:
+                    worker.join()
+
+            if self._error is not None:
+                raise self._error
+
+            # Validated points already in the project that this run didn't
+            # emit (e.g. superseded duplicates of earlier runs) are categorized
+            # too, so the output matches the batch pipeline
+            remaining = [
+                data_point_transaction(dp)
+                for dp in mapper.get_data_points_for_processing()
+                if dp.id not in self._emitted
+            ]
+            if remaining:
+                self._categorize(remaining)
+        finally:
+            dedup_db.close()
+
+        logger.info(
+            f"[{self.project_id}] Streaming pipeline: {self.result.parsed} parsed, "
+            f"{self.result.processed} processed, {self.result.conflicts} conflicts, "
+            f"{len(self.result.categorized_transactions)} categorized"
+        )
+        return self.result
+
+    def _start_stage(
+        self,
+        name: str,
+        inbox: "queue.Queue",
+        outbox: Optional["queue.Queue"],
+        handler: Callable[[Any], Any]
+    ) -> threading.Thread:
+        thread = threading.Thread(
+            target=self._run_stage,
+            args=(name, inbox, outbox, handler),
+            name=f"pipeline-{name}-{self.job_id}",
+            daemon=True
+        )
+        thread.start()
+        return thread
+
+    def _run_stage(
+        self,
+        name: str,
+        inbox: "queue.Queue",
+        outbox: Optional["queue.Queue"],
+        handler: Callable[[Any], Any]
+    ):
+        try:
+            while True:
+                item = inbox.get()
+                if item is _DONE:
+                    break
+                # After a failure, keep draining so upstream never blocks
+                if self._error is not None:
+                    continue
+                try:
+                    output = handler(item)
+                except Exception as e:
+                    self._fail(name, e)
+                    continue
+                if outbox is not None and output:
+                    outbox.put(output)
+        finally:
+            if outbox is not None:
+                outbox.put(_DONE)
+
+    def _fail(self, stage: str, error: BaseException):
+        logger.error(f"[{self.project_id}] Streaming stage '{stage}' failed: {error}", exc_info=error)
+        with self._error_lock:
+            if self._error is None:
+                self._error = error
+
+    def _parse(self, parser, item) -> Optional[Tuple[List[DataPoint], Future]]:
+        # Parse without waiting for the row's id; it is filled in by the
+        # dedup stage, by which time the writer has usually committed it
+        extracted_data, stored = item
+        try:
+            data_points = parser.parse_extracted_data(extracted_data, None)
+        except Exception as e:
+            logger.error(f"Error parsing {extracted_data.file_name}: {e}", exc_info=True)
+            return None
+
+        self.result.parsed += len(data_points)
+        return (data_points, stored) if data_points else None
+
+    def _dedup_handler(self, db: Session, mapper) -> Callable[[Tuple[List[DataPoint], Future]], List[Dict[str, Any]]]:
+        state: Dict[str, Any] = {}
+
+        def dedup(item: Tuple[List[DataPoint], Future]) -> List[Dict[str, Any]]:
+            data_points, stored = item
+            source_file_id = stored.result()
+            for dp in data_points:
+                dp.source_file_id = source_file_id
+
+            # Index and rules are loaded on first use and shared by every batch
+            if not state:
+                state['index'] = DataPointIndex.load(db, self.project_id)
+                state['rules'] = ValidationRuleEngine.load(db, self.project_id)
+
+            processed, conflicts = mapper.process_data_points(
+                data_points, index=state['index'], rule_engine=state['rules']
+            )
+            self.result.processed += len(processed)
+            self.result.conflicts += len(conflicts)
+
+            validated = [dp for dp in processed if dp.status == DataPointStatus.VALIDATED]
+            self._emitted.update(dp.id for dp in validated)
+            return [data_point_transaction(dp) for dp in validated]
+
+        return dedup
+
+    def _categorize(self, transactions: List[Dict[str, Any]]):
+        categorized = self.categorizer.categorize_batch(transactions, use_llm=False)
+        self.result.categorized_transactions.extend(categorized)
+
+        if self.result.first_categorized_seconds is None:
+            self.result.first_categorized_seconds = round(time.monotonic() - self._started, 3)
+
+        get_progress_bus().publish(
+            self._channel, "categorized",
+            categorized=len(self.result.categorized_transactions)
+        )
+
+
+def run_streaming_pipeline(
+    project_id: str,
+    job_id: str,
+    db: Session,
+    categorizer: AICategorizer,
+    queue_size: int = STREAM_QUEUE_SIZE,
+    incremental: bool = True
+) -> StreamResult:
+    """Run extraction through categorization as a streaming pipeline."""
+    return StreamingPipeline(project_id, job_id, db, categorizer, queue_size, incremental).run()
@@ -0,0 +1,404 @@
+"""
+Portfolio Pipeline Runner
+
+Runs the financial builder pipeline for many projects at once (e.g. every
+project at month-end close) on a shared pool of worker processes, so CPU
+bound phases of different projects run on different cores instead of one
+project at a time inside the web process.
+
+Scheduling:
+- At most `max_workers` pipelines run at once across all portfolio runs
+  (PORTFOLIO_WORKERS, default one per CPU core).
+- Every worker process commits through its own DatabaseWriter. SQLite
+  takes one writer at a time, so with SQLite the workers' commits queue on
+  the database lock (each waits up to busy_timeout) and the pool is capped
+  at PORTFOLIO_SQLITE_WORKERS to keep those waits short.
+- A project holds at most one worker, so a huge project slows only its own
+  slot and can't starve the rest of the portfolio.
+- When several portfolio runs are active, free workers are handed to the
+  runs in round-robin order.
+- Within a run, larger projects (by bytes of source files) start first so
+  the biggest one doesn't become the straggler at the end of the run.
+
+Each project still gets its own ExtractionJob, so per-project status,
+metrics and downloads work as for a single run; the portfolio run adds a
+consolidated view over those jobs. Workers forward their progress events
+over a queue, and a relay thread publishes them on the web process's
+progress bus, so job status and event streams see portfolio jobs live.
+"""
+
+import logging
+import multiprocessing
+import os
+import threading
+import uuid
+from collections import deque
+from concurrent.futures import Future, ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Any, Deque, Dict, List, Optional
+
+from sqlalchemy.orm import Session
+
+from app.config import get_config
+from app.services.file_extractor import FileExtractor
+from app.services.progress_bus import get_progress_bus
+from app.services.project_registry import get_project_registry
+
+logger = logging.getLogger(__name__)
+
+# Project states within a portfolio run
+QUEUED = "queued"
+RUNNING = "running"
+COMPLETED = "completed"
+FAILED = "failed"
+SKIPPED = "skipped"
+
+_FINISHED = {COMPLETED, FAILED, SKIPPED}
+
+
+def discover_projects() -> List[str]:
+    """Project IDs with a data folder under backend/projects/."""
+    return get_project_registry().project_ids()
+
+
+def _init_worker(events):
+    """Forward a worker process's progress events to the web process."""
+    get_progress_bus().forward = lambda channel, event, data: events.put((channel, event, data))
+
+
+def _relay_events(events):
+    """Publish worker progress events on this process's bus (relay thread)."""
+    bus = get_progress_bus()
+    while True:
+        item = events.get()
+        if item is None:
+            return
+        channel, event, data = item
+        try:
+            bus.publish(channel, event, **data)
+        except Exception as e:
+            logger.error(f"Could not relay {event} event on {channel}: {e}")
+
+
+def run_project_pipeline(project_id: str, job_id: str, force: bool, streaming: bool) -> str:
+    """
+    Run one project's full pipeline (executed in a worker process).
+
+    Returns:
+        Final job status value
+    """
+    # Imported here so worker processes only load the pipeline when they run it
+    from app.database import SessionLocal
+    from app.models.extraction import ExtractionJob
+    from app.routers.financial_builder import run_pipeline_phases
+    from app.services.template_parser import TemplateParser
+
+    db = SessionLocal()
+    try:
+        parser = TemplateParser(project_id)
+        template_dict = parser.parse()
+        parser.save_to_json()
+
+        run_pipeline_phases(project_id, job_id, template_dict, db, force, streaming)
+
+        job = db.query(ExtractionJob).filter(ExtractionJob.job_id == job_id).first()
+        return job.status.value if job else FAILED
+    finally:
+        db.close()
+
+
+@dataclass
+class PortfolioProject:
+    """One project within a portfolio run."""
+    project_id: str
+    job_id: Optional[str] = None
+    total_files: int = 0
+    total_bytes: int = 0
+    status: str = QUEUED
+    error: Optional[str] = None
+    started_at: Optional[datetime] = None
+    finished_at: Optional[datetime] = None
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            'project_id': self.project_id,
+            'job_id': self.job_id,
+            'total_files': self.total_files,
+            'status': self.status,
+            'error': self.error,
+            'started_at': self.started_at.isoformat() if self.started_at else None,
+            'finished_at': self.finished_at.isoformat() if self.finished_at else None,
+        }
+
+
+@dataclass
+class PortfolioRun:
+    """A pipeline run over several projects."""
+    run_id: str
+    force: bool
+    streaming: bool
+    projects: List[PortfolioProject]
+    started_at: datetime = field(default_factory=datetime.now)
+    finished_at: Optional[datetime] = None
+    pending: Deque[PortfolioProject] = field(default_factory=deque)
+
+    @property
+    def done(self) -> bool:
+        return all(project.status in _FINISHED for project in self.projects)
+
+    def to_dict(self) -> Dict[str, Any]:
+        counts = {state: 0 for state in (QUEUED, RUNNING, COMPLETED, FAILED, SKIPPED)}
+        for project in self.projects:
+            counts[project.status] += 1
+
+        return {
+            'run_id': self.run_id,
+            'status': 'completed' if self.done else 'processing',
+            'force': self.force,
+            'streaming': self.streaming,
+            'started_at': self.started_at.isoformat(),
+            'finished_at': self.finished_at.isoformat() if self.finished_at else None,
+            'total_projects': len(self.projects),
+            'counts': counts,
+            'projects': [project.to_dict() for project in self.projects],
+        }
+
+
+class PortfolioRunner:
+    """Schedules project pipelines onto a shared process pool."""
+
+    def __init__(self, max_workers: Optional[int] = None):
+        self.max_workers = max_workers or os.cpu_count() or 1
+        self._executor: Optional[ProcessPoolExecutor] = None
+        self._runs: Dict[str, PortfolioRun] = {}
+        self._active: Deque[str] = deque()  # run IDs with pending projects, round-robin order
+        self._in_flight = 0
+        self._lock = threading.RLock()
+        self._events = None  # Worker progress events (multiprocessing queue)
+        self._relay: Optional[threading.Thread] = None
+
+    def start_run(
+        self,
+        db: Session,
+        project_ids: Optional[List[str]] = None,
+        force: bool = False,
+        streaming: bool = False
+    ) -> PortfolioRun:
+        """
+        Create jobs for the given projects (default: all) and queue them.
+
+        Projects without files, or already queued or running in another
+        portfolio run, are marked skipped.
+
+        Args:
+            db: Database session used to create the extraction jobs
+            project_ids: Projects to run (default: every discovered project)
+            force: Re-run every stage even if its inputs are unchanged
+            streaming: Run phases 1-5 as a streaming pipeline
+
+        Returns:
+            The new PortfolioRun
+        """
+        project_ids = project_ids or discover_projects()
+        run = PortfolioRun(
+            run_id=f"portfolio_{datetime.now().strftime('%Y%m%d_%H%M%S')}_{uuid.uuid4().hex[:8]}",
+            force=force,
+            streaming=streaming,
+            projects=[PortfolioProject(project_id) for project_id in project_ids],
+        )
+
+        with self._lock:
+            busy = self._busy_projects()
+
+            for project in run.projects:
+                if project.project_id in busy:
+                    project.status = SKIPPED
+                    project.error = "Already running in another portfolio run"
+                    continue
+
+                extractor = FileExtractor(project.project_id, db)
+                files = extractor.scan_files()
+                if not files:
+                    project.status = SKIPPED
+                    project.error = "No files found"
+                    continue
+
+                project.total_files = len(files)
+                project.total_bytes = sum(f['size'] for f in files)
+                project.job_id = extractor.create_extraction_job()
+
+            queued = [project for project in run.projects if project.status == QUEUED]
+            run.pending.extend(sorted(queued, key=lambda project: project.total_bytes, reverse=True))
+
+            self._runs[run.run_id] = run
+            if run.pending:
+                self._active.append(run.run_id)
+            else:
+                run.finished_at = datetime.now()
+            self._dispatch()
+
+        logger.info(
+            f"Portfolio run {run.run_id}: {len(queued)} projects queued, "
+            f"{len(run.projects) - len(queued)} skipped, {self.max_workers} workers"
+        )
+        return run
+
+    def get_run(self, run_id: str) -> Optional[PortfolioRun]:
+        return self._runs.get(run_id)
+
+    def list_runs(self) -> List[PortfolioRun]:
+        """Portfolio runs of this process, newest first."""
+        return sorted(self._runs.values(), key=lambda run: run.started_at, reverse=True)
+
+    def shutdown(self):
+        """Stop dispatching and wait for running pipelines to finish."""
+        with self._lock:
+            self._active.clear()
+            executor, self._executor = self._executor, None
+            events, self._events = self._events, None
+            relay, self._relay = self._relay, None
+        if executor is not None:
+            executor.shutdown(wait=True, cancel_futures=True)
+        if events is not None:
+            events.put(None)
+            relay.join(timeout=5.0)
+
+    def _busy_projects(self) -> set:
+        return {
+            project.project_id
+            for run in self._runs.values()
+            for project in run.projects
+            if project.status in (QUEUED, RUNNING)
+        }
+
+    def _get_executor(self) -> ProcessPoolExecutor:
+        if self._executor is None:
+            # Spawned workers don't inherit the web process's threads and locks
+            context = multiprocessing.get_context("spawn")
+            if self._events is None:
+                self._events = context.Queue()
+                self._relay = threading.Thread(
+                    target=_relay_events, args=(self._events,), name="portfolio-events", daemon=True
+                )
+                self._relay.start()
+            self._executor = ProcessPoolExecutor(
+                max_workers=self.max_workers,
+                mp_context=context,
+                initializer=_init_worker,
+                initargs=(self._events,)
+            )
+        return self._executor
+
+    def _dispatch(self):
+        """Fill free workers, taking one project per active run in turn."""
+        with self._lock:
+            while self._in_flight < self.max_workers and self._active:
+                run = self._runs[self._active.popleft()]
+                project = run.pending.popleft()
+                if run.pending:
+                    self._active.append(run.run_id)
+
+                project.status = RUNNING
+                project.started_at = datetime.now()
+                self._in_flight += 1
+
+                try:
+                    future = self._get_executor().submit(
+                        run_project_pipeline, project.project_id, project.job_id, run.force, run.streaming
+                    )
+                except Exception as e:
+                    self._finish(run, project, None, e)
+                    continue
+
+                future.add_done_callback(
+                    lambda f, run=run, project=project: self._on_done(run, project, f)
+                )
+
+    def _on_done(self, run: PortfolioRun, project: PortfolioProject, future: Future):
+        try:
+            status = future.result()
+            error = None
+        except Exception as e:
+            status, error = None, e
+
+        with self._lock:
+            self._finish(run, project, status, error)
+            self._dispatch()
+
+    def _finish(
+        self,
+        run: PortfolioRun,
+        project: PortfolioProject,
+        status: Optional[str],
+        error: Optional[BaseException]
+    ):
+        self._in_flight -= 1
+        project.finished_at = datetime.now()
+
+        if isinstance(error, BrokenProcessPool):
+            # A worker died (e.g. out of memory); start a fresh pool for the rest
+            self._executor = None
+
+        if error is not None:
+            logger.error(f"Portfolio run {run.run_id}: {project.project_id} failed: {error}")
+            project.status = FAILED
+            project.error = str(error)
+            self._fail_job(project, str(error))
+        else:
+            project.status = COMPLETED if status == COMPLETED else FAILED
+
+        if run.done:
+            run.finished_at = datetime.now()
+            logger.info(f"Portfolio run {run.run_id} finished")
+
+    def _fail_job(self, project: PortfolioProject, message: str):
+        """Mark a job failed when its worker died before the pipeline could."""
+        from app.database import SessionLocal
+        from app.models.extraction import ExtractionJob, JobStatus
+
+        db = SessionLocal()
+        try:
+            job = db.query(ExtractionJob).filter(ExtractionJob.job_id == project.job_id).first()
+            if job is not None and job.status not in (JobStatus.COMPLETED, JobStatus.FAILED):
+                job.status = JobStatus.FAILED
+                job.error_message = message
+                db.commit()
+        except Exception as e:
+            logger.error(f"Could not mark job {project.job_id} failed: {e}")
+        finally:
+            db.close()
+
+
+_runner: Optional[PortfolioRunner] = None
+_runner_lock = threading.Lock()
+
+
+def _worker_count() -> int:
+    """Configured pool size, capped for SQLite (one writer at a time)."""
+    from app import database
+
+    config = get_config()
+    workers = config.portfolio_workers or os.cpu_count() or 1
+    if database.SQLALCHEMY_DATABASE_URL.startswith("sqlite"):
+        workers = min(workers, max(config.portfolio_sqlite_workers, 1))
+    return workers
+
+
+def get_portfolio_runner() -> PortfolioRunner:
+    """Get or create the portfolio runner singleton."""
+    global _runner
+    with _runner_lock:
+        if _runner is None:
+            _runner = PortfolioRunner(_worker_count())
+        return _runner
+
+
+def shutdown_portfolio_runner():
+    """Wait for running portfolio pipelines and release the worker pool."""
+    global _runner
+    with _runner_lock:
+        runner, _runner = _runner, None
+    if runner is not None:
+        runner.shutdown()
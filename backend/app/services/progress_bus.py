@@ -0,0 +1,273 @@
+"""
+Progress Bus
+
+In-process publish/subscribe channel for job progress. Background work
+(pipeline phases, file extraction, template population) publishes events
+from worker threads; Server-Sent Events endpoints subscribe from the event
+loop and push them to the browser, so dashboards no longer poll the
+database for progress.
+
+Channels are plain strings, one per job:
+- job:<job_id>        financial-builder extraction / pipeline jobs
+- file:<file_id>      single-file uploads in /api/extraction
+- template:<job_id>   template population jobs
+
+Each channel keeps a short event history (replayed to late subscribers)
+and a merged state dict of everything published so far, which status
+endpoints can serve without touching the database.
+
+Pipelines run in worker processes (portfolio runs) set `forward` on their
+own bus to send every event back to the web process, where it is
+published again.
+"""
+
+import asyncio
+import contextlib
+import json
+import logging
+import threading
+from collections import OrderedDict, deque
+from datetime import datetime
+from typing import Any, AsyncIterator, Callable, Deque, Dict, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+# Events after which a channel produces nothing more
+TERMINAL_EVENTS = {"completed", "failed"}
+
+SSE_HEADERS = {
+    "Cache-Control": "no-cache",
+    "X-Accel-Buffering": "no",  # Disable proxy buffering (nginx)
+}
+
+
+def job_channel(job_id: str) -> str:
+    return f"job:{job_id}"
+
+
+def file_channel(file_id: str) -> str:
+    return f"file:{file_id}"
+
+
+def template_channel(job_id: str) -> str:
+    return f"template:{job_id}"
+
+
+class _Channel:
+    def __init__(self, history_size: int):
+        self.history: Deque[Dict[str, Any]] = deque(maxlen=history_size)
+        self.state: Dict[str, Any] = {}
+        self.subscribers: List[Tuple[asyncio.AbstractEventLoop, asyncio.Queue]] = []
+        self.seq = 0
+
+
+class ProgressBus:
+    """Thread-safe progress event bus with asyncio subscribers."""
+
+    def __init__(self, history_size: int = 100, max_channels: int = 1000, queue_size: int = 1000):
+        self.history_size = history_size
+        self.max_channels = max_channels
+        self.queue_size = queue_size
+        self._channels: "OrderedDict[str, _Channel]" = OrderedDict()
+        self._lock = threading.Lock()
+        # Called with (channel, event, data) after every publish
+        self.forward: Optional[Callable[[str, str, Dict[str, Any]], None]] = None
+
+    def _get_channel(self, name: str) -> _Channel:
+        channel = self._channels.get(name)
+        if channel is None:
+            channel = _Channel(self.history_size)
+            self._channels[name] = channel
+            # Forget the oldest finished channels
+            while len(self._channels) > self.max_channels:
+                oldest = next(iter(self._channels))
+                if self._channels[oldest].subscribers:
+                    self._channels.move_to_end(oldest)
+                    break
+                del self._channels[oldest]
+        else:
+            self._channels.move_to_end(name)
+        return channel
+
+    def publish(self, channel_name: str, event: str, **data) -> Dict[str, Any]:
+        """
+        Publish an event (safe to call from any thread).
+
+        Args:
+            channel_name: Channel to publish on
+            event: Event type (e.g. 'phase', 'file_completed', 'completed', 'failed')
+            **data: JSON-serializable event payload
+
+        Returns:
+            The published event
+        """
+        with self._lock:
+            channel = self._get_channel(channel_name)
+            channel.seq += 1
+            message = {
+                "seq": channel.seq,
+                "event": event,
+                "timestamp": datetime.now().isoformat(),
+                **data
+            }
+            channel.history.append(message)
+            channel.state.update(data)
+            channel.state["last_event"] = event
+            channel.state["seq"] = channel.seq
+            subscribers = list(channel.subscribers)
+
+        for loop, queue in subscribers:
+            try:
+                loop.call_soon_threadsafe(self._offer, queue, message)
+            except RuntimeError:
+                # Subscriber's loop already closed
+                pass
+
+        if self.forward is not None:
+            self.forward(channel_name, event, data)
+
+        return message
+
+    @staticmethod
+    def _offer(queue: asyncio.Queue, message: Dict[str, Any]):
+        if queue.full():
+            # Slow consumer - drop the oldest pending event
+            try:
+                queue.get_nowait()
+            except asyncio.QueueEmpty:
+                pass
+        queue.put_nowait(message)
+
+    def state(self, channel_name: str) -> Optional[Dict[str, Any]]:
+        """Merged payload of every event published on a channel (None if unknown)."""
+        with self._lock:
+            channel = self._channels.get(channel_name)
+            return dict(channel.state) if channel else None
+
+    def is_finished(self, channel_name: str) -> bool:
+        state = self.state(channel_name)
+        return bool(state) and state.get("last_event") in TERMINAL_EVENTS
+
+    def snapshot(self, channel_name: str) -> Optional[Dict[str, Any]]:
+        """
+        Current state as a single event.
+
+        The event is named after the last terminal event when the job has
+        finished, otherwise 'snapshot'.
+        """
+        state = self.state(channel_name)
+        if not state:
+            return None
+
+        event = state["last_event"] if state["last_event"] in TERMINAL_EVENTS else "snapshot"
+        return {"event": event, "timestamp": datetime.now().isoformat(), **state}
+
+    async def subscribe(self, channel_name: str, replay: bool = True) -> AsyncIterator[Dict[str, Any]]:
+        """
+        Yield events for a channel until a terminal event is seen.
+
+        Args:
+            channel_name: Channel to follow
+            replay: Start with the channel's recent history
+        """
+        queue: asyncio.Queue = asyncio.Queue(maxsize=self.queue_size)
+        subscriber = (asyncio.get_running_loop(), queue)
+
+        with self._lock:
+            channel = self._get_channel(channel_name)
+            channel.subscribers.append(subscriber)
+            backlog = list(channel.history) if replay else []
+
+        try:
+            for message in backlog:
+                yield message
+                if message["event"] in TERMINAL_EVENTS:
+                    return
+
+            while True:
+                message = await queue.get()
+                yield message
+                if message["event"] in TERMINAL_EVENTS:
+                    return
+        finally:
+            with self._lock:
+                if subscriber in channel.subscribers:
+                    channel.subscribers.remove(subscriber)
+
+
+def format_sse(message: Dict[str, Any]) -> str:
+    """Format an event as a Server-Sent Events frame."""
+    return (
+        f"id: {message.get('seq', 0)}\n"
+        f"event: {message.get('event', 'message')}\n"
+        f"data: {json.dumps(message, default=str)}\n\n"
+    )
+
+
+async def event_stream(
+    channel_name: str,
+    initial: Optional[List[Dict[str, Any]]] = None,
+    keepalive: float = 15.0
+) -> AsyncIterator[str]:
+    """
+    SSE body for a channel: initial events, then live events until the job ends.
+
+    Args:
+        channel_name: Channel to follow
+        initial: Events to send first (e.g. a snapshot); the stream ends right
+            away if one of them is terminal, and replayed events already
+            covered by a snapshot's seq are skipped
+        keepalive: Seconds between comment frames while idle
+    """
+    after_seq = 0
+    for message in initial or []:
+        yield format_sse(message)
+        if message.get("event") in TERMINAL_EVENTS:
+            return
+        after_seq = max(after_seq, message.get("seq", 0))
+
+    events = get_progress_bus().subscribe(channel_name).__aiter__()
+    pending = None
+
+    try:
+        while True:
+            if pending is None:
+                pending = asyncio.ensure_future(events.__anext__())
+            done, _ = await asyncio.wait({pending}, timeout=keepalive)
+            if not done:
+                yield ": keepalive\n\n"
+                continue
+
+            try:
+                message = pending.result()
+            except StopAsyncIteration:
+                return
+            pending = None
+
+            if message["seq"] > after_seq:
+                yield format_sse(message)
+            if message["event"] in TERMINAL_EVENTS:
+                return
+    finally:
+        if pending is not None:
+            pending.cancel()
+            with contextlib.suppress(asyncio.CancelledError, StopAsyncIteration):
+                await pending
+        await events.aclose()
+
+
+# Singleton instance
+_progress_bus: Optional[ProgressBus] = None
+_progress_bus_lock = threading.Lock()
+
+
+def get_progress_bus() -> ProgressBus:
+    """Get or create the progress bus singleton."""
+    global _progress_bus
+
+    if _progress_bus is None:
+        with _progress_bus_lock:
+            if _progress_bus is None:
+                _progress_bus = ProgressBus()
+
+    return _progress_bus
@@ -0,0 +1,416 @@
+"""
+Project Registry
+
+In-memory index of the projects under backend/projects/: each project's
+project_info.json and the inventory (files and folders, with size and
+mtime) of its data folder. Project lists, document trees and extraction
+scans read it instead of walking the folders on every call.
+
+A project is rescanned only when it changed:
+- With the watcher running (PROJECT_REGISTRY_WATCH, started with the app),
+  watchdog events under a project's data folder or on its
+  project_info.json mark the project stale; the next read rescans it.
+- Otherwise (watchdog missing, CLI runs, worker processes) every read
+  stats the project's folders, which catches added, deleted and renamed
+  files, and rescans the project at most every
+  PROJECT_REGISTRY_RESCAN_SECONDS to catch files rewritten in place.
+
+Every rescan diffs the new inventory against the old one and appends the
+differences to a change log under a registry-wide version number, so
+clients can poll changes_since(version) instead of refetching trees.
+"""
+
+import copy
+import json
+import logging
+import os
+import threading
+import time
+from collections import deque
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Deque, Dict, List, Optional, Tuple
+
+from app.config import get_config
+
+try:
+    from watchdog.events import FileSystemEventHandler
+    from watchdog.observers import Observer
+except ImportError:  # folder stats only
+    FileSystemEventHandler = object
+    Observer = None
+
+logger = logging.getLogger(__name__)
+
+PROJECTS_DIR = Path(__file__).parent.parent.parent / "projects"
+DATA_FOLDER = "data"
+INFO_FILE = "project_info.json"
+
+# Change records kept for changes_since(); older versions get a reset
+MAX_CHANGES = 10000
+
+ADDED = "added"
+MODIFIED = "modified"
+DELETED = "deleted"
+
+
+@dataclass(frozen=True)
+class FileEntry:
+    """A file or folder in a project's data folder."""
+    path: str  # Relative to the data folder, '/'-separated
+    is_dir: bool
+    size: int
+    mtime_ns: int
+
+    @property
+    def name(self) -> str:
+        return self.path.rsplit("/", 1)[-1]
+
+    @property
+    def parts(self) -> Tuple[str, ...]:
+        return tuple(self.path.split("/"))
+
+
+@dataclass
+class _Project:
+    """Scanned state of one project folder."""
+    info: Optional[Dict[str, Any]] = None
+    info_mtime_ns: Optional[int] = None
+    has_data: bool = False
+    entries: Dict[str, FileEntry] = field(default_factory=dict)
+    folder_mtimes: Dict[str, int] = field(default_factory=dict)  # data-relative folder -> mtime_ns
+    scanned_at: float = 0.0
+
+
+def _scan_data(data_dir: Path) -> Tuple[Dict[str, FileEntry], Dict[str, int]]:
+    """Entries under a data folder (sorted by path), and the mtime of every folder in it."""
+    entries: Dict[str, FileEntry] = {}
+    folder_mtimes: Dict[str, int] = {}
+    pending = [(data_dir, "")]
+    while pending:
+        directory, prefix = pending.pop()
+        try:
+            folder_mtimes[prefix] = directory.stat().st_mtime_ns
+            items = list(os.scandir(directory))
+        except OSError:
+            continue
+        for item in items:
+            path = f"{prefix}/{item.name}" if prefix else item.name
+            try:
+                is_dir = item.is_dir(follow_symlinks=False)
+                stat = item.stat(follow_symlinks=False)
+            except OSError:
+                continue
+            entries[path] = FileEntry(path, is_dir, 0 if is_dir else stat.st_size, stat.st_mtime_ns)
+            if is_dir:
+                pending.append((Path(item.path), path))
+    return dict(sorted(entries.items())), folder_mtimes
+
+
+class _ChangeHandler(FileSystemEventHandler):
+    """Marks projects stale on watchdog events."""
+
+    def __init__(self, registry: "ProjectRegistry"):
+        super().__init__()
+        self.registry = registry
+
+    def on_any_event(self, event):
+        if event.event_type in ("opened", "closed_no_write"):
+            return
+        for path in (event.src_path, getattr(event, "dest_path", "")):
+            if path:
+                self.registry._mark_stale(Path(os.fsdecode(path)))
+
+
+class ProjectRegistry:
+    """Cached project metadata and data-folder inventories."""
+
+    def __init__(self, projects_dir: Path = PROJECTS_DIR, rescan_seconds: float = 5.0):
+        self.projects_dir = Path(projects_dir)
+        self.rescan_seconds = rescan_seconds
+        self._projects: Dict[str, _Project] = {}
+        self._projects_mtime_ns: Optional[int] = None
+        self._stale: set = set()
+        self._stale_root = True
+        self._lock = threading.RLock()
+        self._observer = None
+        self._version = 0
+        self._changes: Deque[Dict[str, Any]] = deque()
+        self._dropped_through = 0  # Newest version with change records dropped from the log
+        self.scans = 0
+
+    # -- Reads ---------------------------------------------------------------
+
+    def project_ids(self) -> List[str]:
+        """Project IDs with a data folder, sorted."""
+        with self._lock:
+            self._refresh_projects()
+            return sorted(pid for pid in list(self._projects) if self.has_data(pid))
+
+    def all_project_ids(self) -> List[str]:
+        """Every project folder (with or without a data folder), sorted."""
+        with self._lock:
+            self._refresh_projects()
+            return sorted(self._projects)
+
+    def project_info(self, project_id: str) -> Optional[Dict[str, Any]]:
+        """A copy of the project's project_info.json, or None."""
+        with self._lock:
+            project = self._project(project_id)
+            return copy.deepcopy(project.info) if project is not None else None
+
+    def project_infos(self) -> List[Dict[str, Any]]:
+        """project_info.json of every project that has one."""
+        with self._lock:
+            self._refresh_projects()
+            infos = [self.project_info(project_id) for project_id in sorted(self._projects)]
+            return [info for info in infos if info is not None]
+
+    def has_data(self, project_id: str) -> bool:
+        with self._lock:
+            project = self._project(project_id)
+            return project is not None and project.has_data
+
+    def data_dir(self, project_id: str) -> Path:
+        return self.projects_dir / project_id / DATA_FOLDER
+
+    def entries(self, project_id: str) -> List[FileEntry]:
+        """Files and folders of a project's data folder, sorted by path."""
+        with self._lock:
+            project = self._project(project_id)
+            if project is None:
+                return []
+            return list(project.entries.values())
+
+    def files(self, project_id: str) -> List[FileEntry]:
+        """Files of a project's data folder, sorted by path."""
+        return [entry for entry in self.entries(project_id) if not entry.is_dir]
+
+    @property
+    def version(self) -> int:
+        with self._lock:
+            return self._version
+
+    def changes_since(self, version: int) -> Dict[str, Any]:
+        """
+        Changes recorded after a registry version.
+
+        Args:
+            version: Version from an earlier response (0 for everything kept)
+
+        Returns:
+            version (current), changes (project_id, path, change), and
+            reset=True when changes after `version` are no longer all kept,
+            in which case the client should reload what it shows
+        """
+        with self._lock:
+            self._refresh_projects()
+            for project_id in list(self._projects):
+                self._project(project_id)
+            return {
+                "version": self._version,
+                "reset": version < self._dropped_through,
+                "changes": [change for change in self._changes if change["version"] > version],
+            }
+
+    # -- Invalidation --------------------------------------------------------
+
+    def invalidate(self, project_id: Optional[str] = None):
+        """Rescan a project (or every project) on its next read."""
+        with self._lock:
+            if project_id is None:
+                self._stale_root = True
+                self._stale.update(self._projects)
+            else:
+                self._stale.add(project_id)
+
+    def _mark_stale(self, path: Path):
+        """Invalidate the project a changed path belongs to (watcher thread)."""
+        try:
+            parts = path.relative_to(self.projects_dir).parts
+        except ValueError:
+            return
+        if not parts:
+            return
+        with self._lock:
+            if len(parts) == 1:
+                # A project folder itself was added, removed or renamed
+                self._stale_root = True
+                self._stale.add(parts[0])
+            elif parts[1] in (DATA_FOLDER, INFO_FILE):
+                self._stale.add(parts[0])
+
+    @property
+    def watching(self) -> bool:
+        return self._observer is not None
+
+    # -- Scanning (lock held) ------------------------------------------------
+
+    def _refresh_projects(self):
+        """Pick up added and removed project folders."""
+        try:
+            mtime_ns = self.projects_dir.stat().st_mtime_ns
+        except OSError:
+            mtime_ns = None
+        if not self._stale_root and mtime_ns == self._projects_mtime_ns:
+            return
+
+        self._stale_root = False
+        self._projects_mtime_ns = mtime_ns
+        found = set()
+        if mtime_ns is not None:
+            found = {
+                item.name for item in os.scandir(self.projects_dir)
+                if item.is_dir() and not item.name.startswith(".")
+            }
+        for project_id in set(self._projects) - found:
+            project = self._projects.pop(project_id)
+            self._record(project_id, project, _Project())
+        for project_id in found - set(self._projects):
+            self._projects[project_id] = _Project()
+            self._stale.add(project_id)
+
+    def _project(self, project_id: str) -> Optional[_Project]:
+        """A project's state, rescanned first if it changed."""
+        self._refresh_projects()
+        project = self._projects.get(project_id)
+        if project is None:
+            return None
+        if project_id in self._stale or (not self.watching and self._changed(project_id, project)):
+            self._scan(project_id)
+        return self._projects.get(project_id)
+
+    def _changed(self, project_id: str, project: _Project) -> bool:
+        """Folder-stat check used without the watcher."""
+        if time.monotonic() - project.scanned_at > self.rescan_seconds:
+            return True
+        project_dir = self.projects_dir / project_id
+        try:
+            info_mtime_ns = (project_dir / INFO_FILE).stat().st_mtime_ns
+        except OSError:
+            info_mtime_ns = None
+        if info_mtime_ns != project.info_mtime_ns:
+            return True
+        if not project.has_data:
+            return (project_dir / DATA_FOLDER).is_dir()
+        data_dir = project_dir / DATA_FOLDER
+        for folder, mtime_ns in project.folder_mtimes.items():
+            try:
+                if (data_dir / folder).stat().st_mtime_ns != mtime_ns:
+                    return True
+            except OSError:
+                return True
+        return False
+
+    def _scan(self, project_id: str):
+        self._stale.discard(project_id)
+        project_dir = self.projects_dir / project_id
+        if not project_dir.is_dir():
+            self._stale_root = True
+            self._refresh_projects()
+            return
+
+        scanned = _Project(scanned_at=time.monotonic())
+        info_file = project_dir / INFO_FILE
+        try:
+            scanned.info_mtime_ns = info_file.stat().st_mtime_ns
+            with open(info_file, "r") as f:
+                scanned.info = json.load(f)
+        except OSError:
+            pass
+        except ValueError as e:
+            logger.warning(f"[{project_id}] Unreadable {INFO_FILE}: {e}")
+
+        data_dir = project_dir / DATA_FOLDER
+        scanned.has_data = data_dir.is_dir()
+        if scanned.has_data:
+            scanned.entries, scanned.folder_mtimes = _scan_data(data_dir)
+
+        previous = self._projects.get(project_id, _Project())
+        self._projects[project_id] = scanned
+        self.scans += 1
+        self._record(project_id, previous, scanned)
+
+    def _record(self, project_id: str, old: _Project, new: _Project):
+        """Append the differences between two scans to the change log."""
+        changes = []
+        if old.info != new.info or old.has_data != new.has_data:
+            change = ADDED if old.info is None and not old.has_data else (
+                DELETED if new.info is None and not new.has_data else MODIFIED
+            )
+            changes.append((None, change))
+        for path, entry in new.entries.items():
+            before = old.entries.get(path)
+            if before is None:
+                changes.append((path, ADDED))
+            elif before != entry and not entry.is_dir:
+                changes.append((path, MODIFIED))
+        changes.extend((path, DELETED) for path in old.entries if path not in new.entries)
+
+        if not changes:
+            return
+        self._version += 1
+        for path, change in sorted(changes, key=lambda item: item[0] or ""):
+            self._changes.append({
+                "version": self._version,
+                "project_id": project_id,
+                "path": path,
+                "change": change,
+            })
+        while len(self._changes) > MAX_CHANGES:
+            self._dropped_through = self._changes.popleft()["version"]
+
+    # -- Watcher -------------------------------------------------------------
+
+    def start(self):
+        """Watch the projects folder for changes (needs watchdog)."""
+        if self._observer is not None:
+            return
+        if Observer is None:
+            logger.info("watchdog is not installed; project registry checks folder stats instead")
+            return
+        if not self.projects_dir.is_dir():
+            return
+        observer = Observer()
+        observer.schedule(_ChangeHandler(self), str(self.projects_dir), recursive=True)
+        observer.daemon = True
+        observer.start()
+        with self._lock:
+            self._observer = observer
+            # Changes made before the watch started aren't in any event
+            self.invalidate()
+
+    def stop(self):
+        with self._lock:
+            observer, self._observer = self._observer, None
+        if observer is not None:
+            observer.stop()
+            observer.join(timeout=5.0)
+
+
+_registry: Optional[ProjectRegistry] = None
+_registry_lock = threading.Lock()
+
+
+def get_project_registry() -> ProjectRegistry:
+    """Get or create the project registry singleton."""
+    global _registry
+    with _registry_lock:
+        if _registry is None:
+            _registry = ProjectRegistry(PROJECTS_DIR, get_config().project_registry_rescan_seconds)
+        return _registry
+
+
+def start_project_registry():
+    """Start watching the projects folder, if enabled."""
+    if get_config().project_registry_watch:
+        get_project_registry().start()
+
+
+def shutdown_project_registry():
+    """Stop the folder watcher."""
+    global _registry
+    with _registry_lock:
+        registry, _registry = _registry, None
+    if registry is not None:
+        registry.stop()
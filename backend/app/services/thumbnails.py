@@ -0,0 +1,159 @@
+"""
+Thumbnails
+
+Renders single PDF pages to PNG (pypdfium2) and downscaled variants of
+images (Pillow) on demand, and keeps them in a BoundedDiskCache
+(THUMBNAIL_CACHE_DIR, THUMBNAIL_CACHE_MB).
+
+Thumbnails are keyed by the source file's content hash and the variant
+(page and DPI, or width), so a file copied between folders shares its
+thumbnails and an edited file gets new ones (the old ones age out of the
+cache). File hashes are memoized per path, mtime and size, so a cache hit
+doesn't re-read the source.
+"""
+
+import functools
+import io
+import logging
+import threading
+from pathlib import Path
+from typing import Optional, Tuple
+
+from app.config import get_config
+from app.services.disk_cache import BoundedDiskCache
+from app.services.pipeline_stages import hash_file
+
+try:
+    import pypdfium2 as pdfium
+except ImportError:  # thumbnails unavailable
+    pdfium = None
+
+logger = logging.getLogger(__name__)
+
+# PDF user space units per inch
+_POINTS_PER_INCH = 72
+
+# Image thumbnails keep transparency as PNG; everything else becomes JPEG
+_PNG_SOURCES = {'.png', '.gif', '.webp'}
+JPEG_QUALITY = 85
+
+# PDFium isn't thread-safe; renders are serialized
+_pdfium_lock = threading.Lock()
+
+
+@functools.lru_cache(maxsize=1024)
+def _file_digest(path: str, mtime_ns: int, size: int) -> str:
+    return hash_file(Path(path))
+
+
+def file_digest(file_path: Path) -> str:
+    """Content hash of a file, recomputed only when its mtime or size changes."""
+    stat = file_path.stat()
+    return _file_digest(str(file_path), stat.st_mtime_ns, stat.st_size)
+
+
+def thumbnail_key(file_path: Path, page_number: int, dpi: int) -> str:
+    """Cache key (and ETag source) of a page thumbnail."""
+    return f"pdf:{file_digest(file_path)}:{page_number}:{dpi}"
+
+
+def image_thumbnail_key(file_path: Path, width: int) -> str:
+    """Cache key (and ETag source) of an image thumbnail."""
+    return f"image:{file_digest(file_path)}:{width}"
+
+
+def image_thumbnail_type(file_path: Path) -> str:
+    """Content type of an image's thumbnails."""
+    return "image/png" if file_path.suffix.lower() in _PNG_SOURCES else "image/jpeg"
+
+
+def render_pdf_page(file_path: Path, page_number: int, dpi: int) -> bytes:
+    """
+    Render one page of a PDF to PNG.
+
+    Args:
+        file_path: PDF path
+        page_number: 1-based page number
+        dpi: Resolution (72 renders at the page's size in points)
+
+    Returns:
+        PNG bytes
+
+    Raises:
+        RuntimeError: pypdfium2 isn't installed
+        IndexError: The PDF has no such page
+    """
+    if pdfium is None:
+        raise RuntimeError("PDF page rendering requires pypdfium2")
+
+    with _pdfium_lock:
+        document = pdfium.PdfDocument(str(file_path))
+        try:
+            if not 1 <= page_number <= len(document):
+                raise IndexError(f"Page {page_number} out of range (1-{len(document)})")
+            page = document[page_number - 1]
+            image = page.render(scale=dpi / _POINTS_PER_INCH).to_pil()
+            page.close()
+        finally:
+            document.close()
+
+    buffer = io.BytesIO()
+    image.save(buffer, format="PNG", optimize=True)
+    return buffer.getvalue()
+
+
+def render_image_thumbnail(file_path: Path, width: int) -> bytes:
+    """
+    Downscale an image to at most `width` pixels wide, keeping its aspect ratio.
+
+    Camera rotation (EXIF orientation) is applied; images narrower than
+    width keep their size but are re-encoded (PNG, or JPEG for photos).
+    """
+    from PIL import Image, ImageOps
+
+    with Image.open(file_path) as source:
+        image = ImageOps.exif_transpose(source)
+        if image.width > width:
+            height = max(1, round(image.height * width / image.width))
+            image = image.resize((width, height), Image.Resampling.LANCZOS)
+
+        buffer = io.BytesIO()
+        if image_thumbnail_type(file_path) == "image/png":
+            image.save(buffer, format="PNG", optimize=True)
+        else:
+            image.convert("RGB").save(buffer, format="JPEG", quality=JPEG_QUALITY, optimize=True, progressive=True)
+    return buffer.getvalue()
+
+
+def image_thumbnail(file_path: Path, width: int) -> Tuple[bytes, str]:
+    """Downscaled image and its content type, from the thumbnail cache or rendered on demand."""
+    content = get_thumbnail_cache().get_or_create(
+        image_thumbnail_key(file_path, width),
+        lambda: render_image_thumbnail(file_path, width)
+    )
+    return content, image_thumbnail_type(file_path)
+
+
+def pdf_thumbnail(file_path: Path, page_number: int, dpi: int) -> bytes:
+    """PNG of one PDF page, from the thumbnail cache or rendered on demand."""
+    return get_thumbnail_cache().get_or_create(
+        thumbnail_key(file_path, page_number, dpi),
+        lambda: render_pdf_page(file_path, page_number, dpi)
+    )
+
+
+_cache: Optional[BoundedDiskCache] = None
+_cache_lock = threading.Lock()
+
+
+def get_thumbnail_cache() -> BoundedDiskCache:
+    """Get or create the thumbnail cache singleton."""
+    global _cache
+    with _cache_lock:
+        if _cache is None:
+            config = get_config()
+            _cache = BoundedDiskCache(
+                config.thumbnail_cache_dir,
+                config.thumbnail_cache_mb * 1024 * 1024
+            )
+        return _cache
@@ -5,6 +5,7 @@ Converts extracted raw data into normalized data points.
 Handles both Excel files and PDF invoices.
 """
 
+import numpy as np
 import pandas as pd
 import re
 import json
@@ -15,6 +16,7 @@ from pathlib import Path
 import uuid
 
 from app.models.data_points import DataPoint, DataPointType, DataPointStatus
+from app.models.columnar import tables_from_records
 
 logger = logging.getLogger(__name__)
 
@@ -45,7 +47,7 @@ class TransactionParser:
 
         logger.info(f"Parsing {file_name} ({file_type})")
 
-        if file_type in ['xlsx', 'xls', 'csv']:
+        if file_type in ['xlsx', 'xls', 'excel', 'csv']:
             return self._parse_excel_file(extracted_data, source_file_id)
         elif file_type == 'pdf':
             return self._parse_pdf_file(extracted_data, source_file_id)
@@ -62,259 +64,233 @@ class TransactionParser:
         data_points = []
         file_name = extracted_data.file_name.lower()
 
-        # Parse structured_data JSON if available
-        if extracted_data.structured_data:
-            try:
-                structured = json.loads(extracted_data.structured_data)
+        try:
+            tables = self._load_tables(extracted_data)
+        except Exception as e:
+            logger.error(f"Error loading tables of {extracted_data.file_name}: {e}", exc_info=True)
+            return data_points
 
-                # Handle different Excel file types
-                if 'budget' in file_name:
-                    data_points = self._parse_budget_excel(
-                        structured, source_file_id, extracted_data.file_name
-                    )
-                elif 'payment' in file_name:
-                    data_points = self._parse_payments_excel(
-                        structured, source_file_id, extracted_data.file_name
-                    )
-                elif 'subcontractor' in file_name:
-                    data_points = self._parse_subcontractors_excel(
-                        structured, source_file_id, extracted_data.file_name
-                    )
-                elif 'invoice' in file_name or 'receipt' in file_name:
-                    data_points = self._parse_invoice_excel(
-                        structured, source_file_id, extracted_data.file_name
-                    )
-                else:
-                    # Generic Excel parser - try to identify columns
-                    data_points = self._parse_generic_excel(
-                        structured, source_file_id, extracted_data.file_name
-                    )
+        # Handle different Excel file types
+        if 'budget' in file_name:
+            parse_table = self._parse_budget_excel
+        elif 'payment' in file_name:
+            parse_table = self._parse_payments_excel
+        elif 'subcontractor' in file_name:
+            parse_table = self._parse_subcontractors_excel
+        elif 'invoice' in file_name or 'receipt' in file_name:
+            parse_table = self._parse_invoice_excel
+        else:
+            # Generic Excel parser - try to identify columns
+            parse_table = self._parse_generic_excel
 
+        for sheet_name, df in tables.items():
+            if df.empty:
+                continue
+            # Row numbers are only ambiguous in multi-sheet workbooks
+            location_prefix = f'{sheet_name}!' if len(tables) > 1 else ''
+            try:
+                data_points.extend(parse_table(
+                    df, source_file_id, extracted_data.file_name, location_prefix
+                ))
             except Exception as e:
-                logger.error(f"Error parsing Excel {extracted_data.file_name}: {e}", exc_info=True)
+                logger.error(
+                    f"Error parsing Excel {extracted_data.file_name} ({sheet_name}): {e}", exc_info=True
+                )
 
         return data_points
 
+    def _load_tables(self, extracted_data: Any) -> Dict[str, pd.DataFrame]:
+        """Typed tables of an extracted file (legacy rows hold JSON records)."""
+        tables = getattr(extracted_data, 'tables', None)
+        if tables is not None:
+            return tables
+        if extracted_data.structured_data:
+            return tables_from_records(json.loads(extracted_data.structured_data))
+        return {}
+
     def _parse_budget_excel(
         self,
-        structured: Dict,
+        df: pd.DataFrame,
         source_file_id: str,
-        file_name: str
+        file_name: str,
+        location_prefix: str = ''
     ) -> List[DataPoint]:
         """Parse Budget.xlsx into budget_item data points."""
         data_points = []
 
         # Budget.xlsx has: Item Name, Category, Budget Amount, Actual Spent, Variance
-        rows = structured.get('rows', [])
-
-        for idx, row in enumerate(rows):
-            try:
-                # Skip header rows
-                if idx == 0 and ('Item' in str(row.get('Item Name', '')) or
-                                 'Category' in str(row.get('Category', ''))):
-                    continue
-
-                item_name = str(row.get('Item Name', row.get('Item', '')))
-                category = str(row.get('Category', ''))
-                budget_amount = self._parse_amount(row.get('Budget Amount', row.get('Budget', 0)))
-                actual_spent = self._parse_amount(row.get('Actual Spent', row.get('Actual', 0)))
-
-                if not item_name or item_name.strip() == '' or budget_amount == 0:
-                    continue
-
-                # Create budget data point
-                data_point = DataPoint(
-                    id=str(uuid.uuid4()),
-                    project_id=self.project_id,
-                    source_file_id=source_file_id,
-                    source_file_name=file_name,
-                    source_file_type='xlsx',
-                    source_location=f'Row {idx + 2}',  # Excel rows start at 1, +1 for header
-                    data_point_type=DataPointType.BUDGET_ITEM,
-                    status=DataPointStatus.EXTRACTED,
-                    description=item_name,
-                    amount=budget_amount,
-                    category=category,
-                    extraction_method='pandas',
-                    structured_metadata=json.dumps({
-                        'actual_spent': actual_spent,
-                        'variance': budget_amount - actual_spent
-                    })
-                )
-                data_points.append(data_point)
-
-            except Exception as e:
-                logger.warning(f"Error parsing budget row {idx}: {e}")
-                continue
+        item_names = self._text_column(df, 'Item Name', 'Item')
+        categories = self._text_column(df, 'Category')
+        budget_amounts = self._amount_column(df, 'Budget Amount', 'Budget')
+        actual_spent = self._amount_column(df, 'Actual Spent', 'Actual')
+
+        keep = (item_names.str.strip() != '') & (budget_amounts != 0)
+
+        for idx in np.flatnonzero(keep.to_numpy()):
+            budget_amount = float(budget_amounts.iat[idx])
+            spent = float(actual_spent.iat[idx])
+
+            data_points.append(DataPoint(
+                id=str(uuid.uuid4()),
+                project_id=self.project_id,
+                source_file_id=source_file_id,
+                source_file_name=file_name,
+                source_file_type='xlsx',
+                source_location=f'{location_prefix}Row {idx + 2}',  # Excel rows start at 1, +1 for header
+                data_point_type=DataPointType.BUDGET_ITEM,
+                status=DataPointStatus.EXTRACTED,
+                description=item_names.iat[idx],
+                amount=budget_amount,
+                category=categories.iat[idx],
+                extraction_method='pandas',
+                structured_metadata=json.dumps({
+                    'actual_spent': spent,
+                    'variance': budget_amount - spent
+                })
+            ))
 
         logger.info(f"Parsed {len(data_points)} budget items from {file_name}")
         return data_points
 
     def _parse_payments_excel(
         self,
-        structured: Dict,
+        df: pd.DataFrame,
         source_file_id: str,
-        file_name: str
+        file_name: str,
+        location_prefix: str = ''
     ) -> List[DataPoint]:
         """Parse Payments.xlsx into payment data points."""
         data_points = []
-        rows = structured.get('rows', [])
-
-        for idx, row in enumerate(rows):
-            try:
-                if idx == 0:  # Skip header
-                    continue
-
-                payment_date = self._parse_date(row.get('Payment Date', row.get('Date', '')))
-                vendor = str(row.get('Vendor', row.get('Contractor', '')))
-                amount = self._parse_amount(row.get('Amount', row.get('Payment Amount', 0)))
-                invoice_num = str(row.get('Invoice Number', row.get('Invoice #', '')))
-                description = str(row.get('Description', f'Payment to {vendor}'))
 
-                if not vendor or amount == 0:
-                    continue
-
-                data_point = DataPoint(
-                    id=str(uuid.uuid4()),
-                    project_id=self.project_id,
-                    source_file_id=source_file_id,
-                    source_file_name=file_name,
-                    source_file_type='xlsx',
-                    source_location=f'Row {idx + 2}',
-                    data_point_type=DataPointType.PAYMENT,
-                    status=DataPointStatus.EXTRACTED,
-                    transaction_date=payment_date,
-                    description=description,
-                    amount=amount,
-                    vendor=vendor,
-                    invoice_number=invoice_num,
-                    extraction_method='pandas'
-                )
-                data_points.append(data_point)
-
-            except Exception as e:
-                logger.warning(f"Error parsing payment row {idx}: {e}")
-                continue
+        payment_dates = self._date_column(df, 'Payment Date', 'Date')
+        vendors = self._text_column(df, 'Vendor', 'Contractor')
+        amounts = self._amount_column(df, 'Amount', 'Payment Amount')
+        invoice_numbers = self._text_column(df, 'Invoice Number', 'Invoice #')
+        descriptions = self._text_column(df, 'Description')
+
+        keep = (vendors != '') & (amounts != 0)
+
+        for idx in np.flatnonzero(keep.to_numpy()):
+            vendor = vendors.iat[idx]
+
+            data_points.append(DataPoint(
+                id=str(uuid.uuid4()),
+                project_id=self.project_id,
+                source_file_id=source_file_id,
+                source_file_name=file_name,
+                source_file_type='xlsx',
+                source_location=f'{location_prefix}Row {idx + 2}',
+                data_point_type=DataPointType.PAYMENT,
+                status=DataPointStatus.EXTRACTED,
+                transaction_date=payment_dates[idx],
+                description=descriptions.iat[idx] or f'Payment to {vendor}',
+                amount=float(amounts.iat[idx]),
+                vendor=vendor,
+                invoice_number=invoice_numbers.iat[idx],
+                extraction_method='pandas'
+            ))
 
         logger.info(f"Parsed {len(data_points)} payments from {file_name}")
         return data_points
 
     def _parse_subcontractors_excel(
         self,
-        structured: Dict,
+        df: pd.DataFrame,
         source_file_id: str,
-        file_name: str
+        file_name: str,
+        location_prefix: str = ''
     ) -> List[DataPoint]:
         """Parse Subcontractors.xlsx into cost data points."""
         data_points = []
-        rows = structured.get('rows', [])
-
-        for idx, row in enumerate(rows):
-            try:
-                if idx == 0:  # Skip header
-                    continue
-
-                contractor_name = str(row.get('Contractor', row.get('Subcontractor', '')))
-                trade = str(row.get('Trade', row.get('Specialty', '')))
-                contract_amount = self._parse_amount(row.get('Contract Amount', row.get('Amount', 0)))
-                paid_to_date = self._parse_amount(row.get('Paid to Date', 0))
 
-                if not contractor_name or contract_amount == 0:
-                    continue
-
-                # Create contract data point
-                data_point = DataPoint(
-                    id=str(uuid.uuid4()),
-                    project_id=self.project_id,
-                    source_file_id=source_file_id,
-                    source_file_name=file_name,
-                    source_file_type='xlsx',
-                    source_location=f'Row {idx + 2}',
-                    data_point_type=DataPointType.CONTRACT,
-                    status=DataPointStatus.EXTRACTED,
-                    description=f'{trade} - {contractor_name}',
-                    amount=contract_amount,
-                    vendor=contractor_name,
-                    category=trade,
-                    extraction_method='pandas',
-                    structured_metadata=json.dumps({
-                        'paid_to_date': paid_to_date,
-                        'remaining': contract_amount - paid_to_date
-                    })
-                )
-                data_points.append(data_point)
-
-            except Exception as e:
-                logger.warning(f"Error parsing subcontractor row {idx}: {e}")
-                continue
+        contractor_names = self._text_column(df, 'Contractor', 'Subcontractor')
+        trades = self._text_column(df, 'Trade', 'Specialty')
+        contract_amounts = self._amount_column(df, 'Contract Amount', 'Amount')
+        paid_to_date = self._amount_column(df, 'Paid to Date')
+
+        keep = (contractor_names != '') & (contract_amounts != 0)
+
+        for idx in np.flatnonzero(keep.to_numpy()):
+            contractor_name = contractor_names.iat[idx]
+            trade = trades.iat[idx]
+            contract_amount = float(contract_amounts.iat[idx])
+            paid = float(paid_to_date.iat[idx])
+
+            # Create contract data point
+            data_points.append(DataPoint(
+                id=str(uuid.uuid4()),
+                project_id=self.project_id,
+                source_file_id=source_file_id,
+                source_file_name=file_name,
+                source_file_type='xlsx',
+                source_location=f'{location_prefix}Row {idx + 2}',
+                data_point_type=DataPointType.CONTRACT,
+                status=DataPointStatus.EXTRACTED,
+                description=f'{trade} - {contractor_name}',
+                amount=contract_amount,
+                vendor=contractor_name,
+                category=trade,
+                extraction_method='pandas',
+                structured_metadata=json.dumps({
+                    'paid_to_date': paid,
+                    'remaining': contract_amount - paid
+                })
+            ))
 
         logger.info(f"Parsed {len(data_points)} subcontractor contracts from {file_name}")
         return data_points
 
     def _parse_invoice_excel(
         self,
-        structured: Dict,
+        df: pd.DataFrame,
         source_file_id: str,
-        file_name: str
+        file_name: str,
+        location_prefix: str = ''
     ) -> List[DataPoint]:
         """Parse invoice/receipt Excel files."""
         data_points = []
-        rows = structured.get('rows', [])
-
-        for idx, row in enumerate(rows):
-            try:
-                if idx == 0:  # Skip header
-                    continue
-
-                description = str(row.get('Description', row.get('Item', '')))
-                amount = self._parse_amount(row.get('Amount', row.get('Total', 0)))
-                date = self._parse_date(row.get('Date', row.get('Invoice Date', '')))
-                vendor = str(row.get('Vendor', row.get('Supplier', '')))
-
-                if not description or amount == 0:
-                    continue
 
-                data_point = DataPoint(
-                    id=str(uuid.uuid4()),
-                    project_id=self.project_id,
-                    source_file_id=source_file_id,
-                    source_file_name=file_name,
-                    source_file_type='xlsx',
-                    source_location=f'Row {idx + 2}',
-                    data_point_type=DataPointType.TRANSACTION,
-                    status=DataPointStatus.EXTRACTED,
-                    transaction_date=date,
-                    description=description,
-                    amount=amount,
-                    vendor=vendor,
-                    extraction_method='pandas'
-                )
-                data_points.append(data_point)
-
-            except Exception as e:
-                logger.warning(f"Error parsing invoice row {idx}: {e}")
-                continue
+        descriptions = self._text_column(df, 'Description', 'Item')
+        amounts = self._amount_column(df, 'Amount', 'Total')
+        dates = self._date_column(df, 'Date', 'Invoice Date')
+        vendors = self._text_column(df, 'Vendor', 'Supplier')
+
+        keep = (descriptions != '') & (amounts != 0)
+
+        for idx in np.flatnonzero(keep.to_numpy()):
+            data_points.append(DataPoint(
+                id=str(uuid.uuid4()),
+                project_id=self.project_id,
+                source_file_id=source_file_id,
+                source_file_name=file_name,
+                source_file_type='xlsx',
+                source_location=f'{location_prefix}Row {idx + 2}',
+                data_point_type=DataPointType.TRANSACTION,
+                status=DataPointStatus.EXTRACTED,
+                transaction_date=dates[idx],
+                description=descriptions.iat[idx],
+                amount=float(amounts.iat[idx]),
+                vendor=vendors.iat[idx],
+                extraction_method='pandas'
+            ))
 
         logger.info(f"Parsed {len(data_points)} invoice items from {file_name}")
         return data_points
 
     def _parse_generic_excel(
         self,
-        structured: Dict,
+        df: pd.DataFrame,
         source_file_id: str,
-        file_name: str
+        file_name: str,
+        location_prefix: str = ''
     ) -> List[DataPoint]:
         """
         Generic Excel parser - try to identify amount and description columns.
         """
         data_points = []
-        rows = structured.get('rows', [])
 
-        if not rows or len(rows) < 2:
-            return data_points
-
-        # Try to identify columns
-        header = rows[0] if rows else {}
+        # Try to identify columns from the header
+        header = {col: col for col in df.columns}
         amount_col = self._find_amount_column(header)
         description_col = self._find_description_column(header)
         date_col = self._find_date_column(header)
@@ -326,36 +302,29 @@ class TransactionParser:
             logger.warning(f"Could not identify columns in {file_name}")
             return data_points
 
-        for idx, row in enumerate(rows[1:], start=1):
-            try:
-                amount = self._parse_amount(row.get(amount_col, 0))
-                description = str(row.get(description_col, ''))
-                date = self._parse_date(row.get(date_col, '')) if date_col else None
-                vendor = str(row.get(vendor_col, '')) if vendor_col else ''
-
-                if not description or amount == 0:
-                    continue
-
-                data_point = DataPoint(
-                    id=str(uuid.uuid4()),
-                    project_id=self.project_id,
-                    source_file_id=source_file_id,
-                    source_file_name=file_name,
-                    source_file_type='xlsx',
-                    source_location=f'Row {idx + 2}',
-                    data_point_type=DataPointType.TRANSACTION,
-                    status=DataPointStatus.EXTRACTED,
-                    transaction_date=date,
-                    description=description,
-                    amount=amount,
-                    vendor=vendor,
-                    extraction_method='pandas'
-                )
-                data_points.append(data_point)
-
-            except Exception as e:
-                logger.warning(f"Error parsing generic row {idx}: {e}")
-                continue
+        amounts = self._amount_column(df, amount_col)
+        descriptions = self._text_column(df, description_col)
+        dates = self._date_column(df, date_col) if date_col else [None] * len(df)
+        vendors = self._text_column(df, vendor_col) if vendor_col else None
+
+        keep = (descriptions != '') & (amounts != 0)
+
+        for idx in np.flatnonzero(keep.to_numpy()):
+            data_points.append(DataPoint(
+                id=str(uuid.uuid4()),
+                project_id=self.project_id,
+                source_file_id=source_file_id,
+                source_file_name=file_name,
+                source_file_type='xlsx',
+                source_location=f'{location_prefix}Row {idx + 2}',
+                data_point_type=DataPointType.TRANSACTION,
+                status=DataPointStatus.EXTRACTED,
+                transaction_date=dates[idx],
+                description=descriptions.iat[idx],
+                amount=float(amounts.iat[idx]),
+                vendor=vendors.iat[idx] if vendors is not None else '',
+                extraction_method='pandas'
+            ))
 
         logger.info(f"Parsed {len(data_points)} items from generic Excel {file_name}")
         return data_points
@@ -435,6 +404,56 @@ class TransactionParser:
         logger.info(f"Parsed {len(data_points)} items from PDF {extracted_data.file_name}")
         return data_points
 
+    # Column helpers: whole-column versions of the value parsers below, so
+    # rows are only materialized for the ones that become data points
+
+    def _column(self, df: pd.DataFrame, *names: str) -> Optional[pd.Series]:
+        """First of the named columns present in the table."""
+        for name in names:
+            if name in df.columns:
+                return df[name]
+        return None
+
+    def _text_column(self, df: pd.DataFrame, *names: str) -> pd.Series:
+        """Column as text ('' for missing cells or a missing column)."""
+        series = self._column(df, *names)
+        if series is None:
+            return pd.Series([''] * len(df), index=df.index, dtype=object)
+        return series.map(lambda v: '' if pd.isna(v) else str(v))
+
+    def _amount_column(self, df: pd.DataFrame, *names: str) -> pd.Series:
+        """Column parsed as amounts (0.0 where missing or unparseable)."""
+        series = self._column(df, *names)
+        if series is None:
+            return pd.Series(0.0, index=df.index)
+        if pd.api.types.is_numeric_dtype(series) and not pd.api.types.is_bool_dtype(series):
+            return series.astype(float).fillna(0.0)
+
+        # Same rules as _parse_amount: strip currency symbols and commas,
+        # parentheses mean negative
+        numeric = pd.to_numeric(series.where(series.map(lambda v: isinstance(v, (int, float)))), errors='coerce')
+        text = series.where(series.map(lambda v: isinstance(v, str))).astype(object)
+        cleaned = (
+            text.dropna().astype(str).str.strip()
+            .str.replace(r'[$,€£¥]', '', regex=True)
+            .str.replace('(', '-', regex=False)
+            .str.replace(')', '', regex=False)
+        )
+        parsed = pd.to_numeric(cleaned, errors='coerce').reindex(series.index)
+        return numeric.fillna(parsed).fillna(0.0).astype(float)
+
+    def _date_column(self, df: pd.DataFrame, *names: str) -> List[Optional[datetime]]:
+        """Column parsed as dates (None where missing or unparseable)."""
+        series = self._column(df, *names)
+        if series is None:
+            return [None] * len(df)
+        if pd.api.types.is_datetime64_any_dtype(series):
+            return [None if pd.isna(v) else v.to_pydatetime() for v in series]
+        return [
+            None if value is None or pd.isna(value) else value
+            for value in (self._parse_date(v) for v in series)
+        ]
+
     # Helper methods for parsing
 
     def _parse_amount(self, value: Any) -> float:
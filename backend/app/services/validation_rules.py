@@ -0,0 +1,250 @@
+"""
+Validation Rule Engine
+
+Compiles a project's DataPointValidationRule rows once and evaluates them
+over a whole batch of data points:
+- range checks become array comparisons on the amount column
+- required-field checks become missing-value masks
+- format checks reuse a pre-compiled regex per rule
+
+Errors are returned per point in the same order the per-point validator
+produced them (rules in storage order, then built-in checks).
+"""
+
+import json
+import logging
+import re
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, List, Optional, Sequence
+
+import numpy as np
+from sqlalchemy import or_
+from sqlalchemy.orm import Session
+
+from app.models.data_points import DataPoint, DataPointValidationRule
+
+logger = logging.getLogger(__name__)
+
+MAX_DESCRIPTION_LENGTH = 500
+
+
+class PointColumns:
+    """Column view over a batch of data points, extracted lazily per field."""
+
+    def __init__(self, points: Sequence[DataPoint]):
+        self.points = points
+        self._columns: Dict[str, np.ndarray] = {}
+        self._amounts: Optional[np.ndarray] = None
+        self._types: Optional[np.ndarray] = None
+
+    def __len__(self) -> int:
+        return len(self.points)
+
+    @property
+    def amounts(self) -> np.ndarray:
+        if self._amounts is None:
+            self._amounts = np.fromiter(
+                (np.nan if dp.amount is None else dp.amount for dp in self.points),
+                dtype=float,
+                count=len(self.points)
+            )
+        return self._amounts
+
+    @property
+    def types(self) -> np.ndarray:
+        if self._types is None:
+            self._types = self.column('data_point_type')
+        return self._types
+
+    def column(self, field_name: str) -> np.ndarray:
+        """Values of one attribute across the batch (None when missing)."""
+        if field_name not in self._columns:
+            values = np.empty(len(self.points), dtype=object)
+            values[:] = [getattr(dp, field_name, None) for dp in self.points]
+            self._columns[field_name] = values
+        return self._columns[field_name]
+
+
+@dataclass
+class CompiledRule:
+    """A validation rule parsed and compiled into a batch predicate."""
+    rule_id: str
+    rule_name: str
+    data_point_type: Optional[str]
+    checks: List[Callable[[PointColumns], List[tuple]]]  # each returns [(mask, message)]
+
+
+def _type_value(data_point_type: Any) -> Optional[str]:
+    return getattr(data_point_type, 'value', data_point_type)
+
+
+def _range_checks(rule: DataPointValidationRule, params: Dict[str, Any]) -> List[Callable]:
+    checks = []
+
+    if 'min_amount' in params:
+        minimum = float(params['min_amount'])
+        message = f"{rule.rule_name}: Amount below minimum (${params['min_amount']})"
+        checks.append(lambda cols: [(cols.amounts < minimum, message)])
+
+    if 'max_amount' in params:
+        maximum = float(params['max_amount'])
+        message = f"{rule.rule_name}: Amount exceeds maximum (${params['max_amount']})"
+        checks.append(lambda cols: [(cols.amounts > maximum, message)])
+
+    return checks
+
+
+def _required_field_checks(rule: DataPointValidationRule, params: Dict[str, Any]) -> List[Callable]:
+    field_name = params.get('field_name')
+    if not field_name:
+        return []
+
+    message = f"{rule.rule_name}: Required field '{field_name}' is missing"
+
+    def check(cols: PointColumns):
+        values = cols.column(field_name)
+        missing = np.fromiter((not value for value in values), dtype=bool, count=len(values))
+        return [(missing, message)]
+
+    return [check]
+
+
+def _format_checks(rule: DataPointValidationRule, params: Dict[str, Any]) -> List[Callable]:
+    field_name = params.get('field_name')
+    pattern = params.get('pattern')
+    if not (field_name and pattern):
+        return []
+
+    regex = re.compile(pattern)
+    message = f"{rule.rule_name}: Field '{field_name}' format invalid"
+
+    def check(cols: PointColumns):
+        # Match each distinct value once
+        results: Dict[str, bool] = {}
+        invalid = np.zeros(len(cols), dtype=bool)
+        for i, dp in enumerate(cols.points):
+            text = str(getattr(dp, field_name, ''))
+            if text not in results:
+                results[text] = bool(text) and not regex.match(text)
+            invalid[i] = results[text]
+        return [(invalid, message)]
+
+    return [check]
+
+
+RULE_COMPILERS = {
+    'range_check': _range_checks,
+    'required_field': _required_field_checks,
+    'format_check': _format_checks,
+}
+
+
+class ValidationRuleEngine:
+    """Active validation rules for one project, compiled for batch evaluation."""
+
+    def __init__(self, rules: List[CompiledRule]):
+        self.rules = rules
+
+    @classmethod
+    def load(cls, db: Session, project_id: str) -> 'ValidationRuleEngine':
+        """
+        Load and compile active rules for a project (plus global rules).
+
+        Args:
+            db: Database session
+            project_id: Project identifier
+
+        Returns:
+            ValidationRuleEngine ready to validate batches
+        """
+        rows = db.query(DataPointValidationRule).filter(
+            or_(
+                DataPointValidationRule.project_id == project_id,
+                DataPointValidationRule.project_id == None
+            ),
+            DataPointValidationRule.active == True
+        ).all()
+
+        return cls([rule for rule in (cls.compile_rule(row) for row in rows) if rule])
+
+    @staticmethod
+    def compile_rule(rule: DataPointValidationRule) -> Optional[CompiledRule]:
+        """Parse a rule's parameters and build its predicates (None if unusable)."""
+        try:
+            params = json.loads(rule.rule_parameters)
+            compiler = RULE_COMPILERS.get(rule.rule_type)
+            checks = compiler(rule, params) if compiler else []
+        except Exception as e:
+            logger.error(f"Error applying validation rule {rule.id}: {e}")
+            return None
+
+        return CompiledRule(
+            rule_id=rule.id,
+            rule_name=rule.rule_name,
+            data_point_type=_type_value(rule.data_point_type),
+            checks=checks
+        )
+
+    def validate(self, data_points: Sequence[DataPoint]) -> List[List[str]]:
+        """
+        Validate a batch of data points.
+
+        Args:
+            data_points: Points to validate
+
+        Returns:
+            List of validation error messages for each point, in input order
+        """
+        errors: List[List[str]] = [[] for _ in data_points]
+        if not data_points:
+            return errors
+
+        cols = PointColumns(data_points)
+        type_values = np.array([_type_value(t) for t in cols.types], dtype=object)
+        type_masks: Dict[str, np.ndarray] = {}
+
+        # Apply validation rules
+        for rule in self.rules:
+            applies = None
+            if rule.data_point_type is not None:
+                if rule.data_point_type not in type_masks:
+                    type_masks[rule.data_point_type] = type_values == rule.data_point_type
+                applies = type_masks[rule.data_point_type]
+                if not applies.any():
+                    continue
+
+            for check in rule.checks:
+                try:
+                    results = check(cols)
+                except Exception as e:
+                    logger.error(f"Error applying validation rule {rule.rule_id}: {e}")
+                    continue
+
+                for mask, message in results:
+                    if applies is not None:
+                        mask = mask & applies
+                    for i in np.flatnonzero(mask):
+                        errors[i].append(message)
+
+        # Built-in validations
+        descriptions = cols.column('description')
+        blank = np.fromiter(
+            (not value or value.strip() == '' for value in descriptions),
+            dtype=bool,
+            count=len(descriptions)
+        )
+        too_long = np.fromiter(
+            (len(value or '') > MAX_DESCRIPTION_LENGTH for value in descriptions),
+            dtype=bool,
+            count=len(descriptions)
+        )
+
+        for mask, message in (
+            (cols.amounts == 0, "Amount cannot be zero"),
+            (blank, "Description is required"),
+            (too_long, f"Description too long (max {MAX_DESCRIPTION_LENGTH} characters)"),
+        ):
+            for i in np.flatnonzero(mask):
+                errors[i].append(message)
+
+        return errors
@@ -0,0 +1,169 @@
+"""
+Parsed Workbook Cache
+
+Process-wide LRU cache of parsed project workbooks for the dashboard
+endpoints. ExcelProcessor reader results are cached under
+(project_id, reader, file path, mtime, size), so repeat dashboard loads
+skip pd.read_excel entirely while any edit to a workbook (new mtime or
+size) is picked up on the next request.
+
+Entries from every project share one LRU (WORKBOOK_CACHE_SIZE entries).
+Cached results are deep-copied on the way out so callers can't mutate
+what later requests see.
+
+Reads are run off the event loop on a shared thread pool
+(get_workbook_executor, WORKBOOK_READ_WORKERS threads). Threads rather
+than processes keep every read going through this process's cache.
+"""
+
+import copy
+import functools
+import logging
+import threading
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Any, Callable, Dict, Hashable, Optional, Tuple
+
+from app.config import get_config
+
+logger = logging.getLogger(__name__)
+
+
+class WorkbookCache:
+    """LRU cache of parsed workbook results, invalidated by file mtime/size."""
+
+    def __init__(self, max_entries: int = 64):
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[Tuple[Hashable, ...], Tuple[Tuple[int, int], Any]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._key_locks: Dict[Tuple[Hashable, ...], threading.Lock] = {}
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.invalidations = 0
+
+    def get_or_load(self, key: Tuple[Hashable, ...], file_path: Path, load: Callable[[], Any]) -> Any:
+        """
+        Cached result for key, or load() it when missing or the file changed.
+
+        Args:
+            key: Cache key (project and reader); file identity is added here
+            file_path: Workbook the result was parsed from
+            load: Parses the workbook
+
+        Returns:
+            A copy of the (possibly cached) result
+        """
+        try:
+            stat = file_path.stat()
+        except OSError:
+            # Missing files aren't cached; the reader reports them
+            return load()
+        version = (stat.st_mtime_ns, stat.st_size)
+
+        # One load per key at a time, so concurrent dashboard requests for
+        # the same project parse the workbook once
+        with self._lock:
+            key_lock = self._key_locks.setdefault(key, threading.Lock())
+
+        with key_lock:
+            with self._lock:
+                entry = self._entries.get(key)
+                if entry is not None and entry[0] == version:
+                    self._entries.move_to_end(key)
+                    self.hits += 1
+                    return copy.deepcopy(entry[1])
+                if entry is not None:
+                    self.invalidations += 1
+                self.misses += 1
+
+            value = load()
+
+            with self._lock:
+                self._entries[key] = (version, value)
+                self._entries.move_to_end(key)
+                while len(self._entries) > self.max_entries:
+                    evicted, _ = self._entries.popitem(last=False)
+                    self._key_locks.pop(evicted, None)
+                    self.evictions += 1
+
+            return copy.deepcopy(value)
+
+    def invalidate(self, project_id: Optional[str] = None) -> int:
+        """Drop every entry (or those of one project); returns the number dropped."""
+        with self._lock:
+            keys = [key for key in self._entries if project_id is None or key[0] == project_id]
+            for key in keys:
+                del self._entries[key]
+            return len(keys)
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                'entries': len(self._entries),
+                'max_entries': self.max_entries,
+                'projects': len({key[0] for key in self._entries}),
+                'hits': self.hits,
+                'misses': self.misses,
+                'hit_rate': round(self.hits / lookups, 3) if lookups else None,
+                'evictions': self.evictions,
+                'invalidations': self.invalidations,
+            }
+
+
+def cached_workbook(relative_path: str):
+    """
+    Cache an ExcelProcessor reader's result for the workbook it parses.
+
+    Args:
+        relative_path: Workbook path relative to the project's data folder
+    """
+    def decorator(reader: Callable[..., Any]) -> Callable[..., Any]:
+        @functools.wraps(reader)
+        def wrapper(self, *args, **kwargs):
+            key = (self.project_id, reader.__name__, relative_path, args, tuple(sorted(kwargs.items())))
+            return get_workbook_cache().get_or_load(
+                key, self.base_dir / relative_path, lambda: reader(self, *args, **kwargs)
+            )
+        return wrapper
+    return decorator
+
+
+_cache: Optional[WorkbookCache] = None
+_cache_lock = threading.Lock()
+
+
+def get_workbook_cache() -> WorkbookCache:
+    """Get or create the workbook cache singleton."""
+    global _cache
+    with _cache_lock:
+        if _cache is None:
+            _cache = WorkbookCache(get_config().workbook_cache_size)
+        return _cache
+
+
+_executor: Optional[ThreadPoolExecutor] = None
+_executor_lock = threading.Lock()
+
+
+def get_workbook_executor() -> ThreadPoolExecutor:
+    """Get or create the thread pool workbook reads run on."""
+    global _executor
+    with _executor_lock:
+        if _executor is None:
+            _executor = ThreadPoolExecutor(
+                max_workers=get_config().workbook_read_workers,
+                thread_name_prefix="workbook-read"
+            )
+        return _executor
+
+
+def shutdown_workbook_executor():
+    """Wait for in-flight workbook reads and release the thread pool."""
+    global _executor
+    with _executor_lock:
+        executor, _executor = _executor, None
+    if executor is not None:
+        executor.shutdown(wait=True)
@@ -0,0 +1,293 @@
+"""
+Workbook Reader
+
+Single entry point for reading Excel files. Value-only reads (cell values,
+with formula cells read as their cached results) go through the engine
+selected by EXCEL_ENGINE:
+
+- calamine: Rust-backed reader (python-calamine), several times faster than
+  openpyxl and also reads .xls/.xlsb/.ods
+- openpyxl: pure-Python reader (.xls files use pandas' default engine)
+- auto (default): calamine when installed, otherwise openpyxl
+
+Reads that need formulas or cell styles (fonts, fills) always use openpyxl
+through load_workbook(); calamine only exposes values.
+
+Sheet previews read a window of rows (read_window) sized from the sheet
+dimensions (sheet_dimensions) rather than the whole workbook.
+"""
+
+import datetime
+import itertools
+import logging
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple, Union
+
+import pandas as pd
+
+from app.config import get_config
+
+try:
+    from python_calamine import CalamineWorkbook
+except ImportError:  # openpyxl fallback
+    CalamineWorkbook = None
+
+logger = logging.getLogger(__name__)
+
+ENGINE_AUTO = "auto"
+ENGINE_CALAMINE = "calamine"
+ENGINE_OPENPYXL = "openpyxl"
+
+ENGINES = (ENGINE_CALAMINE, ENGINE_OPENPYXL)
+
+# Formats openpyxl can open; others (.xls) go to pandas' default engine
+_OPENPYXL_SUFFIXES = {'.xlsx', '.xlsm', '.xltx', '.xltm'}
+
+# openpyxl streams a row roughly 10x slower than calamine parses one, so a
+# window ending in the first tenth of a sheet is cheaper to stream
+_STREAM_ROWS_RATIO = 10
+
+PathLike = Union[str, Path]
+
+
+def available_engines() -> List[str]:
+    """Value engines usable in this environment."""
+    return [engine for engine in ENGINES if engine != ENGINE_CALAMINE or CalamineWorkbook is not None]
+
+
+def value_engine(engine: Optional[str] = None) -> str:
+    """
+    Engine for value-only reads.
+
+    Args:
+        engine: Engine to use (default: EXCEL_ENGINE); 'auto' prefers calamine
+    """
+    engine = (engine or get_config().excel_engine).lower()
+    if engine not in (ENGINE_AUTO, *ENGINES):
+        raise ValueError(f"Unknown Excel engine '{engine}' (expected auto, calamine or openpyxl)")
+    if engine in (ENGINE_AUTO, ENGINE_CALAMINE) and CalamineWorkbook is not None:
+        return ENGINE_CALAMINE
+    if engine == ENGINE_CALAMINE:
+        logger.warning("python-calamine is not installed; reading Excel files with openpyxl")
+    return ENGINE_OPENPYXL
+
+
+def _pandas_engine(file_path: PathLike, engine: str) -> Optional[str]:
+    if engine == ENGINE_OPENPYXL and Path(file_path).suffix.lower() not in _OPENPYXL_SUFFIXES:
+        return None
+    return engine
+
+
+def read_excel(file_path: PathLike, sheet_name: Any = 0, engine: Optional[str] = None, **kwargs):
+    """
+    pd.read_excel with the configured value engine.
+
+    Args:
+        file_path: Workbook path
+        sheet_name: Sheet name/index, a list of them, or None for every sheet
+        engine: Engine override (see value_engine)
+        **kwargs: Further pd.read_excel arguments (header, nrows, ...)
+
+    Returns:
+        DataFrame, or a dict of DataFrames by sheet name
+    """
+    engine = _pandas_engine(file_path, value_engine(engine))
+    return pd.read_excel(file_path, sheet_name=sheet_name, engine=engine, **kwargs)
+
+
+def sheet_names(file_path: PathLike, engine: Optional[str] = None) -> List[str]:
+    """Sheet names of a workbook, in workbook order."""
+    if value_engine(engine) == ENGINE_CALAMINE:
+        return list(CalamineWorkbook.from_path(str(file_path)).sheet_names)
+
+    workbook = load_workbook(file_path, read_only=True)
+    try:
+        return list(workbook.sheetnames)
+    finally:
+        workbook.close()
+
+
+def _python_value(value: Any) -> Any:
+    """Calamine cell value as openpyxl returns it (values_only)."""
+    if value == "":
+        return None
+    if isinstance(value, float) and value.is_integer():
+        return int(value)
+    if type(value) is datetime.date:
+        return datetime.datetime(value.year, value.month, value.day)
+    return value
+
+
+def read_values(
+    file_path: PathLike,
+    sheets: Optional[List[str]] = None,
+    engine: Optional[str] = None
+) -> Dict[str, List[List[Any]]]:
+    """
+    Cell values of each sheet as a grid of rows, starting at A1.
+
+    Values match openpyxl's values_only rows: None for empty cells, ints
+    for whole numbers, datetimes for dates and cached results for formulas.
+    Calamine reads error cells (#N/A, #REF!) as empty, where openpyxl
+    returns the error text.
+
+    Args:
+        file_path: Workbook path
+        sheets: Sheets to read (default: all)
+        engine: Engine override (see value_engine)
+
+    Returns:
+        Rows of cell values per sheet name
+    """
+    if value_engine(engine) == ENGINE_CALAMINE:
+        workbook = CalamineWorkbook.from_path(str(file_path))
+        return {
+            name: [
+                [_python_value(value) for value in row]
+                for row in workbook.get_sheet_by_name(name).to_python(skip_empty_area=False)
+            ]
+            for name in (sheets or workbook.sheet_names)
+        }
+
+    workbook = load_workbook(file_path, read_only=True)
+    try:
+        return {
+            name: [list(row) for row in workbook[name].iter_rows(values_only=True)]
+            for name in (sheets or workbook.sheetnames)
+        }
+    finally:
+        workbook.close()
+
+
+def sheet_dimensions(file_path: PathLike) -> Dict[str, Tuple[int, int]]:
+    """
+    Rows and columns of each sheet, from A1 to the last used cell.
+
+    .xlsx files are sized from the dimension each sheet records, without
+    reading its rows. Sheets written without that record (e.g. by
+    openpyxl's write-only mode) and other formats are sized by calamine,
+    or by an openpyxl scan of the sheet when calamine isn't installed.
+
+    Returns:
+        (rows, columns) per sheet name, in workbook order
+    """
+    if Path(file_path).suffix.lower() in _OPENPYXL_SUFFIXES:
+        workbook = load_workbook(file_path, read_only=True)
+        try:
+            dimensions = {}
+            unsized = []
+            for sheet in workbook.worksheets:
+                if sheet.max_row is not None and sheet.max_column is not None:
+                    dimensions[sheet.title] = (sheet.max_row, sheet.max_column)
+                elif CalamineWorkbook is None:
+                    dimensions[sheet.title] = _scan_dimensions(sheet)
+                else:
+                    dimensions[sheet.title] = (0, 0)
+                    unsized.append(sheet.title)
+        finally:
+            workbook.close()
+        if unsized:
+            dimensions.update(_calamine_dimensions(file_path, unsized))
+        return dimensions
+
+    if CalamineWorkbook is None:
+        raise ValueError(f"Reading {Path(file_path).suffix} files requires python-calamine")
+    return _calamine_dimensions(file_path)
+
+
+def _scan_dimensions(sheet) -> Tuple[int, int]:
+    """(rows, columns) of a read-only sheet up to its last non-empty cell, by reading every row."""
+    rows = columns = 0
+    for index, values in enumerate(sheet.iter_rows(values_only=True), 1):
+        used = [column for column, value in enumerate(values, 1) if value is not None]
+        if used:
+            rows = index
+            columns = max(columns, used[-1])
+    return rows, columns
+
+
+def _calamine_dimensions(file_path: PathLike, sheets: Optional[List[str]] = None) -> Dict[str, Tuple[int, int]]:
+    """(rows, columns) of the given sheets (default: all), sized by calamine."""
+    workbook = CalamineWorkbook.from_path(str(file_path))
+    dimensions = {}
+    for name in sheets or workbook.sheet_names:
+        end = workbook.get_sheet_by_name(name).end
+        dimensions[name] = (end[0] + 1, end[1] + 1) if end else (0, 0)
+    return dimensions
+
+
+def read_window(
+    file_path: PathLike,
+    sheet: str,
+    start: int,
+    stop: int,
+    total_rows: Optional[int] = None,
+    engine: Optional[str] = None
+) -> List[List[Any]]:
+    """
+    Cell values of rows start to stop - 1 (0-based from row 1) of one sheet.
+
+    Values are those of read_values. Windows near the top of a large sheet
+    are streamed by openpyxl in read-only mode, which stops reading at the
+    last row of the window; windows further down are parsed by calamine,
+    which only converts rows up to the window to Python values.
+
+    Args:
+        file_path: Workbook path
+        sheet: Sheet name
+        start: First row of the window
+        stop: Row after the last row of the window
+        total_rows: Rows in the sheet (see sheet_dimensions), to pick the
+            cheaper reader; without it the value engine is used
+        engine: Engine override (see value_engine)
+
+    Returns:
+        Rows of cell values (fewer than stop - start past the end of the sheet)
+    """
+    engine = value_engine(engine)
+    streamable = Path(file_path).suffix.lower() in _OPENPYXL_SUFFIXES
+    if engine == ENGINE_CALAMINE and streamable and total_rows is not None:
+        if stop * _STREAM_ROWS_RATIO <= total_rows:
+            engine = ENGINE_OPENPYXL
+
+    if engine == ENGINE_CALAMINE or not streamable:
+        if CalamineWorkbook is None:
+            raise ValueError(f"Reading {Path(file_path).suffix} files requires python-calamine")
+        rows = CalamineWorkbook.from_path(str(file_path)).get_sheet_by_name(sheet).to_python(
+            skip_empty_area=False, nrows=stop
+        )
+        return [[_python_value(value) for value in row] for row in rows[start:stop]]
+
+    workbook = load_workbook(file_path, read_only=True)
+    try:
+        rows = workbook[sheet].iter_rows(max_row=stop, values_only=True)
+        return [list(row) for row in itertools.islice(rows, start, stop)]
+    finally:
+        workbook.close()
+
+
+def load_workbook(
+    file_path: PathLike,
+    formulas: bool = False,
+    styles: bool = False,
+    read_only: bool = False
+):
+    """
+    Open a workbook with openpyxl, for reads that need more than values.
+
+    Args:
+        file_path: Workbook path
+        formulas: Keep formula strings instead of their cached results
+        styles: Caller reads cell styles (fonts, fills), so don't open read-only
+        read_only: Stream rows (faster, lower memory; no random cell access)
+
+    Returns:
+        openpyxl Workbook
+    """
+    import openpyxl
+
+    return openpyxl.load_workbook(
+        str(file_path),
+        data_only=not formulas,
+        read_only=read_only and not styles,
+    )
@@ -7,10 +7,11 @@ for automated file synchronization.
 
 import os
 import json
+import bisect
 import hmac
 import hashlib
 from pathlib import Path
-from typing import Dict, Any, Optional, List
+from typing import Dict, Any, Optional, List, Tuple
 from datetime import datetime
 import logging
 
@@ -34,6 +35,7 @@ class WebhookHandler:
 
         self.events_file = self.webhook_dir / "webhook_events.json"
         self.events: List[Dict[str, Any]] = self._load_events()
+        self._next_sequence = self.events[-1]["sequence"] + 1 if self.events else 1
 
         # Load secrets from environment
         self.dropbox_secret = os.getenv('DROPBOX_WEBHOOK_SECRET')
@@ -45,7 +47,13 @@ class WebhookHandler:
         if self.events_file.exists():
             try:
                 with self.events_file.open('r') as f:
-                    return json.load(f)
+                    events = json.load(f)
+                # Number events saved before they carried a sequence, in order
+                sequence = 0
+                for event in events:
+                    sequence = max(event.get("sequence") or 0, sequence + 1)
+                    event["sequence"] = sequence
+                return events
             except Exception as e:
                 logger.error(f"Failed to load webhook events: {e}")
         return []
@@ -68,8 +76,10 @@ class WebhookHandler:
             "timestamp": datetime.now().isoformat(),
             "provider": provider,
             "event_type": event_type,
-            "data": data
+            "data": data,
+            "sequence": self._next_sequence
         }
+        self._next_sequence += 1
         self.events.append(event)
         self._save_events()
 
@@ -293,7 +303,8 @@ class WebhookHandler:
     def get_events(
         self,
         provider: Optional[str] = None,
-        limit: int = 100
+        limit: int = 100,
+        before: Optional[str] = None
     ) -> List[Dict[str, Any]]:
         """
         Get webhook events.
@@ -301,17 +312,61 @@ class WebhookHandler:
         Args:
             provider: Filter by provider (optional)
             limit: Maximum number of events to return
+            before: Only return events older than this ISO timestamp (optional)
 
         Returns:
             List of events
         """
-        events = self.events
+        events, _ = self.get_events_page(provider=provider, limit=limit, before=before)
+        return events
 
-        if provider:
-            events = [e for e in events if e.get('provider') == provider]
+    def get_events_page(
+        self,
+        provider: Optional[str] = None,
+        limit: int = 100,
+        before: Optional[str] = None,
+        before_sequence: Optional[int] = None
+    ) -> Tuple[List[Dict[str, Any]], bool]:
+        """
+        Get the most recent events older than a (timestamp, sequence) cursor.
+
+        Events are recorded in (timestamp, sequence) order, so the cursor
+        position is found with a binary search and only one page is scanned.
+        The sequence number breaks ties between events recorded within the
+        same timestamp, so none are skipped at a page boundary.
+
+        Args:
+            provider: Filter by provider (optional)
+            limit: Maximum number of events to return
+            before: Only return events older than this ISO timestamp (optional)
+            before_sequence: Sequence number of the event at `before`; events
+                with that timestamp and a lower sequence are returned too
 
-        # Return most recent events
-        return events[-limit:]
+        Returns:
+            Tuple of (events in chronological order, whether older events exist)
+        """
+        end = len(self.events)
+        if before:
+            end = bisect.bisect_left(
+                self.events,
+                (before, before_sequence or 0),
+                key=lambda e: (e.get('timestamp', ''), e.get('sequence', 0))
+            )
+
+        page = []
+        has_more = False
+        for position in range(end - 1, -1, -1):
+            event = self.events[position]
+            if provider and event.get('provider') != provider:
+                continue
+            if len(page) == limit:
+                has_more = True
+                break
+            page.append(event)
+
+        # Return most recent events, oldest first
+        page.reverse()
+        return page, has_more
 
     def get_statistics(self) -> Dict[str, Any]:
         """Get webhook statistics."""
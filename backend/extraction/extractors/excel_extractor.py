@@ -1,5 +1,5 @@
 """
-Excel file extractor using pandas and openpyxl.
+Excel file extractor using pandas and the configured workbook reader engine.
 
 Handles: .xlsx, .xls, .xlsm, .xlsb files
 Capabilities:
@@ -11,11 +11,11 @@ Capabilities:
 """
 
 import pandas as pd
-import openpyxl
 from typing import List, Dict, Any, Optional, Tuple
 from datetime import datetime
 from pathlib import Path
 
+from app.services.workbook_reader import read_excel
 from extraction.base_extractor import BaseExtractor, detect_numbers_in_text, clean_label, detect_date_in_text
 from schemas.extraction_schema import (
     ExtractionResult,
@@ -42,8 +42,8 @@ class ExcelExtractor(BaseExtractor):
         Extract data from Excel file.
 
         Process:
-        1. Load workbook with openpyxl for metadata
-        2. Read all sheets with pandas
+        1. Read all sheets in one pass (cached formula values)
+        2. Extract each sheet with pandas
         3. Detect tables and data ranges
         4. Extract numerical data with labels
         5. Create transactions from row data
@@ -57,18 +57,15 @@ class ExcelExtractor(BaseExtractor):
         transactions: List[Transaction] = []
 
         try:
-            # Load workbook for metadata
-            wb = openpyxl.load_workbook(file_path, data_only=True)  # data_only=True gets calculated values
-            sheet_names = wb.sheetnames
+            # Parse the workbook once for every sheet
+            sheets = read_excel(file_path, sheet_name=None, header=None)
+            sheet_names = list(sheets)
 
             extraction_notes.warnings.append(f"Found {len(sheet_names)} sheets: {', '.join(sheet_names)}")
 
             # Process each sheet
-            for sheet_name in sheet_names:
+            for sheet_name, df in sheets.items():
                 try:
-                    # Read sheet with pandas
-                    df = pd.read_excel(file_path, sheet_name=sheet_name, header=None)
-
                     # Extract transactions from this sheet
                     sheet_transactions = self._extract_transactions_from_sheet(
                         df, sheet_name, extraction_notes
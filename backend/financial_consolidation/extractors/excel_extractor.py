@@ -3,12 +3,12 @@ Excel Extractor Module
 Extracts financial data from Excel files (.xlsx, .xls)
 """
 
-import openpyxl
 from openpyxl.utils import get_column_letter
 from pathlib import Path
 from typing import List, Dict, Any, Optional
 import re
 
+from app.services.workbook_reader import read_values, sheet_names
 from ..config.settings import EXCEL_MAX_ROWS_TO_SCAN, EXCEL_HEADER_ROW_SEARCH_LIMIT
 
 
@@ -23,7 +23,6 @@ class ExcelExtractor:
             file_path: Path to Excel file
         """
         self.file_path = Path(file_path)
-        self.workbook = None
         self.extracted_data = {}
 
     def extract(self) -> Dict[str, Any]:
@@ -34,21 +33,21 @@ class ExcelExtractor:
             Dictionary with extracted data from all sheets
         """
         try:
-            self.workbook = openpyxl.load_workbook(self.file_path, data_only=True)
+            # Cell values (cached results for formulas) of every sheet
+            workbook = read_values(self.file_path)
 
             self.extracted_data = {
                 'file_path': str(self.file_path),
                 'filename': self.file_path.name,
                 'sheets': [],
-                'total_sheets': len(self.workbook.sheetnames)
+                'total_sheets': len(workbook)
             }
 
-            for sheet_name in self.workbook.sheetnames:
-                sheet_data = self._extract_sheet(sheet_name)
+            for sheet_name, rows in workbook.items():
+                sheet_data = self._extract_sheet(sheet_name, rows)
                 if sheet_data:
                     self.extracted_data['sheets'].append(sheet_data)
 
-            self.workbook.close()
             return self.extracted_data
 
         except Exception as e:
@@ -59,34 +58,33 @@ class ExcelExtractor:
                 'sheets': []
             }
 
-    def _extract_sheet(self, sheet_name: str) -> Optional[Dict]:
+    def _extract_sheet(self, sheet_name: str, rows: List[List[Any]]) -> Optional[Dict]:
         """
         Extract data from a single sheet
 
         Args:
             sheet_name: Name of the sheet
+            rows: Cell values of the sheet, row 1 first
 
         Returns:
             Dictionary with sheet data or None if empty
         """
-        ws = self.workbook[sheet_name]
-
         # Check if sheet is empty
-        if ws.max_row == 0 or ws.max_column == 0:
+        if not rows or not rows[0]:
             return None
 
         # Find header row
-        header_row_idx = self._find_header_row(ws)
+        header_row_idx = self._find_header_row(rows)
 
         if header_row_idx is None:
             # No clear header found, treat first row as header
             header_row_idx = 1
 
         # Extract headers
-        headers = self._extract_headers(ws, header_row_idx)
+        headers = self._extract_headers(rows, header_row_idx)
 
         # Extract data rows
-        data_rows = self._extract_data_rows(ws, header_row_idx, headers)
+        data_rows = self._extract_data_rows(rows, header_row_idx, headers)
 
         # Only return sheet data if there are actual data rows
         if not data_rows:
@@ -101,23 +99,23 @@ class ExcelExtractor:
             'column_count': len(headers)
         }
 
-    def _find_header_row(self, ws) -> Optional[int]:
+    def _find_header_row(self, rows: List[List[Any]]) -> Optional[int]:
         """
         Find the header row by looking for rows with text values
 
         Args:
-            ws: Worksheet object
+            rows: Cell values of the sheet
 
         Returns:
             Row index of header row or None
         """
-        for row_idx in range(1, min(EXCEL_HEADER_ROW_SEARCH_LIMIT + 1, ws.max_row + 1)):
-            row = ws[row_idx]
+        for row_idx in range(1, min(EXCEL_HEADER_ROW_SEARCH_LIMIT + 1, len(rows) + 1)):
+            row = rows[row_idx - 1]
 
             # Count non-empty text cells
             text_cells = 0
-            for cell in row:
-                if cell.value and isinstance(cell.value, str):
+            for value in row:
+                if value and isinstance(value, str):
                     text_cells += 1
 
             # If row has multiple text cells, likely a header
@@ -126,24 +124,24 @@ class ExcelExtractor:
 
         return None
 
-    def _extract_headers(self, ws, header_row_idx: int) -> List[str]:
+    def _extract_headers(self, rows: List[List[Any]], header_row_idx: int) -> List[str]:
         """
         Extract column headers
 
         Args:
-            ws: Worksheet object
+            rows: Cell values of the sheet
             header_row_idx: Index of header row
 
         Returns:
             List of header names
         """
         headers = []
-        row = ws[header_row_idx]
+        row = rows[header_row_idx - 1]
 
-        for col_idx, cell in enumerate(row, start=1):
-            if cell.value:
+        for col_idx, value in enumerate(row, start=1):
+            if value:
                 # Clean header name
-                header = str(cell.value).strip()
+                header = str(value).strip()
                 # Remove extra whitespace
                 header = re.sub(r'\s+', ' ', header)
                 headers.append(header)
@@ -153,12 +151,12 @@ class ExcelExtractor:
 
         return headers
 
-    def _extract_data_rows(self, ws, header_row_idx: int, headers: List[str]) -> List[Dict]:
+    def _extract_data_rows(self, rows: List[List[Any]], header_row_idx: int, headers: List[str]) -> List[Dict]:
         """
         Extract data rows
 
         Args:
-            ws: Worksheet object
+            rows: Cell values of the sheet
             header_row_idx: Index of header row
             headers: List of column headers
 
@@ -166,20 +164,19 @@ class ExcelExtractor:
             List of dictionaries (one per row)
         """
         data_rows = []
-        max_row = min(ws.max_row, header_row_idx + EXCEL_MAX_ROWS_TO_SCAN)
+        max_row = min(len(rows), header_row_idx + EXCEL_MAX_ROWS_TO_SCAN)
 
         for row_idx in range(header_row_idx + 1, max_row + 1):
-            row = ws[row_idx]
+            row = rows[row_idx - 1]
 
             # Check if row is empty
-            if all(cell.value is None for cell in row):
+            if all(value is None for value in row):
                 continue
 
             # Create row dictionary
             row_data = {}
-            for col_idx, cell in enumerate(row[:len(headers)]):
+            for col_idx, value in enumerate(row[:len(headers)]):
                 header = headers[col_idx]
-                value = cell.value
 
                 # Clean and standardize value
                 if value is not None:
@@ -206,16 +203,16 @@ class ExcelExtractor:
             List of lists (rows and columns)
         """
         try:
-            self.workbook = openpyxl.load_workbook(self.file_path, data_only=True)
-            ws = self.workbook.active
+            # First sheet of the workbook
+            first_sheet = sheet_names(self.file_path)[0]
+            rows = read_values(self.file_path, sheets=[first_sheet])[first_sheet]
 
             data = []
-            for row in ws.iter_rows(values_only=True):
+            for row in rows:
                 # Skip completely empty rows
                 if any(cell is not None for cell in row):
-                    data.append(list(row))
+                    data.append(row)
 
-            self.workbook.close()
             return data
 
         except Exception as e:
@@ -225,10 +222,7 @@ class ExcelExtractor:
     def get_sheet_names(self) -> List[str]:
         """Get list of sheet names"""
         try:
-            wb = openpyxl.load_workbook(self.file_path, read_only=True)
-            sheet_names = wb.sheetnames
-            wb.close()
-            return sheet_names
+            return sheet_names(self.file_path)
         except Exception as e:
             print(f"Error getting sheet names from {self.file_path}: {e}")
             return []
@@ -5,10 +5,12 @@ Discovers and catalogs all financial files in the project directory
 
 import os
 from pathlib import Path
-from typing import List, Dict
+from typing import List, Dict, Optional
 import json
 from datetime import datetime
 
+from app.services.project_registry import get_project_registry
+
 from ..config.settings import (
     PROJECT_DATA_DIR,
     SUPPORTED_FILE_TYPES,
@@ -49,7 +51,13 @@ class FileScanner:
 
         self.files_inventory = []
 
-        if recursive:
+        registry_files = self._registry_files()
+        if registry_files is not None:
+            # A project data folder: use the registry's inventory
+            for relative_path in registry_files:
+                if recursive or '/' not in relative_path:
+                    self._add_file_if_supported(self.base_dir / relative_path)
+        elif recursive:
             # Recursively scan all subdirectories
             for root, dirs, files in os.walk(self.base_dir):
                 for file in files:
@@ -64,6 +72,20 @@ class FileScanner:
         self._print_summary()
         return self.files_inventory
 
+    def _registry_files(self) -> Optional[List[str]]:
+        """
+        Data-relative paths of the files under base_dir, from the project registry
+
+        Returns:
+            Paths, or None when base_dir isn't a project's data folder
+        """
+        registry = get_project_registry()
+        base_dir = Path(self.base_dir).resolve()
+        project_id = base_dir.parent.name
+        if base_dir != registry.data_dir(project_id).resolve() or not registry.has_data(project_id):
+            return None
+        return [entry.path for entry in registry.files(project_id)]
+
     def _add_file_if_supported(self, file_path: Path):
         """Add file to inventory if it's a supported type"""
         if file_path.suffix.lower() in SUPPORTED_FILE_TYPES:
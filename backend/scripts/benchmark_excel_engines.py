@@ -0,0 +1,108 @@
+"""
+Benchmark the Excel reading engines on the project workbooks.
+
+For every workbook under projects/*/data, times each available engine on
+the two read paths the app uses:
+- pandas: every sheet as a DataFrame (dashboard readers, file extraction,
+  document previews)
+- values: every sheet as rows of cell values (financial consolidation)
+
+Usage (from backend/):
+    python scripts/benchmark_excel_engines.py [--repeat 3] [--top 10] [--project ID]
+"""
+import argparse
+import sys
+import time
+from pathlib import Path
+
+BACKEND_DIR = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(BACKEND_DIR))
+
+from app.services.workbook_reader import available_engines, read_excel, read_values  # noqa: E402
+
+READS = {
+    "pandas": lambda path, engine: read_excel(path, sheet_name=None, engine=engine),
+    "values": lambda path, engine: read_values(path, engine=engine),
+}
+
+
+def find_workbooks(project_id=None):
+    projects_dir = BACKEND_DIR / "projects"
+    pattern = f"{project_id}/data/**/*" if project_id else "*/data/**/*"
+    return sorted(
+        path for path in projects_dir.glob(pattern)
+        if path.suffix.lower() in ('.xlsx', '.xlsm', '.xls') and not path.name.startswith('~$')
+    )
+
+
+def best_time(read, path, engine, repeat):
+    """Fastest of `repeat` reads, in milliseconds."""
+    best = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        read(path, engine)
+        elapsed = (time.perf_counter() - start) * 1000
+        best = elapsed if best is None else min(best, elapsed)
+    return best
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare Excel reading engines on the project workbooks")
+    parser.add_argument("--repeat", type=int, default=3, help="Reads per workbook and engine (best is kept)")
+    parser.add_argument("--top", type=int, default=10, help="Slowest workbooks to list")
+    parser.add_argument("--project", help="Only this project's workbooks")
+    args = parser.parse_args()
+
+    engines = available_engines()
+    workbooks = find_workbooks(args.project)
+    if not workbooks:
+        print("No workbooks found")
+        return
+    if len(engines) < 2:
+        print(f"Only {engines[0]} is available (pip install python-calamine to compare)")
+
+    print(f"{len(workbooks)} workbooks, engines: {', '.join(engines)}, best of {args.repeat}\n")
+
+    # times[read][engine][path] = ms
+    times = {read: {engine: {} for engine in engines} for read in READS}
+    failures = []
+    for path in workbooks:
+        for read_name, read in READS.items():
+            for engine in engines:
+                try:
+                    times[read_name][engine][path] = best_time(read, path, engine, args.repeat)
+                except Exception as e:
+                    failures.append(f"{path.relative_to(BACKEND_DIR)} ({read_name}, {engine}): {e}")
+
+    baseline = "openpyxl"
+    for read_name in READS:
+        print(f"== {read_name} ==")
+        print(f"{'engine':<10} {'total ms':>10} {'mean ms':>9} {'speedup':>8}")
+        base_total = sum(times[read_name][baseline].values())
+        for engine in engines:
+            total = sum(times[read_name][engine].values())
+            count = len(times[read_name][engine]) or 1
+            speedup = f"{base_total / total:.1f}x" if total else "-"
+            print(f"{engine:<10} {total:>10.1f} {total / count:>9.2f} {speedup:>8}")
+        print()
+
+    # Slowest workbooks on the openpyxl pandas path, with each engine's time
+    pandas_times = times["pandas"]
+    slowest = sorted(pandas_times[baseline], key=pandas_times[baseline].get, reverse=True)[:args.top]
+    print(f"== slowest {len(slowest)} workbooks (pandas, ms) ==")
+    print(f"{'workbook':<70} " + " ".join(f"{engine:>10}" for engine in engines))
+    for path in slowest:
+        name = str(path.relative_to(BACKEND_DIR / "projects"))
+        if len(name) > 70:
+            name = "..." + name[-67:]
+        cells = " ".join(f"{pandas_times[engine].get(path, float('nan')):>10.1f}" for engine in engines)
+        print(f"{name:<70} {cells}")
+
+    if failures:
+        print(f"\n{len(failures)} failed reads:")
+        for failure in failures:
+            print(f"  {failure}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,35 @@
+"""
+Shared test fixtures
+"""
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+
+@pytest.fixture
+async def tmp_database(tmp_path, monkeypatch):
+    """
+    Point the app's database at a throwaway SQLite file.
+
+    Swaps the sync engine and session factory and resets the async engine,
+    so endpoints (sync and async sessions) and the test share tmp_path's
+    database instead of data/financial_builder.db. Yields a session factory.
+    """
+    from app import database
+    from app.models import data_points, extraction  # noqa: F401 (register tables)
+
+    url = f"sqlite:///{tmp_path / 'financial_builder.db'}"
+    engine = database.configure_engine(create_engine(url, **database._engine_options(url)))
+    database.Base.metadata.create_all(bind=engine)
+    session_factory = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+
+    monkeypatch.setattr(database, "SQLALCHEMY_DATABASE_URL", url)
+    monkeypatch.setattr(database, "engine", engine)
+    monkeypatch.setattr(database, "SessionLocal", session_factory)
+    monkeypatch.setattr(database, "_async_engine", None)
+    monkeypatch.setattr(database, "_async_session_factory", None)
+
+    yield session_factory
+
+    await database.dispose_async_engine()
+    engine.dispose()
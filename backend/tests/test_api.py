@@ -3,9 +3,13 @@ API Integration Tests
 
 Tests key API endpoints to ensure they're working correctly.
 """
+import uuid
+
 import pytest
 from httpx import AsyncClient, ASGITransport
 from app.main import app
+from app.routers.auth import get_current_user
+from app.services.project_registry import get_project_registry
 
 
 @pytest.fixture
@@ -52,6 +56,10 @@ async def test_authentication_required(client):
     # These endpoints should return 401 without auth
     protected_endpoints = [
         "/api/projects/dashboard",
+        "/api/portfolio/summary",
+        "/api/portfolio/projects",
+        "/api/portfolio/runs",
+        "/api/portfolio/runs/run_missing",
         "/api/templates/list",
         "/api/folder-watch/status"
     ]
@@ -60,9 +68,93 @@ async def test_authentication_required(client):
         response = await client.get(endpoint)
         assert response.status_code == 401, f"Expected 401 for {endpoint}, got {response.status_code}"
 
+    response = await client.post("/api/portfolio/run")
+    assert response.status_code == 401
+
 
 @pytest.mark.asyncio
 async def test_templates_list_unauthorized(client):
     """Test that template list requires authentication"""
     response = await client.get("/api/templates/list")
     assert response.status_code == 401
+
+
+@pytest.mark.asyncio
+async def test_portfolio_summary(client, monkeypatch):
+    """Portfolio summary covers every project in one payload and revalidates with 304"""
+    app.dependency_overrides[get_current_user] = lambda: {"id": 1, "email": "test@example.com"}
+    try:
+        response = await client.get("/api/portfolio/summary")
+        assert response.status_code == 200
+        data = response.json()
+        assert data["total_projects"] == len(data["projects"]) > 0
+        project = next(p for p in data["projects"] if p["project_id"] == "project-a-123-sunset-blvd")
+        assert project["project_name"] == "Project A - 123 Sunset Boulevard"
+        assert {"kpis", "budget_summary", "critical_issues"} <= set(project)
+        assert "categories" not in project["budget_summary"]
+
+        etag = response.headers["etag"]
+        response = await client.get("/api/portfolio/summary", headers={"If-None-Match": etag})
+        assert response.status_code == 304
+
+        # A renamed project changes the ETag
+        registry = get_project_registry()
+        project_info = registry.project_info
+        monkeypatch.setattr(registry, "project_info", lambda project_id: {
+            **(project_info(project_id) or {}), "project_name": f"Renamed {project_id}"
+        })
+        response = await client.get("/api/portfolio/summary", headers={"If-None-Match": etag})
+        assert response.status_code == 200
+        assert response.json()["projects"][0]["project_name"].startswith("Renamed ")
+    finally:
+        app.dependency_overrides.pop(get_current_user, None)
+
+
+@pytest.mark.asyncio
+async def test_dashboard_snapshot_etag_and_gzip(client):
+    """Dashboard revalidates with 304 and serves the precompressed body to gzip clients"""
+    from app.services.dashboard_snapshot import get_dashboard_snapshots
+
+    app.dependency_overrides[get_current_user] = lambda: {"id": 1, "email": "test@example.com"}
+    url = "/api/projects/dashboard?project_id=project-a-123-sunset-blvd"
+    try:
+        response = await client.get(url, headers={"Accept-Encoding": "gzip"})
+        assert response.status_code == 200
+        assert response.headers["content-encoding"] == "gzip"
+        etag = response.headers["etag"]
+        assert "kpis" in response.json()
+
+        response = await client.get(url, headers={"Accept-Encoding": "identity"})
+        assert "content-encoding" not in response.headers
+        assert response.headers["etag"] == etag
+
+        response = await client.get(url, headers={"If-None-Match": etag})
+        assert response.status_code == 304
+        assert response.content == b""
+
+        # Unknown projects are answered but neither their snapshot nor build lock is kept
+        response = await client.get("/api/projects/dashboard?project_id=no-such-project")
+        assert response.status_code == 200
+        assert "no-such-project" not in get_dashboard_snapshots()._build_locks
+    finally:
+        app.dependency_overrides.pop(get_current_user, None)
+
+
+@pytest.mark.asyncio
+async def test_job_status_async_session(client, tmp_database):
+    """Async endpoints get a working AsyncSession (aiosqlite engine builds and queries)"""
+    from app.models.extraction import ExtractionJob, JobStatus
+
+    job_id = f"job_test_{uuid.uuid4().hex[:8]}"
+    with tmp_database() as db:
+        db.add(ExtractionJob(job_id=job_id, project_id="project-a-123-sunset-blvd",
+                             status=JobStatus.COMPLETED, total_files=3, processed_files=3))
+        db.commit()
+
+    response = await client.get(f"/api/financial-builder/jobs/{job_id}/status")
+    assert response.status_code == 200
+    data = response.json()
+    assert (data["status"], data["processed_files"]) == ("completed", 3)
+
+    response = await client.get("/api/financial-builder/jobs/job_missing/status")
+    assert response.status_code == 404
@@ -0,0 +1,63 @@
+"""
+Tests for columnar extraction payloads
+"""
+import pandas as pd
+import pytest
+
+from app.models.extraction import ExtractedData
+from app.models import columnar
+from app.services.transaction_parser import TransactionParser
+
+
+def sample_tables():
+    return {
+        "Invoices": pd.DataFrame({
+            "Date": pd.to_datetime(["2024-07-01", None, "2024-07-03"]),
+            "Description": ["Concrete pour", "Steel", None],
+            "Amount": [1200.5, 300.0, 10.0],
+            "Notes": ["paid", 42, None],  # mixed types
+        }),
+        "Empty": pd.DataFrame(),
+    }
+
+
+@pytest.mark.parametrize("arrow", [True, False])
+def test_tables_round_trip(monkeypatch, arrow):
+    """Both codecs keep values, nulls and datetime columns"""
+    if not arrow:
+        monkeypatch.setattr(columnar, "pa", None)
+    elif columnar.pa is None:
+        pytest.skip("pyarrow not installed")
+
+    payload = columnar.encode_tables(sample_tables())
+    tables = columnar.decode_tables(payload)
+
+    assert list(tables) == ["Invoices", "Empty"]
+    invoices = tables["Invoices"]
+    assert pd.api.types.is_datetime64_any_dtype(invoices["Date"])
+    assert invoices["Amount"].tolist() == [1200.5, 300.0, 10.0]
+    assert invoices["Notes"].tolist()[:2] == ["paid", "42"]
+    assert pd.isna(invoices["Description"].iloc[2])
+
+
+def test_parser_reads_typed_columns():
+    """Columnar rows parse without a stored JSON or text payload"""
+    row = ExtractedData(file_name="Supplier_Invoices.xlsx", file_type="excel")
+    row.tables = {"Sheet1": pd.DataFrame({
+        "Date": pd.to_datetime(["2024-07-01", "2024-07-02", "2024-07-03"]),
+        "Description": ["Concrete pour", "Steel", ""],
+        "Amount": ["$1,200.50", "(300)", "5"],
+    })}
+
+    assert row.raw_text_compressed is None and row.structured_data_compressed is None
+    # Decoded once per payload
+    assert row.tables is row.tables
+    assert row.text_preview.startswith("Date: 2024-07-01 00:00:00 | Description: Concrete pour")
+
+    points = TransactionParser("PROJ001").parse_extracted_data(row, "1")
+
+    assert [(p.description, p.amount, p.source_location) for p in points] == [
+        ("Concrete pour", 1200.5, "Row 2"),
+        ("Steel", -300.0, "Row 3"),
+    ]
+    assert points[0].transaction_date.day == 1
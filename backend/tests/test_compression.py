@@ -0,0 +1,105 @@
+"""
+Tests for fast JSON responses and response compression
+"""
+import gzip
+
+import pytest
+from fastapi import FastAPI
+from fastapi.responses import Response, StreamingResponse
+from httpx import ASGITransport, AsyncClient
+
+from app.middleware.compression import CompressionMiddleware, accepted_encoding
+from app.responses import FastJSONResponse
+
+ROWS = [{"id": i, "description": f"Invoice {i}", "amount": i * 1.5} for i in range(500)]
+
+
+def make_app() -> FastAPI:
+    app = FastAPI(default_response_class=FastJSONResponse)
+    app.add_middleware(CompressionMiddleware, minimum_size=1024)
+
+    @app.get("/rows")
+    async def rows():
+        return {"rows": ROWS}
+
+    @app.get("/small")
+    async def small():
+        return {"ok": True}
+
+    @app.get("/events")
+    async def events():
+        async def stream():
+            for i in range(3):
+                yield f"data: {'x' * 1000} {i}\n\n"
+        return StreamingResponse(stream(), media_type="text/event-stream")
+
+    @app.get("/stream")
+    async def stream_text():
+        async def stream():
+            for i in range(20):
+                yield f"line {i} " * 100 + "\n"
+        return StreamingResponse(stream(), media_type="text/plain")
+
+    @app.get("/chunked-small")
+    async def chunked_small():
+        async def stream():
+            yield "tiny "
+            yield "body"
+        return StreamingResponse(stream(), media_type="text/plain")
+
+    @app.get("/pregzipped")
+    async def pregzipped():
+        body = gzip.compress(b'{"cached": true}' * 200)
+        return Response(body, media_type="application/json", headers={"Content-Encoding": "gzip"})
+
+    return app
+
+
+@pytest.fixture
+async def client():
+    async with AsyncClient(transport=ASGITransport(app=make_app()), base_url="http://test") as ac:
+        yield ac
+
+
+def test_accepted_encoding():
+    assert accepted_encoding("gzip, deflate, br") == "br"
+    assert accepted_encoding("gzip, br;q=0") == "gzip"
+    assert accepted_encoding("identity") is None
+
+
+async def test_large_json_is_compressed(client):
+    response = await client.get("/rows", headers={"Accept-Encoding": "gzip"})
+    assert response.headers["content-encoding"] == "gzip"
+    assert "Accept-Encoding" in response.headers["vary"]
+    assert response.json() == {"rows": ROWS}  # httpx decodes the body
+
+    response = await client.get("/rows", headers={"Accept-Encoding": "br"})
+    assert response.headers["content-encoding"] == "br"
+    assert response.json() == {"rows": ROWS}
+
+
+async def test_streams_are_compressed_incrementally(client):
+    response = await client.get("/stream", headers={"Accept-Encoding": "gzip"})
+    assert response.headers["content-encoding"] == "gzip"
+    assert "content-length" not in response.headers
+    assert response.text.count("line 19") == 100
+
+
+async def test_skipped_responses(client):
+    headers = {"Accept-Encoding": "gzip, br"}
+
+    response = await client.get("/small", headers=headers)
+    assert "content-encoding" not in response.headers
+
+    # Small bodies sent in chunks (as through BaseHTTPMiddleware) stay uncompressed
+    response = await client.get("/chunked-small", headers=headers)
+    assert "content-encoding" not in response.headers
+    assert response.text == "tiny body"
+
+    response = await client.get("/events", headers=headers)
+    assert "content-encoding" not in response.headers
+
+    # Already encoded by the route: passed through, not compressed twice
+    response = await client.get("/pregzipped", headers=headers)
+    assert response.headers["content-encoding"] == "gzip"
+    assert response.content.startswith(b'{"cached": true}')
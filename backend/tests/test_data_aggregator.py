@@ -0,0 +1,58 @@
+"""
+Tests for the vectorized dashboard aggregations
+"""
+import pandas as pd
+
+from app.services.data_aggregator import DataAggregator
+
+BUDGET = [
+    {"category": "Framing", "budget": 1000.0, "actual_spent": 2500.0, "committed": 0,
+     "forecast": 1000.0, "variance": -1500.0, "percent_complete": 250},
+    {"category": "Framing", "budget": 500.0, "actual_spent": 100.0, "committed": 0,
+     "forecast": 500.0, "variance": 400.0, "percent_complete": 20},
+    {"category": "Roofing", "budget": 800.0, "actual_spent": 0.0, "committed": 0,
+     "forecast": 800.0, "variance": 800.0, "percent_complete": 0},
+]
+VARIATIONS = [
+    {"vo_num": "VO-1", "client_price": 300.0, "status": "Approved", "invoiced": "no"},
+    {"vo_num": "VO-2", "client_price": 700.0, "status": "APPROVED", "invoiced": "YES"},
+    {"vo_num": "VO-3", "client_price": 900.0, "status": "nan", "invoiced": "NO"},
+]
+PAYMENTS = [{"total": 110.0, "status": "OVERDUE"}, {"total": 55.0, "status": "PAID"}]
+MILESTONES = [{"amount": 2000.0, "status": "overdue"}, {"amount": 1000.0, "status": "PENDING"}]
+DEFECTS = [{"severity": "CRITICAL", "status": "OPEN"}, {"severity": "Low", "status": "OVERDUE"}]
+
+
+def test_frames_and_rows_aggregate_the_same():
+    """Aggregations accept reader rows or frames and return native numbers"""
+    frames = [pd.DataFrame(rows) for rows in (BUDGET, PAYMENTS, MILESTONES, DEFECTS, VARIATIONS)]
+    budget, payments, milestones, defects, variations = frames
+
+    kpis = DataAggregator.calculate_kpis(budget, variations)
+    assert kpis == DataAggregator.calculate_kpis(BUDGET, VARIATIONS)
+    assert kpis["revenue_leakage"] == 300.0
+    assert kpis["percent_complete"] == 90
+    assert type(kpis["total_costs_to_date"]) is float
+
+    summary = DataAggregator.get_budget_summary(budget)
+    assert summary == DataAggregator.get_budget_summary(BUDGET)
+    assert [c["category"] for c in summary["categories"]] == ["Framing", "Roofing"]
+    assert summary["categories"][0]["actual"] == 2600.0
+
+    issues = DataAggregator.identify_critical_issues(payments, milestones, defects, variations)
+    assert issues == DataAggregator.identify_critical_issues(PAYMENTS, MILESTONES, DEFECTS, VARIATIONS)
+    assert [issue["type"] for issue in issues] == [
+        "overdue_payment", "client_overdue", "revenue_leakage", "critical_defect", "overdue_defect"
+    ]
+
+    cashflow = DataAggregator.get_cashflow_forecast(budget, milestones, variations, weeks=4)
+    assert cashflow["expected_income"] == 1300.0
+
+
+def test_empty_inputs():
+    """Missing workbooks (no rows, no columns) aggregate to zeros"""
+    empty = pd.DataFrame()
+    assert DataAggregator.get_budget_summary([])["categories"] == []
+    assert DataAggregator.calculate_kpis(empty, empty)["revenue_leakage"] == 0
+    assert DataAggregator.identify_critical_issues([], empty, [], empty) == []
+    assert DataAggregator.generate_insights(empty, [], empty, [], empty, []) == []
@@ -0,0 +1,171 @@
+"""
+Tests for Data Point Mapper Service
+"""
+import json
+import uuid
+from datetime import datetime, timedelta
+
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from app.database import Base
+from app.models.data_points import DataPoint, DataPointStatus, DataPointType, DataPointValidationRule
+from app.services.data_point_mapper import DataPointMapper
+from app.services.data_point_index import DataPointIndex
+
+
+@pytest.fixture
+def db():
+    """In-memory database session"""
+    engine = create_engine("sqlite://", connect_args={"check_same_thread": False})
+    Base.metadata.create_all(bind=engine)
+    session = sessionmaker(bind=engine)()
+    try:
+        yield session
+    finally:
+        session.close()
+        engine.dispose()
+
+
+def make_point(amount, description, date=None, vendor=None):
+    """Create an unsaved data point"""
+    return DataPoint(
+        id=str(uuid.uuid4()),
+        project_id="PROJ001",
+        source_file_id="file-1",
+        source_file_name="invoices.xlsx",
+        data_point_type=DataPointType.TRANSACTION,
+        transaction_date=date,
+        description=description,
+        amount=amount,
+        vendor=vendor,
+        is_duplicate=False
+    )
+
+
+def test_exact_duplicate_in_same_batch_is_skipped(db):
+    """Duplicates within one batch are caught before anything is flushed"""
+    mapper = DataPointMapper(db, "PROJ001")
+    date = datetime(2025, 3, 1)
+
+    first = make_point(1200.0, "Concrete pour level 2", date, "ABC Concrete")
+    second = make_point(1200.0, "Concrete pour level 2 ", date, "abc concrete")
+
+    processed, conflicts = mapper.process_data_points([first, second])
+
+    assert processed == [first]
+    assert conflicts == []
+    assert second.is_duplicate is True
+    assert second.superseded_by == first.id
+
+
+def test_duplicates_and_conflicts_against_existing_points(db):
+    """Incoming points are checked against points saved by earlier runs"""
+    mapper = DataPointMapper(db, "PROJ001")
+    date = datetime(2025, 3, 1)
+
+    existing = make_point(5000.0, "Steel framing materials", date)
+    mapper.process_data_points([existing])
+
+    duplicate = make_point(5000.0, "steel framing materials", date + timedelta(hours=3))
+    conflicting = make_point(5030.0, "Steel framing materials", date + timedelta(days=2))
+    out_of_window = make_point(5000.0, "Steel framing materials", date + timedelta(days=30))
+
+    processed, conflicts = mapper.process_data_points([duplicate, conflicting, out_of_window])
+
+    assert duplicate.is_duplicate is True
+    assert duplicate.superseded_by == existing.id
+    assert processed == [conflicting, out_of_window]
+    assert len(conflicts) == 1
+    assert conflicting.conflict_group_id == conflicts[0].conflict_group_id
+
+
+def test_index_candidates_match_amount_and_date_window(db):
+    """Index returns the same candidates the per-point query would"""
+    date = datetime(2025, 6, 15)
+    points = [
+        make_point(100.0, "a", date),
+        make_point(100.9, "b", date + timedelta(days=7)),
+        make_point(101.5, "c", date),
+        make_point(99.5, "d", date - timedelta(days=8)),
+        make_point(100.2, "e", None),
+    ]
+    db.add_all(points)
+    db.commit()
+
+    index = DataPointIndex.load(db, "PROJ001")
+    probe = index.make_probe(make_point(100.0, "probe", date))
+
+    assert [c.point.id for c in index.candidates(probe)] == [points[0].id, points[1].id, points[4].id]
+
+
+def test_validation_rules_applied_per_type_in_batch(db):
+    """Rules are loaded once per batch and only apply to matching types"""
+    db.add_all([
+        DataPointValidationRule(
+            id="rule-range", project_id="PROJ001", rule_name="Invoice limit",
+            rule_type="range_check", data_point_type=DataPointType.TRANSACTION,
+            rule_parameters=json.dumps({"min_amount": 0, "max_amount": 10000}), active=True
+        ),
+        DataPointValidationRule(
+            id="rule-vendor", project_id=None, rule_name="Vendor",
+            rule_type="required_field", rule_parameters=json.dumps({"field_name": "vendor"}),
+            active=True
+        ),
+        DataPointValidationRule(
+            id="rule-invoice", project_id="PROJ001", rule_name="Invoice number",
+            rule_type="format_check",
+            rule_parameters=json.dumps({"field_name": "invoice_number", "pattern": r"INV-\d+$"}),
+            active=True
+        ),
+    ])
+    db.commit()
+
+    mapper = DataPointMapper(db, "PROJ001")
+    too_large = make_point(25000.0, "Crane hire", datetime(2025, 1, 5), "Lift Co")
+    too_large.invoice_number = "INV-001"
+    budget = make_point(25000.0, "Crane budget", datetime(2025, 4, 5))
+    budget.data_point_type = DataPointType.BUDGET_ITEM
+    budget.invoice_number = "bad"
+
+    processed, _ = mapper.process_data_points([too_large, budget])
+
+    assert json.loads(too_large.structured_metadata)["validation_errors"] == [
+        "Invoice limit: Amount exceeds maximum ($10000)"
+    ]
+    assert json.loads(budget.structured_metadata)["validation_errors"] == [
+        "Vendor: Required field 'vendor' is missing",
+        "Invoice number: Field 'invoice_number' format invalid",
+    ]
+    blank = make_point(0.0, "", vendor="X")
+    blank.invoice_number = "INV-7"
+    assert mapper._validate_data_point(blank) == [
+        "Amount cannot be zero",
+        "Description is required",
+    ]
+
+
+def test_processing_version_follows_points_categorization_reads(db):
+    """Edits and new points change the version; points it skips don't"""
+    mapper = DataPointMapper(db, "PROJ001")
+    point = make_point(500.0, "Rebar delivery", datetime(2025, 3, 1))
+    point.status = DataPointStatus.VALIDATED
+    db.add(point)
+    db.commit()
+
+    version = mapper.processing_version()
+    assert [row[0] for row in version] == [point.id]
+    assert mapper.processing_version() == version
+
+    duplicate = make_point(500.0, "Rebar delivery", datetime(2025, 3, 1))
+    duplicate.status = DataPointStatus.VALIDATED
+    duplicate.is_duplicate = True
+    db.add(duplicate)
+    db.commit()
+    assert mapper.processing_version() == version
+
+    mapper.manually_correct_data_point(point.id, {"amount": 550.0}, edited_by="pm@example.com")
+    edited = mapper.processing_version()
+    assert edited != version
+    assert edited[0][2] is True
@@ -0,0 +1,69 @@
+"""
+Tests for the batched single-writer database queue
+"""
+import time
+
+import pytest
+from sqlalchemy import create_engine, text
+from sqlalchemy.orm import sessionmaker
+
+from app.database import DatabaseWriter
+
+
+@pytest.fixture
+def writer(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path / 'writer.db'}")
+    with engine.begin() as connection:
+        connection.execute(text("CREATE TABLE items (name TEXT UNIQUE)"))
+    writer = DatabaseWriter(sessionmaker(bind=engine), max_delay=0.2)
+    writer.engine = engine
+    yield writer
+    writer.shutdown()
+    engine.dispose()
+
+
+def _insert(name):
+    def operation(session):
+        session.execute(text("INSERT INTO items (name) VALUES (:name)"), {"name": name})
+        return name
+    return operation
+
+
+def _names(writer):
+    with writer.engine.connect() as connection:
+        return sorted(row[0] for row in connection.execute(text("SELECT name FROM items")))
+
+
+def test_failing_operation_does_not_lose_its_batch(writer, caplog):
+    writer.submit(_insert("dup")).result(timeout=5)
+
+    # Queued together, so they share one batch until the duplicate fails it
+    futures = [writer.submit(_insert(name)) for name in ("a", "dup", "b")]
+
+    assert futures[0].result(timeout=5) == "a"
+    with pytest.raises(Exception, match="UNIQUE"):
+        futures[1].result(timeout=5)
+    assert futures[2].result(timeout=5) == "b"
+    assert "retrying individually" in caplog.text
+    assert _names(writer) == ["a", "b", "dup"]
+
+
+def test_flush_waits_for_queued_writes(writer):
+    def slow_insert(session):
+        time.sleep(0.3)
+        return _insert("slow")(session)
+
+    future = writer.submit(slow_insert)
+    writer.submit(_insert("after"))
+    writer.flush(timeout=5)
+
+    assert future.done()
+    assert _names(writer) == ["after", "slow"]
+
+
+def test_shutdown_drains_pending_writes(writer):
+    futures = [writer.submit(_insert(f"row{i}")) for i in range(250)]
+    writer.shutdown()
+
+    assert all(future.done() for future in futures)
+    assert len(_names(writer)) == 250
@@ -0,0 +1,95 @@
+"""
+Tests for windowed Excel previews
+"""
+from pathlib import Path
+
+import openpyxl
+import pytest
+
+from fastapi import HTTPException
+
+from app.routers import documents
+from app.services import workbook_reader
+from app.services.document_viewer import DocumentViewer, get_viewer_cache
+from app.services.workbook_cache import get_workbook_cache
+
+
+def test_excel_window(tmp_path):
+    wb = openpyxl.Workbook()
+    ws = wb.active
+    ws.title = "Register"
+    ws.append(["Ref", "Supplier", "Amount", None])
+    for i in range(250):
+        ws.append([f"INV-{i:04d}", "Acme" if i % 2 else None, i * 10, None])
+    wb.save(tmp_path / "register.xlsx")
+
+    viewer = DocumentViewer()
+    viewer.base_dir = tmp_path
+    dashboard_entries = get_workbook_cache().stats()["entries"]
+    viewer_misses = get_viewer_cache().stats()["misses"]
+    window = viewer.excel_window(Path("register.xlsx"), offset=100, limit=20, columns=["Ref", "Supplier"])
+
+    # Windows go to the viewer's own cache, not the dashboards' workbook cache
+    assert get_workbook_cache().stats()["entries"] == dashboard_entries
+    assert get_viewer_cache().stats()["misses"] == viewer_misses + 2
+
+    assert window["total_rows"] == 250
+    assert window["columns"] == ["Ref", "Supplier"]
+    assert window["row_count"] == 20
+    assert window["data"][0] == ["INV-0100", ""]
+    assert window["data"][-1] == ["INV-0119", "Acme"]
+
+    preview = viewer.excel_to_json(Path("register.xlsx"), max_rows=5)
+    sheet = preview["sheets"]["Register"]
+    assert sheet["columns"] == ["Ref", "Supplier", "Amount", "Unnamed: 3"]
+    assert sheet["row_count"] == 5 and sheet["total_rows"] == 250
+
+    assert "error" in viewer.excel_window(Path("register.xlsx"), sheet="Missing")
+
+
+@pytest.mark.parametrize("calamine", [True, False])
+def test_window_of_write_only_workbook(tmp_path, monkeypatch, calamine):
+    """Sheets saved without a dimension record are still sized"""
+    if not calamine:
+        monkeypatch.setattr(workbook_reader, "CalamineWorkbook", None)
+
+    wb = openpyxl.Workbook(write_only=True)
+    ws = wb.create_sheet("Transactions")
+    ws.append(["Date", "Description", "Amount"])
+    for i in range(40):
+        ws.append(["2025-01-01", f"Item {i}", i])
+    wb.create_sheet("Empty")
+    wb.save(tmp_path / "model.xlsx")
+
+    assert workbook_reader.sheet_dimensions(tmp_path / "model.xlsx") == {"Transactions": (41, 3), "Empty": (0, 0)}
+
+    viewer = DocumentViewer()
+    viewer.base_dir = tmp_path
+    window = viewer.excel_window(Path("model.xlsx"), offset=30, limit=20)
+    assert window["total_rows"] == 40
+    assert window["row_count"] == 10
+    assert window["data"][0] == ["2025-01-01", "Item 30", 30]
+
+
+async def test_window_routes_stay_inside_project_data(tmp_path, monkeypatch):
+    (tmp_path / "data").mkdir()
+    wb = openpyxl.Workbook()
+    wb.active.append(["Ref"])
+    wb.save(tmp_path / "data" / "register.xlsx")
+    wb.save(tmp_path / "outside.xlsx")
+
+    def init(self, project_id="project-a"):
+        self.project_id = project_id
+        self.base_dir = tmp_path / "data"
+
+    monkeypatch.setattr(DocumentViewer, "__init__", init)
+    window = await documents.excel_window("project-a", "register.xlsx", None, 0, 10, None, {})
+    assert window["filename"] == "register.xlsx"
+
+    with pytest.raises(HTTPException) as error:
+        await documents.excel_window("project-a", "../outside.xlsx", None, 0, 10, None, {})
+    assert error.value.status_code == 404
+
+    with pytest.raises(HTTPException) as error:
+        await documents.preview_pdf("project-a", "../outside.xlsx", None, {})
+    assert error.value.status_code == 404
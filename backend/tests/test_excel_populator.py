@@ -0,0 +1,71 @@
+"""
+Tests for Excel Populator Service
+"""
+from openpyxl import load_workbook
+
+from app.services.ai_categorizer import AICategorizer
+from app.services.excel_populator import ExcelPopulator
+
+
+def sample_transactions(count=60):
+    """Categorized transactions across revenue, direct and indirect costs"""
+    categories = ['Concrete & Cement', 'Lumber & Wood', 'Progress Payments', 'Insurance', 'Uncategorized']
+    return [
+        {
+            'date': '2025-01-01',
+            'description': f'Item {i}\x01',
+            'vendor': 'Vendor',
+            'amount': 100.0 + i,
+            'category': categories[i % len(categories)],
+            'confidence': (i % 10) / 10,
+            'source_file': 'invoices.xlsx'
+        }
+        for i in range(count)
+    ]
+
+
+def sheet_values(path):
+    workbook = load_workbook(path)
+    return {
+        name: [
+            [cell.value for cell in row]
+            for row in workbook[name].iter_rows()
+            if not str(row[0].value).startswith('Generated')
+        ]
+        for name in workbook.sheetnames
+    }
+
+
+def test_write_only_model_matches_in_memory_model(tmp_path):
+    """Streaming writer produces the same sheets and values from running totals"""
+    transactions = sample_transactions()
+    data = {
+        'categorized_transactions': transactions,
+        'summary': AICategorizer.get_category_summary(None, transactions)
+    }
+    populator = ExcelPopulator()
+
+    in_memory = populator.create_financial_model(data, str(tmp_path / "a.xlsx"), "P", write_only=False)
+    streamed = populator.write_financial_model(iter(transactions), str(tmp_path / "b.xlsx"), "P")
+
+    expected = sheet_values(in_memory)
+    assert list(expected) == ['Summary', 'Revenue', 'Direct Costs', 'Indirect Costs', 'Transactions']
+    assert sheet_values(streamed) == expected
+
+    transactions_sheet = load_workbook(streamed)['Transactions']
+    assert transactions_sheet['B4'].value == 'Item 0'
+    assert transactions_sheet['F4'].number_format == '0.00%'
+    assert transactions_sheet['F4'].font.color.rgb == '009C0006'
+
+
+def test_streamed_model_handles_missing_confidence(tmp_path):
+    """Transactions without a confidence score are written as 0% (low confidence)"""
+    transactions = sample_transactions(3)
+    transactions[0]['confidence'] = None
+    del transactions[1]['confidence']
+
+    streamed = ExcelPopulator().write_financial_model(iter(transactions), str(tmp_path / "model.xlsx"), "P")
+
+    transactions_sheet = load_workbook(streamed)['Transactions']
+    assert [transactions_sheet[f'F{row}'].value for row in (4, 5)] == [0, 0]
+    assert transactions_sheet['F4'].font.color.rgb == '009C0006'
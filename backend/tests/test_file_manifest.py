@@ -0,0 +1,101 @@
+"""
+Tests for the project file manifest
+"""
+import os
+
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from app.database import Base
+from app.models.data_points import DataPoint, DataPointStatus, DataPointType
+from app.models.extraction import ExtractedData, FileManifestEntry
+from app.services.file_manifest import FileManifest
+
+
+@pytest.fixture
+def db():
+    """In-memory database session"""
+    engine = create_engine("sqlite://", connect_args={"check_same_thread": False})
+    Base.metadata.create_all(bind=engine)
+    session = sessionmaker(bind=engine)()
+    try:
+        yield session
+    finally:
+        session.close()
+        engine.dispose()
+
+
+def scan(folder):
+    """File info dicts as FileExtractor.scan_files() returns them"""
+    files = []
+    for path in sorted(folder.iterdir()):
+        stat = path.stat()
+        files.append({
+            'path': str(path), 'name': path.name, 'type': 'csv',
+            'size': stat.st_size, 'mtime_ns': stat.st_mtime_ns
+        })
+    return files
+
+
+def extract(db, file_info):
+    """Store an extracted row and its manifest entry"""
+    row = ExtractedData(
+        project_id="PROJ001", file_path=file_info['path'], file_name=file_info['name'],
+        file_type='csv', raw_text="x", extraction_status='success'
+    )
+    db.add(row)
+    db.flush()
+    FileManifest.record(db, "PROJ001", file_info, row.id)
+    db.commit()
+    return row
+
+
+def test_diff_only_returns_new_and_changed_files(db, tmp_path):
+    """Unchanged and touched files are skipped; edits and deletions are detected"""
+    for name in ("a.csv", "b.csv", "c.csv"):
+        (tmp_path / name).write_text(f"Description,Amount\n{name},1\n")
+
+    manifest = FileManifest(db, "PROJ001")
+    first = manifest.diff(scan(tmp_path))
+    assert [f['name'] for f in first.added] == ["a.csv", "b.csv", "c.csv"]
+    for file_info in first.changed:
+        extract(db, file_info)
+
+    assert manifest.diff(scan(tmp_path)).changed == []
+
+    os.utime(tmp_path / "a.csv", ns=(1, 1))
+    (tmp_path / "b.csv").write_text("Description,Amount\nb.csv,2\n")
+    (tmp_path / "c.csv").unlink()
+
+    diff = manifest.diff(scan(tmp_path))
+    assert [f['name'] for f in diff.unchanged] == ["a.csv"]
+    assert [f['name'] for f in diff.modified] == ["b.csv"]
+    assert [e.file_path for e in diff.deleted] == [str(tmp_path / "c.csv")]
+
+
+def test_retract_removes_stale_rows_and_their_data_points(db, tmp_path):
+    """Rows of modified/deleted files go; manually corrected points stay"""
+    for name in ("a.csv", "b.csv"):
+        (tmp_path / name).write_text(f"{name}\n")
+
+    manifest = FileManifest(db, "PROJ001")
+    rows = [extract(db, f) for f in manifest.diff(scan(tmp_path)).changed]
+    for row, status in zip(rows, (DataPointStatus.VALIDATED, DataPointStatus.MANUALLY_CORRECTED)):
+        for i in range(2):
+            db.add(DataPoint(
+                id=f"{row.id}-{status.value}-{i}", project_id="PROJ001", source_file_id=str(row.id),
+                source_file_name=row.file_name, data_point_type=DataPointType.TRANSACTION,
+                amount=1.0, description="x", status=status
+            ))
+    db.commit()
+
+    (tmp_path / "a.csv").unlink()
+    (tmp_path / "b.csv").write_text("changed\n")
+
+    diff = manifest.diff(scan(tmp_path))
+    assert manifest.retract(diff) == 2
+
+    assert db.query(ExtractedData).count() == 0
+    assert db.query(FileManifestEntry).count() == 1
+    assert {dp.status for dp in db.query(DataPoint)} == {DataPointStatus.MANUALLY_CORRECTED}
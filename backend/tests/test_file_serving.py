@@ -0,0 +1,65 @@
+"""
+Tests for range-capable, conditional file serving
+"""
+import pytest
+from fastapi import FastAPI, Request
+from httpx import ASGITransport, AsyncClient
+
+from app.file_serving import serve_file
+from app.middleware.compression import CompressionMiddleware
+
+CONTENT = b"".join(f"line {i:05d}\n".encode() for i in range(20000))
+
+
+@pytest.fixture
+async def client(tmp_path):
+    path = tmp_path / "register.csv"
+    path.write_bytes(CONTENT)
+
+    app = FastAPI()
+    app.add_middleware(CompressionMiddleware, minimum_size=1024)
+
+    @app.get("/file")
+    async def get_file(request: Request):
+        return serve_file(request, path, filename=path.name, inline=True)
+
+    async with AsyncClient(transport=ASGITransport(app=app), base_url="http://test") as ac:
+        yield ac
+
+
+async def test_conditional_get(client):
+    response = await client.get("/file", headers={"Accept-Encoding": "identity"})
+    assert response.status_code == 200
+    assert response.content == CONTENT
+    assert response.headers["accept-ranges"] == "bytes"
+    assert response.headers["content-disposition"] == 'inline; filename="register.csv"'
+
+    etag = response.headers["etag"]
+    response = await client.get("/file", headers={"If-None-Match": etag})
+    assert response.status_code == 304
+    assert response.content == b""
+
+    response = await client.get("/file", headers={"If-Modified-Since": response.headers["last-modified"]})
+    assert response.status_code == 304
+
+
+async def test_range_requests(client):
+    headers = {"Accept-Encoding": "gzip"}
+
+    response = await client.get("/file", headers={**headers, "Range": "bytes=100-199"})
+    assert response.status_code == 206
+    assert response.content == CONTENT[100:200]
+    assert response.headers["content-range"] == f"bytes 100-199/{len(CONTENT)}"
+    assert "content-encoding" not in response.headers
+
+    response = await client.get("/file", headers={**headers, "Range": "bytes=-11"})
+    assert response.content == CONTENT[-11:]
+
+    response = await client.get("/file", headers={**headers, "Range": f"bytes={len(CONTENT)}-"})
+    assert response.status_code == 416
+    assert response.headers["content-range"] == f"bytes */{len(CONTENT)}"
+
+    # A stale If-Range gets the whole (current) file
+    response = await client.get("/file", headers={**headers, "Range": "bytes=0-9", "If-Range": '"stale"'})
+    assert response.status_code == 200
+    assert response.content == CONTENT
@@ -0,0 +1,113 @@
+"""
+Tests for keyset pagination on the listing endpoints
+"""
+from datetime import datetime
+from types import SimpleNamespace
+
+import pytest
+from httpx import AsyncClient, ASGITransport
+
+from app.auth_utils import get_current_user
+from app.main import app
+from app.pagination import NEXT_CURSOR_HEADER
+from app.routers import extraction, webhooks
+from cloud_webhooks.webhook_handler import WebhookHandler
+
+
+@pytest.fixture
+async def client():
+    app.dependency_overrides[get_current_user] = lambda: {"id": 1, "email": "test@example.com"}
+    transport = ASGITransport(app=app)
+    async with AsyncClient(transport=transport, base_url="http://test") as ac:
+        yield ac
+    app.dependency_overrides.clear()
+
+
+async def _pages(client, url, key, **params):
+    """Follow X-Next-Cursor to the end, returning the key of every item per page"""
+    pages = []
+    cursor = None
+    while True:
+        response = await client.get(url, params={**params, **({"cursor": cursor} if cursor else {})})
+        assert response.status_code == 200
+        pages.append([item[key] for item in response.json()])
+        cursor = response.headers.get(NEXT_CURSOR_HEADER)
+        if not cursor:
+            return pages
+
+
+async def test_webhook_events_page_across_equal_timestamps(client, tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    handler = WebhookHandler()
+    # Bursts recorded within the same clock tick share a timestamp
+    timestamps = ["2026-01-01T00:00:00"] * 5 + ["2026-01-01T00:00:01"] * 2 + ["2026-01-01T00:00:02"] * 4
+    handler.events = [
+        {"timestamp": timestamp, "provider": "dropbox", "event_type": "change", "data": {}, "sequence": sequence}
+        for sequence, timestamp in enumerate(timestamps, start=1)
+    ]
+    monkeypatch.setattr(webhooks, "get_webhook_handler", lambda: handler)
+
+    pages = await _pages(client, "/api/webhooks/events", "sequence", limit=3)
+
+    # Newest page first, each page oldest first
+    assert pages == [[9, 10, 11], [6, 7, 8], [3, 4, 5], [1, 2]]
+    assert await _pages(client, "/api/webhooks/events", "sequence", limit=3, fields="sequence") == pages
+
+
+async def test_extraction_list_pages_without_gaps(client, tmp_path, monkeypatch):
+    # Uploads within the same second share the timestamp prefix of their id
+    file_ids = [f"20260101_120000_{suffix}" for suffix in "edcba"] + ["20260101_120001_a", "20260101_115959_z"]
+    for file_id in file_ids:
+        (tmp_path / f"{file_id}.json").write_text("{}")
+    (tmp_path / "20260101_120000_f_error.json").write_text("{}")
+
+    def load_result(file_id):
+        return SimpleNamespace(metadata=SimpleNamespace(
+            file_id=file_id, original_filename=f"{file_id}.pdf", file_type=SimpleNamespace(value="pdf"),
+            upload_date=datetime(2026, 1, 1), confidence_score=1.0
+        ))
+
+    monkeypatch.setattr(extraction, "EXTRACTION_DIR", tmp_path)
+    monkeypatch.setattr(extraction, "load_extraction_result", load_result)
+
+    pages = await _pages(client, "/api/extraction/list", "file_id", limit=2)
+
+    listed = [file_id for page in pages for file_id in page]
+    assert listed == sorted(file_ids, reverse=True)
+    assert [len(page) for page in pages] == [2, 2, 2, 1]
+
+
+async def test_extracted_data_pages_without_gaps(client, tmp_database):
+    from app.models.extraction import ExtractedData
+
+    created_at = datetime(2026, 1, 1)
+    with tmp_database() as session:
+        # Interleave another project so ids aren't contiguous
+        for index in range(7):
+            for project_id in ("project-a", "project-b"):
+                session.add(ExtractedData(
+                    project_id=project_id, file_name=f"{project_id}-{index}.pdf", file_type="pdf",
+                    extraction_status="success", created_at=created_at
+                ))
+        session.commit()
+        expected = [
+            row.id for row in session.query(ExtractedData.id)
+            .filter(ExtractedData.project_id == "project-a").order_by(ExtractedData.id)
+        ]
+
+    ids = []
+    cursor = None
+    while True:
+        response = await client.get(
+            "/api/financial-builder/project-a/extracted-data",
+            params={"limit": 3, "fields": "id,file_name", **({"cursor": cursor} if cursor else {})}
+        )
+        assert response.status_code == 200
+        body = response.json()
+        assert body["total_files"] == 7
+        ids.extend(item["id"] for item in body["files"])
+        cursor = body["next_cursor"]
+        if not cursor:
+            break
+
+    assert ids == expected
@@ -0,0 +1,54 @@
+"""
+Tests for comparing pipeline run metrics
+"""
+from app.services.pipeline_metrics import compare_runs
+
+
+def _run(job_id, stages, **metrics):
+    return {
+        "job_id": job_id,
+        "created_at": f"2026-01-0{job_id[-1]}T00:00:00",
+        "mode": "streaming",
+        "metrics": {"stages": stages, **metrics},
+    }
+
+
+def _stage(name, duration_s, **flags):
+    return {"name": name, "duration_s": duration_s, **flags}
+
+
+def test_compare_runs_deltas_against_median_baseline():
+    runs = [
+        _run("job_4", [_stage("extract", 6.0), _stage("populate", 1.0)], total_duration_s=7.0),
+        _run("job_3", [_stage("extract", 4.0), _stage("populate", 1.1)]),
+        _run("job_2", [_stage("extract", 3.0), _stage("populate", 0.9)]),
+        _run("job_1", [_stage("extract", 100.0), _stage("populate", 1.0)]),
+    ]
+
+    result = compare_runs(runs)
+
+    assert [run["job_id"] for run in result["runs"]] == ["job_4", "job_3", "job_2", "job_1"]
+    assert result["runs"][0]["stage_durations"] == {"extract": 6.0, "populate": 1.0}
+    # Median of the earlier runs, so one outlier doesn't move the baseline
+    assert result["stages"]["extract"] == {"latest_s": 6.0, "baseline_s": 4.0, "change_pct": 50.0, "runs": 4}
+    assert result["stages"]["populate"]["change_pct"] == 0.0
+    assert result["regressions"] == [
+        {"stage": "extract", "latest_s": 6.0, "baseline_s": 4.0, "change_pct": 50.0},
+    ]
+
+
+def test_compare_runs_missing_cached_and_failed_stages():
+    runs = [
+        _run("job_3", [_stage("extract", 0.0, cached=True), _stage("categorize", 2.0)]),
+        _run("job_2", [_stage("extract", 5.0), _stage("categorize", 9.0, failed=True)]),
+        _run("job_1", [_stage("extract", 4.0)]),
+    ]
+
+    stages = compare_runs(runs)["stages"]
+
+    # Cached in the latest run: no latest value and no delta
+    assert stages["extract"] == {"latest_s": None, "baseline_s": 4.5, "change_pct": None, "runs": 2}
+    # Only the latest run has it (the earlier one failed): no baseline
+    assert stages["categorize"] == {"latest_s": 2.0, "baseline_s": None, "change_pct": None, "runs": 1}
+    assert compare_runs(runs)["regressions"] == []
+    assert compare_runs([]) == {"runs": [], "stages": {}, "regressions": []}
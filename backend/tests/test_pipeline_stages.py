@@ -0,0 +1,74 @@
+"""
+Tests for memoizing pipeline stages across runs
+"""
+import pytest
+
+from app.services.pipeline_stages import STAGES, PipelineStageCache, hash_json
+
+
+@pytest.fixture
+def project(tmp_path):
+    source = tmp_path / "files" / "budget.xlsx"
+    source.parent.mkdir()
+    source.write_bytes(b"v1")
+    return tmp_path
+
+
+def _inputs(cache, project, **overrides):
+    inputs = {
+        "files": cache.hash_files([{"path": str(project / "files" / "budget.xlsx")}]),
+        "validation_rules": hash_json([]),
+        "template": hash_json({"categories": ["Labor"]}),
+        "keyword_map": "1",
+        "data_points": hash_json([["dp-1", "2026-01-01T00:00:00", False]]),
+    }
+    inputs.update(overrides)
+    return inputs
+
+
+def _run(project, **overrides):
+    """One pipeline run: rerun every stage that isn't fresh. Returns the stages it skipped."""
+    cache = PipelineStageCache("project-a", project / "pipeline")
+    fingerprints = cache.fingerprints(_inputs(cache, project, **overrides))
+    fresh = cache.fresh_stages(fingerprints)
+    for stage in STAGES[len(fresh):]:
+        cache.record(stage, fingerprints[stage], {"path": cache.write_json(f"{stage}.json", {})})
+    return fresh
+
+
+def test_second_run_skips_every_stage(project):
+    assert _run(project) == []
+    assert _run(project) == STAGES
+
+    cache = PipelineStageCache("project-a", project / "pipeline")
+    assert cache.fresh_stages(cache.fingerprints(_inputs(cache, project)), force=True) == []
+
+
+@pytest.mark.parametrize("change, fresh", [
+    ({"validation_rules": hash_json([[1, "range"]])}, ["extract"]),
+    ({"template": hash_json({"categories": ["Labor", "Materials"]})}, ["extract", "data_points"]),
+    ({"keyword_map": "2"}, ["extract", "data_points"]),
+    # A data point edited between runs
+    ({"data_points": hash_json([["dp-1", "2026-01-02T00:00:00", True]])}, ["extract", "data_points"]),
+])
+def test_changed_input_reruns_only_downstream_stages(project, change, fresh):
+    _run(project)
+
+    assert _run(project, **change) == fresh
+    # The rerun recorded the new inputs
+    assert _run(project, **change) == STAGES
+
+
+def test_changed_file_reruns_every_stage(project):
+    _run(project)
+    (project / "files" / "budget.xlsx").write_bytes(b"v2")
+
+    assert _run(project) == []
+    assert _run(project) == STAGES
+
+
+def test_missing_output_reruns_from_that_stage(project):
+    _run(project)
+    (project / "pipeline" / "categorize.json").unlink()
+
+    assert _run(project) == ["extract", "data_points"]
@@ -0,0 +1,137 @@
+"""
+Tests for portfolio run scheduling, worker failures and progress relay
+"""
+import os
+import time
+from concurrent.futures import Future
+from concurrent.futures.process import BrokenProcessPool
+
+import pytest
+
+from app.services import portfolio_runner
+from app.services.portfolio_runner import COMPLETED, FAILED, QUEUED, RUNNING, SKIPPED, PortfolioRunner
+from app.services.progress_bus import get_progress_bus, job_channel
+
+PROJECT_BYTES = {"a": 300, "b": 200, "c": 100, "d": 50, "empty": 0}
+
+
+class FakeExtractor:
+    """FileExtractor stand-in: one file of PROJECT_BYTES per project"""
+
+    def __init__(self, project_id, db):
+        self.project_id = project_id
+
+    def scan_files(self):
+        size = PROJECT_BYTES[self.project_id]
+        return [{"size": size}] if size else []
+
+    def create_extraction_job(self):
+        return f"job_{self.project_id}"
+
+
+class FakeExecutor:
+    """Records submitted pipelines; tests resolve their futures"""
+
+    def __init__(self):
+        self.futures = {}
+
+    def submit(self, fn, project_id, job_id, force, streaming):
+        future = Future()
+        self.futures[project_id] = future
+        return future
+
+
+@pytest.fixture
+def runner(monkeypatch):
+    monkeypatch.setattr(portfolio_runner, "FileExtractor", FakeExtractor)
+    runner = PortfolioRunner(max_workers=1)
+    runner.executors = []
+    runner.failed_jobs = []
+
+    def get_executor():
+        if runner._executor is None:
+            runner._executor = FakeExecutor()
+            runner.executors.append(runner._executor)
+        return runner._executor
+
+    runner._get_executor = get_executor
+    runner._fail_job = lambda project, message: runner.failed_jobs.append((project.job_id, message))
+    return runner
+
+
+def _statuses(run):
+    return {project.project_id: project.status for project in run.projects}
+
+
+def test_runs_share_workers_round_robin(runner):
+    first = runner.start_run(None, ["c", "a", "b", "empty"])
+    second = runner.start_run(None, ["d", "a"])
+
+    # Largest project first; empty and already-running projects are skipped
+    assert _statuses(first) == {"a": RUNNING, "b": QUEUED, "c": QUEUED, "empty": SKIPPED}
+    assert _statuses(second) == {"d": QUEUED, "a": SKIPPED}
+
+    executor = runner.executors[0]
+    order = ["a"]
+    for project_id in ("a", "b", "d", "c"):
+        executor.futures[project_id].set_result(COMPLETED)
+        order.extend(project_id for project_id in executor.futures if project_id not in order)
+
+    # A free worker goes to each active run in turn
+    assert order == ["a", "b", "d", "c"]
+    assert first.done and second.done
+    assert first.to_dict()["counts"][COMPLETED] == 3
+    assert runner._in_flight == 0
+
+
+def test_broken_pool_fails_project_and_restarts_pool(runner):
+    run = runner.start_run(None, ["a", "b"])
+    runner.executors[0].futures["a"].set_exception(BrokenProcessPool("worker died"))
+
+    assert _statuses(run) == {"a": FAILED, "b": RUNNING}
+    assert "worker died" in run.projects[0].error
+    assert runner.failed_jobs == [("job_a", "worker died")]
+    # The rest of the run goes to a fresh pool
+    assert len(runner.executors) == 2 and "b" in runner.executors[1].futures
+
+    runner.executors[1].futures["b"].set_result("failed")
+    assert _statuses(run) == {"a": FAILED, "b": FAILED}
+    assert run.finished_at is not None
+    assert runner._in_flight == 0
+
+
+def publish_from_worker(channel):
+    """Runs in a spawned worker process"""
+    get_progress_bus().publish(channel, "completed", status=COMPLETED)
+    return os.getpid()
+
+
+def test_worker_events_reach_web_process_bus():
+    runner = PortfolioRunner(max_workers=1)
+    channel = job_channel(f"job_relay_{os.getpid()}")
+    try:
+        worker_pid = runner._get_executor().submit(publish_from_worker, channel).result(timeout=60)
+        assert worker_pid != os.getpid()
+
+        deadline = time.monotonic() + 10
+        while get_progress_bus().state(channel) is None and time.monotonic() < deadline:
+            time.sleep(0.05)
+        state = get_progress_bus().state(channel)
+        assert state["last_event"] == "completed" and state["status"] == COMPLETED
+    finally:
+        runner.shutdown()
+
+
+@pytest.mark.parametrize("url, workers", [
+    ("sqlite:///data/financial_builder.db", 3),
+    ("postgresql://db/financial_builder", 8),
+])
+def test_worker_count_capped_for_sqlite(monkeypatch, url, workers):
+    from app import database
+    from app.config import get_config
+
+    monkeypatch.setattr(database, "SQLALCHEMY_DATABASE_URL", url)
+    monkeypatch.setattr(get_config(), "portfolio_workers", 8)
+    monkeypatch.setattr(get_config(), "portfolio_sqlite_workers", 3)
+
+    assert portfolio_runner._worker_count() == workers
@@ -0,0 +1,171 @@
+"""
+Tests for the progress bus, its SSE stream and the job event endpoints
+"""
+import asyncio
+import json
+import uuid
+
+import pytest
+from httpx import AsyncClient, ASGITransport
+from jose import jwt
+
+from app.auth_utils import ALGORITHM, SECRET_KEY
+from app.main import app
+from app.models.extraction import ExtractionJob, JobStatus
+from app.routers import financial_builder, templates
+from app.services import progress_bus
+from app.services.progress_bus import ProgressBus, event_stream, get_progress_bus, job_channel, template_channel
+
+
+@pytest.fixture
+async def client():
+    transport = ASGITransport(app=app)
+    async with AsyncClient(transport=transport, base_url="http://test") as ac:
+        yield ac
+
+
+@pytest.fixture
+def bus(monkeypatch):
+    bus = ProgressBus(history_size=3)
+    monkeypatch.setattr(progress_bus, "_progress_bus", bus)
+    return bus
+
+
+def _events(body):
+    """Parse an SSE body into (event, data) pairs, skipping comments"""
+    events = []
+    for frame in body.strip().split("\n\n"):
+        fields = dict(line.split(": ", 1) for line in frame.splitlines() if not line.startswith(":"))
+        if fields:
+            events.append((fields["event"], json.loads(fields["data"])))
+    return events
+
+
+async def _collect(stream):
+    return "".join([frame async for frame in stream])
+
+
+def _publish_later(channel, *events, delay=0.05):
+    """Publish (event, data) pairs from a worker thread once the stream is listening"""
+    async def publish():
+        await asyncio.sleep(delay)
+        for event, data in events:
+            await asyncio.to_thread(get_progress_bus().publish, channel, event, **data)
+    return asyncio.create_task(publish())
+
+
+def test_publish_merges_state_and_trims_history(bus):
+    bus.publish("job:1", "phase", phase="extraction", total_files=4)
+    bus.publish("job:1", "file_completed", processed_files=1)
+    bus.publish("job:1", "file_completed", processed_files=2)
+    bus.publish("job:1", "completed", status="completed")
+
+    state = bus.state("job:1")
+    assert state["phase"] == "extraction" and state["total_files"] == 4
+    assert state["processed_files"] == 2 and state["seq"] == 4
+    assert bus.is_finished("job:1")
+    assert bus.snapshot("job:1")["event"] == "completed"
+    assert [message["seq"] for message in bus._channels["job:1"].history] == [2, 3, 4]
+    assert bus.state("job:unknown") is None and bus.snapshot("job:unknown") is None
+
+
+async def test_subscribe_replays_history_and_stops_at_terminal_event(bus):
+    bus.publish("job:1", "phase", phase="extraction")
+    task = _publish_later("job:1", ("file_completed", {"processed_files": 1}), ("failed", {"error": "boom"}))
+
+    events = [message["event"] async for message in bus.subscribe("job:1")]
+    await task
+
+    assert events == ["phase", "file_completed", "failed"]
+    assert bus._channels["job:1"].subscribers == []
+
+
+async def test_event_stream_skips_events_covered_by_snapshot(bus):
+    bus.publish("job:1", "phase", phase="extraction")
+    bus.publish("job:1", "file_completed", processed_files=1)
+    snapshot = bus.snapshot("job:1")
+    task = _publish_later("job:1", ("completed", {"status": "completed"}))
+
+    events = _events(await _collect(event_stream("job:1", initial=[snapshot])))
+    await task
+
+    assert [event for event, _ in events] == ["snapshot", "completed"]
+    assert events[0][1]["processed_files"] == 1
+    assert events[1][1]["seq"] == 3
+
+
+async def test_event_stream_ends_on_terminal_initial_event_and_keeps_alive(bus):
+    finished = await _collect(event_stream("job:1", initial=[{"event": "completed", "seq": 0}]))
+    assert [event for event, _ in _events(finished)] == ["completed"]
+    assert bus.state("job:1") is None
+
+    task = _publish_later("job:2", ("completed", {}), delay=0.3)
+    body = await _collect(event_stream("job:2", keepalive=0.1))
+    await task
+
+    assert ": keepalive" in body
+    assert [event for event, _ in _events(body)] == ["completed"]
+
+
+async def test_stream_routes_accept_query_token(client, bus, monkeypatch):
+    job_id = "job_" + uuid.uuid4().hex
+    monkeypatch.setitem(templates.template_jobs, job_id, {"status": "processing"})
+    bus.publish(template_channel(job_id), "phase", job_id=job_id, status="processing")
+    url = f"/api/templates/jobs/{job_id}/events"
+
+    assert (await client.get(url)).status_code == 401
+    assert (await client.get(url, params={"token": "not-a-jwt"})).status_code == 401
+    assert (await client.get("/api/extraction/events/unknown-file")).status_code == 401
+
+    token = jwt.encode({"sub": "test@example.com"}, SECRET_KEY, algorithm=ALGORITHM)
+    task = _publish_later(template_channel(job_id), ("completed", {"status": "completed"}))
+    response = await client.get(url, params={"token": token})
+    await task
+
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/event-stream")
+    assert [event for event, _ in _events(response.text)] == ["snapshot", "completed"]
+
+    response = await client.get(
+        "/api/extraction/events/unknown-file", headers={"Authorization": f"Bearer {token}"}
+    )
+    assert response.status_code == 404
+
+
+async def test_job_events_follow_persisted_job(client, bus, tmp_database, monkeypatch):
+    monkeypatch.setattr(financial_builder, "JOB_POLL_INTERVAL", 0.05)
+    job_id = "job_" + uuid.uuid4().hex
+    with tmp_database() as session:
+        session.add(ExtractionJob(job_id=job_id, project_id="p", status=JobStatus.PROCESSING, total_files=2))
+        session.commit()
+
+    async def finish_in_database():
+        await asyncio.sleep(0.2)
+        with tmp_database() as session:
+            job = session.query(ExtractionJob).filter(ExtractionJob.job_id == job_id).one()
+            job.status = JobStatus.COMPLETED
+            job.processed_files = 2
+            session.commit()
+
+    # Another process runs the job, so the stream polls its row until it ends
+    task = asyncio.create_task(finish_in_database())
+    response = await asyncio.wait_for(client.get(f"/api/financial-builder/jobs/{job_id}/events"), timeout=10)
+    await task
+
+    events = _events(response.text)
+    assert [event for event, _ in events] == ["snapshot", "completed"]
+    assert events[-1][1]["processed_files"] == 2
+
+    # Jobs that start publishing here switch over to the bus
+    other_id = "job_" + uuid.uuid4().hex
+    with tmp_database() as session:
+        session.add(ExtractionJob(job_id=other_id, project_id="p", status=JobStatus.PROCESSING))
+        session.commit()
+    task = _publish_later(job_channel(other_id), ("phase", {"phase": "parsing"}), ("failed", {"status": "failed"}),
+                          delay=0.2)
+    response = await asyncio.wait_for(client.get(f"/api/financial-builder/jobs/{other_id}/events"), timeout=10)
+    await task
+
+    assert [event for event, _ in _events(response.text)][0] == "snapshot"
+    assert [event for event, _ in _events(response.text)][-1] == "failed"
+    assert (await client.get("/api/financial-builder/jobs/missing/events")).status_code == 404
@@ -0,0 +1,93 @@
+"""
+Tests for the cached project registry and its change log
+"""
+import json
+import os
+
+from app.routers.project_files import build_file_tree
+from app.services.file_extractor import FileExtractor
+from app.services import project_registry
+from app.services.project_registry import ProjectRegistry
+
+
+def _touch_later(path):
+    """Bump a path's mtime so coarse-grained filesystems still see a change"""
+    stat = path.stat()
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10_000_000))
+
+
+def test_inventory_follows_folder_changes(tmp_path):
+    data = tmp_path / "project-a" / "data" / "01_BUDGET"
+    data.mkdir(parents=True)
+    (tmp_path / "project-a" / "project_info.json").write_text(json.dumps({"project_name": "Project A"}))
+    (data / "budget.xlsx").write_bytes(b"v1")
+    (tmp_path / "project-b").mkdir()
+
+    registry = ProjectRegistry(tmp_path, rescan_seconds=3600)
+    assert registry.project_ids() == ["project-a"]
+    assert registry.all_project_ids() == ["project-a", "project-b"]
+    assert registry.project_infos() == [{"project_name": "Project A"}]
+    assert [entry.path for entry in registry.files("project-a")] == ["01_BUDGET/budget.xlsx"]
+    version = registry.version
+    scans = registry.scans
+
+    # Unchanged folders aren't rescanned
+    registry.files("project-a")
+    assert registry.scans == scans
+
+    # An added file changes its folder's mtime
+    (data / "invoice.pdf").write_bytes(b"pdf")
+    _touch_later(data)
+    assert [entry.name for entry in registry.files("project-a")] == ["budget.xlsx", "invoice.pdf"]
+
+    changes = registry.changes_since(version)
+    assert changes["reset"] is False
+    assert [(c["project_id"], c["path"], c["change"]) for c in changes["changes"]] == [
+        ("project-a", "01_BUDGET/invoice.pdf", "added"),
+    ]
+    assert registry.changes_since(changes["version"])["changes"] == []
+
+    tree = build_file_tree(registry.entries("project-a"))
+    assert tree["children"][0]["path"] == "01_BUDGET"
+    assert [child["name"] for child in tree["children"][0]["children"]] == ["budget.xlsx", "invoice.pdf"]
+
+
+def test_changes_since_resets_when_log_is_trimmed(tmp_path, monkeypatch):
+    monkeypatch.setattr(project_registry, "MAX_CHANGES", 2)
+    data = tmp_path / "project-a" / "data"
+    data.mkdir(parents=True)
+
+    registry = ProjectRegistry(tmp_path, rescan_seconds=3600)
+    registry.files("project-a")
+    for name in ("a.pdf", "b.pdf", "c.pdf"):
+        (data / name).write_bytes(b"pdf")
+        registry.invalidate("project-a")
+        registry.files("project-a")
+
+    assert registry.changes_since(0)["reset"] is True
+    latest = registry.changes_since(registry.version - 1)
+    assert latest["reset"] is False
+    assert [c["path"] for c in latest["changes"]] == ["c.pdf"]
+
+
+def test_scan_files_sees_files_rewritten_in_place(tmp_path, monkeypatch):
+    data = tmp_path / "project-a" / "data"
+    data.mkdir(parents=True)
+    (data / "budget.xlsx").write_bytes(b"v1")
+    registry = ProjectRegistry(tmp_path, rescan_seconds=3600)
+    monkeypatch.setattr(project_registry, "_registry", registry)
+
+    extractor = FileExtractor("project-a", db=None)
+    extractor.base_path = data
+    assert [(f["name"], f["size"]) for f in extractor.scan_files()] == [("budget.xlsx", 2)]
+
+    # Rewriting a file leaves its folder's mtime alone, so the registry
+    # keeps its listing; the stats still have to be current
+    (data / "budget.xlsx").write_bytes(b"version 2")
+    _touch_later(data / "budget.xlsx")
+    stat = (data / "budget.xlsx").stat()
+    scans = registry.scans
+
+    files = extractor.scan_files()
+    assert registry.scans == scans
+    assert [(f["size"], f["mtime_ns"]) for f in files] == [(stat.st_size, stat.st_mtime_ns)]
@@ -0,0 +1,62 @@
+"""
+Tests for PDF page ranges, page thumbnails and the bounded disk cache
+"""
+import pytest
+from PyPDF2 import PdfWriter
+
+from app.services.disk_cache import BoundedDiskCache
+from app.services.document_viewer import parse_page_range
+from app.services.thumbnails import render_image_thumbnail, render_pdf_page, thumbnail_key
+
+
+def test_disk_cache_evicts_least_recently_used(tmp_path):
+    cache = BoundedDiskCache(tmp_path, max_bytes=250)
+    cache.put("a", b"a" * 100)
+    cache.put("b", b"b" * 100)
+    assert cache.get("a") == b"a" * 100  # a is now the most recent
+
+    assert cache.get_or_create("c", lambda: b"c" * 100) == b"c" * 100
+    assert cache.get("b") is None
+    assert cache.get_or_create("a", lambda: b"new") == b"a" * 100
+    assert cache.stats()["evictions"] == 1
+
+    # Files and their recency survive a restart
+    reopened = BoundedDiskCache(tmp_path, max_bytes=250)
+    assert reopened.stats()["files"] == 2
+    assert reopened.get("c") == b"c" * 100
+
+
+def test_parse_page_range():
+    assert parse_page_range("11-20") == (11, 20)
+    assert parse_page_range("5") == (5, 5)
+    assert parse_page_range("30-") == (30, None)
+    for invalid in ("0-3", "9-2", "a-b", ""):
+        with pytest.raises(ValueError):
+            parse_page_range(invalid)
+
+
+def test_render_image_thumbnail(tmp_path):
+    from PIL import Image
+
+    photo = tmp_path / "site.jpg"
+    Image.new("RGB", (1200, 800), "gray").save(photo)
+    thumbnail = tmp_path / "thumb.jpg"
+    thumbnail.write_bytes(render_image_thumbnail(photo, 300))
+    with Image.open(thumbnail) as image:
+        assert (image.format, image.size) == ("JPEG", (300, 200))
+
+
+def test_render_pdf_page(tmp_path):
+    pytest.importorskip("pypdfium2")
+    path = tmp_path / "drawing.pdf"
+    writer = PdfWriter()
+    writer.add_blank_page(width=144, height=72)
+    writer.add_blank_page(width=72, height=72)
+    with open(path, "wb") as f:
+        writer.write(f)
+
+    png = render_pdf_page(path, 1, dpi=72)
+    assert png.startswith(b"\x89PNG")
+    assert thumbnail_key(path, 1, 72) != thumbnail_key(path, 2, 72)
+    with pytest.raises(IndexError):
+        render_pdf_page(path, 3, dpi=72)
@@ -0,0 +1,36 @@
+"""
+Tests for the parsed workbook cache
+"""
+import os
+
+from app.services.workbook_cache import WorkbookCache
+
+
+def test_cache_invalidates_on_change_and_evicts_lru(tmp_path):
+    """Repeat loads are hits; a new mtime reloads; the oldest entry is evicted"""
+    workbook = tmp_path / "budget.xlsx"
+    workbook.write_bytes(b"v1")
+    cache = WorkbookCache(max_entries=2)
+    loads = []
+
+    def load():
+        loads.append(1)
+        return {"items": [workbook.read_bytes().decode()]}
+
+    assert cache.get_or_load(("p1", "budget"), workbook, load) == {"items": ["v1"]}
+    cached = cache.get_or_load(("p1", "budget"), workbook, load)
+    cached["items"].clear()  # callers get copies
+    assert cache.get_or_load(("p1", "budget"), workbook, load) == {"items": ["v1"]}
+    assert len(loads) == 1
+
+    stat = workbook.stat()
+    os.utime(workbook, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000))
+    cache.get_or_load(("p1", "budget"), workbook, load)
+    assert len(loads) == 2
+
+    cache.get_or_load(("p2", "budget"), workbook, load)
+    cache.get_or_load(("p3", "budget"), workbook, load)
+
+    stats = cache.stats()
+    assert (stats["entries"], stats["hits"], stats["misses"]) == (2, 2, 4)
+    assert (stats["invalidations"], stats["evictions"]) == (1, 1)
@@ -0,0 +1,65 @@
+"""
+Tests for the pluggable workbook reader
+"""
+import datetime
+
+import openpyxl
+import pytest
+
+from app.services.workbook_reader import (
+    read_excel,
+    read_values,
+    read_window,
+    sheet_dimensions,
+    sheet_names,
+    value_engine,
+)
+
+
+@pytest.fixture
+def workbook(tmp_path):
+    path = tmp_path / "register.xlsx"
+    wb = openpyxl.Workbook()
+    ws = wb.active
+    ws.title = "Payments"
+    ws.append(["Register"])
+    ws.append([])
+    ws.append(["Date", "Supplier", "Amount", "Notes"])
+    ws.append([datetime.datetime(2024, 9, 2), "Acme", 1200, None])
+    ws.append([datetime.datetime(2024, 9, 9), "Bolt Co", 99.5, "Part paid"])
+    wb.create_sheet("Empty")
+    wb.save(path)
+    return path
+
+
+def test_engines_read_the_same_values(workbook):
+    """Calamine returns the same cells, frames and sheet names as openpyxl"""
+    pytest.importorskip("python_calamine")
+
+    assert value_engine("auto") == "calamine"
+    assert sheet_names(workbook, engine="calamine") == sheet_names(workbook, engine="openpyxl")
+
+    values = read_values(workbook, engine="calamine")
+    assert values["Payments"] == read_values(workbook, engine="openpyxl")["Payments"]
+    assert values["Payments"][3] == [datetime.datetime(2024, 9, 2), "Acme", 1200, None]
+
+    fast = read_excel(workbook, sheet_name="Payments", header=2, engine="calamine")
+    slow = read_excel(workbook, sheet_name="Payments", header=2, engine="openpyxl")
+    assert fast.equals(slow)
+
+
+def test_read_window(workbook):
+    """Windows match the same rows of the full grid on either reader"""
+    assert sheet_dimensions(workbook) == {"Payments": (5, 4), "Empty": (1, 1)}
+
+    rows = read_values(workbook, engine="openpyxl")["Payments"]
+    for engine in ("openpyxl", "calamine"):
+        if engine == "calamine":
+            pytest.importorskip("python_calamine")
+        assert read_window(workbook, "Payments", 2, 4, engine=engine) == rows[2:4]
+        assert read_window(workbook, "Payments", 4, 10, engine=engine) == rows[4:]
+
+
+def test_unknown_engine_is_rejected():
+    with pytest.raises(ValueError):
+        value_engine("xlrd")
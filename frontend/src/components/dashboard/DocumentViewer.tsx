@@ -1,7 +1,7 @@
 import { useState, useEffect } from 'react';
 import { FileText, Download, FolderOpen, File, Image, FileSpreadsheet } from 'lucide-react';
 import * as XLSX from 'xlsx';
-import { getDocumentList, getDocumentDownloadUrl } from '../../services/api';
+import { getDocumentList, getDocumentDownloadUrl, getDocumentFileUrl } from '../../services/api';
 import { useAuth } from '../../contexts/AuthContext';
 
 interface DocumentItem {
@@ -21,6 +21,9 @@ interface DocumentViewerProps {
   projectId: string;
 }
 
+// Widest image preview requested from the server (previews are shown at most ~1000px wide)
+const IMAGE_PREVIEW_WIDTH = 1600;
+
 export function DocumentViewer({ projectId }: DocumentViewerProps) {
   const { token } = useAuth();
   const [documents, setDocuments] = useState<DocumentItem[]>([]);
@@ -124,7 +127,10 @@ export function DocumentViewer({ projectId }: DocumentViewerProps) {
     setIsSelectingRange(false);
 
     try {
-      const url = getDocumentDownloadUrl(projectId, doc.path);
+      // Images are previewed at display size rather than full camera resolution
+      const url = doc.type === 'image'
+        ? getDocumentFileUrl(projectId, doc.path, IMAGE_PREVIEW_WIDTH)
+        : getDocumentDownloadUrl(projectId, doc.path);
 
       const response = await fetch(url, {
         headers: {
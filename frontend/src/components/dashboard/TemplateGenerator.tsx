@@ -2,6 +2,7 @@ import { useState, useEffect } from 'react';
 import { FileSpreadsheet, Download, CheckCircle, AlertCircle, Clock, Loader } from 'lucide-react';
 import axios from 'axios';
 import { useAuth } from '../../contexts/AuthContext';
+import { streamJobEvents } from '../../services/api';
 
 const API_BASE_URL = import.meta.env.VITE_API_URL || 'http://localhost:8000/api';
 
@@ -69,8 +70,8 @@ export function TemplateGenerator() {
         }
       );
 
-      // Start polling for job completion
-      pollJobStatus(response.data.job_id);
+      // Follow the job until it finishes
+      followJobStatus(response.data.job_id);
     } catch (err: any) {
       console.error('Error generating template:', err);
       alert(err.response?.data?.detail || 'Failed to generate template');
@@ -79,24 +80,17 @@ export function TemplateGenerator() {
     }
   };
 
-  const pollJobStatus = async (jobId: string) => {
-    const interval = setInterval(async () => {
-      try {
-        const response = await axios.get(`${API_BASE_URL}/templates/jobs/${jobId}`, {
-          headers: { Authorization: `Bearer ${token}` }
-        });
-
-        const job = response.data;
-
-        if (job.status === 'completed' || job.status === 'failed') {
-          clearInterval(interval);
+  const followJobStatus = (jobId: string) => {
+    streamJobEvents(
+      `/templates/jobs/${jobId}/events`,
+      token,
+      (_job, event) => {
+        if (event === 'completed' || event === 'failed') {
           fetchJobs(); // Refresh job list
         }
-      } catch (err) {
-        console.error('Error polling job status:', err);
-        clearInterval(interval);
-      }
-    }, 2000);
+      },
+      (message) => console.error('Error following job status:', message)
+    );
   };
 
   const downloadTemplate = async (jobId: string) => {
@@ -19,7 +19,7 @@ import { PDFExtractionTest } from '../components/dashboard/PDFExtractionTest';
 import { DetailedPipelineArchitecture } from '../components/dashboard/DetailedPipelineArchitecture';
 import { AIInsightsPanel } from '../components/dashboard/AIInsightsPanel';
 import { useAuth } from '../contexts/AuthContext';
-import { getDashboardData } from '../services/api';
+import { getDashboardData, streamJobEvents } from '../services/api';
 import { useNavigate } from 'react-router-dom';
 import {
   BarChart, Bar, XAxis, YAxis, CartesianGrid, Tooltip, ResponsiveContainer, Legend,
@@ -142,41 +142,30 @@ export function Dashboard() {
       }
 
       setJobId(data.job_id);
-      // Start polling for status
-      pollPipelineStatus(data.job_id);
+      // Follow progress events until the job finishes
+      followPipelineStatus(data.job_id);
     } catch (err: any) {
       setPipelineError(err.message);
       setPipelineRunning(false);
     }
   };
 
-  const pollPipelineStatus = async (jobIdParam: string) => {
+  const followPipelineStatus = (jobIdParam: string) => {
     if (!token) return;
 
-    const pollInterval = setInterval(async () => {
-      try {
-        const response = await fetch(`${API_BASE_URL}/financial-builder/jobs/${jobIdParam}/status`, {
-          headers: {
-            'Authorization': `Bearer ${token}`
-          }
-        });
+    streamJobEvents(
+      `/financial-builder/jobs/${jobIdParam}/events`,
+      token,
+      (state, event) => {
+        // Fields the status card reads before the first progress event
+        setPipelineStatus({ progress_percent: 0, processed_files: 0, total_files: 0, ...state });
 
-        const data = await response.json();
-
-        if (!response.ok) {
-          throw new Error(data.detail || 'Failed to fetch job status');
-        }
-
-        setPipelineStatus(data);
-
-        // Check if completed or failed
-        if (data.status === 'completed') {
-          clearInterval(pollInterval);
+        if (event === 'completed') {
           setPipelineRunning(false);
           // Check if Excel was generated
-          if (data.metadata) {
+          if (state.metadata) {
             try {
-              const metadata = JSON.parse(data.metadata);
+              const metadata = JSON.parse(state.metadata);
               if (metadata.excel_path) {
                 setExcelPath(metadata.excel_path);
               }
@@ -192,18 +181,17 @@ export function Dashboard() {
               console.error('Failed to parse metadata:', e);
             }
           }
-        } else if (data.status === 'failed') {
-          clearInterval(pollInterval);
+        } else if (event === 'failed') {
           setPipelineRunning(false);
-          setPipelineError(data.error_message || 'Pipeline failed');
+          setPipelineError(state.error_message || 'Pipeline failed');
         }
-      } catch (err: any) {
-        console.error('Error polling status:', err);
-        clearInterval(pollInterval);
+      },
+      (message) => {
+        console.error('Error following status:', message);
         setPipelineRunning(false);
-        setPipelineError(err.message);
+        setPipelineError(message);
       }
-    }, 2000); // Poll every 2 seconds
+    );
   };
 
   if (loading) {
@@ -1,6 +1,7 @@
 import { useState, useEffect } from 'react';
 import { FileSpreadsheet, Zap, CheckCircle2, Loader2, AlertCircle, TrendingUp, Database, BarChart3, Download } from 'lucide-react';
 import { useAuth } from '../contexts/AuthContext';
+import { streamJobEvents } from '../services/api';
 import { ConceptFlowAnimation } from '../components/dashboard/ConceptFlowAnimation';
 
 const API_BASE_URL = import.meta.env.VITE_API_URL || 'http://localhost:8000/api';
@@ -30,7 +31,7 @@ interface FinancialResults {
 }
 
 export default function FinancialBuilder() {
-  const { } = useAuth();
+  const { token } = useAuth();
   const currentProject = 'project-a-123-sunset-blvd'; // TODO: Make project-aware
   const [isProcessing, setIsProcessing] = useState(false);
   const [isLoadingResults, setIsLoadingResults] = useState(false);
@@ -90,27 +91,16 @@ export default function FinancialBuilder() {
     }
   };
 
-  // Poll for pipeline status
+  // Follow pipeline progress events
   useEffect(() => {
     if (!jobId || !isProcessing) return;
 
-    const pollInterval = setInterval(async () => {
-      try {
-        const token = localStorage.getItem('token');
-        const response = await fetch(`${API_BASE_URL}/financial-builder/jobs/${jobId}/status`, {
-          headers: {
-            'Authorization': `Bearer ${token}`
-          }
-        });
-
-        if (!response.ok) {
-          throw new Error(`HTTP ${response.status}`);
-        }
-
-        const status = await response.json();
-
+    return streamJobEvents(
+      `/financial-builder/jobs/${jobId}/events`,
+      token,
+      (status, event) => {
         // Update stages based on progress
-        const progressPercent = status.progress_percent;
+        const progressPercent = status.progress_percent ?? 0;
 
         setStages(prev => {
           const newStages = [...prev];
@@ -166,8 +156,7 @@ export default function FinancialBuilder() {
         });
 
         // Check if completed
-        if (status.status === 'completed') {
-          clearInterval(pollInterval);
+        if (event === 'completed') {
           setIsProcessing(false);
 
           // Show loading state for results
@@ -196,8 +185,7 @@ export default function FinancialBuilder() {
         }
 
         // Check if failed
-        if (status.status === 'failed') {
-          clearInterval(pollInterval);
+        if (event === 'failed') {
           setIsProcessing(false);
           setError(status.error_message || 'Pipeline failed');
 
@@ -206,17 +194,14 @@ export default function FinancialBuilder() {
             s.status === 'processing' ? { ...s, status: 'error' } : s
           ));
         }
-
-      } catch (err) {
-        console.error('Status poll failed:', err);
-        clearInterval(pollInterval);
+      },
+      (message) => {
+        console.error('Status stream failed:', message);
         setIsProcessing(false);
         setError('Failed to check pipeline status');
       }
-    }, 2000); // Poll every 2 seconds
-
-    return () => clearInterval(pollInterval);
-  }, [jobId, isProcessing]);
+    );
+  }, [jobId, isProcessing, token]);
 
   const getStageIcon = (status: string) => {
     switch (status) {
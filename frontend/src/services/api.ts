@@ -359,6 +359,57 @@ export function getDocumentDownloadUrl(projectId: string, filePath: string): str
   return `${API_BASE_URL}/documents/download/${projectId}/${filePath}`;
 }
 
+/**
+ * View a document inline (images: pass a width for a downscaled copy)
+ */
+export function getDocumentFileUrl(projectId: string, filePath: string, width?: number): string {
+  const query = width ? `?width=${width}` : '';
+  return `${API_BASE_URL}/documents/file/${projectId}/${filePath}${query}`;
+}
+
+/**
+ * Progress events sent by the job event streams
+ */
+const JOB_EVENTS = ['snapshot', 'phase', 'file_completed', 'categorized', 'completed', 'failed'];
+
+/**
+ * Follow a job's Server-Sent Events stream (e.g. `/financial-builder/jobs/<id>/events`)
+ *
+ * EventSource can't send an Authorization header, so the token goes in the
+ * query string. `onUpdate` gets the job state merged from every event so far;
+ * the stream is closed after a 'completed' or 'failed' event.
+ * Returns a function that closes the stream.
+ */
+export function streamJobEvents(
+  endpoint: string,
+  token: string | null,
+  onUpdate: (state: Record<string, any>, event: string) => void,
+  onError?: (message: string) => void,
+): () => void {
+  const query = token ? `?token=${encodeURIComponent(token)}` : '';
+  const source = new EventSource(`${API_BASE_URL}${endpoint}${query}`);
+  let state: Record<string, any> = {};
+
+  JOB_EVENTS.forEach((name) => {
+    source.addEventListener(name, (message) => {
+      state = { ...state, ...JSON.parse((message as MessageEvent).data) };
+      if (name === 'completed' || name === 'failed') {
+        source.close();
+      }
+      onUpdate(state, name);
+    });
+  });
+
+  source.onerror = () => {
+    // EventSource reconnects on its own unless the server refused the stream
+    if (source.readyState === EventSource.CLOSED) {
+      onError?.('Lost connection to job progress stream');
+    }
+  };
+
+  return () => source.close();
+}
+
 export default {
   login,
   verifyToken,
@@ -383,4 +434,6 @@ export default {
   getDocumentList,
   previewDocument,
   getDocumentDownloadUrl,
+  getDocumentFileUrl,
+  streamJobEvents,
 };